@@ -0,0 +1,88 @@
+"""
+Benchmark: filtros y ordenación de AdvancedFilterEngine con 10k, 100k y 1M items
+Compara el predicado compilado (recorrido de objetos Item) con las máscaras
+y argsorts de ItemColumns (NumPy), verificando que ambos dan el mismo resultado
+"""
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models.item import Item, ItemType
+from core.filter_compiler import compile_filters
+from core.item_columns import ItemColumns, NUMPY_AVAILABLE
+
+SIZES = [int(size) for size in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+REPEAT = 3
+FILTERS = {
+    "favorites": {'is_favorite': True},
+    "type + tags AND": {'type': ['CODE', 'TEXT'], 'tags': {'values': ['git', 'cli'], 'mode': 'AND'}},
+    "use_count > 10": {'use_count': {'operator': '>', 'value': 10}},
+    "created last 30 days": {'created_at': {'preset': 'last_30_days'}},
+    "sort label_asc": {'sort_by': 'label_asc'},
+    "tags OR + sort use_count": {'tags': {'values': ['docker', 'python']}, 'sort_by': 'use_count_desc',
+                                 'top_n': 100},
+}
+
+
+def build_items(count):
+    """Items con tipos, flags, tags, usos y fechas pseudo-aleatorios"""
+    random.seed(42)
+    tags = [f"tag{i}" for i in range(200)] + ["git", "cli", "docker", "python"]
+    types = list(ItemType)
+    now = datetime.now()
+    items = []
+    for i in range(count):
+        item = Item(str(i), f"item {random.randint(0, count)}", "content",
+                    item_type=random.choice(types), tags=random.sample(tags, random.randint(0, 4)))
+        item.is_favorite = random.random() < 0.1
+        item.use_count = random.randint(0, 50)
+        item.created_at = now - timedelta(days=random.randint(0, 365))
+        items.append(item)
+    return items
+
+
+def timed(function):
+    """Mediana de varias ejecuciones (ms) y el último resultado"""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    print("=" * 72)
+    print("BENCHMARK: AdvancedFilterEngine, compiled predicate vs NumPy columns")
+    print("=" * 72)
+    if not NUMPY_AVAILABLE:
+        print("NumPy not installed: only the compiled predicate path is measured")
+
+    for size in SIZES:
+        items = build_items(size)
+        print(f"\n{size:,} items")
+
+        columns = None
+        if NUMPY_AVAILABLE:
+            start = time.perf_counter()
+            columns = ItemColumns.from_items(items)
+            print(f"  build columns (once per dataset version): {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        for name, filters in FILTERS.items():
+            now = datetime.now()
+            python_ms, expected = timed(lambda: compile_filters(filters, now=now).apply(items))
+            line = f"  {name:26} python {python_ms:8.1f} ms"
+            if columns is not None:
+                numpy_ms, result = timed(lambda: columns.apply(filters, now=now))
+                assert result == expected, f"Different results for {name!r}"
+                line += f" | numpy {numpy_ms:7.1f} ms | x{python_ms / max(numpy_ms, 1e-6):5.1f}"
+            print(f"{line} | {len(expected):,} results")
+
+
+if __name__ == "__main__":
+    main()
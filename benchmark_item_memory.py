@@ -0,0 +1,71 @@
+"""
+Benchmark: memoria por Item al cargar 100k items
+Construye los Item como lo hace la búsqueda global (Item.from_row) y
+reporta los bytes asignados por item (tracemalloc)
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models.item import Item
+
+ITEM_COUNT = 100_000
+CATEGORY_COUNT = 50
+
+
+def build_rows(count):
+    """Filas con la forma de DBManager.get_all_items()"""
+    rows = []
+    for i in range(count):
+        category = i % CATEGORY_COUNT
+        rows.append({
+            'id': i,
+            'label': f'Item {i}',
+            'content': f'echo "contenido del item {i}"',
+            'type': ('TEXT', 'URL', 'CODE', 'PATH')[i % 4],
+            'icon': None,
+            'tags': [f'tag{i % 20}', f'grupo{i % 7}'],
+            'description': None,
+            # Copias distintas del mismo texto, como las devuelve sqlite3
+            'category_name': ''.join(['Categoría ', str(category)]),
+            'category_icon': '📁',
+            'category_color': '#007acc',
+            'created_at': f'2025-01-{1 + i % 28:02d} 10:{i % 60:02d}:00',
+            'last_used': None,
+            'use_count': i % 100,
+        })
+    return rows
+
+
+def main():
+    print("=" * 60)
+    print(f"BENCHMARK: Item memory at {ITEM_COUNT:,} items")
+    print("=" * 60)
+
+    # Las filas se crean dentro de la medición y se liberan al final: solo
+    # cuenta lo que retienen los Item (p. ej. su copia del nombre de categoría)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    rows = build_rows(ITEM_COUNT)
+    start = time.perf_counter()
+    items = [Item.from_row(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    del rows
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = after - before
+    print(f"Items built:      {len(items):,}")
+    print(f"Build time:       {elapsed * 1000:.0f} ms (traced) ({elapsed / len(items) * 1e6:.2f} us/item)")
+    print(f"Retained memory:  {total / 1024 / 1024:.1f} MiB")
+    print(f"Bytes per item:   {total / len(items):.0f}")
+    print(f"Peak during load: {(peak - before) / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: latencia por pulsación del motor de búsqueda con 100k items
+Simula escribir consultas carácter a carácter (type-ahead) por las mismas
+llamadas que hacen los paneles: search() sobre todas las categorías y
+search_in_category() sobre una categoría temporal de 10k items filtrados
+(FloatingPanel). Los items no cambian entre pulsaciones: se pasa una
+versión fija, como los paneles
+"""
+import random
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models.item import Item
+from models.category import Category
+from core.search_engine import SearchEngine
+
+ITEM_COUNT = 100_000
+CATEGORY_COUNT = 50
+PANEL_ITEM_COUNT = 10_000
+REPEAT = 5
+VERSION = 1
+QUERIES = ["docker compose", "git status", "https://github", "kubectl get pods"]
+
+
+def build_categories(count):
+    """Categorías con items de texto pseudo-aleatorio"""
+    random.seed(42)
+    words = [''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9))) for _ in range(20000)]
+    words += ["docker", "compose", "git", "status", "https://github.com", "kubectl", "pods"]
+    categories = [Category(str(i), f"Categoría {i}") for i in range(CATEGORY_COUNT)]
+    for i in range(count):
+        label = ' '.join(random.choices(words, k=3))
+        content = ' '.join(random.choices(words, k=10))
+        tags = random.sample(words[:200], 2)
+        categories[i % CATEGORY_COUNT].items.append(Item(str(i), label, content, tags=tags))
+    return categories
+
+
+def run_queries(search, repeat=REPEAT):
+    """Teclea cada consulta carácter a carácter e imprime las latencias"""
+    for query in QUERIES:
+        # Mediana de varias repeticiones de la secuencia de pulsaciones
+        timings = [[] for _ in query]
+        for _ in range(repeat):
+            for length in range(1, len(query) + 1):
+                start = time.perf_counter()
+                results = search(query[:length])
+                timings[length - 1].append((time.perf_counter() - start) * 1000)
+        # Primera pasada: consultas cortas sin memorizar; resto: mediana
+        cold = [key_timings[0] for key_timings in timings]
+        medians = [statistics.median(key_timings[1:]) for key_timings in timings]
+        print(f"{query!r:20} 1 char {cold[0]:5.1f} ms (again {medians[0]:4.1f}) | "
+              f"2 chars {cold[1]:5.1f} ms (again {medians[1]:4.1f}) | "
+              f"3+ chars avg {statistics.mean(medians[2:]):4.1f} ms, max {max(cold[2:]):4.1f} ms | "
+              f"{len(results)} results")
+
+
+def main():
+    print("=" * 60)
+    print(f"BENCHMARK: SearchEngine type-ahead at {ITEM_COUNT:,} items")
+    print("=" * 60)
+
+    categories = build_categories(ITEM_COUNT)
+
+    # Búsqueda sobre todas las categorías
+    engine = SearchEngine()
+    start = time.perf_counter()
+    engine.search("x", categories, version=VERSION)
+    print(f"First query (builds index): {(time.perf_counter() - start) * 1000:.0f} ms")
+    run_queries(lambda query: engine.search(query, categories, version=VERSION))
+
+    start = time.perf_counter()
+    stats = engine.get_search_stats("docker", categories, version=VERSION)
+    print(f"get_search_stats: {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({stats['total_results']} results, {len(stats['category_breakdown'])} categories)")
+
+    # Ruta de FloatingPanel: categoría temporal con los items filtrados del panel
+    print("-" * 60)
+    print(f"FloatingPanel route: search_in_category over {PANEL_ITEM_COUNT:,} items")
+    panel_engine = SearchEngine()
+    temp_category = Category("temp", "temp")
+    temp_category.items = [item for category in categories for item in category.items][:PANEL_ITEM_COUNT]
+    panel_version = (("filters", VERSION), "normal")
+    start = time.perf_counter()
+    panel_engine.search_in_category("x", temp_category, version=panel_version)
+    print(f"First query (builds index): {(time.perf_counter() - start) * 1000:.0f} ms")
+    run_queries(lambda query: panel_engine.search_in_category(query, temp_category, version=panel_version))
+
+
+if __name__ == "__main__":
+    main()
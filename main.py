@@ -73,6 +73,8 @@ from core.auth_manager import AuthManager
 from core.session_manager import SessionManager
 from views.first_time_wizard import FirstTimeWizard
 from views.login_dialog import LoginDialog
+from core.usage_tracker import flush_usage_queues, schedule_history_compaction
+from database.connection_pool import close_all_pools
 
 
 def get_app_dir() -> Path:
@@ -191,6 +193,9 @@ def main():
         controller = MainController()
         logger.info("MainController initialized")
 
+        # Envejecer historial de uso crudo (los rollups conservan las estadísticas)
+        schedule_history_compaction(controller.config_manager.db.db_path)
+
         # Create main window with controller
         logger.info("Creating main window...")
         window = MainWindow(controller)
@@ -226,6 +231,8 @@ def main():
         logger.info("Starting Qt event loop...")
         exit_code = app.exec()
         logger.info(f"Application exited with code: {exit_code}")
+        flush_usage_queues()
+        close_all_pools()
         sys.exit(exit_code)
 
     except Exception as e:
@@ -13,10 +13,14 @@ from core.pinned_panels_manager import PinnedPanelsManager
 from core.simple_browser_manager import SimpleBrowserManager
 from core.notebook_manager import NotebookManager
 from core.workarea_manager import WorkareaManager
+from core.item_store import ItemStore
+from core.item_snapshot import ItemSnapshotService
+from core.file_manager import FileManager
 from controllers.clipboard_controller import ClipboardController
 from controllers.list_controller import ListController
 from models.category import Category
 from models.item import Item
+from database.db_manager import ITEM_DELETED
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,6 +39,18 @@ class MainController:
         self.notebook_manager = NotebookManager(self.config_manager.db)
         self.workarea_manager = WorkareaManager()
 
+        # Almacén central de items: recibe los cambios de DBManager y los
+        # propaga como diffs a las vistas suscritas
+        self.item_store = ItemStore(self.config_manager.db)
+        self.item_store.subscribe(self._on_item_store_changed)
+
+        # Items (objetos Item) compartidos por los paneles de búsqueda global
+        self.item_snapshots = ItemSnapshotService(self.item_store)
+
+        # Almacenamiento por contenido: borrar items libera sus blobs
+        self.file_manager = FileManager(self.config_manager)
+        self.file_manager.start_blob_collection()
+
         # Initialize controllers
         self.clipboard_controller = ClipboardController(self.clipboard_manager)
         self.list_controller = ListController(self.config_manager.db, self.clipboard_manager)
@@ -64,6 +80,8 @@ class MainController:
         for cat in self.categories:
             print(f"  - {cat.name}: {len(cat.items)} items")
 
+        self.item_store.load()
+
     def get_categories(self, include_filtered: bool = True) -> List[Category]:
         """
         Get categories
@@ -83,7 +101,7 @@ class MainController:
             return self._all_categories
 
     def get_category(self, category_id: str) -> Optional[Category]:
-        """Get a specific category by ID"""
+        """Get a specific category by ID (cached per category by ConfigManager)"""
         return self.config_manager.get_category(category_id)
 
     def set_current_category(self, category_id: str) -> bool:
@@ -199,23 +217,66 @@ class MainController:
         """
         logger.debug("Invalidating filter engine cache")
         self.category_filter_engine.clear_cache()
-        # Also clear config manager cache
+        # Also clear config manager cache (the per-category cache of
+        # get_category is invalidated by the DB change notifications)
         if hasattr(self.config_manager, '_categories_cache'):
             self.config_manager._categories_cache = None
 
-    def refresh_ui(self) -> None:
+    def _on_item_store_changed(self, change) -> None:
+        """
+        Aplicar un diff del almacén de items a las categorías en memoria
+
+        Los items de cada Category se reemplazan/agregan/eliminan en sitio,
+        sin recargar categorías desde la base de datos.
+        """
+        categories_by_id = {str(category.id): category for category in self._all_categories}
+
+        for row in change.items:
+            item_id = str(row['id'])
+            # Quitar la versión anterior (puede haber cambiado de categoría)
+            previous = change.previous.get(row['id'], row)
+            old_category = categories_by_id.get(str(previous.get('category_id')))
+            position = None
+            if old_category:
+                for index, item in enumerate(old_category.items):
+                    if item.id == item_id:
+                        position = index
+                        old_category.items.pop(index)
+                        break
+
+            if change.kind == ITEM_DELETED:
+                continue
+
+            category = categories_by_id.get(str(row.get('category_id')))
+            if category:
+                item = self.config_manager._dict_to_item(row)
+                if category is old_category and position is not None:
+                    category.items.insert(position, item)
+                else:
+                    category.items.append(item)
+
+        logger.debug(f"Categorías actualizadas por diff: {change.kind} {len(change.items)} items")
+
+    def refresh_ui(self, reload_data: bool = True) -> None:
         """
         Recarga todos los datos desde la base de datos y actualiza la UI completa
         Este método debe ser llamado cuando se crean/editan/eliminan items o categorías
+
+        Args:
+            reload_data: Si es False no consulta la base de datos: los cambios
+                         de items hechos con DBManager ya se aplicaron a las
+                         categorías en memoria (diffs del almacén de items)
         """
         logger.info("Refrescando UI completa...")
 
         # Invalidar cachés
         self.invalidate_filter_cache()
 
-        # Recargar categorías desde la base de datos
-        logger.debug("Recargando categorías desde la base de datos")
-        self._all_categories = self.config_manager.load_default_categories()
+        if reload_data:
+            # Recargar categorías desde la base de datos
+            logger.debug("Recargando categorías desde la base de datos")
+            self._all_categories = self.config_manager.load_default_categories()
+            self.item_store.load()
 
         # Si hay filtros activos, re-aplicarlos
         if self._filters_active:
@@ -233,10 +294,15 @@ class MainController:
             # Si hay un FloatingPanel abierto, actualizarlo también
             if hasattr(self.main_window, 'floating_panel') and self.main_window.floating_panel:
                 logger.debug("Actualizando FloatingPanel")
-                # Recargar items de la categoría actual
+                # Recargar items de la categoría actual desde la carga masiva
+                # (sin consultas adicionales por categoría)
                 if self.current_category:
-                    items = self.config_manager.get_items_by_category(self.current_category.id)
-                    self.main_window.floating_panel.load_items(items, self.current_category)
+                    current_id = str(self.current_category.id)
+                    for category in self._all_categories:
+                        if str(category.id) == current_id:
+                            self.current_category = category
+                            self.main_window.floating_panel.load_category(category)
+                            break
 
         logger.info(f"UI refrescada. Total de categorías: {len(self.categories)}")
 
@@ -227,8 +227,8 @@ class AIBulkItemManager:
         Proceso:
         1. Validar que categoría existe
         2. Filtrar items seleccionados
-        3. Insertar en transacción
-        4. Actualizar item_count de categoría
+        3. Insertar en una transacción (DBManager.add_items_bulk)
+        4. Actualizar item_count de categoría (una vez)
         5. Retornar estadísticas
 
         Args:
@@ -261,63 +261,55 @@ class AIBulkItemManager:
             f"to category {category_id} ({category['name']})"
         )
 
-        # Inserción en transacción
+        # Preparar filas (tags y orden de lista) antes de tocar la BD
+        rows = []
+        # Si los items son de lista, asignar orden secuencial (comenzando desde 1)
+        list_order_counter = 1
+        for item in selected_items:
+            try:
+                # Convertir tags de string a lista
+                # Ej: "clonar_proyecto" → ["clonar_proyecto"]
+                # Ej: "git,deploy,automation" → ["git", "deploy", "automation"]
+                tags_list = [tag.strip() for tag in item.tags.split(',') if tag.strip()] if item.tags else []
+
+                # Asignar orden_lista secuencial si es lista
+                orden_lista = None
+                if item.is_list == 1:
+                    orden_lista = item.orden_lista if item.orden_lista is not None else list_order_counter
+                    list_order_counter += 1
+
+                rows.append({
+                    'label': item.label,
+                    'content': item.content,
+                    'item_type': item.type,
+                    'tags': tags_list,
+                    'description': item.description,
+                    'icon': item.icon,
+                    'color': item.color,
+                    'is_sensitive': item.is_sensitive,
+                    'is_favorite': item.is_favorite,
+                    'is_list': item.is_list,
+                    'list_group': item.list_group,
+                    'orden_lista': orden_lista,
+                    'working_dir': item.working_dir,
+                    'badge': item.badge
+                })
+            except Exception as e:
+                error_msg = f"Error preparando '{item.label}': {str(e)}"
+                result.add_error(error_msg)
+                logger.error(f"Failed to prepare item '{item.label}': {e}", exc_info=True)
+
+        # Inserción en una sola transacción (cifrado en lote + executemany)
         try:
-            with self.db.transaction() as conn:
-                # Si los items son de lista, asignar orden secuencial (comenzando desde 1)
-                list_order_counter = 1
-
-                for item in selected_items:
-                    try:
-                        # Convertir tags de string a lista
-                        # Ej: "clonar_proyecto" → ["clonar_proyecto"]
-                        # Ej: "git,deploy,automation" → ["git", "deploy", "automation"]
-                        tags_list = [tag.strip() for tag in item.tags.split(',') if tag.strip()] if item.tags else []
-
-                        # Asignar orden_lista secuencial si es lista
-                        orden_lista = None
-                        if item.is_list == 1:
-                            orden_lista = item.orden_lista if item.orden_lista is not None else list_order_counter
-                            list_order_counter += 1
-
-                        # Crear item usando el método del DBManager
-                        item_id = self.db.add_item(
-                            category_id=category_id,
-                            label=item.label,
-                            content=item.content,
-                            item_type=item.type,
-                            tags=tags_list,
-                            description=item.description,
-                            icon=item.icon,
-                            color=item.color,
-                            is_sensitive=item.is_sensitive,
-                            is_favorite=item.is_favorite,
-                            is_list=item.is_list,
-                            list_group=item.list_group,
-                            orden_lista=orden_lista,
-                            working_dir=item.working_dir,
-                            badge=item.badge
-                        )
-
-                        result.created_count += 1
-
-                        logger.debug(
-                            f"Created item {item_id}: '{item.label}' "
-                            f"(type: {item.type}, sensitive: {item.is_sensitive}, "
-                            f"is_list: {item.is_list}, list_group: {item.list_group})"
-                        )
-
-                    except Exception as e:
-                        error_msg = f"Error creando '{item.label}': {str(e)}"
-                        result.add_error(error_msg)
-                        logger.error(f"Failed to create item '{item.label}': {e}", exc_info=True)
-
-                # Actualizar item_count de categoría
-                try:
-                    self.db.update_category_item_count(category_id)
-                except Exception as e:
-                    logger.error(f"Failed to update category item_count: {e}")
-                    # No es crítico, continuar
+            item_ids = self.db.add_items_bulk(category_id, rows)
+            result.created_count = len(item_ids)
+
+            # Actualizar item_count de categoría (una vez por importación)
+            try:
+                self.db.update_category_item_count(category_id)
+            except Exception as e:
+                logger.error(f"Failed to update category item_count: {e}")
+                # No es crítico, continuar
 
             # Si se creó al menos un item, es exitoso
             result.success = result.created_count > 0
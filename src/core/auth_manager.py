@@ -218,3 +218,7 @@ class AuthManager:
         """
         lock_until = int(time.time()) + duration
         self._set_env("LOCK_TIMESTAMP", str(lock_until))
+
+        # Drop decrypted secrets kept in memory
+        from core.encryption_manager import purge_plaintext_caches
+        purge_plaintext_caches()
@@ -14,6 +14,8 @@ import sys
 
 from PyQt6.QtWebEngineCore import QWebEngineProfile
 
+from core.storage_catalog import get_storage_catalog, profile_root
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +45,8 @@ class BrowserProfileManager:
             db_manager: Instancia de DBManager para persistencia
         """
         self.db = db_manager
+        # Catálogo persistido de tamaños (get_profile_size sin recorrer el disco)
+        self.catalog = get_storage_catalog(db_manager)
         self.current_profile: Optional[QWebEngineProfile] = None
         self.current_profile_id: Optional[int] = None
 
@@ -204,6 +208,7 @@ class BrowserProfileManager:
                         import shutil
                         shutil.rmtree(storage_path)
                         logger.info(f"Datos del perfil eliminados: {storage_path}")
+                    self.catalog.forget_root(profile_root(profile_id))
 
             # Eliminar de la base de datos
             success = self.db.delete_browser_profile(profile_id)
@@ -269,6 +274,7 @@ class BrowserProfileManager:
                 shutil.rmtree(storage_path)
                 storage_path.mkdir(parents=True, exist_ok=True)
                 logger.info(f"Datos del perfil limpiados: {storage_path}")
+            self.catalog.forget_root(profile_root(profile_id))
 
             return True
 
@@ -276,32 +282,34 @@ class BrowserProfileManager:
             logger.error(f"Error al limpiar datos del perfil: {e}")
             return False
 
-    def get_profile_size(self, profile_id: int) -> int:
+    def get_profile_size(self, profile_id: int, reconcile: bool = True) -> int:
         """
-        Calcula el tamaño en disco de un perfil.
+        Obtiene el tamaño en disco de un perfil.
+
+        El tamaño sale del catálogo de almacenamiento (sin recorrer el
+        directorio). Con reconcile=True se programa una reconciliación en
+        segundo plano que solo revisa carpetas con mtime cambiado; el
+        primer cálculo de un perfil aún no catalogado devuelve 0.
 
         Args:
             profile_id: ID del perfil
+            reconcile: Programar la actualización del catálogo
 
         Returns:
             int: Tamaño en bytes
         """
         try:
-            profile_data = self.db.get_profile_by_id(profile_id)
-            if not profile_data:
-                return 0
-
-            storage_path = self.base_dir / profile_data['storage_path']
-
-            if not storage_path.exists():
-                return 0
+            root = profile_root(profile_id)
+            if reconcile:
+                profile_data = self.db.get_profile_by_id(profile_id)
+                if not profile_data:
+                    return 0
 
-            total_size = 0
-            for item in storage_path.rglob('*'):
-                if item.is_file():
-                    total_size += item.stat().st_size
+                storage_path = self.base_dir / profile_data['storage_path']
+                if storage_path.exists():
+                    self.catalog.schedule_reconcile(root, storage_path)
 
-            return total_size
+            return self.catalog.get_root_size(root)
 
         except Exception as e:
             logger.error(f"Error al calcular tamaño del perfil: {e}")
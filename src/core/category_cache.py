@@ -0,0 +1,208 @@
+"""
+Category Cache
+Per-category cache of loaded Category objects (with their items) for
+ConfigManager.get_category. Entries carry a version stamp and are
+invalidated only for the categories touched by DBManager item/category
+change notifications; concurrent loads of the same category collapse
+into a single database read.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from database.db_manager import ITEM_DELETED, BULK_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+# Categorías conservadas (sale primero la usada hace más tiempo)
+CATEGORY_CACHE_SIZE = 64
+
+
+@dataclass
+class _CacheEntry:
+    version: int       # Versión de la categoría cuando empezó la carga
+    category: Any      # Category cargada
+    item_ids: Set[int]  # Items de la categoría (para invalidar en borrados)
+
+
+class _Flight:
+    """Load in progress of one category; concurrent requests wait for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class CategoryCache:
+    """
+    Version-stamped, single-flight cache of categories by ID
+
+    Every invalidation bumps the category version: a load that started
+    before the bump still answers its callers but is not stored, so a
+    mutation made during a load never leaves a stale entry behind.
+
+    Writes made through the DBManager arrive as change notifications.
+    Writes from other connections (favorites, usage tracker, ...) do not,
+    so every lookup also compares PRAGMA data_version of the DBManager
+    connection, which only moves when another connection commits, and
+    drops every entry when it changed.
+    """
+
+    def __init__(self, db_manager, loader: Callable[[int], Any],
+                 max_entries: int = CATEGORY_CACHE_SIZE):
+        """
+        Args:
+            db_manager: DBManager whose change notifications invalidate entries
+            loader: Callable(category_id) -> Category or None (not cached)
+            max_entries: Maximum cached categories
+        """
+        self.db = db_manager
+        self._loader = loader
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._flights: Dict[int, _Flight] = {}
+
+        # Contadores para diagnóstico y tests
+        self.hits = 0
+        self.loads = 0
+
+        self._data_version = self._read_data_version()
+
+        self.db.add_item_listener(self._on_items_changed)
+        self.db.add_category_listener(self._on_categories_changed)
+
+    # ========== CONSULTAS ==========
+
+    def get(self, category_id: int):
+        """
+        Get a category, loading it once if it is not cached
+
+        Args:
+            category_id: Category ID
+
+        Returns:
+            The loader result (None if the category does not exist)
+        """
+        category_id = int(category_id)
+        self._check_external_writes()
+        with self._lock:
+            entry = self._entries.get(category_id)
+            if entry is not None and entry.version == self._versions.get(category_id, 0):
+                self._entries.move_to_end(category_id)
+                self.hits += 1
+                return entry.category
+
+            flight = self._flights.get(category_id)
+            owner = flight is None
+            if owner:
+                flight = _Flight()
+                self._flights[category_id] = flight
+                version = self._versions.get(category_id, 0)
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._loader(category_id)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self.loads += 1
+                del self._flights[category_id]
+                if (flight.error is None and flight.result is not None
+                        and self._versions.get(category_id, 0) == version):
+                    self._store(category_id, version, flight.result)
+            flight.done.set()
+
+        return flight.result
+
+    def _store(self, category_id: int, version: int, category) -> None:
+        """Store a loaded category (lock held), evicting the oldest entries"""
+        item_ids = {int(item.id) for item in getattr(category, 'items', ()) if str(item.id).isdigit()}
+        self._entries[category_id] = _CacheEntry(version, category, item_ids)
+        self._entries.move_to_end(category_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    # ========== INVALIDACIÓN ==========
+
+    def invalidate(self, category_ids: Iterable[int]) -> None:
+        """Drop the given categories and bump their versions"""
+        with self._lock:
+            for category_id in category_ids:
+                category_id = int(category_id)
+                self._versions[category_id] = self._versions.get(category_id, 0) + 1
+                self._entries.pop(category_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry (and make loads in progress uncacheable)"""
+        with self._lock:
+            category_ids = set(self._entries) | set(self._flights)
+        self.invalidate(category_ids)
+
+    def _read_data_version(self) -> int:
+        """Commit counter of the other connections, as seen by the DBManager connection"""
+        return self.db.execute_query("PRAGMA data_version")[0]['data_version']
+
+    def _check_external_writes(self) -> None:
+        """Drop every entry if another connection committed since the last check"""
+        data_version = self._read_data_version()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self.clear()
+            logger.debug("Category cache cleared: database changed by another connection")
+
+    def _on_items_changed(self, kind: str, item_ids) -> None:
+        """Invalidate the categories that contain (or now contain) the items"""
+        changed = {int(item_id) for item_id in item_ids}
+        with self._lock:
+            if not self._entries and not self._flights:
+                return
+            affected = {category_id for category_id, entry in self._entries.items()
+                        if entry.item_ids & changed}
+            # Una carga en curso puede haber leído los items antes del cambio
+            affected.update(self._flights)
+            look_up = kind != ITEM_DELETED and bool(self._entries)
+
+        if look_up:
+            # Altas y movimientos: la categoría actual de cada item
+            affected.update(self._categories_of(list(changed)))
+        if affected:
+            self.invalidate(affected)
+            logger.debug(f"Category cache invalidated by {kind} items: {sorted(affected)}")
+
+    def _on_categories_changed(self, kind: str, category_ids) -> None:
+        """Invalidate updated/deleted categories"""
+        self.invalidate(category_ids)
+        logger.debug(f"Category cache invalidated ({kind}): {list(category_ids)}")
+
+    def _categories_of(self, item_ids) -> Set[int]:
+        """Category IDs of the given items (chunked IN queries)"""
+        category_ids = set()
+        for start in range(0, len(item_ids), BULK_CHUNK_SIZE):
+            chunk = item_ids[start:start + BULK_CHUNK_SIZE]
+            rows = self.db.execute_query(
+                f"SELECT DISTINCT category_id FROM items WHERE id IN ({', '.join('?' * len(chunk))})",
+                tuple(chunk)
+            )
+            category_ids.update(row['category_id'] for row in rows)
+        return category_ids
+
+    def close(self) -> None:
+        """Stop listening to DBManager changes and drop every entry"""
+        self.db.remove_item_listener(self._on_items_changed)
+        self.db.remove_category_listener(self._on_categories_changed)
+        with self._lock:
+            self._entries.clear()
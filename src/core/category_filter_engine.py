@@ -11,7 +11,6 @@ Filtros soportados:
 - Ordenamiento: alfabético, popularidad, fecha, accesos, anclado
 """
 
-import sqlite3
 import logging
 import hashlib
 import json
@@ -24,6 +23,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.models.category import Category
+from database.connection_pool import get_connection_pool, PooledConnection
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +69,10 @@ class CategoryFilterEngine:
         self._cache_hits = 0
         self._cache_misses = 0
 
+    def _get_connection(self) -> PooledConnection:
+        """Obtener conexión del pool compartido (close() la devuelve al pool)"""
+        return get_connection_pool(self.db_path).connection()
+
     def apply_filters(self, filters: Dict[str, Any]) -> List[Category]:
         """
         Aplicar filtros a las categorías
@@ -136,8 +140,7 @@ class CategoryFilterEngine:
             self.last_params = params
 
             # Ejecutar query
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self._get_connection()
             cursor = conn.cursor()
 
             logger.debug(f"Executing query: {query}")
@@ -386,7 +389,7 @@ class CategoryFilterEngine:
             Lista de colores (hex) únicos
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -413,7 +416,7 @@ class CategoryFilterEngine:
             Diccionario con fechas mínimas y máximas
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -451,7 +454,7 @@ class CategoryFilterEngine:
             Diccionario con estadísticas min/max/avg
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -12,7 +12,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.category import Category
 from models.item import Item, ItemType
 from database.db_manager import DBManager
-from core.encryption_manager import EncryptionManager
+from database.config_stream import ProgressCallback, is_stream_path, export_jsonl, import_jsonl
+from core.encryption_manager import get_encryption_manager
+from core.category_cache import CategoryCache
 
 
 class ConfigManager:
@@ -45,13 +47,16 @@ class ConfigManager:
         # Initialize database manager
         self.db = DBManager(self.db_path)
 
-        # Initialize encryption manager
+        # Shared encryption manager (one per process, .env read once)
         env_path = str(self.base_dir / ".env")
-        self.encryption_manager = EncryptionManager(env_path)
+        self.encryption_manager = get_encryption_manager(env_path)
 
         # Cache for categories
         self._categories_cache: Optional[List[Category]] = None
 
+        # Per-category cache for get_category (invalidated by DB change notifications)
+        self._category_cache = CategoryCache(self.db, self._load_category)
+
     def load_config(self) -> Dict[str, Any]:
         """
         Load configuration from database (for backward compatibility)
@@ -92,17 +97,18 @@ class ConfigManager:
         if self._categories_cache is not None:
             return self._categories_cache
 
-        # Load from database
-        categories_data = self.db.get_categories(include_inactive=False)
+        # Load categories and items from database in one pass
+        # (sensitive content decrypted on read)
+        categories_data = self.db.get_categories_with_items(
+            include_inactive=False, lazy_content=True
+        )
         categories = []
 
         for cat_data in categories_data:
             # Convert database dict to Category object
             category = self._dict_to_category(cat_data)
 
-            # Load items for this category
-            items_data = self.db.get_items_by_category(cat_data['id'])
-            for item_data in items_data:
+            for item_data in cat_data['items']:
                 item = self._dict_to_item(item_data)
                 category.add_item(item)
 
@@ -138,23 +144,36 @@ class ConfigManager:
             else:
                 cat_id = int(category_id)
 
-            cat_data = self.db.get_category(cat_id)
-            if not cat_data:
-                return None
+            # Cached until one of its items or the category itself changes
+            return self._category_cache.get(cat_id)
 
-            category = self._dict_to_category(cat_data)
+        except (ValueError, TypeError):
+            return None
 
-            # Load items
-            items_data = self.db.get_items_by_category(cat_id)
-            for item_data in items_data:
-                item = self._dict_to_item(item_data)
-                category.add_item(item)
+    def _load_category(self, cat_id: int) -> Optional[Category]:
+        """
+        Load a category with its items from the database (CategoryCache loader)
 
-            return category
+        Args:
+            cat_id: Category ID
 
-        except (ValueError, TypeError):
+        Returns:
+            Optional[Category]: Category object or None
+        """
+        cat_data = self.db.get_category(cat_id)
+        if not cat_data:
             return None
 
+        category = self._dict_to_category(cat_data)
+
+        # Load items (sensitive content as lazy handles, decrypted on reveal)
+        items_data = self.db.get_items_by_category(cat_id, lazy_content=True)
+        for item_data in items_data:
+            item = self._dict_to_item(item_data)
+            category.add_item(item)
+
+        return category
+
     def add_category(self, category: Category) -> bool:
         """
         Add a new category
@@ -184,24 +203,25 @@ class ConfigManager:
             )
             logger.info(f"[ConfigManager] Category added to DB: {category.name} (ID: {cat_id}, order_index: {category.order_index})")
 
-            # Add items
-            for item in category.items:
-                item_id = self.db.add_item(
-                    category_id=cat_id,
-                    label=item.label,
-                    content=item.content,
-                    item_type=item.type.value.upper(),
-                    icon=item.icon,
-                    is_sensitive=item.is_sensitive,
-                    is_favorite=getattr(item, 'is_favorite', False),  # FIX: Add is_favorite
-                    tags=item.tags,
-                    description=item.description,
-                    working_dir=getattr(item, 'working_dir', None),
-                    color=getattr(item, 'color', None),  # FIX: Add color
-                    is_active=getattr(item, 'is_active', True),  # Add is_active (default True)
-                    is_archived=getattr(item, 'is_archived', False)  # Add is_archived (default False)
-                )
-                logger.info(f"  [ConfigManager] Item added: {item.label} (ID: {item_id})")
+            # Add items (one transaction for the whole category)
+            item_ids = self.db.add_items_bulk(cat_id, [
+                {
+                    'label': item.label,
+                    'content': item.content,
+                    'item_type': item.type.value.upper(),
+                    'icon': item.icon,
+                    'is_sensitive': item.is_sensitive,
+                    'is_favorite': getattr(item, 'is_favorite', False),  # FIX: Add is_favorite
+                    'tags': item.tags,
+                    'description': item.description,
+                    'working_dir': getattr(item, 'working_dir', None),
+                    'color': getattr(item, 'color', None),  # FIX: Add color
+                    'is_active': getattr(item, 'is_active', True),  # Add is_active (default True)
+                    'is_archived': getattr(item, 'is_archived', False)  # Add is_archived (default False)
+                }
+                for item in category.items
+            ])
+            logger.info(f"  [ConfigManager] {len(item_ids)} items added to {category.name}")
 
             # Clear cache
             self._categories_cache = None
@@ -370,17 +390,27 @@ class ConfigManager:
             print(f"Error adding to history: {e}")
             return False
 
-    def export_config(self, export_path: Path) -> bool:
+    def export_config(self, export_path: Path, progress: Optional[ProgressCallback] = None,
+                      compression: Optional[str] = None) -> bool:
         """
         Export configuration to JSON file
 
+        Files named .jsonl (optionally .jsonl.gz / .jsonl.zst) are written
+        as streamed JSON Lines in chunks (see database.config_stream).
+
         Args:
             export_path: Path to export file
+            progress: Optional callback (items exported, total items), JSON Lines only
+            compression: Optional compression override, JSON Lines only
 
         Returns:
             bool: True if successful
         """
         try:
+            if is_stream_path(export_path):
+                export_jsonl(self.db, export_path, compression=compression, progress=progress)
+                return True
+
             # Get all data from database
             settings = self.db.get_all_settings()
             categories = self.get_categories()
@@ -400,17 +430,26 @@ class ConfigManager:
             print(f"Error exporting config: {e}")
             return False
 
-    def import_config(self, import_path: Path) -> bool:
+    def import_config(self, import_path: Path, progress: Optional[ProgressCallback] = None) -> bool:
         """
         Import configuration from JSON file
 
+        JSON Lines exports are imported in chunks, one transaction each,
+        and an interrupted import resumes where it stopped.
+
         Args:
             import_path: Path to import file
+            progress: Optional callback (items imported, total items), JSON Lines only
 
         Returns:
             bool: True if successful
         """
         try:
+            if is_stream_path(import_path):
+                import_jsonl(self.db, import_path, progress=progress)
+                self._categories_cache = None
+                return True
+
             with open(import_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
@@ -468,6 +507,7 @@ class ConfigManager:
 
     def close(self):
         """Close database connection"""
+        self._category_cache.close()
         self.db.close()
 
     # ========== PRIVATE HELPER METHODS ==========
@@ -666,6 +706,28 @@ class ConfigManager:
         value = 'true' if auto_create else 'false'
         return self.set_setting('files_auto_create_folders', value)
 
+    def get_files_storage_mode(self) -> str:
+        """
+        Get file storage layout
+
+        Returns:
+            str: 'folders' (one folder per file type) or 'content_addressed'
+        """
+        value = self.get_setting('files_storage_mode', 'folders')
+        return value if value in ('folders', 'content_addressed') else 'folders'
+
+    def set_files_storage_mode(self, mode: str) -> bool:
+        """
+        Set file storage layout
+
+        Args:
+            mode: 'folders' or 'content_addressed'
+
+        Returns:
+            bool: True if successful
+        """
+        return self.set_setting('files_storage_mode', mode)
+
     # ======================================================================
 
     def __del__(self):
@@ -6,6 +6,11 @@ Manages business logic for the Structure Dashboard
 from typing import Dict, List, Tuple
 import logging
 
+from core.item_columns import ItemColumns, NUMPY_AVAILABLE, COLUMNAR_THRESHOLD, FLAG_FAVORITE, FLAG_SENSITIVE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +27,8 @@ class DashboardManager:
         self.db = db_manager
         self._structure_cache = None
         self._statistics_cache = None
+        # Columnas NumPy de la última estructura filtrada: (estructura, ItemColumns, offsets)
+        self._structure_columns = None
         logger.info("DashboardManager initialized")
 
     def get_full_structure(self, force_refresh: bool = False) -> Dict:
@@ -65,14 +72,14 @@ class DashboardManager:
         logger.info("Loading full structure from database...")
 
         try:
-            # Get all categories
-            categories = self.db.get_categories()
+            # Get all categories with their items in one pass
+            # (sensitive content decrypted on read)
+            categories = self.db.get_categories_with_items(lazy_content=True)
 
             structure = {'categories': []}
 
             for category in categories:
-                # Get items for this category
-                items = self.db.get_items_by_category(category['id'])
+                items = category['items']
 
                 category_data = {
                     'id': category['id'],
@@ -272,14 +279,27 @@ class DashboardManager:
         """
         Get tag cloud data (tag name, count)
 
+        Counts the tags of the active categories and of their items, like
+        get_full_structure() holds them. Without a structure the item counts
+        come from the materialized tag frequencies of the database (no pass
+        over the items of active categories).
+
         Args:
-            structure: Optional structure dict
+            structure: Optional structure dict (counted in memory if given)
 
         Returns:
             List[Tuple[str, int]]: List of (tag, count) tuples sorted by count desc
         """
         if structure is None:
-            structure = self.get_full_structure()
+            try:
+                tag_counts = self.db.get_tag_counts(active_categories_only=True)
+                for category in self.db.get_categories():
+                    for tag in self._parse_tags(category.get('tags', '')):
+                        tag_counts[tag] = tag_counts.get(tag, 0) + 1
+                return sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
+            except Exception as e:
+                logger.error(f"Error reading tag frequencies: {e}", exc_info=True)
+                structure = self.get_full_structure()
 
         logger.info("Generating tag cloud...")
 
@@ -429,6 +449,29 @@ class DashboardManager:
 
         logger.info(f"Filtering structure - Types: {type_filters}, States: {state_filters}, Sort: {sort_by}")
 
+        total_items = sum(len(category['items']) for category in structure['categories'])
+        if (type_filters or state_filters) and NUMPY_AVAILABLE and total_items >= COLUMNAR_THRESHOLD:
+            # Máscaras NumPy sobre columnas de la estructura (construidas una vez)
+            filtered_structure = self._filter_structure_columnar(structure, type_filters, state_filters)
+        else:
+            filtered_structure = self._filter_structure(structure, type_filters, state_filters)
+
+        # Sort categories
+        if sort_by == 'name_asc':
+            filtered_structure['categories'].sort(key=lambda c: c['name'].lower())
+        elif sort_by == 'name_desc':
+            filtered_structure['categories'].sort(key=lambda c: c['name'].lower(), reverse=True)
+        elif sort_by == 'items_desc':
+            filtered_structure['categories'].sort(key=lambda c: len(c['items']), reverse=True)
+        elif sort_by == 'items_asc':
+            filtered_structure['categories'].sort(key=lambda c: len(c['items']))
+
+        logger.info(f"Filtering complete")
+        return filtered_structure
+
+    def _filter_structure(self, structure: Dict, type_filters: Dict = None,
+                          state_filters: Dict = None) -> Dict:
+        """Filter a deep copy of the structure item by item"""
         # Deep copy to avoid modifying original
         import copy
         filtered_structure = copy.deepcopy(structure)
@@ -465,15 +508,48 @@ class DashboardManager:
 
                 category['items'] = filtered_items
 
-        # Sort categories
-        if sort_by == 'name_asc':
-            filtered_structure['categories'].sort(key=lambda c: c['name'].lower())
-        elif sort_by == 'name_desc':
-            filtered_structure['categories'].sort(key=lambda c: c['name'].lower(), reverse=True)
-        elif sort_by == 'items_desc':
-            filtered_structure['categories'].sort(key=lambda c: len(c['items']), reverse=True)
-        elif sort_by == 'items_asc':
-            filtered_structure['categories'].sort(key=lambda c: len(c['items']))
-
-        logger.info(f"Filtering complete")
         return filtered_structure
+
+    def _filter_structure_columnar(self, structure: Dict, type_filters: Dict = None,
+                                   state_filters: Dict = None) -> Dict:
+        """
+        Filter the structure with boolean masks over its item columns
+
+        Same result as _filter_structure, but only the kept items are
+        deep-copied.
+        """
+        import copy
+
+        cached_structure, columns, offsets = self._structure_columns or (None, None, None)
+        if cached_structure is not structure:
+            rows = [item for category in structure['categories'] for item in category['items']]
+            columns = ItemColumns.from_rows(rows)
+            offsets = np.cumsum([0] + [len(category['items']) for category in structure['categories']])
+            self._structure_columns = (structure, columns, offsets)
+
+        keep = np.ones(len(columns), dtype=bool)
+        if type_filters:
+            keep &= columns.type_mask(lambda item_type: type_filters.get(item_type, True))
+        if state_filters:
+            is_favorite = (columns.flags & FLAG_FAVORITE) != 0
+            is_sensitive = (columns.flags & FLAG_SENSITIVE) != 0
+            include = np.zeros(len(columns), dtype=bool)
+            if state_filters.get('favorites', True):
+                include |= is_favorite
+            if state_filters.get('sensitive', True):
+                include |= is_sensitive
+            if state_filters.get('normal', True):
+                include |= ~is_favorite & ~is_sensitive
+            keep &= include
+
+        kept_rows = np.flatnonzero(keep)
+        bounds = np.searchsorted(kept_rows, offsets).tolist()
+        kept_rows = kept_rows.tolist()
+        categories = []
+        for index, category in enumerate(structure['categories']):
+            start = int(offsets[index])
+            category_rows = kept_rows[bounds[index]:bounds[index + 1]]
+            categories.append({**category, 'items': [category['items'][row - start] for row in category_rows]})
+
+        # Copia solo de los items que quedan (el original no se modifica)
+        return copy.deepcopy({**structure, 'categories': categories})
@@ -4,21 +4,40 @@ Maneja el cifrado y descifrado de datos sensibles usando AES-256 (Fernet)
 """
 
 import os
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Dict, Any
 from cryptography.fernet import Fernet, InvalidToken
 from dotenv import load_dotenv, set_key
 
 logger = logging.getLogger(__name__)
 
+# Contenido mostrado en lugar de un texto que no se pudo descifrar
+DECRYPTION_ERROR = "[DECRYPTION ERROR]"
+
 
 class EncryptionManager:
     """
     Gestor de cifrado para datos sensibles
     Utiliza Fernet (AES-256) para cifrar/descifrar contraseñas
+
+    Usar get_encryption_manager() para obtener la instancia compartida del
+    proceso en lugar de crear una nueva (cada instancia vuelve a leer .env).
     """
 
+    # Máximo de textos descifrados en caché (LRU)
+    PLAINTEXT_CACHE_SIZE = 512
+
+    # A partir de este número de tokens, decrypt_many usa el pool de hilos
+    PARALLEL_DECRYPT_THRESHOLD = 64
+
+    # Hilos del pool de descifrado
+    MAX_DECRYPT_WORKERS = 4
+
     def __init__(self, env_file: str = ".env"):
         """
         Initialize encryption manager
@@ -28,6 +47,12 @@ class EncryptionManager:
         """
         self.env_file = Path(env_file)
         self.cipher_suite: Optional[Fernet] = None
+
+        # Caché LRU de texto plano: (item_id, hash del token) -> texto
+        self._plaintext_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         self._initialize()
 
     def _initialize(self):
@@ -146,6 +171,131 @@ class EncryptionManager:
             logger.error(f"Decryption error: {e}")
             raise
 
+    def encrypt_many(self, plaintexts: List[str]) -> List[str]:
+        """
+        Encrypt a batch of plaintexts
+
+        Large batches are encrypted in parallel on the same thread pool
+        used by decrypt_many().
+
+        Args:
+            plaintexts: Texts to encrypt
+
+        Returns:
+            List[str]: Encrypted texts in the same order as plaintexts
+
+        Raises:
+            RuntimeError: If the encryption manager is not initialized
+        """
+        if len(plaintexts) >= self.PARALLEL_DECRYPT_THRESHOLD:
+            encrypted = list(self._get_executor().map(self.encrypt, plaintexts))
+        else:
+            encrypted = [self.encrypt(plaintext) for plaintext in plaintexts]
+
+        logger.debug(f"Batch encrypt: {len(plaintexts)} texts")
+        return encrypted
+
+    def decrypt_many(self, tokens: List[str],
+                     item_ids: Optional[List[Any]] = None) -> List[Optional[str]]:
+        """
+        Decrypt a batch of encrypted texts
+
+        Large batches are decrypted in parallel on a thread pool. When item_ids
+        are given, results are served from / stored in the plaintext LRU cache,
+        keyed by item ID and ciphertext hash (an edited item never hits a stale
+        entry).
+
+        Args:
+            tokens: Encrypted texts (base64-encoded)
+            item_ids: Optional item IDs (same order as tokens) to enable caching
+
+        Returns:
+            List[Optional[str]]: Decrypted texts in the same order as tokens,
+            None for every token that failed to decrypt (empty tokens give "")
+        """
+        results: List[Optional[str]] = [None] * len(tokens)
+        pending = []
+
+        for index, token in enumerate(tokens):
+            if not token:
+                results[index] = ""
+                continue
+
+            cache_key = None
+            if item_ids is not None:
+                cache_key = self._cache_key(item_ids[index], token)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+
+            pending.append((index, token, cache_key))
+
+        if not pending:
+            return results
+
+        pending_tokens = [token for _, token, _ in pending]
+        if len(pending) >= self.PARALLEL_DECRYPT_THRESHOLD:
+            decrypted = list(self._get_executor().map(self._try_decrypt, pending_tokens))
+        else:
+            decrypted = [self._try_decrypt(token) for token in pending_tokens]
+
+        for (index, _, cache_key), plaintext in zip(pending, decrypted):
+            if plaintext is None:
+                continue
+            results[index] = plaintext
+            if cache_key is not None:
+                self._cache_put(cache_key, plaintext)
+
+        logger.debug(f"Batch decrypt: {len(tokens)} tokens, {len(pending)} decrypted")
+        return results
+
+    def purge_plaintext_cache(self) -> None:
+        """Remove all cached plaintexts (call on lock/logout)"""
+        with self._cache_lock:
+            self._plaintext_cache.clear()
+        logger.info("Plaintext cache purged")
+
+    def _try_decrypt(self, token: str) -> Optional[str]:
+        """Decrypt a token returning None instead of raising"""
+        try:
+            return self.decrypt(token)
+        except Exception:
+            return None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get (lazily created) thread pool for batch decryption"""
+        if self._executor is None:
+            with self._cache_lock:
+                if self._executor is None:
+                    workers = min(self.MAX_DECRYPT_WORKERS, os.cpu_count() or 1)
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=workers,
+                        thread_name_prefix="decrypt"
+                    )
+        return self._executor
+
+    @staticmethod
+    def _cache_key(item_id: Any, token: str) -> tuple:
+        """Build plaintext cache key from item ID and ciphertext hash"""
+        return (str(item_id), hashlib.sha256(token.encode()).digest())
+
+    def _cache_get(self, key: tuple) -> Optional[str]:
+        """Get cached plaintext and mark it as recently used"""
+        with self._cache_lock:
+            plaintext = self._plaintext_cache.get(key)
+            if plaintext is not None:
+                self._plaintext_cache.move_to_end(key)
+            return plaintext
+
+    def _cache_put(self, key: tuple, plaintext: str) -> None:
+        """Store plaintext evicting least recently used entries"""
+        with self._cache_lock:
+            self._plaintext_cache[key] = plaintext
+            self._plaintext_cache.move_to_end(key)
+            while len(self._plaintext_cache) > self.PLAINTEXT_CACHE_SIZE:
+                self._plaintext_cache.popitem(last=False)
+
     def is_encrypted(self, text: str) -> bool:
         """
         Check if text appears to be encrypted
@@ -180,3 +330,98 @@ class EncryptionManager:
             return test_data == decrypted
         except Exception:
             return False
+
+
+# ========== Contenido cifrado diferido ==========
+
+class EncryptedContent:
+    """
+    Handle for sensitive content that is decrypted only when revealed
+
+    Returned by DBManager listing methods in lazy content mode, so listing
+    items costs nothing for sensitive rows and no cleartext is kept in
+    cached models. Decryption goes through the shared manager (and its
+    plaintext cache) on every reveal().
+    """
+
+    __slots__ = ('token', 'item_id')
+
+    def __init__(self, token: str, item_id: Any = None):
+        """
+        Args:
+            token: Encrypted content as stored in the database
+            item_id: Item ID (enables the plaintext cache)
+        """
+        self.token = token
+        self.item_id = item_id
+
+    def reveal(self) -> str:
+        """
+        Decrypt and return the content
+
+        Returns:
+            str: Plaintext, or DECRYPTION_ERROR if decryption fails
+        """
+        item_ids = [self.item_id] if self.item_id is not None else None
+        plaintext = get_encryption_manager().decrypt_many([self.token], item_ids=item_ids)[0]
+        if plaintext is None:
+            logger.error(f"Failed to decrypt item {self.item_id}")
+            return DECRYPTION_ERROR
+        return plaintext
+
+    def __bool__(self) -> bool:
+        return bool(self.token)
+
+    def __repr__(self) -> str:
+        return f"EncryptedContent(item_id={self.item_id})"
+
+
+def reveal_content(value: Any) -> Any:
+    """
+    Return plaintext for an EncryptedContent handle, or the value unchanged
+
+    Args:
+        value: Item content (str or EncryptedContent)
+
+    Returns:
+        Plaintext content
+    """
+    if isinstance(value, EncryptedContent):
+        return value.reveal()
+    return value
+
+
+# ========== Instancia compartida ==========
+
+_shared_instances: Dict[str, EncryptionManager] = {}
+_shared_lock = threading.Lock()
+
+
+def get_encryption_manager(env_file: str = ".env") -> EncryptionManager:
+    """
+    Get the process-wide EncryptionManager for an .env file
+
+    The instance is created lazily on first use, so .env is read from disk
+    only once per process instead of once per database call.
+
+    Args:
+        env_file: Path to .env file
+
+    Returns:
+        EncryptionManager: Shared instance
+    """
+    key = str(Path(env_file).resolve())
+    instance = _shared_instances.get(key)
+    if instance is None:
+        with _shared_lock:
+            instance = _shared_instances.get(key)
+            if instance is None:
+                instance = EncryptionManager(env_file)
+                _shared_instances[key] = instance
+    return instance
+
+
+def purge_plaintext_caches() -> None:
+    """Purge the plaintext cache of every shared instance (lock/logout)"""
+    for instance in list(_shared_instances.values()):
+        instance.purge_plaintext_cache()
@@ -4,11 +4,12 @@ Autor: Widget Sidebar Team
 Fecha: 2025-01-23
 """
 
-import sqlite3
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from database.connection_pool import get_connection_pool, PooledConnection
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,11 +24,9 @@ class FavoritesManager:
             logger.error(f"Database not found: {self.db_path}")
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_connection(self) -> PooledConnection:
+        """Obtener conexión del pool compartido (close() la devuelve al pool)"""
+        return get_connection_pool(self.db_path).connection()
 
     # ==================== CRUD Básico ====================
 
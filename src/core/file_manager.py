@@ -15,6 +15,7 @@ import sys
 import shutil
 import hashlib
 import logging
+import tempfile
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 from datetime import datetime
@@ -22,6 +23,8 @@ from datetime import datetime
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.item import Item
+from core.storage_catalog import get_storage_catalog, ROOT_FILES, TEMP_FILE_PREFIX
+from database.db_manager import ITEM_DELETED, ITEM_UPDATED
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +42,21 @@ FOLDER_MAPPING = {
     'OTROS': []  # Fallback para archivos desconocidos
 }
 
+# Tamaño del buffer de copia/hash (1 MiB): menos syscalls y menos vueltas
+# del bucle de Python en archivos de varios GB
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Modos de almacenamiento: carpeta por tipo o por contenido (hash)
+STORAGE_MODE_FOLDERS = 'folders'
+STORAGE_MODE_CONTENT = 'content_addressed'
+
+# Carpeta de blobs del modo por contenido: BLOBS/ab/abcdef...ext
+BLOBS_FOLDER = 'BLOBS'
+
+# Segundos que un blob recién copiado se conserva sin referencias (el item
+# que lo usa se guarda después de copiar el archivo)
+BLOB_GRACE_PERIOD = 3600
+
 # Iconos emoji por tipo de archivo
 FILE_TYPE_ICONS = {
     'IMAGEN': '🖼️',
@@ -51,6 +69,43 @@ FILE_TYPE_ICONS = {
 }
 
 
+# ==================== Detección de Tipo ====================
+
+def detect_file_type(extension: str) -> str:
+    """
+    Detecta el tipo de archivo basado en su extensión
+
+    Args:
+        extension: Extensión del archivo (con o sin punto)
+
+    Returns:
+        str: Tipo de archivo (IMAGEN, VIDEO, PDF, WORD, EXCEL, TEXT, OTROS)
+    """
+    # Normalizar extensión (agregar punto si no lo tiene, lowercase)
+    ext = extension.lower()
+    if not ext.startswith('.'):
+        ext = '.' + ext
+
+    # Buscar en el mapeo
+    for file_type, extensions in FOLDER_MAPPING.items():
+        if ext in extensions:
+            # Normalizar nombre de tipo
+            if file_type == 'IMAGENES':
+                return 'IMAGEN'
+            elif file_type == 'VIDEOS':
+                return 'VIDEO'
+            elif file_type == 'PDFS':
+                return 'PDF'
+            elif file_type == 'WORDS':
+                return 'WORD'
+            elif file_type == 'EXCELS':
+                return 'EXCEL'
+            elif file_type == 'TEXT':
+                return 'TEXT'
+
+    return 'OTROS'
+
+
 # ==================== FileManager Class ====================
 
 class FileManager:
@@ -70,6 +125,8 @@ class FileManager:
         """
         self.config_manager = config_manager
         self.db_manager = config_manager.db
+        # Catálogo de tamaños compartido (estadísticas sin recorrer el disco)
+        self.catalog = get_storage_catalog(self.db_manager, detect_file_type)
         logger.info("FileManager initialized")
 
     # ==================== Métodos de Configuración ====================
@@ -156,6 +213,24 @@ class FileManager:
         """
         return self.config_manager.get_files_auto_create_folders()
 
+    def get_storage_mode(self) -> str:
+        """
+        Obtiene el modo de almacenamiento de archivos
+
+        Returns:
+            str: STORAGE_MODE_FOLDERS o STORAGE_MODE_CONTENT
+        """
+        return self.config_manager.get_files_storage_mode()
+
+    def is_content_addressed(self) -> bool:
+        """
+        Indica si los archivos se guardan por contenido (un blob por hash)
+
+        Returns:
+            bool: True si el modo es STORAGE_MODE_CONTENT
+        """
+        return self.get_storage_mode() == STORAGE_MODE_CONTENT
+
     # ==================== Detección Automática ====================
 
     def detect_file_type(self, extension: str) -> str:
@@ -168,29 +243,7 @@ class FileManager:
         Returns:
             str: Tipo de archivo (IMAGEN, VIDEO, PDF, WORD, EXCEL, TEXT, OTROS)
         """
-        # Normalizar extensión (agregar punto si no lo tiene, lowercase)
-        ext = extension.lower()
-        if not ext.startswith('.'):
-            ext = '.' + ext
-
-        # Buscar en el mapeo
-        for file_type, extensions in FOLDER_MAPPING.items():
-            if ext in extensions:
-                # Normalizar nombre de tipo
-                if file_type == 'IMAGENES':
-                    return 'IMAGEN'
-                elif file_type == 'VIDEOS':
-                    return 'VIDEO'
-                elif file_type == 'PDFS':
-                    return 'PDF'
-                elif file_type == 'WORDS':
-                    return 'WORD'
-                elif file_type == 'EXCELS':
-                    return 'EXCEL'
-                elif file_type == 'TEXT':
-                    return 'TEXT'
-
-        return 'OTROS'
+        return detect_file_type(extension)
 
     def get_target_folder(self, extension: str) -> str:
         """
@@ -224,12 +277,21 @@ class FileManager:
         """
         Copia un archivo al almacenamiento organizado y extrae metadatos
 
+        El archivo se lee una sola vez: se copia a un temporal de la carpeta
+        destino calculando el hash al vuelo. Si ya hay un item con el mismo
+        hash (y su archivo existe), el temporal se descarta y se devuelve la
+        ruta del archivo ya almacenado.
+
         Args:
             source_path: Ruta absoluta al archivo fuente
 
         Returns:
             Dict con los siguientes campos:
-                - full_path: Ruta completa del archivo copiado
+                - destination_path: Ruta completa del archivo almacenado
+                - relative_path: Ruta relativa a la ruta base (se guarda en DB)
+                - duplicate: True si se reutilizó un archivo ya almacenado
+                - duplicate_item: Item existente con ese archivo (solo si
+                  duplicate; en modo por contenido puede ser None)
                 - file_size: Tamaño en bytes
                 - file_type: Tipo detectado (IMAGEN, VIDEO, etc.)
                 - file_extension: Extensión con punto
@@ -257,6 +319,15 @@ class FileManager:
         original_filename = source.name
         file_extension = source.suffix.lower()
         file_type = self.detect_file_type(file_extension)
+        metadata = {
+            'file_type': file_type,
+            'file_extension': file_extension,
+            'original_filename': original_filename
+        }
+
+        if self.is_content_addressed():
+            return self._copy_to_blob_storage(source, Path(base_path), metadata)
+
         target_folder = self.get_target_folder(file_extension)
 
         # Construir ruta destino
@@ -270,43 +341,204 @@ class FileManager:
         if not dest_dir.exists():
             raise ValueError(f"La carpeta destino no existe: {dest_dir}")
 
-        # Manejar archivos con nombre duplicado
-        dest_file = dest_dir / original_filename
-        if dest_file.exists():
-            # Agregar timestamp al nombre
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            name_without_ext = source.stem
-            dest_file = dest_dir / f"{name_without_ext}_{timestamp}{file_extension}"
+        # Copiar a un temporal en la carpeta destino calculando el hash
+        # en la misma pasada (un único read del origen)
+        temp_path, file_hash, file_size = self._stream_to_temp(source, dest_dir)
 
-        # Copiar archivo
         try:
-            shutil.copy2(source, dest_file)
+            # Deduplicar antes de confirmar la copia
+            duplicate = self._find_stored_duplicate(file_hash)
+            if duplicate:
+                os.remove(temp_path)
+                relative_path = duplicate['content'].replace('\\', '/')
+                logger.info(f"Duplicate file not copied: {source} -> {relative_path}")
+                return {
+                    'success': True,
+                    'duplicate': True,
+                    'duplicate_item': duplicate,
+                    'destination_path': self.get_absolute_path(relative_path),
+                    'relative_path': relative_path,
+                    'file_size': file_size,
+                    'file_hash': file_hash,
+                    **metadata
+                }
+
+            # Manejar archivos con nombre duplicado
+            dest_file = dest_dir / original_filename
+            if dest_file.exists():
+                # Agregar timestamp al nombre
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                name_without_ext = source.stem
+                dest_file = dest_dir / f"{name_without_ext}_{timestamp}{file_extension}"
+
+            shutil.copystat(source, temp_path)
+            os.replace(temp_path, dest_file)
             logger.info(f"File copied: {source} -> {dest_file}")
+            self._catalog_record(f"{target_folder}/{dest_file.name}")
         except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             logger.error(f"Error copying file: {e}")
             raise IOError(f"Error al copiar archivo: {e}")
 
-        # Calcular metadatos
-        file_size = dest_file.stat().st_size
-        file_hash = self.calculate_file_hash(str(dest_file))
-
         # Construir ruta relativa (portable)
         # Formato: CARPETA/archivo.ext
-        relative_path = f"{target_folder}/{original_filename}"
-        if dest_file.name != original_filename:
-            # Si se le agregó timestamp, usar el nombre real
-            relative_path = f"{target_folder}/{dest_file.name}"
+        relative_path = f"{target_folder}/{dest_file.name}"
 
         return {
             'success': True,
+            'duplicate': False,
             'destination_path': str(dest_file),  # Ruta completa (temporal, para preview)
             'relative_path': relative_path,      # Ruta relativa (PORTABLE - se guarda en DB)
             'file_size': file_size,
-            'file_type': file_type,
-            'file_extension': file_extension,
-            'original_filename': original_filename,
-            'file_hash': file_hash
+            'file_hash': file_hash,
+            **metadata
+        }
+
+    def _copy_to_blob_storage(self, source: Path, base_path: Path, metadata: Dict) -> Dict[str, any]:
+        """
+        Copia un archivo al almacenamiento por contenido (BLOBS/ab/<hash>.ext)
+
+        Si el blob ya existe (búsqueda por clave primaria en file_blobs) el
+        temporal se descarta y se devuelve la ruta del blob existente.
+        """
+        blobs_dir = base_path / BLOBS_FOLDER
+        self.ensure_folder_exists(str(blobs_dir))
+
+        temp_path, file_hash, file_size = self._stream_to_temp(source, blobs_dir)
+
+        try:
+            blob = self.db_manager.get_file_blob(file_hash)
+            if blob and (base_path / blob['relative_path']).is_file():
+                os.remove(temp_path)
+                relative_path = blob['relative_path']
+                # Reinicia el periodo de gracia: el item que lo usará aún no se guardó
+                self.db_manager.register_file_blob(file_hash, relative_path, file_size)
+                duplicate = True
+                logger.info(f"Blob already stored: {source} -> {relative_path}")
+            else:
+                # Si el archivo del blob se había perdido se restaura en su ruta
+                if blob:
+                    relative_path = blob['relative_path']
+                else:
+                    relative_path = self.get_blob_relative_path(file_hash, metadata['file_extension'])
+                dest_file = base_path / relative_path
+                self.ensure_folder_exists(str(dest_file.parent))
+                shutil.copystat(source, temp_path)
+                os.replace(temp_path, dest_file)
+                self._catalog_record(relative_path)
+                self.db_manager.register_file_blob(file_hash, relative_path, file_size)
+                duplicate = False
+                logger.info(f"Blob stored: {source} -> {relative_path}")
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            logger.error(f"Error storing blob: {e}")
+            raise IOError(f"Error al copiar archivo: {e}")
+
+        result = {
+            'success': True,
+            'duplicate': duplicate,
+            'destination_path': str(base_path / relative_path),
+            'relative_path': relative_path,
+            'file_size': file_size,
+            'file_hash': file_hash,
+            **metadata
         }
+        if duplicate:
+            # Item que ya usa el blob (None si ningún item lo referencia aún)
+            result['duplicate_item'] = self.check_duplicate(file_hash)
+        return result
+
+    def _stream_to_temp(self, source: Path, dest_dir: Path) -> Tuple[str, str, int]:
+        """
+        Copia el origen a un temporal de dest_dir calculando su hash
+
+        El temporal está en la misma carpeta (mismo sistema de archivos)
+        para que os.replace lo confirme de forma atómica.
+
+        Returns:
+            Tuple[str, str, int]: (ruta del temporal, hash, bytes copiados)
+
+        Raises:
+            IOError: Si hay error al copiar (el temporal se elimina)
+        """
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=TEMP_FILE_PREFIX, suffix='.tmp', dir=str(dest_dir))
+            with os.fdopen(fd, 'wb') as target:
+                file_hash, file_size = self._copy_and_hash(source, target)
+            return temp_path, file_hash, file_size
+        except Exception as e:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            logger.error(f"Error copying file: {e}")
+            raise IOError(f"Error al copiar archivo: {e}")
+
+    def _copy_and_hash(self, source: Path, target) -> Tuple[str, int]:
+        """
+        Copia el origen al archivo abierto target calculando el SHA256
+
+        Se usa un único buffer reutilizable (readinto) para no crear un
+        objeto bytes por bloque. sendfile/copy_file_range no sirven aquí:
+        copian en el kernel sin pasar los bytes por el hash.
+
+        Returns:
+            Tuple[str, int]: (hash hexadecimal, bytes copiados)
+        """
+        sha256 = hashlib.sha256()
+        buffer = bytearray(COPY_BUFFER_SIZE)
+        view = memoryview(buffer)
+        total = 0
+
+        with open(source, 'rb', buffering=0) as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                chunk = view[:read]
+                sha256.update(chunk)
+                target.write(chunk)
+                total += read
+
+        return sha256.hexdigest(), total
+
+    def _find_stored_duplicate(self, file_hash: str) -> Optional[Dict]:
+        """
+        Busca un item con el mismo hash cuyo archivo siga en el almacenamiento
+
+        Returns:
+            Optional[Dict]: Item existente, o None si no hay duplicado utilizable
+        """
+        duplicate = self.check_duplicate(file_hash)
+        if not duplicate or not duplicate.get('content'):
+            return None
+
+        try:
+            stored_path = Path(self.get_absolute_path(duplicate['content']))
+        except ValueError:
+            return None
+
+        # Si el archivo del item existente ya no está, se confirma la copia
+        if not stored_path.is_file():
+            logger.warning(f"Duplicate item {duplicate.get('id')} points to a missing file: {stored_path}")
+            return None
+        return duplicate
+
+    def _catalog_record(self, relative_path: str) -> None:
+        """Registrar en el catálogo un archivo recién escrito en el almacenamiento"""
+        try:
+            self.catalog.record_file(ROOT_FILES, self.get_base_path(), relative_path)
+        except Exception as e:
+            # El catálogo se corrige en la próxima reconciliación
+            logger.warning(f"Storage catalog not updated for {relative_path}: {e}")
+
+    def _catalog_forget(self, relative_path: str) -> None:
+        """Quitar del catálogo un archivo eliminado del almacenamiento"""
+        try:
+            self.catalog.forget_file(ROOT_FILES, relative_path)
+        except Exception as e:
+            logger.warning(f"Storage catalog not updated for {relative_path}: {e}")
 
     def calculate_file_hash(self, file_path: str) -> str:
         """
@@ -331,7 +563,7 @@ class FileManager:
         try:
             with open(path, 'rb') as f:
                 # Leer en bloques para archivos grandes
-                for block in iter(lambda: f.read(4096), b''):
+                for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
                     sha256.update(block)
         except Exception as e:
             logger.error(f"Error calculating hash: {e}")
@@ -444,6 +676,164 @@ class FileManager:
             'file_hash': file_hash
         }
 
+    # ==================== Almacenamiento por Contenido ====================
+
+    def get_blob_relative_path(self, file_hash: str, extension: str = '') -> str:
+        """
+        Obtiene la ruta relativa de un blob (BLOBS/ab/<hash><ext>)
+
+        Args:
+            file_hash: Hash SHA256 del archivo
+            extension: Extensión con punto (se conserva para abrir el archivo)
+
+        Returns:
+            str: Ruta relativa a la ruta base
+        """
+        return f"{BLOBS_FOLDER}/{file_hash[:2]}/{file_hash}{(extension or '').lower()}"
+
+    def migrate_to_content_addressed(self) -> Dict[str, int]:
+        """
+        Migra los archivos de las carpetas por tipo al almacenamiento por contenido
+
+        Cada archivo almacenado se mueve a su blob (o se elimina si el blob
+        ya existe) y todos los items que apuntaban a él pasan a apuntar al
+        blob. Las rutas absolutas (archivos fuera del almacenamiento) no se
+        tocan. Al terminar se activa el modo STORAGE_MODE_CONTENT.
+
+        Returns:
+            Dict con contadores: files_migrated, files_deduplicated,
+            items_updated, items_skipped, bytes_saved
+
+        Raises:
+            ValueError: Si la ruta base no está configurada
+        """
+        base_path = self.get_base_path()
+        if not base_path:
+            raise ValueError("La ruta base de almacenamiento no está configurada")
+        base = Path(base_path)
+
+        stats = {
+            'files_migrated': 0,
+            'files_deduplicated': 0,
+            'items_updated': 0,
+            'items_skipped': 0,
+            'bytes_saved': 0
+        }
+
+        # Agrupar items por archivo: varios items pueden compartir la misma ruta
+        rows = self.db_manager.execute_query(
+            "SELECT id, content, is_sensitive, file_extension FROM items WHERE type = 'PATH'"
+        )
+        # Los items sensibles también cuentan: su ruta puede ser la misma
+        self.db_manager._decrypt_sensitive_items(rows)
+        items_by_path: Dict[str, list] = {}
+        for row in rows:
+            relative_path = (row['content'] or '').strip().replace('\\', '/')
+            if (not relative_path or Path(relative_path).is_absolute()
+                    or relative_path.startswith(f"{BLOBS_FOLDER}/")
+                    or not (base / relative_path).is_file()):
+                stats['items_skipped'] += 1
+                continue
+            items_by_path.setdefault(relative_path, []).append(row)
+
+        self.ensure_folder_exists(str(base / BLOBS_FOLDER))
+
+        for relative_path, items in items_by_path.items():
+            old_file = base / relative_path
+            try:
+                file_hash = self.calculate_file_hash(str(old_file))
+                file_size = old_file.stat().st_size
+                extension = items[0]['file_extension'] or old_file.suffix
+
+                blob = self.db_manager.get_file_blob(file_hash)
+                if blob and (base / blob['relative_path']).is_file():
+                    blob_path = blob['relative_path']
+                    stats['files_deduplicated'] += 1
+                    stats['bytes_saved'] += file_size
+                else:
+                    blob_path = blob['relative_path'] if blob else self.get_blob_relative_path(file_hash, extension)
+                    dest_file = base / blob_path
+                    self.ensure_folder_exists(str(dest_file.parent))
+                    os.replace(old_file, dest_file)
+                    self._catalog_forget(relative_path)
+                    self._catalog_record(blob_path)
+                    if not blob:
+                        self.db_manager.register_file_blob(file_hash, blob_path, file_size)
+                    stats['files_migrated'] += 1
+
+                for item in items:
+                    self.db_manager.update_item(item['id'], content=blob_path, file_hash=file_hash,
+                                                file_size=file_size)
+                    stats['items_updated'] += 1
+
+                # Copia redundante: ya ningún item apunta a ella
+                if old_file.exists():
+                    old_file.unlink()
+                    self._catalog_forget(relative_path)
+            except Exception as e:
+                logger.error(f"Error migrating {relative_path} to blob storage: {e}")
+                stats['items_skipped'] += len(items)
+
+        self.config_manager.set_files_storage_mode(STORAGE_MODE_CONTENT)
+        logger.info(f"Storage migrated to content-addressed layout: {stats}")
+        return stats
+
+    def collect_unreferenced_blobs(self, released_only: bool = False) -> int:
+        """
+        Elimina los blobs que ya no referencia ningún item (ref_count <= 0)
+
+        Los blobs copiados hace menos de BLOB_GRACE_PERIOD se conservan: su
+        item puede no haberse guardado todavía.
+
+        Args:
+            released_only: Solo los blobs cuyo último item se borró o pasó a
+                           otro archivo (no los copiados sin llegar a guardarse)
+
+        Returns:
+            int: Número de blobs eliminados
+        """
+        base_path = self.get_base_path()
+        if not base_path:
+            return 0
+
+        blobs = self.db_manager.get_unreferenced_file_blobs(BLOB_GRACE_PERIOD, released_only)
+        removed = 0
+        for blob in blobs:
+            blob_file = Path(base_path) / blob['relative_path']
+            try:
+                if blob_file.exists():
+                    blob_file.unlink()
+                    self._catalog_forget(blob['relative_path'])
+                self.db_manager.delete_file_blob(blob['file_hash'])
+                removed += 1
+            except OSError as e:
+                logger.error(f"Error removing blob {blob_file}: {e}")
+
+        if removed:
+            logger.info(f"Unreferenced blobs removed: {removed}")
+        return removed
+
+    def start_blob_collection(self) -> None:
+        """
+        Elimina los blobs sin referencias cada vez que se borran o editan items
+
+        Registra un listener de items en DBManager (compartido por todos los
+        DBManager del mismo archivo) y recoge los blobs que quedaron sin
+        referencias en sesiones anteriores.
+        """
+        self.db_manager.add_item_listener(self._on_items_changed)
+        if self.is_content_addressed():
+            self.collect_unreferenced_blobs()
+
+    def stop_blob_collection(self) -> None:
+        """Deja de recoger blobs tras los cambios de items"""
+        self.db_manager.remove_item_listener(self._on_items_changed)
+
+    def _on_items_changed(self, kind: str, item_ids) -> None:
+        """Listener de DBManager: borrar o editar items puede liberar blobs"""
+        if kind in (ITEM_DELETED, ITEM_UPDATED) and self.is_content_addressed():
+            self.collect_unreferenced_blobs(released_only=True)
+
     # ==================== Utilidades ====================
 
     def format_file_size(self, size_bytes: int) -> str:
@@ -531,35 +921,43 @@ class FileManager:
         file_type = self.detect_file_type(extension)
         return self.get_file_icon_by_type(file_type)
 
-    def get_storage_stats(self) -> Dict[str, any]:
+    def get_storage_stats(self, reconcile: bool = True) -> Dict[str, any]:
         """
         Obtiene estadísticas del almacenamiento de archivos
 
+        Se leen del catálogo persistido (tabla de totales), sin recorrer el
+        disco. Con reconcile=True se programa además una reconciliación en
+        segundo plano que solo revisa carpetas con mtime cambiado.
+
+        Args:
+            reconcile: Programar la reconciliación del catálogo
+
         Returns:
             Dict con estadísticas:
-                - total_items: Total de items PATH
+                - total_files: Total de archivos en el almacenamiento
                 - total_size: Tamaño total en bytes
                 - total_size_formatted: Tamaño formateado
-                - by_type: Diccionario con conteo por tipo
+                - by_type: {tipo: {'count': n, 'size': bytes}}
+                - by_folder: {carpeta: {'count': n, 'size': bytes}}
+                - catalogued: False si el catálogo aún no se construyó
         """
         try:
-            # Obtener todos los items de tipo PATH
-            # Nota: esto requeriría un método en DBManager para filtrar por tipo
-            # Por ahora retornamos estructura básica
-            stats = {
-                'total_items': 0,
-                'total_size': 0,
-                'total_size_formatted': '0 B',
-                'by_type': {}
-            }
+            base_path = self.get_base_path()
+            if reconcile and base_path and Path(base_path).is_dir():
+                self.catalog.schedule_reconcile(ROOT_FILES, base_path)
 
+            stats = self.catalog.get_totals(ROOT_FILES)
+            stats['total_size_formatted'] = self.format_file_size(stats['total_size'])
+            stats['catalogued'] = self.catalog.is_catalogued(ROOT_FILES)
             return stats
 
         except Exception as e:
             logger.error(f"Error getting storage stats: {e}")
             return {
-                'total_items': 0,
+                'total_files': 0,
                 'total_size': 0,
                 'total_size_formatted': '0 B',
-                'by_type': {}
+                'by_type': {},
+                'by_folder': {},
+                'catalogued': False
             }
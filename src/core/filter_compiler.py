@@ -0,0 +1,291 @@
+"""
+Filter Compiler
+Compila el diccionario de filtros de AdvancedFilterEngine en un único
+predicado (una sola pasada sobre los items), con las etapas ordenadas por
+selectividad estimada para descartar cuanto antes
+"""
+
+import json
+import logging
+import operator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from models.item import Item, ItemType
+
+logger = logging.getLogger(__name__)
+
+
+# Items muestreados para estimar la selectividad real de cada etapa
+SELECTIVITY_SAMPLE_SIZE = 256
+
+_COMPARATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '=': operator.eq,
+}
+
+_MISSING = object()
+
+
+@dataclass
+class FilterStage:
+    """One criterion of the filter dict, as a per-item predicate"""
+    name: str
+    predicate: Callable[[Item], bool]
+    estimate: float  # Fracción de items que se espera que pase (0-1)
+
+
+def filter_key(filters: Dict[str, Any]) -> str:
+    """Stable key of a filter dict (datetimes as ISO strings)"""
+    return json.dumps(filters, sort_keys=True, default=str)
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _parse_created_at(item: Item) -> Optional[datetime]:
+    """created_at as datetime (some callers build items with string dates)"""
+    value = getattr(item, 'created_at', None)
+    if not value or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            logger.warning(f"Could not parse created_at for item '{item.label}': {value}")
+            return None
+
+
+class CompiledFilter:
+    """
+    Filter dict compiled into ordered stages plus sort / top N
+
+    cacheable is False when the result depends on something other than the
+    items and the filter dict: the clock (rolling date windows) or
+    last_used, which views update in place when an item is copied
+    (uses_last_used: such filters must also read the live Item objects).
+    """
+
+    def __init__(self, stages: List[FilterStage], sort_by: Optional[str] = None,
+                 top_n: Optional[int] = None, cacheable: bool = True,
+                 uses_last_used: bool = False):
+        self.stages = sorted(stages, key=lambda stage: stage.estimate)
+        self.sort_by = sort_by
+        self.top_n = top_n
+        self.uses_last_used = uses_last_used
+        self.cacheable = cacheable and not uses_last_used
+
+    def order_by_selectivity(self, items: Sequence[Item]) -> None:
+        """Reorder the stages by their pass rate on an evenly spaced sample"""
+        if len(self.stages) < 2 or len(items) <= SELECTIVITY_SAMPLE_SIZE:
+            return
+        step = len(items) // SELECTIVITY_SAMPLE_SIZE
+        sample = items[::step][:SELECTIVITY_SAMPLE_SIZE]
+        for stage in self.stages:
+            stage.estimate = sum(1 for item in sample if stage.predicate(item)) / len(sample)
+        self.stages.sort(key=lambda stage: stage.estimate)
+        logger.debug("Filter stages by selectivity: " +
+                     ", ".join(f"{stage.name}={stage.estimate:.2f}" for stage in self.stages))
+
+    def predicate(self) -> Optional[Callable[[Item], bool]]:
+        """Fuse the stages into one short-circuiting predicate (None: no stages)"""
+        fused = None
+        for stage in reversed(self.stages):
+            fused = stage.predicate if fused is None else (
+                lambda item, first=stage.predicate, rest=fused: first(item) and rest(item)
+            )
+        return fused
+
+    def apply(self, items: Sequence[Item]) -> List[Item]:
+        """Filter in one pass, then sort and cut to top N"""
+        self.order_by_selectivity(items)
+        matches = self.predicate()
+        result = [item for item in items if matches(item)] if matches else list(items)
+
+        if self.sort_by:
+            result = sort_items(result, self.sort_by)
+        if self.top_n:
+            result = result[:self.top_n]
+        return result
+
+
+# ========== ETAPAS ==========
+
+def _type_stage(types: List[str]) -> FilterStage:
+    allowed = frozenset(t.upper() for t in types)
+    return FilterStage('type', lambda item: item.type.value.upper() in allowed,
+                       min(len(allowed) / len(ItemType), 1.0))
+
+
+def _flag_stage(name: str, value: bool, estimate_true: float) -> FilterStage:
+    def predicate(item):
+        return getattr(item, name, _MISSING) == value
+    return FilterStage(name, predicate, estimate_true if value else 1 - estimate_true)
+
+
+def _has_tags_stage(has_tags: bool) -> FilterStage:
+    return FilterStage('has_tags', lambda item: bool(item.tags) == has_tags, 0.5)
+
+
+def _is_list_stage(is_list: bool) -> FilterStage:
+    def predicate(item):
+        is_list_item = getattr(item, 'is_list_item', None)
+        return is_list_item is not None and is_list_item() == is_list
+    return FilterStage('is_list', predicate, 0.2 if is_list else 0.8)
+
+
+def _tags_stage(tag_filter: Dict[str, Any]) -> Optional[FilterStage]:
+    if 'values' not in tag_filter:
+        return None
+    targets = frozenset(tag_filter['values'])
+
+    if tag_filter.get('mode', 'OR').upper() == 'AND':
+        # Item debe tener TODOS los tags
+        return FilterStage('tags', lambda item: bool(item.tags) and targets.issubset(item.tags),
+                           0.05 / len(targets) if targets else 0.5)
+    # Item debe tener AL MENOS UN tag
+    return FilterStage('tags', lambda item: bool(item.tags) and not targets.isdisjoint(item.tags),
+                       min(0.1 * len(targets), 0.5))
+
+
+def _use_count_stage(count_filter: Dict[str, Any]) -> FilterStage:
+    compare = _COMPARATORS.get(count_filter.get('operator', '>'))
+    value = count_filter.get('value', 0)
+    if compare is None:
+        # Operador desconocido: ningún item cumple
+        return FilterStage('use_count', lambda item: False, 0.0)
+    return FilterStage('use_count', lambda item: compare(getattr(item, 'use_count', 0), value), 0.5)
+
+
+def _last_used_stage(date_filter: Dict[str, Any], now: datetime) -> Optional[FilterStage]:
+    if 'preset' in date_filter:
+        preset = date_filter['preset']
+        if preset == 'never':
+            # Items nunca usados (use_count = 0)
+            return FilterStage('last_used', lambda item: getattr(item, 'use_count', 0) == 0, 0.5)
+        starts = {
+            'today': _start_of_day(now),
+            'last_7_days': now - timedelta(days=7),
+            'last_30_days': now - timedelta(days=30),
+            'last_90_days': now - timedelta(days=90),
+        }
+        if preset not in starts:
+            return None
+        start = starts[preset]
+        return FilterStage('last_used', lambda item: getattr(item, 'last_used', _MISSING) is not _MISSING
+                           and item.last_used >= start, 0.3)
+
+    if 'custom_from' in date_filter and 'custom_to' in date_filter:
+        from_date, to_date = date_filter['custom_from'], date_filter['custom_to']
+        return FilterStage('last_used', lambda item: getattr(item, 'last_used', _MISSING) is not _MISSING
+                           and from_date <= item.last_used <= to_date, 0.3)
+    return None
+
+
+def _created_at_stage(date_filter: Dict[str, Any], now: datetime) -> Optional[FilterStage]:
+    if 'preset' in date_filter:
+        starts = {
+            'today': _start_of_day(now),
+            'this_week': _start_of_day(now - timedelta(days=now.weekday())),
+            'this_month': _start_of_day(now.replace(day=1)),
+            'last_7_days': now - timedelta(days=7),
+            'last_30_days': now - timedelta(days=30),
+        }
+        start = starts.get(date_filter['preset'])
+        if start is None:
+            return None
+        return FilterStage('created_at', lambda item: bool(getattr(item, 'created_at', None))
+                           and item.created_at >= start, 0.3)
+
+    if 'custom_from' in date_filter and 'custom_to' in date_filter:
+        from_date, to_date = date_filter['custom_from'], date_filter['custom_to']
+
+        def predicate(item):
+            created_at = _parse_created_at(item)
+            return created_at is not None and from_date <= created_at <= to_date
+        return FilterStage('created_at', predicate, 0.3)
+    return None
+
+
+# Presets de fecha alineados a días: el resultado no cambia dentro del mismo día
+_DAY_ALIGNED_PRESETS = {'today', 'this_week', 'this_month'}
+
+
+def compile_filters(filters: Dict[str, Any], now: Optional[datetime] = None) -> CompiledFilter:
+    """
+    Compile a filter dict (AdvancedFilterEngine.apply_filters format)
+
+    Args:
+        filters: Filter criteria
+        now: Reference time for date presets (default: now)
+
+    Returns:
+        CompiledFilter
+    """
+    now = now or datetime.now()
+    stages: List[FilterStage] = []
+    cacheable = True
+    uses_last_used = bool(filters.get('last_used')) or filters.get('sort_by') == 'recent'
+
+    if filters.get('type'):
+        stages.append(_type_stage(filters['type']))
+    if filters.get('is_favorite') is not None:
+        stages.append(_flag_stage('is_favorite', filters['is_favorite'], 0.1))
+    if filters.get('is_sensitive') is not None:
+        stages.append(_flag_stage('is_sensitive', filters['is_sensitive'], 0.05))
+    if filters.get('has_tags') is not None:
+        stages.append(_has_tags_stage(filters['has_tags']))
+    if filters.get('is_list') is not None:
+        stages.append(_is_list_stage(filters['is_list']))
+    if filters.get('tags'):
+        stages.append(_tags_stage(filters['tags']))
+    if filters.get('use_count'):
+        stages.append(_use_count_stage(filters['use_count']))
+    if filters.get('last_used'):
+        stages.append(_last_used_stage(filters['last_used'], now))
+    if filters.get('created_at'):
+        stages.append(_created_at_stage(filters['created_at'], now))
+        preset = filters['created_at'].get('preset')
+        cacheable = preset is None or preset in _DAY_ALIGNED_PRESETS
+
+    return CompiledFilter(
+        [stage for stage in stages if stage is not None],
+        sort_by=filters.get('sort_by') or None,
+        top_n=filters.get('top_n') or None,
+        cacheable=cacheable,
+        uses_last_used=uses_last_used,
+    )
+
+
+def sort_items(items: List[Item], sort_by: str) -> List[Item]:
+    """
+    Ordenar items según criterio
+
+    Opciones de sort_by:
+        - use_count_desc: Más usados primero
+        - use_count_asc: Menos usados primero
+        - recent: Usados recientemente primero
+        - oldest: Más antiguos primero
+        - label_asc: Alfabético A-Z
+        - label_desc: Alfabético Z-A
+    """
+    if sort_by == 'use_count_desc':
+        return sorted(items, key=lambda x: getattr(x, 'use_count', 0), reverse=True)
+    elif sort_by == 'use_count_asc':
+        return sorted(items, key=lambda x: getattr(x, 'use_count', 0))
+    elif sort_by == 'recent':
+        return sorted(items, key=lambda x: getattr(x, 'last_used', datetime.min), reverse=True)
+    elif sort_by == 'oldest':
+        return sorted(items, key=lambda x: getattr(x, 'created_at', datetime.max))
+    elif sort_by == 'label_asc':
+        return sorted(items, key=lambda x: x.label.lower())
+    elif sort_by == 'label_desc':
+        return sorted(items, key=lambda x: x.label.lower(), reverse=True)
+    return items
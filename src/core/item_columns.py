@@ -0,0 +1,316 @@
+"""
+Item Columns
+Columnar (NumPy) snapshot of an item list: ids, category ids, type codes,
+flag bits, use_count, epoch timestamps and a CSR tag matrix. Filters become
+boolean masks and sorts become stable argsorts. Used by AdvancedFilterEngine
+and DashboardManager above COLUMNAR_THRESHOLD items when NumPy is installed;
+results match the per-item Python path (filter_compiler) exactly.
+"""
+
+import logging
+import operator
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from models.item import Item, ItemType, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+# Por debajo de este tamaño construir columnas no compensa
+COLUMNAR_THRESHOLD = 20_000
+
+# Bits de flags: "== True" y "== False" por separado (valores None no cumplen ninguno)
+FLAG_FAVORITE = 1
+FLAG_NOT_FAVORITE = 2
+FLAG_SENSITIVE = 4
+FLAG_NOT_SENSITIVE = 8
+FLAG_HAS_TAGS = 16
+FLAG_IS_LIST = 32
+
+_TYPE_CODES = {item_type: code for code, item_type in enumerate(ItemType)}
+
+_COMPARATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '=': operator.eq,
+}
+
+
+def _flag(value, true_bit: int, false_bit: int) -> int:
+    if value == True:  # noqa: E712 - 1 y True cuentan igual que en el predicado
+        return true_bit
+    if value == False:  # noqa: E712
+        return false_bit
+    return 0
+
+
+def _epoch(value) -> float:
+    """datetime/timestamp string -> epoch seconds (NaN if missing)"""
+    value = parse_timestamp(value) if value else None
+    return value.timestamp() if value else float('nan')
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class ItemColumns:
+    """
+    Column arrays of a fixed item list (rebuild when the list changes)
+
+    Row i of every array describes items[i]. Tags are a CSR matrix:
+    the tag ids of row i are tag_indices[tag_indptr[i]:tag_indptr[i + 1]],
+    named by tag_names.
+    """
+
+    def __init__(self, items: Sequence, ids, category_ids, type_codes, flags,
+                 use_count, created_at, last_used, tag_indptr, tag_indices,
+                 tag_names: List[str], labels: List[str], type_names: Optional[List[str]] = None):
+        self.items = items
+        self.ids = ids
+        self.category_ids = category_ids
+        self.type_codes = type_codes
+        self.flags = flags
+        self.use_count = use_count
+        self.created_at = created_at
+        self.last_used = last_used
+        self.tag_indptr = tag_indptr
+        self.tag_indices = tag_indices
+        self.tag_names = tag_names
+        self.tag_ids = {name: tag_id for tag_id, name in enumerate(tag_names)}
+        self._labels = labels
+        self._label_ranks = None
+        # Fila de cada entrada de tag_indices (CSR expandido a COO)
+        self._tag_rows = np.repeat(np.arange(len(items)), np.diff(tag_indptr))
+        # Tipos como texto (estructura del dashboard); None: códigos de ItemType
+        self.type_names = type_names
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ========== CONSTRUCCIÓN ==========
+
+    @classmethod
+    def from_items(cls, items: Sequence[Item]) -> 'ItemColumns':
+        """Build the columns of a list of Item objects"""
+        return cls._build(
+            items,
+            ids=(int(item.id) if str(item.id).isdigit() else -1 for item in items),
+            category_ids=(-1 for _ in items),
+            type_codes=(_TYPE_CODES.get(item.type, -1) for item in items),
+            flags=(
+                _flag(getattr(item, 'is_favorite', None), FLAG_FAVORITE, FLAG_NOT_FAVORITE)
+                | _flag(item.is_sensitive, FLAG_SENSITIVE, FLAG_NOT_SENSITIVE)
+                | (FLAG_HAS_TAGS if item.tags else 0)
+                | (FLAG_IS_LIST if item.is_list_item() else 0)
+                for item in items
+            ),
+            use_count=(getattr(item, 'use_count', 0) or 0 for item in items),
+            created_at=(_epoch(getattr(item, 'created_at', None)) for item in items),
+            last_used=(_epoch(getattr(item, 'last_used', None)) for item in items),
+            tags=(item.tags for item in items),
+            labels=[item.label.lower() for item in items],
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> 'ItemColumns':
+        """
+        Build the columns of item dicts (DashboardManager structure rows)
+
+        Types are kept as their raw strings (type_names) because the
+        dashboard filters compare them verbatim.
+        """
+        type_names = list(dict.fromkeys(row.get('type') for row in rows))
+        type_codes = {name: code for code, name in enumerate(type_names)}
+        columns = cls._build(
+            rows,
+            ids=(row.get('id', -1) for row in rows),
+            category_ids=(row.get('category_id', -1) or -1 for row in rows),
+            type_codes=(type_codes[row.get('type')] for row in rows),
+            flags=(
+                _flag(row.get('is_favorite'), FLAG_FAVORITE, FLAG_NOT_FAVORITE)
+                | _flag(row.get('is_sensitive'), FLAG_SENSITIVE, FLAG_NOT_SENSITIVE)
+                | (FLAG_HAS_TAGS if row.get('tags') else 0)
+                | (FLAG_IS_LIST if row.get('is_list') else 0)
+                for row in rows
+            ),
+            use_count=(row.get('use_count') or 0 for row in rows),
+            created_at=(_epoch(row.get('created_at')) for row in rows),
+            last_used=(_epoch(row.get('last_used')) for row in rows),
+            tags=(row.get('tags') or [] for row in rows),
+            labels=[str(row.get('label', '')).lower() for row in rows],
+        )
+        columns.type_names = type_names
+        return columns
+
+    @classmethod
+    def _build(cls, items, ids, category_ids, type_codes, flags, use_count,
+               created_at, last_used, tags: Iterable, labels: List[str]) -> 'ItemColumns':
+        count = len(items)
+        tag_ids: Dict[str, int] = {}
+        indptr = np.zeros(count + 1, dtype=np.int64)
+        indices: List[int] = []
+        for row, item_tags in enumerate(tags):
+            for tag in dict.fromkeys(item_tags):
+                indices.append(tag_ids.setdefault(tag, len(tag_ids)))
+            indptr[row + 1] = len(indices)
+
+        return cls(
+            items,
+            ids=np.fromiter(ids, dtype=np.int64, count=count),
+            category_ids=np.fromiter(category_ids, dtype=np.int64, count=count),
+            type_codes=np.fromiter(type_codes, dtype=np.int16, count=count),
+            flags=np.fromiter(flags, dtype=np.uint8, count=count),
+            use_count=np.fromiter(use_count, dtype=np.int64, count=count),
+            created_at=np.fromiter(created_at, dtype=np.float64, count=count),
+            last_used=np.fromiter(last_used, dtype=np.float64, count=count),
+            tag_indptr=indptr,
+            tag_indices=np.array(indices, dtype=np.int32),
+            tag_names=list(tag_ids),
+            labels=labels,
+        )
+
+    # ========== MÁSCARAS ==========
+
+    def _all(self, value: bool):
+        return np.full(len(self.items), value, dtype=bool)
+
+    def _flag_mask(self, value, true_bit: int, false_bit: int):
+        bit = _flag(value, true_bit, false_bit)
+        return (self.flags & bit) != 0 if bit else self._all(False)
+
+    def type_mask(self, allowed: Callable[[Any], bool]):
+        """Rows whose type satisfies allowed(type) (ItemType or raw type string)"""
+        types = self.type_names if self.type_names is not None else list(ItemType)
+        codes = [code for code, item_type in enumerate(types) if allowed(item_type)]
+        return np.isin(self.type_codes, codes)
+
+    def tag_counts(self, names: Iterable[str]):
+        """Per row, how many of the given tags it has"""
+        wanted = [self.tag_ids[name] for name in set(names) if name in self.tag_ids]
+        if not wanted:
+            return np.zeros(len(self.items), dtype=np.int64)
+        hits = np.isin(self.tag_indices, wanted)
+        return np.bincount(self._tag_rows[hits], minlength=len(self.items))
+
+    def _tags_mask(self, tag_filter: Dict[str, Any]):
+        if 'values' not in tag_filter:
+            return None
+        targets = set(tag_filter['values'])
+        has_tags = (self.flags & FLAG_HAS_TAGS) != 0
+        if tag_filter.get('mode', 'OR').upper() == 'AND':
+            if not targets:
+                return has_tags
+            if not targets.issubset(self.tag_ids):
+                return self._all(False)
+            return self.tag_counts(targets) == len(targets)
+        return self.tag_counts(targets) > 0
+
+    def _date_mask(self, column, date_filter: Dict[str, Any], starts: Dict[str, datetime]):
+        if 'preset' in date_filter:
+            start = starts.get(date_filter['preset'])
+            return None if start is None else column >= start.timestamp()
+        if 'custom_from' in date_filter and 'custom_to' in date_filter:
+            return ((column >= date_filter['custom_from'].timestamp())
+                    & (column <= date_filter['custom_to'].timestamp()))
+        return None
+
+    def mask(self, filters: Dict[str, Any], now: Optional[datetime] = None):
+        """
+        Boolean mask of the rows that pass every criterion of a filter dict
+        (AdvancedFilterEngine.apply_filters format, same semantics)
+        """
+        now = now or datetime.now()
+        masks = []
+
+        if filters.get('type'):
+            allowed = {t.upper() for t in filters['type']}
+            masks.append(self.type_mask(lambda item_type: item_type.value.upper() in allowed))
+        if filters.get('is_favorite') is not None:
+            masks.append(self._flag_mask(filters['is_favorite'], FLAG_FAVORITE, FLAG_NOT_FAVORITE))
+        if filters.get('is_sensitive') is not None:
+            masks.append(self._flag_mask(filters['is_sensitive'], FLAG_SENSITIVE, FLAG_NOT_SENSITIVE))
+        if filters.get('has_tags') is not None:
+            has_tags = (self.flags & FLAG_HAS_TAGS) != 0
+            masks.append(has_tags if filters['has_tags'] == True else  # noqa: E712
+                         ~has_tags if filters['has_tags'] == False else self._all(False))  # noqa: E712
+        if filters.get('is_list') is not None:
+            is_list = (self.flags & FLAG_IS_LIST) != 0
+            masks.append(is_list == filters['is_list'] if isinstance(filters['is_list'], (bool, int))
+                         else self._all(False))
+        if filters.get('tags'):
+            masks.append(self._tags_mask(filters['tags']))
+        if filters.get('use_count'):
+            compare = _COMPARATORS.get(filters['use_count'].get('operator', '>'))
+            value = filters['use_count'].get('value', 0)
+            masks.append(compare(self.use_count, value) if compare else self._all(False))
+        if filters.get('last_used'):
+            if filters['last_used'].get('preset') == 'never':
+                masks.append(self.use_count == 0)
+            else:
+                masks.append(self._date_mask(self.last_used, filters['last_used'], {
+                    'today': _start_of_day(now),
+                    'last_7_days': now - timedelta(days=7),
+                    'last_30_days': now - timedelta(days=30),
+                    'last_90_days': now - timedelta(days=90),
+                }))
+        if filters.get('created_at'):
+            masks.append(self._date_mask(self.created_at, filters['created_at'], {
+                'today': _start_of_day(now),
+                'this_week': _start_of_day(now - timedelta(days=now.weekday())),
+                'this_month': _start_of_day(now.replace(day=1)),
+                'last_7_days': now - timedelta(days=7),
+                'last_30_days': now - timedelta(days=30),
+            }))
+
+        result = self._all(True)
+        for mask in masks:
+            if mask is not None:
+                result &= mask
+        return result
+
+    # ========== ORDEN ==========
+
+    @staticmethod
+    def _stable_order(keys, descending: bool):
+        """Stable argsort; descending keeps equal keys in their original order"""
+        if not descending:
+            return np.argsort(keys, kind='stable')
+        reversed_order = np.argsort(keys[::-1], kind='stable')
+        return (len(keys) - 1 - reversed_order)[::-1]
+
+    def sort(self, rows, sort_by: str):
+        """Reorder row indices by an AdvancedFilterEngine sort_by option"""
+        if sort_by in ('use_count_desc', 'use_count_asc'):
+            keys = self.use_count[rows]
+        elif sort_by == 'recent':
+            keys = np.nan_to_num(self.last_used[rows], nan=-np.inf)
+        elif sort_by == 'oldest':
+            keys = np.nan_to_num(self.created_at[rows], nan=np.inf)
+        elif sort_by in ('label_asc', 'label_desc'):
+            if self._label_ranks is None:
+                # Rango denso de cada etiqueta (iguales comparten rango): se ordenan enteros
+                self._label_ranks = np.unique(np.array(self._labels, dtype=str), return_inverse=True)[1]
+            keys = self._label_ranks[rows]
+        else:
+            return rows
+        descending = sort_by in ('use_count_desc', 'recent', 'label_desc')
+        return rows[self._stable_order(keys, descending)]
+
+    def apply(self, filters: Dict[str, Any], now: Optional[datetime] = None) -> list:
+        """Filter, sort and cut to top N, returning the selected items"""
+        rows = np.flatnonzero(self.mask(filters, now))
+        if filters.get('sort_by'):
+            rows = self.sort(rows, filters['sort_by'])
+        if filters.get('top_n'):
+            rows = rows[:filters['top_n']]
+        return list(map(self.items.__getitem__, rows.tolist()))
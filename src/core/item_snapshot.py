@@ -0,0 +1,164 @@
+"""
+Item Snapshot Service
+Shared, read-only list of Item objects (items of active categories, newest
+first) built once from the ItemStore for every open global search panel.
+Panels hold a reference to the current snapshot and keep only their own
+filter state and result lists; item changes produce a new snapshot
+(copy-on-write) that reuses the unchanged Item objects.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from database.db_manager import ITEM_DELETED
+from models.item import Item
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ItemSnapshot:
+    """Immutable item list shared by every holder"""
+    version: int
+    items: Tuple[Item, ...]  # Más recientes primero (orden de get_all_items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class ItemSnapshotService:
+    """
+    Reference-counted provider of the shared ItemSnapshot
+
+    The first acquire() builds the snapshot from the ItemStore and starts
+    following its diffs; the last release() drops it (and the Item objects
+    nobody else references). A diff never mutates a published snapshot:
+    a new one is built, reusing the Item objects of the rows that did not
+    change, and handed to every holder's refresh callback.
+    """
+
+    def __init__(self, item_store, item_factory: Callable[[dict], Item] = Item.from_row):
+        """
+        Args:
+            item_store: ItemStore with every item row
+            item_factory: Callable(row) -> Item
+        """
+        self.item_store = item_store
+        self._item_factory = item_factory
+        self._lock = threading.RLock()
+        self._snapshot: Optional[ItemSnapshot] = None
+        self._refcount = 0
+        self._listeners: List[Callable[[ItemSnapshot], None]] = []
+
+        # Contadores para diagnóstico y tests
+        self.builds = 0
+        self.patches = 0
+
+    # ========== REFERENCIAS ==========
+
+    def acquire(self, on_refresh: Optional[Callable[[ItemSnapshot], None]] = None) -> ItemSnapshot:
+        """
+        Take a reference to the shared snapshot, building it on first use
+
+        Args:
+            on_refresh: Callable(snapshot) called with each new snapshot
+                        (on the thread that changed the database)
+
+        Returns:
+            ItemSnapshot: Current snapshot
+        """
+        with self._lock:
+            if self._refcount == 0:
+                self.item_store.subscribe(self._on_store_changed)
+                self._snapshot = self._build()
+            self._refcount += 1
+            if on_refresh is not None:
+                self._listeners.append(on_refresh)
+            return self._snapshot
+
+    def release(self, on_refresh: Optional[Callable[[ItemSnapshot], None]] = None) -> None:
+        """
+        Drop a reference taken with acquire() (pass the same callback)
+        """
+        with self._lock:
+            if self._refcount == 0:
+                logger.warning("Item snapshot released more times than acquired")
+                return
+            if on_refresh is not None and on_refresh in self._listeners:
+                self._listeners.remove(on_refresh)
+            self._refcount -= 1
+            if self._refcount == 0:
+                self.item_store.unsubscribe(self._on_store_changed)
+                self._snapshot = None
+                self._listeners.clear()
+                logger.debug("Item snapshot dropped (no holders left)")
+
+    @property
+    def current(self) -> Optional[ItemSnapshot]:
+        """Current snapshot (None while nobody holds one)"""
+        return self._snapshot
+
+    @property
+    def refcount(self) -> int:
+        return self._refcount
+
+    # ========== CONSTRUCCIÓN ==========
+
+    def _build(self) -> ItemSnapshot:
+        """Build the snapshot from every active item of the store (lock held)"""
+        items = self._to_items(self.item_store.get_items(include_inactive=False))
+        self.builds += 1
+        logger.info(f"Item snapshot built: {len(items)} items")
+        return ItemSnapshot(version=0, items=tuple(items))
+
+    def _to_items(self, rows) -> List[Item]:
+        """Convert rows to Items, skipping (and logging) rows that fail"""
+        items = []
+        for row in rows:
+            try:
+                items.append(self._item_factory(row))
+            except Exception as e:
+                logger.error(f"Error converting item {row.get('id')}: {e}")
+        return items
+
+    def _on_store_changed(self, change) -> None:
+        """ItemStore subscriber: publish a patched copy of the snapshot"""
+        changed_ids = {str(item_id) for item_id in change.item_ids}
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+
+            if change.kind == ITEM_DELETED:
+                items = tuple(item for item in snapshot.items if item.id not in changed_ids)
+            else:
+                active_rows = [row for row in change.items if row.get('category_is_active', 1)]
+                new_items = {item.id: item for item in self._to_items(active_rows)}
+
+                # Reemplazo en sitio para conservar el orden; el resto se reutiliza
+                patched = []
+                for item in snapshot.items:
+                    if item.id in changed_ids:
+                        replacement = new_items.pop(item.id, None)
+                        if replacement is not None:
+                            patched.append(replacement)
+                    else:
+                        patched.append(item)
+
+                # Items nuevos (o que pasan a ser visibles) van primero: más recientes
+                items = tuple(new_items.values()) + tuple(patched)
+
+            self._snapshot = ItemSnapshot(version=snapshot.version + 1, items=items)
+            self.patches += 1
+            listeners = list(self._listeners)
+            new_snapshot = self._snapshot
+
+        logger.debug(f"Item snapshot v{new_snapshot.version}: {change.kind} {len(changed_ids)} items")
+        for callback in listeners:
+            try:
+                callback(new_snapshot)
+            except Exception as e:
+                logger.error(f"Item snapshot holder failed: {e}", exc_info=True)
@@ -0,0 +1,226 @@
+"""
+Item Store
+Central in-memory copy of all items, kept current from DBManager change
+notifications so views can apply diffs instead of reloading everything
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from database.db_manager import ITEM_ADDED, ITEM_UPDATED, ITEM_DELETED
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ItemStoreChange:
+    """Diff delivered to ItemStore subscribers"""
+    kind: str                     # ITEM_ADDED, ITEM_UPDATED o ITEM_DELETED
+    items: List[Dict]             # Filas nuevas (added/updated) o eliminadas (deleted)
+    previous: Dict[int, Dict] = field(default_factory=dict)  # Filas anteriores (updated)
+
+    @property
+    def item_ids(self) -> List[int]:
+        return [item['id'] for item in self.items]
+
+
+class ItemStore:
+    """
+    In-memory item store indexed by id, category, list group and tag
+
+    Rows have the get_all_items() shape (category info included; sensitive
+    content as an EncryptedContent handle). The store registers itself as
+    an item listener of the DBManager: every add/update/delete made through
+    it patches only the affected rows (one query for the changed IDs) and
+    is forwarded to subscribers as an ItemStoreChange.
+    """
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DBManager instance
+        """
+        self.db = db_manager
+        self._lock = threading.RLock()
+        self._loaded = False
+
+        # Orden de inserción: del más antiguo al más reciente
+        self._items: Dict[int, Dict] = {}
+        self._by_category: Dict[int, Set[int]] = {}
+        self._by_list_group: Dict[Tuple[int, str], Set[int]] = {}
+        self._by_tag: Dict[str, Set[int]] = {}
+
+        self._subscribers = []
+        self.db.add_item_listener(self._on_items_changed)
+
+    # ========== CARGA ==========
+
+    def load(self) -> None:
+        """(Re)load every item from the database"""
+        rows = self.db.get_all_items(include_inactive=True, lazy_content=True)
+        with self._lock:
+            self._items.clear()
+            self._by_category.clear()
+            self._by_list_group.clear()
+            self._by_tag.clear()
+            # get_all_items ordena por created_at DESC
+            for row in reversed(rows):
+                self._index(row)
+            self._loaded = True
+        logger.info(f"Item store loaded: {len(rows)} items")
+
+    def ensure_loaded(self) -> None:
+        """Load the store on first use"""
+        if not self._loaded:
+            self.load()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    # ========== CONSULTAS ==========
+
+    def get(self, item_id) -> Optional[Dict]:
+        """Get an item row by ID (None if unknown)"""
+        self.ensure_loaded()
+        with self._lock:
+            return self._items.get(int(item_id))
+
+    def get_items(self, include_inactive: bool = False) -> List[Dict]:
+        """
+        Get all items, newest first (same order as DBManager.get_all_items)
+
+        Args:
+            include_inactive: Include items of inactive categories
+        """
+        self.ensure_loaded()
+        with self._lock:
+            rows = list(reversed(self._items.values()))
+        if include_inactive:
+            return rows
+        return [row for row in rows if row.get('category_is_active', 1)]
+
+    def get_by_category(self, category_id) -> List[Dict]:
+        """Get the items of a category (oldest first)"""
+        return self._lookup(self._by_category, int(category_id))
+
+    def get_by_list_group(self, category_id, list_group: str) -> List[Dict]:
+        """Get the items of a list, ordered by orden_lista"""
+        rows = self._lookup(self._by_list_group, (int(category_id), list_group))
+        return sorted(rows, key=lambda row: row.get('orden_lista') or 0)
+
+    def get_by_tag(self, tag: str) -> List[Dict]:
+        """Get the items having a tag"""
+        return self._lookup(self._by_tag, tag)
+
+    def _lookup(self, index: Dict, key) -> List[Dict]:
+        """Resolve the IDs stored under an index key (oldest first)"""
+        self.ensure_loaded()
+        with self._lock:
+            item_ids = index.get(key) or ()
+            return [self._items[item_id] for item_id in sorted(item_ids)]
+
+    # ========== SUSCRIPCIONES ==========
+
+    def subscribe(self, callback) -> None:
+        """
+        Register a callback receiving an ItemStoreChange after each patch
+
+        Callbacks run on the thread that made the database change.
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Unregister a callback added with subscribe()"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _publish(self, change: ItemStoreChange) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"Item store subscriber failed: {e}", exc_info=True)
+
+    # ========== PARCHES ==========
+
+    def refresh(self, item_ids: List[int]) -> None:
+        """Re-read some rows from the database and publish the diff"""
+        self._on_items_changed(ITEM_UPDATED, [int(item_id) for item_id in item_ids])
+
+    def _on_items_changed(self, kind: str, item_ids: List[int]) -> None:
+        """DBManager listener: patch the affected rows and publish the diff"""
+        if not self._loaded:
+            # Nada que parchear: la primera carga leerá el estado actual
+            return
+
+        if kind == ITEM_DELETED:
+            with self._lock:
+                removed = [self._unindex(item_id) for item_id in item_ids]
+            removed = [row for row in removed if row is not None]
+            if removed:
+                self._publish(ItemStoreChange(ITEM_DELETED, removed))
+            return
+
+        rows = self.db.get_items_by_ids(item_ids, lazy_content=True)
+        found = {row['id'] for row in rows}
+        previous = {}
+        with self._lock:
+            for row in rows:
+                old = self._items.get(row['id'])
+                if old is not None:
+                    # Reemplazo en sitio: el item conserva su posición
+                    self._unindex_maps(old)
+                    previous[row['id']] = old
+                self._index(row)
+            # IDs que ya no existen en la base de datos
+            missing = [self._unindex(item_id) for item_id in item_ids if item_id not in found]
+        missing = [row for row in missing if row is not None]
+
+        if rows:
+            self._publish(ItemStoreChange(kind if kind == ITEM_ADDED else ITEM_UPDATED, rows, previous))
+        if missing:
+            self._publish(ItemStoreChange(ITEM_DELETED, missing))
+
+    def _index(self, row: Dict) -> None:
+        """Add a row to the maps (caller holds the lock)"""
+        item_id = row['id']
+        self._items[item_id] = row
+        self._by_category.setdefault(row.get('category_id'), set()).add(item_id)
+        if row.get('list_group'):
+            key = (row.get('category_id'), row['list_group'])
+            self._by_list_group.setdefault(key, set()).add(item_id)
+        for tag in row.get('tags') or []:
+            self._by_tag.setdefault(tag, set()).add(item_id)
+
+    def _unindex(self, item_id: int) -> Optional[Dict]:
+        """Remove a row from the maps (caller holds the lock)"""
+        row = self._items.pop(item_id, None)
+        if row is not None:
+            self._unindex_maps(row)
+        return row
+
+    def _unindex_maps(self, row: Dict) -> None:
+        """Remove a row from the secondary maps (caller holds the lock)"""
+        item_id = row['id']
+        self._discard(self._by_category, row.get('category_id'), item_id)
+        if row.get('list_group'):
+            self._discard(self._by_list_group, (row.get('category_id'), row['list_group']), item_id)
+        for tag in row.get('tags') or []:
+            self._discard(self._by_tag, tag, item_id)
+
+    @staticmethod
+    def _discard(index: Dict, key, item_id: int) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del index[key]
+
+    def close(self) -> None:
+        """Stop listening to the database"""
+        self.db.remove_item_listener(self._on_items_changed)
+        self._subscribers.clear()
@@ -9,6 +9,8 @@ from typing import List, Dict, Optional
 from pathlib import Path
 import logging
 
+from database.connection_pool import get_connection_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -122,10 +124,9 @@ class NotificationManager:
             return []
 
     def _get_failing_items(self, min_executions: int = 10, min_error_rate: int = 30) -> List[Dict]:
-        """Obtener items con alta tasa de error"""
+        """Obtener items con alta tasa de error (rollups diarios)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection_pool(self.db_path).connection()
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -133,13 +134,19 @@ class NotificationManager:
                     i.id,
                     i.label,
                     i.badge,
-                    COUNT(h.id) as total_executions,
-                    SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) as error_count,
-                    ROUND(100.0 * SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) / COUNT(h.id), 1) as error_rate
+                    r.total_executions,
+                    r.error_count,
+                    ROUND(100.0 * r.error_count / r.total_executions, 1) as error_rate
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                GROUP BY i.id
-                HAVING total_executions >= ? AND error_rate >= ?
+                JOIN (
+                    SELECT item_id,
+                           SUM(executions) as total_executions,
+                           SUM(failures) as error_count
+                    FROM item_usage_daily
+                    GROUP BY item_id
+                    HAVING total_executions >= ? AND total_executions > 0
+                ) r ON r.item_id = i.id
+                WHERE ROUND(100.0 * r.error_count / r.total_executions, 1) >= ?
                 ORDER BY error_rate DESC
                 LIMIT 10
             """, (min_executions, min_error_rate))
@@ -163,10 +170,9 @@ class NotificationManager:
             return []
 
     def _get_slow_items(self, min_executions: int = 10, min_avg_time_seconds: float = 5.0) -> List[Dict]:
-        """Obtener items con tiempo de ejecución lento"""
+        """Obtener items con tiempo de ejecución lento (rollups diarios)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection_pool(self.db_path).connection()
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -174,13 +180,18 @@ class NotificationManager:
                     i.id,
                     i.label,
                     i.badge,
-                    COUNT(h.id) as executions,
-                    ROUND(AVG(h.execution_time_ms) / 1000.0, 2) as avg_time_seconds
+                    r.executions,
+                    ROUND(1.0 * r.success_time_ms / r.executions / 1000.0, 2) as avg_time_seconds
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                WHERE h.success = 1
-                GROUP BY i.id
-                HAVING executions >= ? AND avg_time_seconds >= ?
+                JOIN (
+                    SELECT item_id,
+                           SUM(successes) as executions,
+                           SUM(success_time_ms) as success_time_ms
+                    FROM item_usage_daily
+                    GROUP BY item_id
+                    HAVING executions >= ? AND executions > 0
+                ) r ON r.item_id = i.id
+                WHERE ROUND(1.0 * r.success_time_ms / r.executions / 1000.0, 2) >= ?
                 ORDER BY avg_time_seconds DESC
                 LIMIT 10
             """, (min_executions, min_avg_time_seconds))
@@ -0,0 +1,154 @@
+"""
+Panel Restore Scheduler
+Hydrates restored pinned panels (load category / all items, apply filters)
+in short idle-time slices after the panel shells are already on screen, so
+startup returns control to the event loop before any panel content loads.
+"""
+
+import time
+import logging
+from typing import Callable, Dict, Hashable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Tiempo máximo de trabajo por porción antes de devolver el control (ms)
+RESTORE_SLICE_BUDGET_MS = 40
+
+# Prioridades: visibles primero, luego los que están fuera de pantalla
+PRIORITY_VISIBLE = 0
+PRIORITY_OFFSCREEN = 1
+
+
+class PanelRestoreScheduler:
+    """
+    Runs panel hydration tasks by priority, a time-boxed slice at a time
+
+    Tasks are plain callables. Eager tasks run in priority order (then in
+    the order they were added) within slices of at most budget_ms; after
+    each slice the next one is handed to `schedule` (QTimer.singleShot(0, ...)
+    in the UI) so input and paint events are processed in between. Deferred
+    tasks (minimized panels) never run from the queue: they wait until
+    run_now() is called for their key (panel expanded).
+    """
+
+    def __init__(self, schedule: Callable[[Callable[[], None]], None],
+                 budget_ms: float = RESTORE_SLICE_BUDGET_MS,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            schedule: Callable(callback) that runs callback on the next idle turn
+            budget_ms: Work time per slice (at least one task runs per slice)
+            clock: Time source in seconds (injectable for tests)
+        """
+        self._schedule = schedule
+        self._budget = budget_ms / 1000.0
+        self._clock = clock
+        self._queue: List[Tuple[int, int, Hashable]] = []
+        self._tasks: Dict[Hashable, Callable[[], None]] = {}
+        self._deferred: Dict[Hashable, Callable[[], None]] = {}
+        self._sequence = 0
+        self._slice_pending = False
+
+        # Contadores para diagnóstico y tests
+        self.slices = 0
+        self.completed = 0
+
+    # ========== TAREAS ==========
+
+    def add(self, key: Hashable, task: Callable[[], None],
+            priority: int = PRIORITY_VISIBLE, deferred: bool = False) -> None:
+        """
+        Register the hydration task of a panel
+
+        Args:
+            key: Panel key (used by run_now / cancel)
+            task: Callable that hydrates the panel
+            priority: Lower runs first (PRIORITY_VISIBLE, PRIORITY_OFFSCREEN)
+            deferred: Wait for run_now() instead of running from the queue
+        """
+        self.cancel(key)
+        if deferred:
+            self._deferred[key] = task
+            return
+        self._tasks[key] = task
+        self._queue.append((priority, self._sequence, key))
+        self._sequence += 1
+        self._queue.sort()
+
+    def defer(self, key: Hashable) -> None:
+        """Move a queued task to the deferred set (panel minimized before hydration)"""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            self._deferred[key] = task
+
+    def run_now(self, key: Hashable) -> bool:
+        """
+        Run the task of a panel immediately (queued or deferred)
+
+        Returns:
+            bool: True if a pending task was run
+        """
+        task = self._tasks.pop(key, None) or self._deferred.pop(key, None)
+        if task is None:
+            return False
+        self._run(key, task)
+        return True
+
+    def cancel(self, key: Hashable) -> None:
+        """Forget the task of a panel (panel closed before hydration)"""
+        self._tasks.pop(key, None)
+        self._deferred.pop(key, None)
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Check if a panel still has to be hydrated"""
+        return key in self._tasks or key in self._deferred
+
+    @property
+    def queued_count(self) -> int:
+        """Tasks waiting for an idle slice"""
+        return len(self._tasks)
+
+    @property
+    def deferred_count(self) -> int:
+        """Tasks waiting for their panel to be expanded"""
+        return len(self._deferred)
+
+    # ========== EJECUCIÓN ==========
+
+    def start(self) -> None:
+        """Schedule the first slice (no-op if one is already pending)"""
+        if self._tasks and not self._slice_pending:
+            self._slice_pending = True
+            self._schedule(self._run_slice)
+
+    def _run_slice(self) -> None:
+        """Run queued tasks until the budget is spent, then yield"""
+        self._slice_pending = False
+        self.slices += 1
+        deadline = self._clock() + self._budget
+
+        while self._queue:
+            _, _, key = self._queue.pop(0)
+            task = self._tasks.pop(key, None)
+            if task is None:
+                continue  # Ya ejecutada, cancelada o diferida
+            self._run(key, task)
+            if self._clock() >= deadline:
+                break
+
+        if self._tasks:
+            self.start()
+        else:
+            self._queue.clear()
+            logger.info(f"Panel restore queue drained in {self.slices} slices "
+                        f"({len(self._deferred)} deferred)")
+
+    def _run(self, key: Hashable, task: Callable[[], None]) -> None:
+        """Run one task; a failing panel never stops the others"""
+        try:
+            task()
+        except Exception as e:
+            logger.error(f"Error hydrating restored panel {key}: {e}", exc_info=True)
+        finally:
+            self.completed += 1
@@ -3,29 +3,286 @@ Search Engine for Widget Sidebar
 Provides filtering and searching functionality for items across categories
 """
 
-from typing import List, Optional
+from bisect import bisect_right, insort
+from itertools import chain
+from typing import List, Optional, Dict, Hashable, Sequence
 import re
+import logging
+import operator
 from models.item import Item
 from models.category import Category
 
+logger = logging.getLogger(__name__)
+
+
+# Separador entre campos del texto indexado: es espacio en blanco, así
+# que ningún token (ni una consulta de una línea) cruza dos campos
+_FIELD_SEPARATOR = '\n'
+
+# Type-ahead: se re-filtran los resultados anteriores si no superan este
+# tamaño; si no, se resuelve con el índice
+_NARROW_LIMIT = 5000
+
+# Consultas más cortas que esto (casi todo coincide) se memorizan hasta que
+# cambian los items: volver a ellas (borrar, reescribir) no recorre los items
+_SHORT_QUERY_LENGTH = 3
+_SHORT_QUERY_CACHE_SIZE = 32
+
+
+class SearchIndex:
+    """
+    In-memory trigram index over the items of a set of categories
+
+    Each item is reduced once to a pre-lowercased text (label, content and
+    tags; the content of sensitive items is not indexed, so it is never
+    decrypted just to search) and split into whitespace tokens. Token
+    postings map each distinct token to the items containing it, and a
+    trigram index over the token vocabulary finds the tokens containing a
+    query piece without scanning the items. A query that extends the
+    previous one only re-checks the previous matches (type-ahead).
+
+    Callers that version their item lists pass the version to sync(): an
+    unchanged version skips the per-call comparison of the item objects.
+    """
+
+    def __init__(self):
+        self._items: List[Item] = []
+        self._texts: List[str] = []
+        self._positions: Dict[int, int] = {}            # id(item) -> posición
+        self._segments: List[Category] = []             # categoría de cada tramo
+        self._segment_starts: List[int] = []            # posición inicial de cada tramo
+        self._snapshots: List[List[Item]] = []          # items de cada tramo indexados
+        self._token_postings: Dict[str, List[int]] = {} # token -> posiciones
+        self._token_trigrams: Dict[str, List[str]] = {} # trigrama -> tokens
+        self._last_query: Optional[str] = None
+        self._last_positions: List[int] = []
+        self._version: Optional[Hashable] = None              # versión sincronizada
+        self._short_results: Dict[str, List[int]] = {}  # consulta corta -> posiciones
+
+    @staticmethod
+    def _item_text(item: Item) -> str:
+        """Pre-lowercased searchable text of an item"""
+        fields = [item.label or '']
+        if not item.is_sensitive:
+            fields.append(item.content or '')
+        if item.tags:
+            fields.extend(item.tags)
+        return _FIELD_SEPARATOR.join(fields).lower()
+
+    # ========== SINCRONIZACIÓN ==========
+
+    def sync(self, categories: Sequence[Category], version: Optional[Hashable] = None) -> None:
+        """
+        Point the index at the items of some categories
+
+        The index is patched only if the item objects changed (replaced in
+        place: those items are reindexed; added, removed or reordered: full
+        rebuild). A new list holding the same items keeps the index.
+
+        Args:
+            categories: Categories whose items are searched, in order
+            version: Version of the item lists (None: compare the items).
+                     The caller must change it whenever the items change.
+        """
+        # Tramos por categoría (para atribuir resultados en get_search_stats)
+        self._segments = list(categories)
+        self._segment_starts = []
+        start = 0
+        for category in categories:
+            self._segment_starts.append(start)
+            start += len(category.items)
+
+        if version is not None and version == self._version and len(categories) == len(self._snapshots):
+            return
+        self._version = version
+
+        previous = self._items
+        snapshots = self._snapshots
+        if len(categories) == len(snapshots) and all(
+            len(category.items) == len(snapshot) and all(map(operator.is_, category.items, snapshot))
+            for category, snapshot in zip(categories, snapshots)
+        ):
+            return
+
+        # Copia de las listas de cada categoría para la próxima comparación
+        self._snapshots = [list(category.items) for category in categories]
+        items = list(chain.from_iterable(category.items for category in categories))
+        if len(items) == len(previous):
+            changed = [position for position, (item, old) in enumerate(zip(items, previous)) if item is not old]
+            if len(changed) <= max(len(items) // 10, 1):
+                self._reindex(items, changed)
+                return
+
+        self._rebuild(items)
+
+    def _rebuild(self, items: List[Item]) -> None:
+        """Index a new item sequence from scratch"""
+        texts = [self._item_text(item) for item in items]
+        postings: Dict[str, List[int]] = {}
+        for position, text in enumerate(texts):
+            for token in set(text.split()):
+                positions = postings.get(token)
+                if positions is None:
+                    postings[token] = [position]
+                else:
+                    positions.append(position)
+
+        self._items = items
+        self._texts = texts
+        self._positions = {id(item): position for position, item in enumerate(items)}
+        self._token_postings = postings
+        self._token_trigrams = {}
+        for token in postings:
+            self._add_token_trigrams(token)
+        self._reset_type_ahead()
+        logger.debug(f"Search index rebuilt: {len(items)} items, {len(postings)} tokens")
+
+    def _reindex(self, items: List[Item], changed: List[int]) -> None:
+        """Reindex the items replaced at some positions"""
+        for position in changed:
+            old_item = self._items[position]
+            self._positions.pop(id(old_item), None)
+            for token in set(self._texts[position].split()):
+                positions = self._token_postings.get(token)
+                if positions is not None:
+                    positions.remove(position)
+                    if not positions:
+                        # El trigrama conserva el token: se verifica al consultar
+                        del self._token_postings[token]
+
+            item = items[position]
+            text = self._item_text(item)
+            self._texts[position] = text
+            self._positions[id(item)] = position
+            for token in set(text.split()):
+                positions = self._token_postings.get(token)
+                if positions is None:
+                    self._token_postings[token] = [position]
+                    self._add_token_trigrams(token)
+                else:
+                    insort(positions, position)
+
+        self._items = items
+        self._reset_type_ahead()
+        logger.debug(f"Search index patched: {len(changed)} items")
+
+    def _add_token_trigrams(self, token: str) -> None:
+        trigrams = self._token_trigrams
+        for trigram in {token[i:i + 3] for i in range(len(token) - 2)}:
+            tokens = trigrams.get(trigram)
+            if tokens is None:
+                trigrams[trigram] = [token]
+            elif token not in tokens[-1:]:
+                tokens.append(token)
+
+    def _reset_type_ahead(self) -> None:
+        self._last_query = None
+        self._last_positions = []
+        self._short_results = {}
+
+    # ========== CONSULTAS ==========
+
+    def search(self, query: str) -> List[int]:
+        """
+        Get the positions of the items containing a query
+
+        Args:
+            query: Search string (case-insensitive substring)
+
+        Returns:
+            Ascending item positions
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self._texts)))
+        if query == self._last_query:
+            return self._last_positions
+        short = len(query) < _SHORT_QUERY_LENGTH
+        if short and query in self._short_results:
+            positions = self._short_results[query]
+            self._last_query = query
+            self._last_positions = positions
+            return positions
+
+        texts = self._texts
+        if (self._last_query and self._last_query in query
+                and len(self._last_positions) <= _NARROW_LIMIT):
+            # La consulta extiende la anterior: solo pueden coincidir sus resultados
+            positions = [position for position in self._last_positions if query in texts[position]]
+        elif len(query) == 1:
+            # Un carácter coincide con casi todo: recorrer los textos es más rápido
+            positions = [position for position, text in enumerate(texts) if query in text]
+        else:
+            # Todo fragmento sin espacios de la consulta está dentro de un token
+            pieces = query.split()
+            positions = self._piece_positions(max(pieces, key=len))
+            if len(pieces) > 1 or pieces[0] != query:
+                positions = [position for position in positions if query in texts[position]]
+
+        if short:
+            if len(self._short_results) >= _SHORT_QUERY_CACHE_SIZE:
+                del self._short_results[next(iter(self._short_results))]
+            self._short_results[query] = positions
+        self._last_query = query
+        self._last_positions = positions
+        return positions
+
+    def _piece_positions(self, piece: str) -> List[int]:
+        """Get the positions of the items having a token that contains a piece"""
+        postings = self._token_postings
+        if len(piece) >= 3:
+            trigram_tokens = [
+                self._token_trigrams.get(piece[i:i + 3], ())
+                for i in range(len(piece) - 2)
+            ]
+            candidates = min(trigram_tokens, key=len)
+        else:
+            candidates = postings.keys()
+
+        matched = [postings[token] for token in candidates if piece in token and token in postings]
+        if not matched:
+            return []
+        if len(matched) == 1:
+            return list(matched[0])
+        return sorted(set().union(*matched))
+
+    def items_at(self, positions: List[int]) -> List[Item]:
+        """Get the items at some positions"""
+        items = self._items
+        return [items[position] for position in positions]
+
+    def category_of(self, item: Item) -> Optional[Category]:
+        """Get the category an indexed item belongs to (None if not indexed)"""
+        position = self._positions.get(id(item))
+        if position is None or not self._segments:
+            return None
+        return self._segments[bisect_right(self._segment_starts, position) - 1]
+
 
 class SearchEngine:
     """
     Search engine for filtering items across categories
-    Performs case-insensitive search on item labels and content
+    Performs case-insensitive search on item labels, content and tags
+    through an in-memory SearchIndex
+
+    The callers already hold the items they search, so the index is the only
+    search path (substring matching). Database-wide search goes through
+    DBManager.search_items_fts() instead.
     """
 
     def __init__(self):
         """Initialize search engine"""
-        pass
+        self._index = SearchIndex()
 
-    def search(self, query: str, categories: List[Category]) -> List[Item]:
+    def search(self, query: str, categories: List[Category],
+               version: Optional[Hashable] = None) -> List[Item]:
         """
         Search for items matching the query across all categories
 
         Args:
             query: Search query string (case-insensitive)
             categories: List of categories to search through
+            version: Optional version of the categories' items (see SearchIndex.sync)
 
         Returns:
             List of items that match the query
@@ -34,38 +291,18 @@ class SearchEngine:
             # Return all items if query is empty
             return self._get_all_items(categories)
 
-        query = query.strip().lower()
-        matching_items = []
-
-        for category in categories:
-            if not category.is_active:
-                continue
-
-            for item in category.items:
-                # Search in label, content, and tags
-                label_match = query in item.label.lower()
-                content_match = query in item.content.lower()
-
-                # Search in tags
-                tags_match = False
-                if item.tags:
-                    for tag in item.tags:
-                        if query in tag.lower():
-                            tags_match = True
-                            break
-
-                if label_match or content_match or tags_match:
-                    matching_items.append(item)
+        self._index.sync([category for category in categories if category.is_active], version)
+        return self._index.items_at(self._index.search(query))
 
-        return matching_items
-
-    def search_in_category(self, query: str, category: Category) -> List[Item]:
+    def search_in_category(self, query: str, category: Category,
+                           version: Optional[Hashable] = None) -> List[Item]:
         """
         Search for items matching the query within a specific category
 
         Args:
             query: Search query string (case-insensitive)
             category: Category to search in
+            version: Optional version of the category's items (see SearchIndex.sync)
 
         Returns:
             List of items that match the query in the category
@@ -73,26 +310,8 @@ class SearchEngine:
         if not query or not query.strip():
             return category.items
 
-        query = query.strip().lower()
-        matching_items = []
-
-        for item in category.items:
-            # Search in label, content, and tags
-            label_match = query in item.label.lower()
-            content_match = query in item.content.lower()
-
-            # Search in tags
-            tags_match = False
-            if item.tags:
-                for tag in item.tags:
-                    if query in tag.lower():
-                        tags_match = True
-                        break
-
-            if label_match or content_match or tags_match:
-                matching_items.append(item)
-
-        return matching_items
+        self._index.sync([category], version)
+        return self._index.items_at(self._index.search(query))
 
     def highlight_matches(self, text: str, query: str) -> str:
         """
@@ -135,27 +354,28 @@ class SearchEngine:
                 all_items.extend(category.items)
         return all_items
 
-    def get_search_stats(self, query: str, categories: List[Category]) -> dict:
+    def get_search_stats(self, query: str, categories: List[Category],
+                         version: Optional[Hashable] = None) -> dict:
         """
         Get statistics about search results
 
         Args:
             query: Search query
             categories: List of categories to search
+            version: Optional version of the categories' items (see SearchIndex.sync)
 
         Returns:
             Dictionary with search statistics
         """
-        results = self.search(query, categories)
+        results = self.search(query, categories, version)
 
-        # Count matches by category
+        # Count matches by category (attribution read from the index)
+        self._index.sync([category for category in categories if category.is_active], version)
         category_counts = {}
         for item in results:
-            # Find which category this item belongs to
-            for category in categories:
-                if item in category.items:
-                    category_counts[category.name] = category_counts.get(category.name, 0) + 1
-                    break
+            category = self._index.category_of(item)
+            if category is not None:
+                category_counts[category.name] = category_counts.get(category.name, 0) + 1
 
         return {
             'total_results': len(results),
@@ -109,6 +109,10 @@ class SessionManager:
         self._set_env("SESSION_TOKEN", "")
         self._set_env("SESSION_EXPIRES", "0")
 
+        # Drop decrypted secrets kept in memory
+        from core.encryption_manager import purge_plaintext_caches
+        purge_plaintext_caches()
+
     def is_session_expired(self) -> bool:
         """
         Check if session is expired (without invalidating it)
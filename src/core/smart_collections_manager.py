@@ -11,6 +11,10 @@ import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from database.connection_pool import get_connection_pool, PooledConnection
+from database.fts_index import build_match_query, fts_table_exists
+from database.tag_index import tag_index_exists, tagged_items_subquery
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,17 +31,14 @@ class SmartCollectionsManager:
         self.db_path = db_path
         logger.info("SmartCollectionsManager initialized")
 
-    def _get_connection(self) -> sqlite3.Connection:
+    def _get_connection(self) -> PooledConnection:
         """
-        Obtener conexión a la base de datos
+        Obtener conexión del pool compartido
 
         Returns:
-            Conexión SQLite
+            Conexión del pool (close() la devuelve al pool)
         """
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return get_connection_pool(self.db_path).connection()
 
     # ========== CREATE ==========
 
@@ -473,14 +474,28 @@ class SmartCollectionsManager:
 
             # Filtro por texto de búsqueda
             if collection.get('search_text'):
-                search_pattern = f"%{collection['search_text']}%"
-                where_clauses.append("(label LIKE ? OR content LIKE ?)")
-                params.extend([search_pattern, search_pattern])
+                match_query = build_match_query(collection['search_text'])
+                if match_query and fts_table_exists(conn):
+                    # Usar índice FTS5 en lugar de LIKE con comodín inicial
+                    where_clauses.append("id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)")
+                    params.append(match_query)
+                else:
+                    search_pattern = f"%{collection['search_text']}%"
+                    where_clauses.append("(label LIKE ? OR content LIKE ?)")
+                    params.extend([search_pattern, search_pattern])
+
+            # Tags exactos por el índice item_tags (LIKE en bases sin índice)
+            use_tag_index = (collection.get('tags_include') or collection.get('tags_exclude')) \
+                and tag_index_exists(conn)
 
             # Filtro por tags incluidos (debe tener al menos uno)
             if collection.get('tags_include'):
                 tags_list = [tag.strip() for tag in collection['tags_include'].split(',')]
-                if tags_list:
+                if use_tag_index:
+                    tagged_items, tag_params = tagged_items_subquery(tags_list)
+                    where_clauses.append(f"id IN ({tagged_items})")
+                    params.extend(tag_params)
+                elif tags_list:
                     tag_conditions = []
                     for tag in tags_list:
                         tag_conditions.append("tags LIKE ?")
@@ -490,9 +505,14 @@ class SmartCollectionsManager:
             # Filtro por tags excluidos (no debe tener ninguno)
             if collection.get('tags_exclude'):
                 tags_list = [tag.strip() for tag in collection['tags_exclude'].split(',')]
-                for tag in tags_list:
-                    where_clauses.append("(tags NOT LIKE ? OR tags IS NULL)")
-                    params.append(f"%{tag}%")
+                if use_tag_index:
+                    tagged_items, tag_params = tagged_items_subquery(tags_list)
+                    where_clauses.append(f"id NOT IN ({tagged_items})")
+                    params.extend(tag_params)
+                else:
+                    for tag in tags_list:
+                        where_clauses.append("(tags NOT LIKE ? OR tags IS NULL)")
+                        params.append(f"%{tag}%")
 
             # Filtro por rango de fechas
             if collection.get('date_from'):
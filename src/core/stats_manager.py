@@ -4,11 +4,13 @@ Autor: Widget Sidebar Team
 Fecha: 2025-01-23
 """
 
-import sqlite3
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from database.connection_pool import get_connection_pool, PooledConnection
+from database.usage_rollups import rollup_window
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,11 +25,9 @@ class StatsManager:
             logger.error(f"Database not found: {self.db_path}")
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_connection(self) -> PooledConnection:
+        """Obtener conexión del pool compartido (close() la devuelve al pool)"""
+        return get_connection_pool(self.db_path).connection()
 
     # ==================== Items Populares ====================
 
@@ -54,16 +54,20 @@ class StatsManager:
                 days = period_map.get(period, None)
 
             if days:
-                # Uso reciente
-                cursor.execute("""
-                    SELECT i.*, COUNT(h.id) as recent_uses
+                # Uso reciente (rollups por hora/día)
+                table, where, param = rollup_window(days)
+                cursor.execute(f"""
+                    SELECT i.*, COALESCE(r.recent_uses, 0) as recent_uses
                     FROM items i
-                    LEFT JOIN item_usage_history h ON i.id = h.item_id
-                        AND h.used_at >= datetime('now', '-' || ? || ' days')
-                    GROUP BY i.id
+                    LEFT JOIN (
+                        SELECT item_id, SUM(executions) as recent_uses
+                        FROM {table}
+                        WHERE {where}
+                        GROUP BY item_id
+                    ) r ON r.item_id = i.id
                     ORDER BY recent_uses DESC, i.use_count DESC
                     LIMIT ?
-                """, (days, limit))
+                """, (param, limit))
             else:
                 # Global
                 cursor.execute("""
@@ -89,23 +93,22 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            table, where, param = rollup_window(days)
+            cursor.execute(f"""
                 SELECT i.*,
-                       COUNT(h.id) as recent_uses,
-                       CASE
-                           WHEN i.use_count > 0
-                           THEN ROUND(100.0 * COUNT(h.id) / i.use_count, 2)
-                           ELSE 0
-                       END as trend_percentage
+                       r.recent_uses,
+                       ROUND(100.0 * r.recent_uses / i.use_count, 2) as trend_percentage
                 FROM items i
-                LEFT JOIN item_usage_history h ON i.id = h.item_id
-                    AND h.used_at >= datetime('now', '-' || ? || ' days')
+                JOIN (
+                    SELECT item_id, SUM(executions) as recent_uses
+                    FROM {table}
+                    WHERE {where}
+                    GROUP BY item_id
+                ) r ON r.item_id = i.id
                 WHERE i.use_count > 0
-                GROUP BY i.id
-                HAVING recent_uses > 0
                 ORDER BY trend_percentage DESC, recent_uses DESC
                 LIMIT ?
-            """, (days, limit))
+            """, (param, limit))
 
             results = cursor.fetchall()
             conn.close()
@@ -222,18 +225,22 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT i.*, COUNT(h.id) as uses_last_30_days
+            table, where, param = rollup_window(30)
+            cursor.execute(f"""
+                SELECT i.*, r.uses_last_30_days
                 FROM items i
-                LEFT JOIN item_usage_history h ON i.id = h.item_id
-                    AND h.used_at >= datetime('now', '-30 days')
+                JOIN (
+                    SELECT item_id, SUM(executions) as uses_last_30_days
+                    FROM {table}
+                    WHERE {where}
+                    GROUP BY item_id
+                ) r ON r.item_id = i.id
                 WHERE i.is_favorite = 0
                   AND i.use_count > 10
-                GROUP BY i.id
-                HAVING uses_last_30_days > 5
+                  AND r.uses_last_30_days > 5
                 ORDER BY uses_last_30_days DESC, i.use_count DESC
                 LIMIT ?
-            """, (limit,))
+            """, (param, limit))
 
             results = cursor.fetchall()
             conn.close()
@@ -306,40 +313,36 @@ class StatsManager:
             cursor.execute("SELECT COUNT(*) as total FROM items")
             total_items = cursor.fetchone()['total']
 
-            # Total ejecuciones
-            cursor.execute("SELECT COUNT(*) as total FROM item_usage_history")
-            total_executions = cursor.fetchone()['total']
+            # Total ejecuciones y tasa de éxito (rollups diarios)
+            cursor.execute("""
+                SELECT
+                    COALESCE(SUM(executions), 0) as total,
+                    COALESCE(SUM(successes), 0) as successful
+                FROM item_usage_daily
+            """)
+            result = cursor.fetchone()
+            total_executions = result['total']
+            success_rate = 100.0
+            if result['total'] > 0:
+                success_rate = (result['successful'] / result['total']) * 100
 
             # Ejecuciones hoy
             cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
-                WHERE date(used_at) = date('now')
+                SELECT COALESCE(SUM(executions), 0) as total FROM item_usage_daily
+                WHERE day = date('now')
             """)
             executions_today = cursor.fetchone()['total']
 
             # Ejecuciones esta semana
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
-                WHERE used_at >= datetime('now', '-7 days')
-            """)
+            table, where, param = rollup_window(7)
+            cursor.execute(f"SELECT COALESCE(SUM(executions), 0) as total FROM {table} WHERE {where}",
+                           (param,))
             executions_week = cursor.fetchone()['total']
 
             # Favoritos
             cursor.execute("SELECT COUNT(*) as total FROM items WHERE is_favorite = 1")
             favorites_count = cursor.fetchone()['total']
 
-            # Tasa de éxito
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful
-                FROM item_usage_history
-            """)
-            result = cursor.fetchone()
-            success_rate = 100.0
-            if result['total'] > 0:
-                success_rate = (result['successful'] / result['total']) * 100
-
             conn.close()
 
             return {
@@ -368,32 +371,24 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            # Días con actividad
-            cursor.execute("""
-                SELECT COUNT(DISTINCT date(used_at)) as active_days
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
-            """, (days,))
-            active_days = cursor.fetchone()['active_days']
-
-            # Total ejecuciones
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
-            """, (days,))
-            total_executions = cursor.fetchone()['total']
+            # Días con actividad, ejecuciones y tiempo total (rollups)
+            table, where, param = rollup_window(days)
+            bucket = 'hour' if table.startswith('item_usage_hourly') else 'day'
+            cursor.execute(f"""
+                SELECT COUNT(DISTINCT substr({bucket}, 1, 10)) as active_days,
+                       COALESCE(SUM(executions), 0) as total,
+                       SUM(total_time_ms) / 1000.0 as total_time
+                FROM {table}
+                WHERE {where}
+            """, (param,))
+            result = cursor.fetchone()
+            active_days = result['active_days']
+            total_executions = result['total']
 
             # Promedio por día
             avg_per_day = round(total_executions / days, 2) if days > 0 else 0
 
             # Tiempo total ahorrado (estimado en segundos)
-            cursor.execute("""
-                SELECT SUM(execution_time_ms) / 1000.0 as total_time
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
-            """, (days,))
-            result = cursor.fetchone()
             total_time = result['total_time'] if result['total_time'] else 0
 
             conn.close()
@@ -451,14 +446,17 @@ class StatsManager:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT i.id, i.label, i.badge,
-                       COUNT(h.id) as executions,
-                       ROUND(AVG(h.execution_time_ms) / 1000.0, 2) as avg_time_seconds
+                SELECT i.id, i.label, i.badge, r.executions,
+                       ROUND(1.0 * r.success_time_ms / r.executions / 1000.0, 2) as avg_time_seconds
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                WHERE h.success = 1
-                GROUP BY i.id
-                HAVING executions >= ?
+                JOIN (
+                    SELECT item_id,
+                           SUM(successes) as executions,
+                           SUM(success_time_ms) as success_time_ms
+                    FROM item_usage_daily
+                    GROUP BY item_id
+                    HAVING executions >= ? AND executions > 0
+                ) r ON r.item_id = i.id
                 ORDER BY avg_time_seconds DESC
                 LIMIT ?
             """, (min_executions, limit))
@@ -480,14 +478,18 @@ class StatsManager:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT i.id, i.label, i.badge,
-                       COUNT(h.id) as total_executions,
-                       SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) as failures,
-                       ROUND(100.0 * SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) / COUNT(h.id), 2) as error_rate
+                SELECT i.id, i.label, i.badge, r.total_executions, r.failures,
+                       ROUND(100.0 * r.failures / r.total_executions, 2) as error_rate
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                GROUP BY i.id
-                HAVING total_executions >= ? AND error_rate > 5
+                JOIN (
+                    SELECT item_id,
+                           SUM(executions) as total_executions,
+                           SUM(failures) as failures
+                    FROM item_usage_daily
+                    GROUP BY item_id
+                    HAVING total_executions >= ? AND total_executions > 0
+                ) r ON r.item_id = i.id
+                WHERE 100.0 * r.failures / r.total_executions > 5
                 ORDER BY error_rate DESC, failures DESC
                 LIMIT ?
             """, (min_executions, limit))
@@ -523,35 +525,29 @@ class StatsManager:
             cursor.execute("SELECT COUNT(*) as favs FROM items WHERE is_favorite = 1")
             favorites = cursor.fetchone()['favs']
 
-            # Ejecuciones hoy
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
-                WHERE date(used_at) = date('now')
-            """)
-            executions_today = cursor.fetchone()['total']
-
-            # Tasa de éxito hoy
+            # Ejecuciones y tasa de éxito hoy (rollup diario)
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful
-                FROM item_usage_history
-                WHERE date(used_at) = date('now')
+                    COALESCE(SUM(executions), 0) as total,
+                    COALESCE(SUM(successes), 0) as successful
+                FROM item_usage_daily
+                WHERE day = date('now')
             """)
             result = cursor.fetchone()
+            executions_today = result['total']
             success_rate_today = 100.0
             if result['total'] > 0:
                 success_rate_today = (result['successful'] / result['total']) * 100
 
             # Items problemáticos
             cursor.execute("""
-                SELECT COUNT(DISTINCT item_id) as problematic
+                SELECT COUNT(*) as problematic
                 FROM (
                     SELECT item_id,
-                           ROUND(100.0 * SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) / COUNT(*), 2) as error_rate
-                    FROM item_usage_history
+                           ROUND(100.0 * SUM(failures) / SUM(executions), 2) as error_rate
+                    FROM item_usage_daily
                     GROUP BY item_id
-                    HAVING COUNT(*) >= 5 AND error_rate > 10
+                    HAVING SUM(executions) >= 5 AND error_rate > 10
                 )
             """)
             problematic_items = cursor.fetchone()['problematic']
@@ -0,0 +1,368 @@
+"""
+Storage Catalog
+Persisted catalog of the files under the app storage folders (stored files
+and browser profiles): size, type and mtime per file, with per-root totals
+kept by SQLite triggers so storage stats never walk the disk
+"""
+
+import os
+import logging
+import posixpath
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Root del almacenamiento de archivos (items PATH)
+ROOT_FILES = 'files'
+
+# Prefijo de los temporales de copia en curso (no se catalogan)
+TEMP_FILE_PREFIX = '.copy-'
+
+
+def profile_root(profile_id: int) -> str:
+    """Catalog root of a browser profile"""
+    return f'profile:{profile_id}'
+
+
+class StorageCatalog:
+    """
+    Size catalog of storage roots persisted in the storage_catalog_* tables
+
+    Each root is a directory tree identified by a name (ROOT_FILES,
+    profile_root(id)). Files are recorded incrementally when the app
+    writes or deletes them (record_file / forget_file) and a background
+    reconcile fixes drift from outside changes. The reconcile skips every
+    directory whose mtime did not change since the last pass (its file
+    list is known), so only new/renamed/deleted entries cost a stat.
+    Files rewritten in place do not change their directory mtime: a
+    full reconcile (full=True) re-stats everything.
+
+    Use get_storage_catalog() to get the shared catalog of a DBManager.
+    """
+
+    def __init__(self, db_manager, type_of: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            db_manager: DBManager instance
+            type_of: Function mapping an extension ('.pdf') to a file type
+        """
+        self.db = db_manager
+        self.type_of = type_of or _unclassified
+        self._lock = threading.Lock()
+        # root -> (ruta, full) pendientes de reconciliar
+        self._pending: Dict[str, Tuple[Path, bool]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    # ========== CONSULTAS ==========
+
+    def get_totals(self, root: str) -> Dict:
+        """
+        Get the catalogued totals of a root (reads only the totals table)
+
+        Returns:
+            Dict con total_files, total_size, by_type y by_folder
+            ({nombre: {'count': n, 'size': bytes}})
+        """
+        rows = self.db.execute_query("""
+            SELECT folder, file_type, file_count, total_size
+            FROM storage_catalog_totals
+            WHERE root = ? AND file_count > 0
+        """, (root,))
+
+        totals = {'total_files': 0, 'total_size': 0, 'by_type': {}, 'by_folder': {}}
+        for row in rows:
+            totals['total_files'] += row['file_count']
+            totals['total_size'] += row['total_size']
+            for key, name in (('by_type', row['file_type']), ('by_folder', row['folder'])):
+                entry = totals[key].setdefault(name, {'count': 0, 'size': 0})
+                entry['count'] += row['file_count']
+                entry['size'] += row['total_size']
+        return totals
+
+    def get_root_size(self, root: str) -> int:
+        """Get the catalogued size in bytes of a root"""
+        result = self.db.execute_query(
+            "SELECT COALESCE(SUM(total_size), 0) AS size FROM storage_catalog_totals WHERE root = ?",
+            (root,)
+        )
+        return result[0]['size'] if result else 0
+
+    def is_catalogued(self, root: str) -> bool:
+        """Check if a root was reconciled at least once"""
+        result = self.db.execute_query(
+            "SELECT 1 FROM storage_catalog_dirs WHERE root = ? AND rel_dir = '' LIMIT 1", (root,)
+        )
+        return bool(result)
+
+    def set_type_of(self, type_of: Callable[[str], str]) -> None:
+        """
+        Set the file type classifier of a catalog created without one
+
+        Rows catalogued before as 'OTROS' are classified again; the triggers
+        move their sizes to the right type in the totals.
+
+        Args:
+            type_of: Function mapping an extension ('.pdf') to a file type
+        """
+        self.type_of = type_of
+        with self.db.transaction() as conn:
+            rows = conn.execute(
+                "SELECT root, rel_path FROM storage_catalog_files WHERE file_type = 'OTROS'"
+            ).fetchall()
+            updates = []
+            for root, rel_path in rows:
+                file_type = type_of(posixpath.splitext(rel_path)[1])
+                if file_type != 'OTROS':
+                    updates.append((file_type, root, rel_path))
+            if updates:
+                conn.executemany(
+                    "UPDATE storage_catalog_files SET file_type = ? WHERE root = ? AND rel_path = ?",
+                    updates
+                )
+        logger.info(f"Storage catalog classifier set ({len(updates)} files reclassified)")
+
+    # ========== ACTUALIZACIÓN INCREMENTAL ==========
+
+    def record_file(self, root: str, root_path, rel_path: str) -> None:
+        """
+        Record (or refresh) one file after the app wrote it
+
+        Args:
+            root: Catalog root
+            root_path: Directory of the root on disk
+            rel_path: File path relative to root_path ('/' separators)
+        """
+        rel_path = rel_path.replace('\\', '/')
+        try:
+            stat = (Path(root_path) / rel_path).stat()
+        except OSError as e:
+            logger.warning(f"Cannot catalog {rel_path}: {e}")
+            return
+
+        with self.db.transaction() as conn:
+            self._upsert_files(conn, root, posixpath.dirname(rel_path),
+                               {rel_path: (stat.st_size, stat.st_mtime_ns)})
+
+    def forget_file(self, root: str, rel_path: str) -> None:
+        """Remove one file from the catalog after the app deleted it"""
+        self.db.execute_update(
+            "DELETE FROM storage_catalog_files WHERE root = ? AND rel_path = ?",
+            (root, rel_path.replace('\\', '/'))
+        )
+
+    def forget_root(self, root: str) -> None:
+        """Remove every entry of a root (its directory was deleted or wiped)"""
+        with self._lock:
+            self._pending.pop(root, None)
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM storage_catalog_files WHERE root = ?", (root,))
+            conn.execute("DELETE FROM storage_catalog_dirs WHERE root = ?", (root,))
+            conn.execute("DELETE FROM storage_catalog_totals WHERE root = ?", (root,))
+
+    # ========== RECONCILIACIÓN ==========
+
+    def reconcile(self, root: str, root_path, full: bool = False) -> int:
+        """
+        Bring the catalog of a root in line with the disk
+
+        Args:
+            root: Catalog root
+            root_path: Directory of the root on disk
+            full: Re-stat every file (also directories with unchanged mtime)
+
+        Returns:
+            int: Number of directories rescanned
+        """
+        root_path = Path(root_path)
+        known_mtimes: Dict[str, int] = {}
+        children: Dict[str, List[str]] = {}
+        for row in self.db.execute_query(
+                "SELECT rel_dir, parent, mtime_ns FROM storage_catalog_dirs WHERE root = ?", (root,)):
+            known_mtimes[row['rel_dir']] = row['mtime_ns']
+            if row['parent'] is not None:
+                children.setdefault(row['parent'], []).append(row['rel_dir'])
+
+        seen = set()
+        rescanned = 0
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = root_path / rel_dir if rel_dir else root_path
+            try:
+                mtime_ns = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(rel_dir)
+
+            if not full and known_mtimes.get(rel_dir) == mtime_ns:
+                # Directorio sin cambios: sus archivos y subcarpetas son los catalogados
+                stack.extend(children.get(rel_dir, ()))
+                continue
+
+            files, subdirs = self._scan_dir(abs_dir, rel_dir)
+            parent = posixpath.dirname(rel_dir) if rel_dir else None
+            with self.db.transaction() as conn:
+                self._replace_dir_files(conn, root, rel_dir, files)
+                conn.execute("""
+                    INSERT OR REPLACE INTO storage_catalog_dirs (root, rel_dir, parent, mtime_ns)
+                    VALUES (?, ?, ?, ?)
+                """, (root, rel_dir, parent, mtime_ns))
+            rescanned += 1
+            stack.extend(subdirs)
+
+        # Directorios que ya no existen
+        removed = [rel_dir for rel_dir in known_mtimes if rel_dir not in seen]
+        if removed:
+            with self.db.transaction() as conn:
+                for rel_dir in removed:
+                    conn.execute("DELETE FROM storage_catalog_files WHERE root = ? AND rel_dir = ?",
+                                 (root, rel_dir))
+                    conn.execute("DELETE FROM storage_catalog_dirs WHERE root = ? AND rel_dir = ?",
+                                 (root, rel_dir))
+
+        logger.debug(f"Storage catalog '{root}' reconciled: {rescanned} dirs rescanned, "
+                     f"{len(seen) - rescanned} skipped, {len(removed)} removed")
+        return rescanned
+
+    def schedule_reconcile(self, root: str, root_path, full: bool = False) -> None:
+        """
+        Reconcile a root in a background thread
+
+        Requests for a root already pending are merged (a full request wins).
+        """
+        with self._lock:
+            previous = self._pending.get(root)
+            self._pending[root] = (Path(root_path), full or bool(previous and previous[1]))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run_pending, name="StorageCatalogReconcile", daemon=True
+                )
+                self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for the background reconcile to finish"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run_pending(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                root, (root_path, full) = self._pending.popitem()
+            try:
+                self.reconcile(root, root_path, full)
+            except Exception as e:
+                logger.error(f"Storage catalog reconcile of '{root}' failed: {e}", exc_info=True)
+
+    # ========== INTERNOS ==========
+
+    @staticmethod
+    def _scan_dir(abs_dir: Path, rel_dir: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+        """List one directory: ({rel_path: (size, mtime_ns)}, [rel_dir de subcarpetas])"""
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(abs_dir) as entries:
+                for entry in entries:
+                    rel_path = posixpath.join(rel_dir, entry.name) if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(rel_path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if entry.name.startswith(TEMP_FILE_PREFIX):
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            files[rel_path] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        # Archivo eliminado durante el recorrido
+                        continue
+        except OSError as e:
+            logger.warning(f"Cannot scan {abs_dir}: {e}")
+        return files, subdirs
+
+    def _replace_dir_files(self, conn, root: str, rel_dir: str,
+                           files: Dict[str, Tuple[int, int]]) -> None:
+        """Make the catalogued files of one directory equal to files"""
+        known = {
+            row[0]: (row[1], row[2]) for row in conn.execute(
+                "SELECT rel_path, size, mtime_ns FROM storage_catalog_files WHERE root = ? AND rel_dir = ?",
+                (root, rel_dir)
+            )
+        }
+        gone = [(root, rel_path) for rel_path in known if rel_path not in files]
+        if gone:
+            conn.executemany("DELETE FROM storage_catalog_files WHERE root = ? AND rel_path = ?", gone)
+        changed = {rel_path: entry for rel_path, entry in files.items() if known.get(rel_path) != entry}
+        self._upsert_files(conn, root, rel_dir, changed, known)
+
+    def _upsert_files(self, conn, root: str, rel_dir: str, files: Dict[str, Tuple[int, int]],
+                      known: Optional[Dict] = None) -> None:
+        """Insert or update catalog rows (the triggers adjust the totals)"""
+        if not files:
+            return
+        if known is None:
+            known = {
+                row[0]: None for row in conn.execute(
+                    "SELECT rel_path FROM storage_catalog_files WHERE root = ? AND rel_dir = ?",
+                    (root, rel_dir)
+                )
+            }
+
+        updates = []
+        inserts = []
+        for rel_path, (size, mtime_ns) in files.items():
+            if rel_path in known:
+                updates.append((size, mtime_ns, root, rel_path))
+            else:
+                folder = rel_path.split('/', 1)[0] if '/' in rel_path else ''
+                file_type = self.type_of(posixpath.splitext(rel_path)[1])
+                inserts.append((root, rel_path, rel_dir, folder, file_type, size, mtime_ns))
+
+        if updates:
+            conn.executemany("""
+                UPDATE storage_catalog_files SET size = ?, mtime_ns = ?
+                WHERE root = ? AND rel_path = ?
+            """, updates)
+        if inserts:
+            conn.executemany("""
+                INSERT INTO storage_catalog_files
+                (root, rel_path, rel_dir, folder, file_type, size, mtime_ns)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, inserts)
+
+
+def _unclassified(extension: str) -> str:
+    """Default classifier until a real one is set"""
+    return 'OTROS'
+
+
+# Un catálogo por DBManager (comparte el hilo de reconciliación)
+_catalogs: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_catalogs_lock = threading.Lock()
+
+
+def get_storage_catalog(db_manager, type_of: Optional[Callable[[str], str]] = None) -> StorageCatalog:
+    """
+    Get the shared StorageCatalog of a DBManager
+
+    Args:
+        db_manager: DBManager instance
+        type_of: File type classifier. Set on the catalog when it is created,
+            or later if the catalog was created without one (e.g. by the
+            browser profile manager before the FileManager exists)
+    """
+    with _catalogs_lock:
+        catalog = _catalogs.get(db_manager)
+        if catalog is None:
+            catalog = StorageCatalog(db_manager, type_of)
+            _catalogs[db_manager] = catalog
+        elif type_of is not None and catalog.type_of is _unclassified:
+            catalog.set_type_of(type_of)
+        return catalog
@@ -11,6 +11,9 @@ import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from database.connection_pool import get_connection_pool, PooledConnection
+from database.tag_index import tag_index_exists, tagged_items_subquery, group_usage_counts
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,17 +30,14 @@ class TagGroupsManager:
         self.db_path = db_path
         logger.info("TagGroupsManager initialized")
 
-    def _get_connection(self) -> sqlite3.Connection:
+    def _get_connection(self) -> PooledConnection:
         """
-        Obtener conexión a la base de datos
+        Obtener conexión del pool compartido
 
         Returns:
-            Conexión SQLite
+            Conexión del pool (close() la devuelve al pool)
         """
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return get_connection_pool(self.db_path).connection()
 
     # ========== CREATE ==========
 
@@ -438,22 +438,24 @@ class TagGroupsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            # Construir condiciones de búsqueda para cada tag
-            # Buscamos items que contengan cualquiera de los tags del grupo
-            conditions = []
-            params = []
+            if tag_index_exists(conn):
+                # Items con al menos uno de los tags exactos del grupo (join indexado)
+                tagged_items, params = tagged_items_subquery(tags_list)
+                query = f"SELECT COUNT(DISTINCT item_id) as count FROM ({tagged_items})"
+            else:
+                # Base sin índice de tags: búsqueda por subcadena en el campo tags
+                conditions = []
+                params = []
 
-            for tag in tags_list:
-                # Buscar el tag exacto en el campo tags
-                # El campo tags puede ser: "tag1,tag2,tag3"
-                conditions.append("tags LIKE ?")
-                params.append(f"%{tag}%")
+                for tag in tags_list:
+                    conditions.append("tags LIKE ?")
+                    params.append(f"%{tag}%")
 
-            query = f"""
-                SELECT COUNT(DISTINCT id) as count
-                FROM items
-                WHERE ({' OR '.join(conditions)})
-            """
+                query = f"""
+                    SELECT COUNT(DISTINCT id) as count
+                    FROM items
+                    WHERE ({' OR '.join(conditions)})
+                """
 
             cursor.execute(query, params)
             result = cursor.fetchone()
@@ -475,9 +477,31 @@ class TagGroupsManager:
             Lista de grupos con campo 'usage_count' agregado
         """
         groups = self.get_all_groups()
+        if not groups:
+            return groups
+
+        try:
+            conn = self._get_connection()
+            try:
+                if tag_index_exists(conn):
+                    # Una sola consulta indexada para todos los grupos
+                    usage = group_usage_counts(conn, {
+                        group['id']: [tag.strip() for tag in (group.get('tags') or '').split(',')]
+                        for group in groups
+                    })
+                else:
+                    usage = None
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error getting usage counts for tag groups: {e}", exc_info=True)
+            usage = None
 
         for group in groups:
-            group['usage_count'] = self.get_group_usage_count(group['id'])
+            if usage is not None:
+                group['usage_count'] = usage.get(group['id'], 0)
+            else:
+                group['usage_count'] = self.get_group_usage_count(group['id'])
 
         return groups
 
@@ -4,68 +4,319 @@ Autor: Widget Sidebar Team
 Fecha: 2025-01-23
 """
 
-import sqlite3
+import atexit
 import logging
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+
+from database.connection_pool import get_connection_pool, PooledConnection
+from database.usage_rollups import (
+    rollup_window, compact_usage_history, RAW_HISTORY_RETENTION_DAYS, HOURLY_RETENTION_DAYS
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Modos de durabilidad del registro de uso
+DURABILITY_ASYNC = "async"  # Write-behind: se escribe en lotes (por tiempo o tamaño)
+DURABILITY_SYNC = "sync"    # Cada uso se escribe (y confirma) antes de retornar
+
+
+class UsageWriteQueue:
+    """
+    Write-behind queue for usage events of one database
+
+    Usage events are buffered in memory and written by a background thread
+    in a single transaction: one executemany INSERT into item_usage_history
+    and one grouped `use_count = use_count + n` UPDATE per item. A flush
+    happens every FLUSH_INTERVAL seconds, when FLUSH_THRESHOLD events are
+    pending, on flush() and at interpreter shutdown.
+
+    Use get_usage_queue() to get the shared queue of a database file.
+    """
+
+    # Segundos máximos que un evento espera en memoria
+    FLUSH_INTERVAL = 2.0
+
+    # Eventos pendientes que disparan un flush inmediato
+    FLUSH_THRESHOLD = 100
+
+    # Flushes fallidos seguidos tras los que se descartan los eventos
+    # (un error permanente, p.ej. de esquema, no se reintenta para siempre)
+    MAX_FLUSH_RETRIES = 5
+
+    # Máximo de eventos en cola: si la base no acepta escrituras se
+    # descartan los más antiguos
+    MAX_PENDING = 10000
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        # (item_id, used_at, execution_time_ms, success, error_message)
+        self._pending: List[Tuple] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._failed_flushes = 0
+        # Eventos descartados sin escribir (reintentos agotados o cola llena)
+        self.dropped_events = 0
+
+    def put(self, item_id: int, execution_time_ms: int = 0, success: bool = True,
+            error_message: Optional[str] = None) -> None:
+        """Queue a usage event (timestamp taken now, in UTC like datetime('now'))"""
+        used_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self._condition:
+            self._pending.append(
+                (item_id, used_at, execution_time_ms, 1 if success else 0, error_message)
+            )
+            self._trim_pending()
+            self._ensure_thread()
+            if len(self._pending) >= self.FLUSH_THRESHOLD:
+                self._condition.notify()
+
+    def pending_usage(self, item_id: int) -> Tuple[int, Optional[str]]:
+        """
+        Get queued (not yet written) uses of an item
+
+        Returns:
+            Tuple[int, Optional[str]]: (pending use count, last pending used_at)
+        """
+        with self._condition:
+            used_at = [event[1] for event in self._pending if event[0] == item_id]
+        return len(used_at), (used_at[-1] if used_at else None)
+
+    def flush(self) -> int:
+        """
+        Write all queued events now
+
+        On error (e.g. a transient "database is locked") the transaction is
+        rolled back and the events go back to the front of the queue, so the
+        next flush retries them. After MAX_FLUSH_RETRIES failed flushes in a
+        row the events are dropped (counted in dropped_events).
+
+        Returns:
+            int: Number of events written (0 if nothing pending or on error)
+        """
+        with self._flush_lock:
+            with self._condition:
+                events, self._pending = self._pending, []
+            if not events:
+                return 0
+
+            # Agrupar usos por item: (n, último used_at)
+            per_item: Dict[int, List] = {}
+            for item_id, used_at, _, _, _ in events:
+                entry = per_item.setdefault(item_id, [0, used_at])
+                entry[0] += 1
+                entry[1] = max(entry[1], used_at)
+
+            conn = None
+            try:
+                conn = get_connection_pool(self.db_path).connection()
+                cursor = conn.cursor()
+
+                cursor.executemany("""
+                    UPDATE items
+                    SET use_count = use_count + ?,
+                        last_used = ?,
+                        updated_at = datetime('now')
+                    WHERE id = ?
+                """, [(count, last_used, item_id) for item_id, (count, last_used) in per_item.items()])
+
+                # Omitir eventos de items eliminados mientras estaban en cola
+                cursor.executemany("""
+                    INSERT INTO item_usage_history
+                    (item_id, used_at, execution_time_ms, success, error_message)
+                    SELECT ?, ?, ?, ?, ?
+                    WHERE EXISTS (SELECT 1 FROM items WHERE id = ?)
+                """, [event + (event[0],) for event in events])
+
+                conn.commit()
+                conn.close()
+                self._failed_flushes = 0
+
+                logger.debug(f"Flushed {len(events)} usage events for {len(per_item)} items")
+                return len(events)
+
+            except Exception as e:
+                if conn is not None:
+                    conn.rollback()
+                self._failed_flushes += 1
+                if self._failed_flushes >= self.MAX_FLUSH_RETRIES:
+                    logger.error(f"Dropping {len(events)} usage events after "
+                                 f"{self._failed_flushes} failed flushes: {e}")
+                    self._failed_flushes = 0
+                    self.dropped_events += len(events)
+                    return 0
+
+                logger.error(f"Error flushing {len(events)} usage events (will retry): {e}")
+                with self._condition:
+                    self._pending[:0] = events
+                    self._trim_pending()
+                return 0
+
+    def stop(self) -> None:
+        """Stop the background writer and flush remaining events"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.FLUSH_INTERVAL * 2)
+        self.flush()
+
+    def _trim_pending(self) -> None:
+        """Drop the oldest events above MAX_PENDING (caller holds the condition)"""
+        overflow = len(self._pending) - self.MAX_PENDING
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.dropped_events += overflow
+            logger.warning(f"Usage queue full: dropped {overflow} oldest events")
+
+    def _ensure_thread(self) -> None:
+        """Start the background writer on first use (caller holds the condition)"""
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(
+                target=self._run, name="usage-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Background loop: flush on timer or size threshold"""
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._pending) < self.FLUSH_THRESHOLD:
+                    self._condition.wait(timeout=self.FLUSH_INTERVAL)
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+
+_usage_queues: Dict[str, UsageWriteQueue] = {}
+_usage_queues_lock = threading.Lock()
+
+
+def get_usage_queue(db_path) -> UsageWriteQueue:
+    """
+    Get the process-wide usage write queue of a database file
+
+    Args:
+        db_path: Path to SQLite database file
+
+    Returns:
+        UsageWriteQueue: Shared queue
+    """
+    key = str(Path(db_path).resolve())
+    queue = _usage_queues.get(key)
+    if queue is None:
+        with _usage_queues_lock:
+            queue = _usage_queues.get(key)
+            if queue is None:
+                queue = UsageWriteQueue(Path(key))
+                _usage_queues[key] = queue
+    return queue
+
+
+def flush_usage_queues() -> None:
+    """Flush and stop every usage write queue (application shutdown)"""
+    for queue in list(_usage_queues.values()):
+        queue.stop()
+
+
+atexit.register(flush_usage_queues)
+
+
+def schedule_history_compaction(db_path, raw_days: int = RAW_HISTORY_RETENTION_DAYS,
+                                hourly_days: int = HOURLY_RETENTION_DAYS) -> threading.Thread:
+    """
+    Compact the usage history of a database in a background thread
+
+    Raw rows older than raw_days and hourly buckets older than hourly_days
+    are deleted; daily rollups keep the all-time statistics.
+
+    Returns:
+        threading.Thread: Started daemon thread
+    """
+    def _compact():
+        try:
+            get_usage_queue(db_path).flush()
+            conn = get_connection_pool(db_path).connection()
+            try:
+                compact_usage_history(conn, raw_days, hourly_days)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error compacting usage history: {e}")
+
+    thread = threading.Thread(target=_compact, name="usage-compaction", daemon=True)
+    thread.start()
+    return thread
+
+
 class UsageTracker:
     """Gestor de tracking de uso de items"""
 
-    def __init__(self, db_path: str = "widget_sidebar.db"):
-        """Inicializar tracker"""
+    def __init__(self, db_path: str = "widget_sidebar.db", durability: str = DURABILITY_ASYNC):
+        """
+        Inicializar tracker
+
+        Args:
+            db_path: Ruta a la base de datos SQLite
+            durability: DURABILITY_ASYNC (write-behind en lotes) o
+                        DURABILITY_SYNC (cada uso se escribe al registrarlo)
+        """
         self.db_path = Path(db_path)
+        self.durability = durability
 
         if not self.db_path.exists():
             logger.error(f"Database not found: {self.db_path}")
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        self._queue = get_usage_queue(self.db_path)
+
+    def _get_connection(self) -> PooledConnection:
+        """Obtener conexión del pool compartido (close() la devuelve al pool)"""
+        return get_connection_pool(self.db_path).connection()
 
     # ==================== Registro de Uso ====================
 
     def track_usage(self, item_id: int, execution_time_ms: int = 0,
                     success: bool = True, error_message: Optional[str] = None) -> bool:
-        """Registrar uso de un item"""
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        """
+        Registrar uso de un item
 
-            # 1. Incrementar use_count y actualizar last_used en items
-            cursor.execute("""
-                UPDATE items
-                SET use_count = use_count + 1,
-                    last_used = datetime('now'),
-                    updated_at = datetime('now')
-                WHERE id = ?
-            """, (item_id,))
-
-            # 2. Insertar registro en item_usage_history
-            cursor.execute("""
-                INSERT INTO item_usage_history
-                (item_id, used_at, execution_time_ms, success, error_message)
-                VALUES (?, datetime('now'), ?, ?, ?)
-            """, (item_id, execution_time_ms, 1 if success else 0, error_message))
+        En modo DURABILITY_ASYNC el uso se encola y se escribe en el próximo
+        flush (use_count se incrementa y se inserta en item_usage_history).
+        """
+        try:
+            self._queue.put(item_id, execution_time_ms, success, error_message)
 
-            conn.commit()
-            conn.close()
+            if self.durability == DURABILITY_SYNC and not self._queue.flush():
+                return False
 
-            logger.info(f"Tracked usage for item {item_id}: success={success}, time={execution_time_ms}ms")
+            logger.debug(f"Tracked usage for item {item_id}: success={success}, time={execution_time_ms}ms")
             return True
 
         except Exception as e:
             logger.error(f"Error tracking usage for item {item_id}: {e}")
             return False
 
+    def flush(self) -> int:
+        """
+        Escribir ahora los usos pendientes
+
+        Returns:
+            int: Número de usos escritos
+        """
+        return self._queue.flush()
+
     def track_execution_start(self, item_id: int) -> int:
         """Iniciar tracking de ejecución (retorna timestamp en ms)"""
         return int(time.time() * 1000)
@@ -93,7 +344,12 @@ class UsageTracker:
             result = cursor.fetchone()
             conn.close()
 
-            return result['use_count'] if result else 0
+            if not result:
+                return 0
+
+            # Sumar los usos encolados que aún no se escribieron
+            pending_count, _ = self._queue.pending_usage(item_id)
+            return result['use_count'] + pending_count
 
         except Exception as e:
             logger.error(f"Error getting use count for item {item_id}: {e}")
@@ -112,7 +368,11 @@ class UsageTracker:
             result = cursor.fetchone()
             conn.close()
 
-            return result['last_used'] if result else None
+            if not result:
+                return None
+
+            _, pending_last_used = self._queue.pending_usage(item_id)
+            return pending_last_used or result['last_used']
 
         except Exception as e:
             logger.error(f"Error getting last used for item {item_id}: {e}")
@@ -178,7 +438,7 @@ class UsageTracker:
                 SELECT h.*, i.label, i.badge
                 FROM item_usage_history h
                 JOIN items i ON h.item_id = i.id
-                WHERE date(h.used_at) = date('now')
+                WHERE h.used_at >= date('now')
                 ORDER BY h.used_at DESC
             """)
 
@@ -201,7 +461,7 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
+                SELECT COALESCE(SUM(executions), 0) as total FROM item_usage_daily
             """)
 
             result = cursor.fetchone()
@@ -220,9 +480,9 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM item_usage_history
-                WHERE date(used_at) = date('now')
+                SELECT COALESCE(SUM(executions), 0) as total
+                FROM item_usage_daily
+                WHERE day = date('now')
             """)
 
             result = cursor.fetchone()
@@ -240,11 +500,12 @@ class UsageTracker:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-7 days')
-            """)
+            table, where, param = rollup_window(7)
+            cursor.execute(f"""
+                SELECT COALESCE(SUM(executions), 0) as total
+                FROM {table}
+                WHERE {where}
+            """, (param,))
 
             result = cursor.fetchone()
             conn.close()
@@ -262,9 +523,9 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT AVG(execution_time_ms) as avg_time
-                FROM item_usage_history
-                WHERE item_id = ? AND success = 1
+                SELECT 1.0 * SUM(success_time_ms) / NULLIF(SUM(successes), 0) as avg_time
+                FROM item_usage_daily
+                WHERE item_id = ?
             """, (item_id,))
 
             result = cursor.fetchone()
@@ -286,9 +547,9 @@ class UsageTracker:
 
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful
-                FROM item_usage_history
+                    COALESCE(SUM(executions), 0) as total,
+                    COALESCE(SUM(successes), 0) as successful
+                FROM item_usage_daily
                 WHERE item_id = ?
             """, (item_id,))
 
@@ -310,9 +571,9 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT COUNT(*) as errors
-                FROM item_usage_history
-                WHERE item_id = ? AND success = 0
+                SELECT COALESCE(SUM(failures), 0) as errors
+                FROM item_usage_daily
+                WHERE item_id = ?
             """, (item_id,))
 
             result = cursor.fetchone()
@@ -354,21 +615,29 @@ class UsageTracker:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            # Más allá de la retención de buckets por hora solo quedan los
+            # diarios (sin desglose por hora): la ventana se limita a ella
+            table, where, param = rollup_window(min(days, HOURLY_RETENTION_DAYS))
+
+            cursor.execute(f"""
                 SELECT
-                    strftime('%H', used_at) as hour,
-                    COUNT(*) as executions,
-                    ROUND(AVG(execution_time_ms) / 1000.0, 2) as avg_time_seconds
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
-                GROUP BY hour
-                ORDER BY hour
-            """, (days,))
+                    substr(hour, 12, 2) as hour_of_day,
+                    SUM(executions) as executions,
+                    ROUND(1.0 * SUM(total_time_ms) / SUM(executions) / 1000.0, 2) as avg_time_seconds
+                FROM {table}
+                WHERE {where}
+                GROUP BY hour_of_day
+                ORDER BY hour_of_day
+            """, (param,))
 
             results = cursor.fetchall()
             conn.close()
 
-            return [dict(row) for row in results]
+            return [
+                {'hour': row['hour_of_day'], 'executions': row['executions'],
+                 'avg_time_seconds': row['avg_time_seconds']}
+                for row in results
+            ]
 
         except Exception as e:
             logger.error(f"Error getting usage by hour: {e}")
@@ -382,13 +651,13 @@ class UsageTracker:
 
             cursor.execute("""
                 SELECT
-                    date(used_at) as day,
-                    COUNT(*) as executions,
+                    day,
+                    SUM(executions) as executions,
                     COUNT(DISTINCT item_id) as unique_items,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                    SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
+                    SUM(successes) as successful,
+                    SUM(failures) as failed
+                FROM item_usage_daily
+                WHERE day >= date('now', '-' || ? || ' days')
                 GROUP BY day
                 ORDER BY day DESC
             """, (days,))
@@ -435,6 +704,29 @@ class UsageTracker:
             logger.error(f"Error cleaning up old history: {e}")
             return 0
 
+    def compact_history(self, raw_days: int = RAW_HISTORY_RETENTION_DAYS,
+                        hourly_days: int = HOURLY_RETENTION_DAYS) -> Tuple[int, int]:
+        """
+        Compactar historial: eliminar filas crudas y buckets por hora antiguos
+
+        Los rollups diarios se conservan, así que las estadísticas globales
+        no cambian.
+
+        Returns:
+            Tuple[int, int]: (filas crudas eliminadas, buckets por hora eliminados)
+        """
+        try:
+            self._queue.flush()
+            conn = self._get_connection()
+            try:
+                return compact_usage_history(conn, raw_days, hourly_days)
+            finally:
+                conn.close()
+
+        except Exception as e:
+            logger.error(f"Error compacting usage history: {e}")
+            return 0, 0
+
     def get_item_stats(self, item_id: int) -> Dict:
         """Estadísticas completas de un item"""
         try:
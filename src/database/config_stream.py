@@ -0,0 +1,344 @@
+"""
+Streaming export/import of the configuration in JSON Lines
+One JSON record per line (header, settings, categories, items, end; kind
+in its "record" key), read and written in chunks so memory stays bounded with any number of items.
+Files can be compressed with gzip (.gz) or zstd (.zst, optional zstandard
+package). Imports commit one transaction per chunk together with a
+checkpoint, so an interrupted import resumes after the last chunk.
+"""
+
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+from .connection_pool import get_connection_pool
+from .db_manager import ITEM_ADDED
+
+logger = logging.getLogger(__name__)
+
+
+# Identificación del formato (primera línea del archivo)
+STREAM_FORMAT = 'widget-sidebar-jsonl'
+STREAM_VERSION = 1
+
+# Items por chunk (una transacción por chunk al importar)
+STREAM_CHUNK_SIZE = 1000
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+
+_COMPRESSION_SUFFIXES = {'.gz': COMPRESSION_GZIP, '.zst': COMPRESSION_ZSTD}
+
+# Callback de progreso: (items procesados, items totales)
+ProgressCallback = Callable[[int, int], None]
+
+_CHECKPOINT_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS import_checkpoints (
+        source TEXT PRIMARY KEY,
+        line INTEGER NOT NULL,
+        category_map TEXT NOT NULL,
+        categories INTEGER NOT NULL DEFAULT 0,
+        items INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def is_stream_path(path: Union[str, Path]) -> bool:
+    """Check if a file name uses the JSON Lines format (.jsonl, .jsonl.gz, .jsonl.zst)"""
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] in _COMPRESSION_SUFFIXES:
+        suffixes = suffixes[:-1]
+    return bool(suffixes) and suffixes[-1] == '.jsonl'
+
+
+def _detect_compression(path: Path) -> str:
+    return _COMPRESSION_SUFFIXES.get(path.suffix, COMPRESSION_NONE)
+
+
+def _open_text(path: Path, mode: str, compression: str):
+    """Open a (possibly compressed) UTF-8 text file for reading ('r') or writing ('w')"""
+    if compression == COMPRESSION_GZIP:
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    if compression == COMPRESSION_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8', newline='\n')
+
+
+def _read_connection(db):
+    """Connection for long reads that does not block the DBManager connection"""
+    if str(db.db_path) == ":memory:":
+        return db.connect()
+    return get_connection_pool(db.db_path).reader()
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+
+
+# ========== EXPORT ==========
+
+def export_jsonl(db, export_path: Union[str, Path], compression: Optional[str] = None,
+                 chunk_size: int = STREAM_CHUNK_SIZE,
+                 progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """
+    Export settings, categories and items to a JSON Lines file
+
+    Items are read with a cursor in chunks of chunk_size (sensitive
+    contents decrypted per chunk) and written as they are read. The file
+    is written next to the target and renamed when complete.
+
+    Args:
+        db: DBManager instance
+        export_path: Target file
+        compression: COMPRESSION_* (default: from the file suffix)
+        chunk_size: Items read per chunk
+        progress: Optional callback (items exported, total items)
+
+    Returns:
+        Dict[str, int]: Counts of exported settings, categories and items
+    """
+    export_path = Path(export_path)
+    compression = compression or _detect_compression(export_path)
+    conn = _read_connection(db)
+
+    total_items = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    total_categories = conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
+    settings = db.get_all_settings()
+    stats = {'settings': len(settings), 'categories': 0, 'items': 0}
+
+    temp_path = export_path.with_name(export_path.name + '.partial')
+    try:
+        with _open_text(temp_path, 'w', compression) as f:
+            f.write(_dumps({
+                'record': 'header', 'format': STREAM_FORMAT, 'version': STREAM_VERSION,
+                'categories': total_categories, 'items': total_items
+            }))
+            for key, value in settings.items():
+                f.write(_dumps({'record': 'setting', 'key': key, 'value': value}))
+
+            for row in conn.execute("SELECT * FROM categories ORDER BY order_index, id"):
+                f.write(_dumps({'record': 'category', **dict(row)}))
+                stats['categories'] += 1
+
+            cursor = conn.execute("SELECT * FROM items ORDER BY category_id, id")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                items = [dict(row) for row in rows]
+                db._decrypt_sensitive_items(items)
+                f.write(''.join(
+                    _dumps({'record': 'item', **item, 'tags': db._parse_tags_value(item.get('tags'))})
+                    for item in items
+                ))
+                stats['items'] += len(items)
+                if progress:
+                    progress(stats['items'], total_items)
+
+            f.write(_dumps({'record': 'end', **stats}))
+        os.replace(temp_path, export_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Configuration exported to {export_path} ({compression}): "
+                f"{stats['categories']} categories, {stats['items']} items")
+    return stats
+
+
+# ========== IMPORT ==========
+
+class _ChunkImporter:
+    """Buffers categories/items and commits them one chunk per transaction"""
+
+    def __init__(self, db, source: str, checkpoint: Optional[Dict]):
+        self.db = db
+        self.source = source
+        conn = db.connect()
+        self.category_columns = {row[1] for row in conn.execute("PRAGMA table_info(categories)")} - {'id'}
+        self.item_columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")} - {'id'}
+        # id de categoría en el archivo -> id en esta base
+        self.category_map: Dict[str, int] = checkpoint['category_map'] if checkpoint else {}
+        self.stats = {
+            'categories': checkpoint['categories'] if checkpoint else 0,
+            'items': checkpoint['items'] if checkpoint else 0,
+        }
+        self.categories: List[Dict] = []
+        self.items: List[Dict] = []
+
+    def _encrypt_sensitive(self) -> None:
+        """Encrypt the plaintext of sensitive items in one batch (outside the transaction)"""
+        sensitive = [item for item in self.items if item.get('is_sensitive') and item.get('content')]
+        if not sensitive:
+            return
+        from core.encryption_manager import get_encryption_manager
+        encrypted = get_encryption_manager().encrypt_many([item['content'] for item in sensitive])
+        for item, token in zip(sensitive, encrypted):
+            item['content'] = token
+
+    def flush(self, line: int) -> List[int]:
+        """Insert the buffered records and save the checkpoint in one transaction"""
+        self._encrypt_sensitive()
+
+        item_ids = []
+        with self.db.transaction() as conn:
+            for category in self.categories:
+                source_id = str(category.pop('id'))
+                columns = [column for column in category if column in self.category_columns]
+                cursor = conn.execute(
+                    f"INSERT INTO categories ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    [category[column] for column in columns]
+                )
+                self.category_map[source_id] = cursor.lastrowid
+                self.stats['categories'] += 1
+
+            # Items agrupados por conjunto de columnas (normalmente uno solo)
+            batches: Dict[tuple, List[list]] = {}
+            for item in self.items:
+                source_category = str(item.get('category_id'))
+                if source_category not in self.category_map:
+                    raise ValueError(f"Item '{item.get('label')}' references unknown category {source_category}")
+                item['category_id'] = self.category_map[source_category]
+                item['tags'] = json.dumps(item.get('tags') or [])
+                columns = tuple(column for column in item if column in self.item_columns)
+                batches.setdefault(columns, []).append([item[column] for column in columns])
+
+            for columns, rows in batches.items():
+                conn.executemany(
+                    f"INSERT INTO items ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows
+                )
+                # Ids contiguos: la transacción tiene el lock de escritura (AUTOINCREMENT)
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                item_ids.extend(range(last_id - len(rows) + 1, last_id + 1))
+            self.stats['items'] += len(self.items)
+
+            conn.execute("""
+                INSERT OR REPLACE INTO import_checkpoints
+                (source, line, category_map, categories, items, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (self.source, line, json.dumps(self.category_map),
+                  self.stats['categories'], self.stats['items']))
+
+        self.categories = []
+        self.items = []
+        return item_ids
+
+
+def _checkpoint_source(path: Path) -> str:
+    """Checkpoint key of an import file (same path and size = same file)"""
+    return f"{path.resolve()}|{path.stat().st_size}"
+
+
+def import_jsonl(db, import_path: Union[str, Path], chunk_size: int = STREAM_CHUNK_SIZE,
+                 progress: Optional[ProgressCallback] = None, resume: bool = True) -> Dict[str, int]:
+    """
+    Import a JSON Lines export, one transaction per chunk of items
+
+    Categories get new IDs (items are remapped to them). Every chunk
+    commits with a checkpoint (line reached and category ID map): if the
+    import is interrupted, running it again on the same file resumes
+    after the last committed chunk.
+
+    Args:
+        db: DBManager instance
+        import_path: File written by export_jsonl (compression from its suffix)
+        chunk_size: Items per transaction
+        progress: Optional callback (items imported, total items)
+        resume: Continue from the checkpoint of a previous interrupted import
+
+    Returns:
+        Dict[str, int]: Counts of imported settings, categories and items,
+                        and resumed_from (line skipped up to, 0 if none)
+
+    Raises:
+        ValueError: If the file is not a widget-sidebar JSON Lines export
+    """
+    import_path = Path(import_path)
+    compression = _detect_compression(import_path)
+    source = _checkpoint_source(import_path)
+
+    conn = db.connect()
+    conn.execute(_CHECKPOINT_SCHEMA)
+    conn.commit()
+
+    checkpoint = None
+    if resume:
+        row = conn.execute(
+            "SELECT line, category_map, categories, items FROM import_checkpoints WHERE source = ?", (source,)
+        ).fetchone()
+        if row:
+            checkpoint = {'line': row[0], 'category_map': json.loads(row[1]),
+                          'categories': row[2], 'items': row[3]}
+            logger.info(f"Resuming import of {import_path} after line {row[0]} ({row[3]} items done)")
+
+    importer = _ChunkImporter(db, source, checkpoint)
+    done_line = checkpoint['line'] if checkpoint else 0
+    settings_count = 0
+    total_items = 0
+    line_number = 0
+
+    with _open_text(import_path, 'r', compression) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            if line_number == 1:
+                header = json.loads(line)
+                if header.get('record') != 'header' or header.get('format') != STREAM_FORMAT:
+                    raise ValueError(f"{import_path} is not a {STREAM_FORMAT} export")
+                if header.get('version', 0) > STREAM_VERSION:
+                    raise ValueError(f"Unsupported export version {header.get('version')}")
+                total_items = header.get('items', 0)
+                continue
+            if line_number <= done_line:
+                continue
+
+            record = json.loads(line)
+            record_type = record.pop('record', None)
+            if record_type == 'setting':
+                db.set_setting(record['key'], record['value'])
+                settings_count += 1
+            elif record_type == 'category':
+                importer.categories.append(record)
+            elif record_type == 'item':
+                importer.items.append(record)
+                if len(importer.items) >= chunk_size:
+                    db._notify_items_changed(ITEM_ADDED, importer.flush(line_number))
+                    if progress:
+                        progress(importer.stats['items'], total_items)
+
+    if importer.categories or importer.items:
+        db._notify_items_changed(ITEM_ADDED, importer.flush(line_number))
+        if progress:
+            progress(importer.stats['items'], total_items)
+
+    # item_count de las categorías importadas, una sola sentencia al final
+    category_ids = list(importer.category_map.values())
+    with db.transaction() as conn:
+        for start in range(0, len(category_ids), 500):
+            chunk = category_ids[start:start + 500]
+            conn.execute(f"""
+                UPDATE categories
+                SET item_count = (SELECT COUNT(*) FROM items
+                                  WHERE items.category_id = categories.id AND items.is_active = 1)
+                WHERE id IN ({', '.join('?' * len(chunk))})
+            """, chunk)
+        conn.execute("DELETE FROM import_checkpoints WHERE source = ?", (source,))
+
+    stats = {'settings': settings_count, **importer.stats, 'resumed_from': done_line}
+    logger.info(f"Configuration imported from {import_path}: {stats['categories']} categories, "
+                f"{stats['items']} items")
+    return stats
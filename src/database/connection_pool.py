@@ -0,0 +1,311 @@
+"""
+SQLite connection pool shared by the database-backed managers
+Per-thread reader connections and one serialized writer connection per database
+file, all configured for WAL mode with tuned cache and statement caching
+"""
+
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+# Tiempo máximo de espera por el writer (segundos)
+BUSY_TIMEOUT = 5.0
+
+# Sentencias preparadas en caché por conexión
+STATEMENT_CACHE_SIZE = 256
+
+# Caché de páginas por conexión (KiB) y tamaño de memory-mapped I/O (bytes)
+CACHE_SIZE_KIB = 16384
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Primeras palabras de sentencias que no escriben
+_READ_KEYWORDS = ('SELECT', 'WITH', 'EXPLAIN', 'VALUES', 'PRAGMA')
+
+
+def configure_connection(conn: sqlite3.Connection) -> None:
+    """
+    Apply the shared connection settings
+
+    WAL lets readers run concurrently with the writer, synchronous=NORMAL is
+    durable in WAL mode (only the last transactions may roll back on power
+    loss, never corrupt), and the page cache / mmap avoid re-reading pages.
+
+    Args:
+        conn: Connection to configure
+    """
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def _is_write_statement(sql: str) -> bool:
+    """Return True if the statement may modify the database"""
+    words = sql.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() not in _READ_KEYWORDS
+
+
+class ConnectionPool:
+    """
+    Connection pool for one SQLite database file
+
+    - reader(): connection owned by the calling thread (created once)
+    - writer connection: single connection, used under a process-wide lock
+    - connection(): PooledConnection lease that reads on the thread's reader
+      and moves to the writer (taking the lock) on the first write statement
+
+    Use get_connection_pool() to get the shared pool of a database file.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = str(db_path)
+        self._is_memory = self.db_path == ":memory:"
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        configure_connection(conn)
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """
+        Get the reader connection of the calling thread
+
+        Returns:
+            sqlite3.Connection: Thread-local connection (do not close it)
+        """
+        if self._is_memory:
+            # Una base en memoria solo existe dentro de su conexión
+            return self._get_writer()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Get (lazily created) writer connection"""
+        if self._writer is None:
+            with self._write_lock:
+                if self._writer is None:
+                    self._writer = self._open()
+        return self._writer
+
+    def acquire_writer(self) -> sqlite3.Connection:
+        """
+        Take the write lock and return the writer connection
+
+        Must be paired with release_writer() on the same thread.
+
+        Raises:
+            sqlite3.OperationalError: If the lock is not obtained within BUSY_TIMEOUT
+        """
+        if not self._write_lock.acquire(timeout=BUSY_TIMEOUT):
+            raise sqlite3.OperationalError("database is locked")
+        return self._get_writer()
+
+    def release_writer(self) -> None:
+        """Release the write lock taken by acquire_writer()"""
+        self._write_lock.release()
+
+    def connection(self) -> 'PooledConnection':
+        """
+        Get a connection lease for the legacy connect/commit/close pattern
+
+        Returns:
+            PooledConnection: Lease (close() returns it to the pool)
+        """
+        return PooledConnection(self)
+
+    def close_all(self) -> None:
+        """Close every connection of the pool"""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self._local = threading.local()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        logger.info(f"Connection pool closed: {self.db_path}")
+
+
+class PooledConnection:
+    """
+    Connection lease with the sqlite3.Connection subset used by the managers
+
+    Reads run on the thread's reader connection. The first write statement
+    takes the pool's write lock and from then on the lease works on the
+    writer connection until commit(), rollback() or close(), which release
+    the lock. close() rolls back uncommitted changes (same as closing a
+    sqlite3 connection) and never closes the pooled connections.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        self._writing = False
+
+    def _connection_for(self, sql: str) -> sqlite3.Connection:
+        """Get the connection that must run a statement"""
+        if not self._writing and _is_write_statement(sql):
+            self._pool.acquire_writer()
+            self._writing = True
+        if self._writing:
+            return self._pool._get_writer()
+        return self._pool.reader()
+
+    def _end_write(self, commit: bool) -> None:
+        """Finish the write transaction and release the write lock"""
+        if not self._writing:
+            return
+        try:
+            writer = self._pool._get_writer()
+            try:
+                if commit:
+                    writer.commit()
+                elif writer.in_transaction:
+                    writer.rollback()
+            except Exception:
+                # Un commit fallido no deja la transacción abierta en el escritor compartido
+                if writer.in_transaction:
+                    writer.rollback()
+                raise
+        finally:
+            self._writing = False
+            self._pool.release_writer()
+
+    def cursor(self) -> 'PooledCursor':
+        return PooledCursor(self)
+
+    def execute(self, sql: str, parameters=()) -> 'PooledCursor':
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters) -> 'PooledCursor':
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        self._end_write(commit=True)
+
+    def rollback(self) -> None:
+        self._end_write(commit=False)
+
+    def close(self) -> None:
+        self._end_write(commit=False)
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._end_write(commit=exc_type is None)
+
+    def __del__(self):
+        # Lease abandonada por una excepción antes de close()
+        if self._writing:
+            try:
+                self._end_write(commit=False)
+            except Exception:
+                pass
+
+
+class PooledCursor:
+    """Cursor that follows its lease from the reader to the writer connection"""
+
+    def __init__(self, lease: PooledConnection):
+        self._lease = lease
+        self._cursor: Optional[sqlite3.Cursor] = None
+
+    def _prepare(self, sql: str) -> sqlite3.Cursor:
+        conn = self._lease._connection_for(sql)
+        if self._cursor is None or self._cursor.connection is not conn:
+            self._cursor = conn.cursor()
+        return self._cursor
+
+    def execute(self, sql: str, parameters=()) -> 'PooledCursor':
+        self._prepare(sql).execute(sql, parameters)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters) -> 'PooledCursor':
+        self._prepare(sql).executemany(sql, seq_of_parameters)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone() if self._cursor else None
+
+    def fetchall(self):
+        return self._cursor.fetchall() if self._cursor else []
+
+    def fetchmany(self, size: int = 1):
+        return self._cursor.fetchmany(size) if self._cursor else []
+
+    def __iter__(self):
+        return iter(self._cursor) if self._cursor else iter(())
+
+    def __getattr__(self, name):
+        # lastrowid, rowcount, description...
+        return getattr(self._cursor, name)
+
+
+# ========== Pools compartidos ==========
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: Union[str, Path]) -> ConnectionPool:
+    """
+    Get the process-wide connection pool of a database file
+
+    Args:
+        db_path: Path to SQLite database file
+
+    Returns:
+        ConnectionPool: Shared pool (a new private pool for ":memory:")
+    """
+    if str(db_path) == ":memory:":
+        return ConnectionPool(db_path)
+
+    key = str(Path(db_path).resolve())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key)
+                _pools[key] = pool
+    return pool
+
+
+def close_all_pools() -> None:
+    """Close the connections of every shared pool (application shutdown)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
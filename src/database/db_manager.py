@@ -6,17 +6,78 @@ Manages SQLite database operations for settings, categories, items, and clipboar
 import sqlite3
 import json
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from contextlib import contextmanager
 
+from .connection_pool import configure_connection, BUSY_TIMEOUT, STATEMENT_CACHE_SIZE
+from .fts_index import (
+    FTS_COLUMNS, FTS_BM25_WEIGHTS, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE,
+    ensure_fts_index, rebuild_fts_index, build_match_query, parse_highlight_offsets
+)
+from .file_storage import ensure_file_storage_schema
+from .usage_rollups import ensure_usage_rollups
+from .query_indexes import ensure_query_indexes
+from .tag_index import ensure_tag_index, tagged_items_subquery
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Tipos de cambio notificados a los listeners de items
+ITEM_ADDED = "added"
+ITEM_UPDATED = "updated"
+ITEM_DELETED = "deleted"
+
+# Tipos de cambio notificados a los listeners de categorías
+CATEGORY_UPDATED = "category_updated"
+CATEGORY_DELETED = "category_deleted"
+
+# Resultado por id de las operaciones masivas cuando el item no existe
+ITEM_NOT_FOUND = "not_found"
+
+# Campos editables de items (update_item / bulk_update_items)
+ITEM_UPDATE_FIELDS = (
+    'label', 'content', 'type', 'icon', 'is_sensitive', 'is_favorite', 'tags', 'description',
+    'working_dir', 'color', 'badge', 'is_active', 'is_archived', 'is_list', 'list_group',
+    'orden_lista', 'file_size', 'file_type', 'file_extension', 'original_filename', 'file_hash'
+)
+
+# Campos que se cifran/descifran por item: no se aplican en bloque
+_PER_ITEM_FIELDS = ('content', 'is_sensitive')
+
+# Metadatos del archivo de un item PATH (describen su content)
+_FILE_METADATA_FIELDS = ('file_size', 'file_type', 'file_extension', 'original_filename', 'file_hash')
+
+# Ids por sentencia en las operaciones masivas (SQLite admite 999 parámetros
+# en versiones antiguas)
+BULK_CHUNK_SIZE = 500
+
+# Listeners compartidos por ruta de base de datos: (items, categorías)
+_shared_listeners: Dict[str, tuple] = {}
+_shared_listeners_lock = threading.Lock()
+
+
+def _listeners_for(db_path: Path) -> tuple:
+    """
+    Get the (item, category) listener lists of a database file
+
+    Every DBManager opened on the same file shares them, so a change made
+    through any instance (e.g. a dialog's own DBManager) reaches the
+    listeners registered on the others. In-memory databases are private
+    to their instance.
+    """
+    if str(db_path) == ":memory:":
+        return [], []
+    key = str(db_path.resolve())
+    with _shared_listeners_lock:
+        return _shared_listeners.setdefault(key, ([], []))
+
+
 class DBManager:
     """Gestor de base de datos SQLite para Widget Sidebar"""
 
@@ -29,7 +90,17 @@ class DBManager:
         """
         self.db_path = Path(db_path)
         self.connection = None
+        # La conexión se comparte entre hilos: serializar su uso
+        self._lock = threading.RLock()
+        # Callbacks (kind, item_ids) / (kind, category_ids) notificados tras
+        # cada mutación; compartidos con los demás DBManager del mismo archivo
+        self._item_listeners, self._category_listeners = _listeners_for(self.db_path)
         self._ensure_database()
+        ensure_file_storage_schema(self.connect())
+        ensure_usage_rollups(self.connect())
+        ensure_query_indexes(self.connect())
+        ensure_tag_index(self.connect())
+        self.fts_enabled = ensure_fts_index(self.connect())
         logger.info(f"Database initialized at: {self.db_path}")
 
     def _ensure_database(self):
@@ -50,21 +121,26 @@ class DBManager:
             sqlite3.Connection: Database connection
         """
         if self.connection is None:
-            self.connection = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False
-            )
-            self.connection.row_factory = sqlite3.Row
-            # Enable foreign keys
-            self.connection.execute("PRAGMA foreign_keys = ON")
+            with self._lock:
+                if self.connection is None:
+                    connection = sqlite3.connect(
+                        self.db_path,
+                        timeout=BUSY_TIMEOUT,
+                        check_same_thread=False,
+                        cached_statements=STATEMENT_CACHE_SIZE
+                    )
+                    # Row factory, foreign keys, WAL and cache settings
+                    configure_connection(connection)
+                    self.connection = connection
         return self.connection
 
     def close(self):
         """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            logger.info("Database connection closed")
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+                logger.info("Database connection closed")
 
     @contextmanager
     def transaction(self):
@@ -75,14 +151,15 @@ class DBManager:
             with db.transaction() as conn:
                 conn.execute(...)
         """
-        conn = self.connect()
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Transaction failed: {e}")
-            raise
+        with self._lock:
+            conn = self.connect()
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Transaction failed: {e}")
+                raise
 
     def _create_database(self):
         """Create database schema with all tables and indices"""
@@ -159,6 +236,17 @@ class DBManager:
                 FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE SET NULL
             );
 
+            -- Tabla de historial de uso de items
+            CREATE TABLE IF NOT EXISTS item_usage_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL,
+                used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                execution_time_ms INTEGER DEFAULT 0,
+                success BOOLEAN DEFAULT 1,
+                error_message TEXT,
+                FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE
+            );
+
             -- Tabla de paneles anclados (pinned panels)
             CREATE TABLE IF NOT EXISTS pinned_panels (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -257,10 +345,11 @@ class DBManager:
             List[Dict]: Query results
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+            with self._lock:
+                conn = self.connect()
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
             return [dict(row) for row in rows]
         except sqlite3.Error as e:
             logger.error(f"Query execution failed: {e}")
@@ -280,11 +369,12 @@ class DBManager:
             int: Last row ID for INSERT, or number of affected rows
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.lastrowid
+            with self._lock:
+                conn = self.connect()
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                conn.commit()
+                return cursor.lastrowid
         except sqlite3.Error as e:
             logger.error(f"Update execution failed: {e}")
             logger.error(f"Query: {query}")
@@ -308,6 +398,72 @@ class DBManager:
             logger.error(f"Batch execution failed: {e}")
             raise
 
+    # ========== CHANGE NOTIFICATIONS ==========
+
+    def add_item_listener(self, callback) -> None:
+        """
+        Register a callback for item mutations
+
+        The callback receives (kind, item_ids) after every add/update/delete
+        made through any DBManager of the same database file, with kind one
+        of ITEM_ADDED, ITEM_UPDATED or ITEM_DELETED.
+
+        Args:
+            callback: Callable(kind: str, item_ids: List[int])
+        """
+        if callback not in self._item_listeners:
+            self._item_listeners.append(callback)
+
+    def remove_item_listener(self, callback) -> None:
+        """Unregister a callback added with add_item_listener()"""
+        if callback in self._item_listeners:
+            self._item_listeners.remove(callback)
+
+    def _notify_items_changed(self, kind: str, item_ids: List[int]) -> None:
+        """Notify item listeners (errors in a listener are logged, not raised)"""
+        if not item_ids:
+            return
+        for callback in list(self._item_listeners):
+            try:
+                callback(kind, list(item_ids))
+            except Exception as e:
+                logger.error(f"Item listener failed for {kind} {item_ids}: {e}", exc_info=True)
+
+    def add_category_listener(self, callback) -> None:
+        """
+        Register a callback for category mutations
+
+        The callback receives (kind, category_ids) after every update,
+        reorder, item count refresh or delete made through any DBManager of
+        the same database file, with kind one of CATEGORY_UPDATED or
+        CATEGORY_DELETED.
+
+        Args:
+            callback: Callable(kind: str, category_ids: List[int])
+        """
+        if callback not in self._category_listeners:
+            self._category_listeners.append(callback)
+
+    def remove_category_listener(self, callback) -> None:
+        """Unregister a callback added with add_category_listener()"""
+        if callback in self._category_listeners:
+            self._category_listeners.remove(callback)
+
+    def _notify_categories_changed(self, kind: str, category_ids: List[int]) -> None:
+        """Notify category listeners (errors in a listener are logged, not raised)"""
+        if not category_ids:
+            return
+        for callback in list(self._category_listeners):
+            try:
+                callback(kind, list(category_ids))
+            except Exception as e:
+                logger.error(f"Category listener failed for {kind} {category_ids}: {e}", exc_info=True)
+
+    def _get_item_ids(self, where: str, params: tuple) -> List[int]:
+        """Get IDs of the items matching a WHERE clause"""
+        rows = self.execute_query(f"SELECT id FROM items WHERE {where}", params)
+        return [row['id'] for row in rows]
+
     # ========== SETTINGS ==========
 
     def get_setting(self, key: str, default: Any = None) -> Any:
@@ -400,6 +556,50 @@ class DBManager:
         result = self.execute_query(query, (category_id,))
         return result[0] if result else None
 
+    def get_categories_with_items(self, include_inactive: bool = False,
+                                  lazy_content: bool = False) -> List[Dict]:
+        """
+        Get all categories with their items in a single pass
+
+        Replaces the get_categories() + get_items_by_category() per category
+        pattern: items of every selected category are fetched with one query
+        ordered like the categories, grouped while streaming the rows, and
+        tag parsing / decryption run once over the whole result.
+
+        Args:
+            include_inactive: Include inactive categories
+            lazy_content: If True, sensitive content is returned as an
+                          EncryptedContent handle (decrypted on reveal)
+
+        Returns:
+            List[Dict]: Category dictionaries ordered by order_index, each with
+                        an 'items' list ordered by created_at
+        """
+        categories = self.get_categories(include_inactive=include_inactive)
+        items_by_category = {}
+        for category in categories:
+            category['items'] = []
+            items_by_category[category['id']] = category['items']
+
+        query = """
+            SELECT i.* FROM items i
+            JOIN categories c ON c.id = i.category_id
+            WHERE c.is_active = 1 OR ? = 1
+            ORDER BY c.order_index, i.category_id, i.created_at
+        """
+        all_items = self.execute_query(query, (include_inactive,))
+        for item in all_items:
+            item['tags'] = self._parse_tags_value(item['tags'])
+            category_items = items_by_category.get(item['category_id'])
+            if category_items is not None:
+                category_items.append(item)
+
+        # Decrypt sensitive content in one batched call
+        self._decrypt_sensitive_items(all_items, lazy=lazy_content)
+
+        logger.debug(f"Bulk loaded {len(categories)} categories, {len(all_items)} items")
+        return categories
+
     def add_category(self, name: str, icon: str = None,
                      is_predefined: bool = False, order_index: int = None) -> int:
         """
@@ -464,6 +664,13 @@ class DBManager:
             query = f"UPDATE categories SET {', '.join(updates)} WHERE id = ?"
             self.execute_update(query, tuple(params))
             logger.info(f"Category updated: ID {category_id}")
+            self._notify_categories_changed(CATEGORY_UPDATED, [category_id])
+
+            # Los items exponen nombre/icono/estado de su categoría
+            if name is not None or icon is not None or is_active is not None:
+                self._notify_items_changed(
+                    ITEM_UPDATED, self._get_item_ids("category_id = ?", (category_id,))
+                )
 
     def delete_category(self, category_id: int) -> None:
         """
@@ -472,9 +679,12 @@ class DBManager:
         Args:
             category_id: Category ID to delete
         """
+        item_ids = self._get_item_ids("category_id = ?", (category_id,))
         query = "DELETE FROM categories WHERE id = ?"
         self.execute_update(query, (category_id,))
         logger.info(f"Category deleted: ID {category_id}")
+        self._notify_categories_changed(CATEGORY_DELETED, [category_id])
+        self._notify_items_changed(ITEM_DELETED, item_ids)
 
     def reorder_categories(self, category_ids: List[int]) -> None:
         """
@@ -487,15 +697,81 @@ class DBManager:
         query = "UPDATE categories SET order_index = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
         self.execute_many(query, updates)
         logger.info(f"Categories reordered: {len(category_ids)} items")
+        self._notify_categories_changed(CATEGORY_UPDATED, list(category_ids))
 
     # ========== ITEMS ==========
 
-    def get_items_by_category(self, category_id: int) -> List[Dict]:
+    @staticmethod
+    def _parse_tags_value(tags: Any) -> List[str]:
+        """
+        Parse an items.tags column value (JSON list or legacy CSV)
+
+        Args:
+            tags: Raw column value
+
+        Returns:
+            List[str]: Tag list (empty if no tags)
+        """
+        if not tags:
+            return []
+        try:
+            # Try to parse as JSON first
+            return json.loads(tags)
+        except json.JSONDecodeError:
+            # If JSON parsing fails, try CSV format (legacy)
+            if isinstance(tags, str):
+                return [tag.strip() for tag in tags.split(',') if tag.strip()]
+            return []
+
+    def _decrypt_sensitive_items(self, items: List[Dict], lazy: bool = False) -> None:
+        """
+        Decrypt content of sensitive items in place with a single batched call
+
+        Uses the shared EncryptionManager (plaintext cache + parallel decrypt
+        for large result sets). Items that fail to decrypt get
+        DECRYPTION_ERROR as content.
+
+        Args:
+            items: Item dictionaries as returned by the database
+            lazy: If True, replace content with an EncryptedContent handle
+                  that decrypts only when revealed (no decryption here)
+        """
+        sensitive_items = [
+            item for item in items
+            if item.get('is_sensitive') and item.get('content')
+        ]
+        if not sensitive_items:
+            return
+
+        if lazy:
+            from core.encryption_manager import EncryptedContent
+            for item in sensitive_items:
+                item['content'] = EncryptedContent(item['content'], item['id'])
+            return
+
+        from core.encryption_manager import get_encryption_manager, DECRYPTION_ERROR
+        encryption_manager = get_encryption_manager()
+
+        plaintexts = encryption_manager.decrypt_many(
+            [item['content'] for item in sensitive_items],
+            item_ids=[item['id'] for item in sensitive_items]
+        )
+        for item, plaintext in zip(sensitive_items, plaintexts):
+            if plaintext is None:
+                logger.error(f"Failed to decrypt item {item['id']}")
+                plaintext = DECRYPTION_ERROR
+            item['content'] = plaintext
+
+        logger.debug(f"Content decrypted for {len(sensitive_items)} sensitive items")
+
+    def get_items_by_category(self, category_id: int, lazy_content: bool = False) -> List[Dict]:
         """
         Get all items for a specific category
 
         Args:
             category_id: Category ID
+            lazy_content: If True, sensitive content is returned as an
+                          EncryptedContent handle (decrypted on reveal)
 
         Returns:
             List[Dict]: List of item dictionaries (content decrypted if sensitive)
@@ -507,34 +783,12 @@ class DBManager:
         """
         results = self.execute_query(query, (category_id,))
 
-        # Initialize encryption manager for decrypting sensitive items
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
-
-        # Parse tags and decrypt sensitive content
+        # Parse tags
         for item in results:
-            # Parse tags from JSON or CSV format
-            if item['tags']:
-                try:
-                    # Try to parse as JSON first
-                    item['tags'] = json.loads(item['tags'])
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, try CSV format (legacy)
-                    if isinstance(item['tags'], str):
-                        item['tags'] = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
-                    else:
-                        item['tags'] = []
-            else:
-                item['tags'] = []
+            item['tags'] = self._parse_tags_value(item['tags'])
 
-            # Decrypt sensitive content
-            if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+        # Decrypt sensitive content in one batched call
+        self._decrypt_sensitive_items(results, lazy=lazy_content)
 
         return results
 
@@ -567,15 +821,7 @@ class DBManager:
                 item['tags'] = []
 
             # Decrypt sensitive content
-            if item.get('is_sensitive') and item.get('content'):
-                from core.encryption_manager import EncryptionManager
-                encryption_manager = EncryptionManager()
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item_id}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item_id}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+            self._decrypt_sensitive_items([item])
 
             return item
         return None
@@ -584,6 +830,8 @@ class DBManager:
         """
         Get item by file hash (for duplicate detection)
 
+        Uses the partial index idx_items_file_hash (no full scan of items).
+
         Args:
             file_hash: SHA256 hash of the file
 
@@ -594,32 +842,82 @@ class DBManager:
         result = self.execute_query(query, (file_hash,))
         if result:
             item = result[0]
-            # Parse tags
-            if item['tags']:
-                try:
-                    item['tags'] = json.loads(item['tags'])
-                except json.JSONDecodeError:
-                    if isinstance(item['tags'], str):
-                        item['tags'] = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
-                    else:
-                        item['tags'] = []
-            else:
-                item['tags'] = []
+            item['tags'] = self._parse_tags_value(item['tags'])
 
-            # Decrypt sensitive content if needed
-            if item.get('is_sensitive') and item.get('content'):
-                from core.encryption_manager import EncryptionManager
-                encryption_manager = EncryptionManager()
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item with hash: {file_hash[:16]}...")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item with hash {file_hash[:16]}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+            # Decrypt sensitive content
+            self._decrypt_sensitive_items([item])
 
             return item
         return None
 
+    # ========== FILE BLOBS (almacenamiento por contenido) ==========
+
+    def get_file_blob(self, file_hash: str) -> Optional[Dict]:
+        """
+        Get a stored blob by hash
+
+        Args:
+            file_hash: SHA256 hash of the file
+
+        Returns:
+            Optional[Dict]: Blob row (file_hash, relative_path, file_size, ref_count) or None
+        """
+        result = self.execute_query("SELECT * FROM file_blobs WHERE file_hash = ?", (file_hash,))
+        return result[0] if result else None
+
+    def register_file_blob(self, file_hash: str, relative_path: str, file_size: int) -> None:
+        """
+        Register a blob; its ref_count starts at the number of items that
+        already have this hash (the triggers keep it updated afterwards)
+
+        Registering an existing blob again (a file copied while its item is
+        being created) restarts its grace period, see get_unreferenced_file_blobs().
+
+        Args:
+            file_hash: SHA256 hash of the file
+            relative_path: Blob path relative to the storage base path
+            file_size: Size in bytes
+        """
+        self.execute_update("""
+            INSERT INTO file_blobs (file_hash, relative_path, file_size, ref_count)
+            VALUES (?, ?, ?, (SELECT COUNT(*) FROM items WHERE file_hash = ?))
+            ON CONFLICT(file_hash) DO UPDATE
+            SET created_at = CURRENT_TIMESTAMP, released_at = NULL
+        """, (file_hash, relative_path, file_size, file_hash))
+
+    def get_unreferenced_file_blobs(self, grace_seconds: int = 0,
+                                    released_only: bool = False) -> List[Dict]:
+        """
+        Get the blobs no item points to anymore
+
+        A blob is registered before the item that uses it is saved, so blobs
+        registered less than grace_seconds ago are left out.
+
+        Args:
+            grace_seconds: Minimum age (since registration) of the returned blobs
+            released_only: Only blobs whose ref_count dropped because an item
+                           was deleted or pointed to another file
+
+        Returns:
+            List[Dict]: Blob rows with ref_count <= 0
+        """
+        query = """
+            SELECT * FROM file_blobs
+            WHERE ref_count <= 0 AND created_at <= datetime('now', ?)
+        """
+        if released_only:
+            query += " AND released_at IS NOT NULL"
+        return self.execute_query(query, (f"-{int(grace_seconds)} seconds",))
+
+    def delete_file_blob(self, file_hash: str) -> None:
+        """
+        Delete a blob row (the file itself is removed by FileManager)
+
+        Args:
+            file_hash: SHA256 hash of the file
+        """
+        self.execute_update("DELETE FROM file_blobs WHERE file_hash = ?", (file_hash,))
+
     def get_all_items(self, active_only: bool = False, include_archived: bool = True) -> List[Dict]:
         """
         Get all items from all categories
@@ -655,11 +953,7 @@ class DBManager:
 
         results = self.execute_query(query, tuple(params)) if params else self.execute_query(query)
 
-        # Initialize encryption manager for decrypting sensitive items
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
-
-        # Parse tags and decrypt sensitive content
+        # Parse tags
         for item in results:
             # Parse tags from JSON or CSV format
             if item['tags']:
@@ -675,14 +969,8 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
-            if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+        # Decrypt sensitive content in one batched call
+        self._decrypt_sensitive_items(results)
 
         logger.debug(f"Retrieved {len(results)} items")
         return results
@@ -734,8 +1022,8 @@ class DBManager:
         """
         # Encrypt content if sensitive
         if is_sensitive and content:
-            from core.encryption_manager import EncryptionManager
-            encryption_manager = EncryptionManager()
+            from core.encryption_manager import get_encryption_manager
+            encryption_manager = get_encryption_manager()
             content = encryption_manager.encrypt(content)
             logger.info(f"Content encrypted for sensitive item: {label}")
 
@@ -751,8 +1039,67 @@ class DBManager:
         )
         list_info = f", List: {list_group}[{orden_lista}]" if is_list else ""
         logger.info(f"Item added: {label} (ID: {item_id}, Sensitive: {is_sensitive}, Favorite: {is_favorite}, Active: {is_active}, Archived: {is_archived}{list_info})")
+        self._notify_items_changed(ITEM_ADDED, [item_id])
         return item_id
 
+    def add_items_bulk(self, category_id: int, items: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add many items to a category in one transaction
+
+        Sensitive contents are encrypted in one batch before the transaction,
+        rows are inserted with a single executemany and listeners get one
+        ITEM_ADDED event. Item ids are contiguous: the insert holds the
+        SQLite write lock and items uses AUTOINCREMENT.
+
+        Args:
+            category_id: Category ID
+            items: Dicts with the add_item() arguments (label and content
+                   required; item_type, tags, is_sensitive, ... optional)
+
+        Returns:
+            List[int]: New item IDs in the same order as items
+
+        Example:
+            ids = db.add_items_bulk(category_id, [
+                {'label': 'Repo', 'content': 'git clone ...', 'item_type': 'CODE', 'tags': ['git']},
+            ])
+        """
+        if not items:
+            return []
+
+        contents = [item['content'] for item in items]
+        sensitive_indexes = [index for index, item in enumerate(items)
+                             if item.get('is_sensitive') and item['content']]
+        if sensitive_indexes:
+            from core.encryption_manager import get_encryption_manager
+            encrypted = get_encryption_manager().encrypt_many([contents[index] for index in sensitive_indexes])
+            for index, token in zip(sensitive_indexes, encrypted):
+                contents[index] = token
+
+        rows = [
+            (category_id, item['label'], content, item.get('item_type', 'TEXT'), item.get('icon'),
+             item.get('is_sensitive', False), item.get('is_favorite', False), json.dumps(item.get('tags') or []),
+             item.get('description'), item.get('working_dir'), item.get('color'), item.get('badge'),
+             item.get('is_active', True), item.get('is_archived', False), item.get('is_list', False),
+             item.get('list_group'), item.get('orden_lista', 0), item.get('file_size'), item.get('file_type'),
+             item.get('file_extension'), item.get('original_filename'), item.get('file_hash'))
+            for item, content in zip(items, contents)
+        ]
+        query = """
+            INSERT INTO items
+            (category_id, label, content, type, icon, is_sensitive, is_favorite, tags, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista, file_size, file_type, file_extension, original_filename, file_hash, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """
+        with self.transaction() as conn:
+            conn.executemany(query, rows)
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        item_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+        logger.info(f"Bulk insert: {len(item_ids)} items added to category {category_id} "
+                    f"({len(sensitive_indexes)} encrypted)")
+        self._notify_items_changed(ITEM_ADDED, item_ids)
+        return item_ids
+
     def update_item(self, item_id: int, **kwargs) -> None:
         """
         Update item fields
@@ -761,7 +1108,7 @@ class DBManager:
             item_id: Item ID to update
             **kwargs: Fields to update (label, content, type, icon, is_sensitive, is_favorite, tags, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista, file_size, file_type, file_extension, original_filename, file_hash)
         """
-        allowed_fields = ['label', 'content', 'type', 'icon', 'is_sensitive', 'is_favorite', 'tags', 'description', 'working_dir', 'color', 'badge', 'is_active', 'is_archived', 'is_list', 'list_group', 'orden_lista', 'file_size', 'file_type', 'file_extension', 'original_filename', 'file_hash']
+        allowed_fields = ITEM_UPDATE_FIELDS
         updates = []
         params = []
 
@@ -771,6 +1118,14 @@ class DBManager:
             logger.warning(f"Item not found for update: ID {item_id}")
             return
 
+        # Sin archivo nuevo (contenido sin cambios) no se borran los metadatos
+        # del archivo: quitar file_hash liberaría el blob que el item sigue usando
+        current_content = current_item.get('content')
+        if current_item.get('file_hash') and kwargs.get('content', current_content) == current_content:
+            for field in _FILE_METADATA_FIELDS:
+                if field in kwargs and kwargs[field] is None:
+                    del kwargs[field]
+
         # Check if item is being marked as sensitive or if it's already sensitive
         is_currently_sensitive = current_item.get('is_sensitive', False)
         will_be_sensitive = kwargs.get('is_sensitive', is_currently_sensitive)
@@ -782,8 +1137,8 @@ class DBManager:
                     value = json.dumps(value)
                 # Handle content encryption for sensitive items
                 elif field == 'content' and will_be_sensitive and value:
-                    from core.encryption_manager import EncryptionManager
-                    encryption_manager = EncryptionManager()
+                    from core.encryption_manager import get_encryption_manager
+                    encryption_manager = get_encryption_manager()
                     # Only encrypt if not already encrypted
                     if not encryption_manager.is_encrypted(value):
                         value = encryption_manager.encrypt(value)
@@ -798,6 +1153,7 @@ class DBManager:
             query = f"UPDATE items SET {', '.join(updates)} WHERE id = ?"
             self.execute_update(query, tuple(params))
             logger.info(f"Item updated: ID {item_id}")
+            self._notify_items_changed(ITEM_UPDATED, [item_id])
 
     def delete_item(self, item_id: int) -> None:
         """
@@ -809,6 +1165,90 @@ class DBManager:
         query = "DELETE FROM items WHERE id = ?"
         self.execute_update(query, (item_id,))
         logger.info(f"Item deleted: ID {item_id}")
+        self._notify_items_changed(ITEM_DELETED, [item_id])
+
+    def bulk_update_items(self, item_ids: List[int], **fields) -> Dict[int, str]:
+        """
+        Set the same field values on many items in one transaction
+
+        Items are updated with UPDATE ... WHERE id IN (...) in chunks of
+        BULK_CHUNK_SIZE and listeners get a single ITEM_UPDATED event.
+
+        Args:
+            item_ids: Item IDs to update
+            **fields: Fields to set (any of ITEM_UPDATE_FIELDS except content
+                      and is_sensitive, which need per-item encryption)
+
+        Returns:
+            Dict[int, str]: item_id -> ITEM_UPDATED o ITEM_NOT_FOUND
+
+        Raises:
+            ValueError: If no fields are given or a field cannot be bulk updated
+
+        Example:
+            outcomes = db.bulk_update_items([1, 2, 3], is_archived=1)
+        """
+        if not fields:
+            raise ValueError("No fields to update")
+        invalid = [field for field in fields
+                   if field not in ITEM_UPDATE_FIELDS or field in _PER_ITEM_FIELDS]
+        if invalid:
+            raise ValueError(f"Fields cannot be bulk updated: {', '.join(invalid)}")
+
+        values = [json.dumps(value) if field == 'tags' else value for field, value in fields.items()]
+        assignments = ', '.join(f"{field} = ?" for field in fields)
+
+        item_ids = list(dict.fromkeys(item_ids))
+        found = set()
+        with self.transaction() as conn:
+            for start in range(0, len(item_ids), BULK_CHUNK_SIZE):
+                chunk = item_ids[start:start + BULK_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                found.update(row[0] for row in conn.execute(
+                    f"SELECT id FROM items WHERE id IN ({placeholders})", chunk
+                ))
+                conn.execute(
+                    f"UPDATE items SET {assignments}, updated_at = CURRENT_TIMESTAMP "
+                    f"WHERE id IN ({placeholders})",
+                    (*values, *chunk)
+                )
+
+        outcomes = {item_id: ITEM_UPDATED if item_id in found else ITEM_NOT_FOUND
+                    for item_id in item_ids}
+        updated_ids = [item_id for item_id in item_ids if item_id in found]
+        logger.info(f"Bulk update of {', '.join(fields)}: {len(updated_ids)} items updated, "
+                    f"{len(item_ids) - len(updated_ids)} not found")
+        self._notify_items_changed(ITEM_UPDATED, updated_ids)
+        return outcomes
+
+    def bulk_delete_items(self, item_ids: List[int]) -> Dict[int, str]:
+        """
+        Delete many items in one transaction
+
+        Args:
+            item_ids: Item IDs to delete
+
+        Returns:
+            Dict[int, str]: item_id -> ITEM_DELETED o ITEM_NOT_FOUND
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        found = set()
+        with self.transaction() as conn:
+            for start in range(0, len(item_ids), BULK_CHUNK_SIZE):
+                chunk = item_ids[start:start + BULK_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                found.update(row[0] for row in conn.execute(
+                    f"SELECT id FROM items WHERE id IN ({placeholders})", chunk
+                ))
+                conn.execute(f"DELETE FROM items WHERE id IN ({placeholders})", chunk)
+
+        outcomes = {item_id: ITEM_DELETED if item_id in found else ITEM_NOT_FOUND
+                    for item_id in item_ids}
+        deleted_ids = [item_id for item_id in item_ids if item_id in found]
+        logger.info(f"Bulk delete: {len(deleted_ids)} items deleted, "
+                    f"{len(item_ids) - len(deleted_ids)} not found")
+        self._notify_items_changed(ITEM_DELETED, deleted_ids)
+        return outcomes
 
     def update_last_used(self, item_id: int) -> None:
         """
@@ -820,16 +1260,20 @@ class DBManager:
         query = "UPDATE items SET last_used = CURRENT_TIMESTAMP WHERE id = ?"
         self.execute_update(query, (item_id,))
         logger.debug(f"Last used updated: ID {item_id}")
+        self._notify_items_changed(ITEM_UPDATED, [item_id])
 
-    def get_all_items(self, include_inactive: bool = False) -> List[Dict]:
+    def get_all_items(self, include_inactive: bool = False, lazy_content: bool = False) -> List[Dict]:
         """
         Get ALL items from ALL categories with category info
 
         Args:
             include_inactive: Include items from inactive categories
+            lazy_content: If True, sensitive content is returned as an
+                          EncryptedContent handle (decrypted on reveal)
 
         Returns:
-            List[Dict]: List of all items with category_name, category_icon, category_color
+            List[Dict]: List of all items with category_name, category_icon, category_color,
+                        category_is_active
         """
         query = """
             SELECT
@@ -837,6 +1281,7 @@ class DBManager:
                 c.name as category_name,
                 c.icon as category_icon,
                 c.color as category_color,
+                c.is_active as category_is_active,
                 c.id as category_id
             FROM items i
             JOIN categories c ON i.category_id = c.id
@@ -845,11 +1290,7 @@ class DBManager:
         """
         results = self.execute_query(query, (include_inactive,))
 
-        # Initialize encryption manager for decrypting sensitive items
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
-
-        # Parse tags and decrypt sensitive content
+        # Parse tags
         for item in results:
             # Parse tags from JSON or CSV format
             if item['tags']:
@@ -865,20 +1306,57 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
-            if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+        # Decrypt sensitive content in one batched call
+        self._decrypt_sensitive_items(results, lazy=lazy_content)
+
+        return results
+
+    def get_items_by_ids(self, item_ids: List[int], lazy_content: bool = False) -> List[Dict]:
+        """
+        Get specific items with category info (same columns as get_all_items)
+
+        Args:
+            item_ids: Item IDs to fetch
+            lazy_content: If True, sensitive content is returned as an
+                          EncryptedContent handle (decrypted on reveal)
+
+        Returns:
+            List[Dict]: Existing items among item_ids (deleted IDs are skipped)
+        """
+        if not item_ids:
+            return []
+
+        results = []
+        # Respetar el límite de parámetros de SQLite
+        chunk_size = 500
+        for start in range(0, len(item_ids), chunk_size):
+            chunk = list(item_ids[start:start + chunk_size])
+            placeholders = ', '.join('?' * len(chunk))
+            query = f"""
+                SELECT
+                    i.*,
+                    c.name as category_name,
+                    c.icon as category_icon,
+                    c.color as category_color,
+                    c.is_active as category_is_active,
+                    c.id as category_id
+                FROM items i
+                JOIN categories c ON i.category_id = c.id
+                WHERE i.id IN ({placeholders})
+            """
+            results.extend(self.execute_query(query, tuple(chunk)))
+
+        for item in results:
+            item['tags'] = self._parse_tags_value(item['tags'])
+
+        # Decrypt sensitive content in one batched call
+        self._decrypt_sensitive_items(results, lazy=lazy_content)
 
         return results
 
     def search_items(self, search_query: str, limit: int = 50) -> List[Dict]:
         """
-        Search items by label or content
+        Search items by label or content (substring) or tag (exact)
 
         Args:
             search_query: Search text
@@ -891,14 +1369,16 @@ class DBManager:
             SELECT i.*, c.name as category_name
             FROM items i
             JOIN categories c ON i.category_id = c.id
-            WHERE i.label LIKE ? OR i.content LIKE ? OR i.tags LIKE ?
+            WHERE i.label LIKE ? OR i.content LIKE ? OR i.id IN ({tagged_items})
             ORDER BY i.last_used DESC
             LIMIT ?
         """
+        # Tags: coincidencia exacta por el índice de tags ("git" no encuentra "github")
+        tagged_items, tag_params = tagged_items_subquery([search_query])
         search_pattern = f"%{search_query}%"
         results = self.execute_query(
-            query,
-            (search_pattern, search_pattern, search_pattern, limit)
+            query.format(tagged_items=tagged_items),
+            (search_pattern, search_pattern, *tag_params, limit)
         )
 
         # Parse tags
@@ -918,6 +1398,190 @@ class DBManager:
 
         return results
 
+    # ========== TAGS ==========
+
+    def get_tag_counts(self, item_ids: Optional[List[int]] = None,
+                       active_categories_only: bool = False) -> Dict[str, int]:
+        """
+        Count items per tag using the normalized tag index
+
+        Without item_ids the counts are the materialized tags.item_count
+        (one row per tag, no join over the items).
+
+        Args:
+            item_ids: Restrict the count to these items (None for all items)
+            active_categories_only: Without item_ids, leave out the items of
+                inactive categories and items without category (their links
+                are subtracted from the materialized counts)
+
+        Returns:
+            Dict[str, int]: Tag -> item count, most used first
+        """
+        if item_ids is None:
+            rows = self.execute_query("""
+                SELECT name, item_count as count
+                FROM tags
+                WHERE item_count > 0
+            """)
+            if active_categories_only:
+                rows.extend(
+                    {'name': row['name'], 'count': -row['count']} for row in self.execute_query("""
+                        SELECT t.name, COUNT(*) as count
+                        FROM items i
+                        JOIN item_tags it ON it.item_id = i.id
+                        JOIN tags t ON t.id = it.tag_id
+                        WHERE i.category_id IS NULL
+                           OR i.category_id IN (SELECT id FROM categories WHERE is_active = 0)
+                        GROUP BY it.tag_id
+                    """)
+                )
+        else:
+            rows = []
+            unique_ids = list(dict.fromkeys(item_ids))
+            for start in range(0, len(unique_ids), BULK_CHUNK_SIZE):
+                chunk = unique_ids[start:start + BULK_CHUNK_SIZE]
+                rows.extend(self.execute_query(f"""
+                    SELECT t.name, COUNT(*) as count
+                    FROM item_tags it
+                    JOIN tags t ON t.id = it.tag_id
+                    WHERE it.item_id IN ({', '.join('?' * len(chunk))})
+                    GROUP BY it.tag_id
+                """, tuple(chunk)))
+
+        counts: Dict[str, int] = {}
+        for row in rows:
+            counts[row['name']] = counts.get(row['name'], 0) + row['count']
+        counts = {tag: count for tag, count in counts.items() if count > 0}
+        return dict(sorted(counts.items(), key=lambda entry: entry[1], reverse=True))
+
+    # ========== FULL-TEXT SEARCH ==========
+
+    def search_item_ids_fts(self, search_query: str, limit: Optional[int] = None,
+                            category_id: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Get IDs of items matching the query, best bm25 rank first
+
+        Pass category_id and/or limit when only part of the database is
+        needed: the filter and the limit run inside the FTS query, so the
+        cost follows the scope instead of the size of the whole database.
+
+        Args:
+            search_query: Search text (each word is matched as a prefix)
+            limit: Maximum results (None for all matches)
+            category_id: Only items of this category (None for all items)
+
+        Returns:
+            Optional[List[int]]: Ranked item IDs, or None if the FTS index is
+            unavailable (callers should fall back to their own scan)
+        """
+        if not self.fts_enabled:
+            return None
+
+        match_query = build_match_query(search_query)
+        if match_query is None:
+            return []
+
+        weights = ', '.join(str(w) for w in FTS_BM25_WEIGHTS)
+        params = [match_query]
+        if category_id is None:
+            query = f"""
+                SELECT rowid FROM items_fts
+                WHERE items_fts MATCH ?
+                ORDER BY bm25(items_fts, {weights})
+                LIMIT ?
+            """
+        else:
+            query = f"""
+                SELECT items_fts.rowid FROM items_fts
+                JOIN items i ON i.id = items_fts.rowid
+                WHERE items_fts MATCH ? AND i.category_id = ?
+                ORDER BY bm25(items_fts, {weights})
+                LIMIT ?
+            """
+            params.append(category_id)
+        params.append(-1 if limit is None else limit)
+
+        conn = self.connect()
+        rows = conn.execute(query, params).fetchall()
+        return [row[0] for row in rows]
+
+    def search_items_fts(self, search_query: str, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """
+        Search items using the FTS5 index with bm25 ranking
+
+        Args:
+            search_query: Search text (each word is matched as a prefix)
+            limit: Maximum results
+            offset: Number of ranked results to skip (pagination)
+
+        Returns:
+            List[Dict]: Matching items with category_name plus:
+                - rank: bm25 score (lower is better)
+                - snippet: Best matching fragment with <mark> tags
+                - match_offsets: {column: [(start, end), ...]} character offsets
+        """
+        if not self.fts_enabled:
+            logger.debug("FTS index unavailable, using LIKE search")
+            return self.search_items(search_query, limit=limit)
+
+        match_query = build_match_query(search_query)
+        if match_query is None:
+            return []
+
+        weights = ', '.join(str(w) for w in FTS_BM25_WEIGHTS)
+        highlight_columns = ', '.join(
+            f"highlight(items_fts, {index}, '{HIGHLIGHT_OPEN}', '{HIGHLIGHT_CLOSE}') AS hl_{column}"
+            for index, column in enumerate(FTS_COLUMNS)
+        )
+        query = f"""
+            SELECT i.*, c.name as category_name,
+                   bm25(items_fts, {weights}) AS rank,
+                   snippet(items_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet,
+                   {highlight_columns}
+            FROM items_fts
+            JOIN items i ON i.id = items_fts.rowid
+            JOIN categories c ON i.category_id = c.id
+            WHERE items_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """
+        results = self.execute_query(query, (match_query, limit, offset))
+
+        for item in results:
+            item['match_offsets'] = {}
+            for column in FTS_COLUMNS:
+                offsets = parse_highlight_offsets(item.pop(f'hl_{column}'))
+                if offsets:
+                    item['match_offsets'][column] = offsets
+
+            # Parse tags from JSON or CSV format
+            if item['tags']:
+                try:
+                    item['tags'] = json.loads(item['tags'])
+                except json.JSONDecodeError:
+                    if isinstance(item['tags'], str):
+                        item['tags'] = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
+                    else:
+                        item['tags'] = []
+            else:
+                item['tags'] = []
+
+        logger.debug(f"FTS search '{search_query}': {len(results)} results")
+        return results
+
+    def rebuild_search_index(self) -> int:
+        """
+        Rebuild the full-text index from the items table
+
+        Returns:
+            int: Number of indexed items (0 if FTS is unavailable)
+        """
+        if not self.fts_enabled:
+            return 0
+        count = rebuild_fts_index(self.connect())
+        logger.info(f"Search index rebuilt: {count} items")
+        return count
+
     # ========== LISTAS AVANZADAS ==========
 
     def create_list(self, category_id: int, list_name: str, items_data: List[Dict[str, Any]]) -> List[int]:
@@ -1033,10 +1697,7 @@ class DBManager:
         """
         results = self.execute_query(query, (category_id, list_group))
 
-        # Desencriptar y parsear tags (mismo proceso que en get_items_by_category)
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
-
+        # Parsear tags (mismo proceso que en get_items_by_category)
         for item in results:
             # Parse tags
             if item['tags']:
@@ -1050,14 +1711,8 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
-            if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+        # Decrypt sensitive content in one batched call
+        self._decrypt_sensitive_items(results)
 
         logger.debug(f"Obtenidos {len(results)} items de lista '{list_group}'")
         return results
@@ -1088,6 +1743,11 @@ class DBManager:
             logger.debug(f"Item {item_id} ya está en la posición {new_orden}")
             return True
 
+        # Items de la lista (todos pueden cambiar de posición)
+        list_item_ids = self._get_item_ids(
+            "category_id = ? AND list_group = ?", (category_id, list_group)
+        )
+
         try:
             with self.transaction() as conn:
                 cursor = conn.cursor()
@@ -1124,7 +1784,9 @@ class DBManager:
                 """, (new_orden, item_id))
 
                 logger.info(f"Item {item_id} reordenado de posición {old_orden} a {new_orden} en lista '{list_group}'")
-                return True
+
+            self._notify_items_changed(ITEM_UPDATED, list_item_ids)
+            return True
 
         except Exception as e:
             logger.error(f"Error al reordenar item {item_id}: {e}")
@@ -1148,13 +1810,18 @@ class DBManager:
                 AND list_group = ?
                 AND is_list = 1
             """
+            item_ids = self._get_item_ids(
+                "category_id = ? AND list_group = ? AND is_list = 1", (category_id, list_group)
+            )
             with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, (category_id, list_group))
                 deleted_count = cursor.rowcount
 
                 logger.info(f"Lista '{list_group}' eliminada ({deleted_count} items) de categoría {category_id}")
-                return True
+
+            self._notify_items_changed(ITEM_DELETED, item_ids)
+            return True
 
         except Exception as e:
             logger.error(f"Error al eliminar lista '{list_group}': {e}")
@@ -1178,6 +1845,7 @@ class DBManager:
         Returns:
             bool: True si se actualizó exitosamente
         """
+        renamed_ids = []
         try:
             with self.transaction() as conn:
                 # Caso 1: Solo renombrar
@@ -1186,6 +1854,10 @@ class DBManager:
                     if not self.is_list_name_unique(category_id, new_list_group, exclude_list=old_list_group):
                         raise ValueError(f"El nombre '{new_list_group}' ya existe en esta categoría")
 
+                    renamed_ids = self._get_item_ids(
+                        "category_id = ? AND list_group = ? AND is_list = 1",
+                        (category_id, old_list_group)
+                    )
                     cursor = conn.cursor()
                     cursor.execute("""
                         UPDATE items
@@ -1208,7 +1880,8 @@ class DBManager:
 
                     logger.info(f"Lista '{final_list_name}' actualizada con {len(items_data)} items")
 
-                return True
+            self._notify_items_changed(ITEM_UPDATED, renamed_ids)
+            return True
 
         except Exception as e:
             logger.error(f"Error al actualizar lista '{old_list_group}': {e}")
@@ -1310,15 +1983,14 @@ class DBManager:
         Args:
             keep_latest: Number of entries to keep
         """
+        # Los ids crecen con cada copia y solo se borran las más antiguas:
+        # MAX(id) - N es el corte, y el DELETE es un rango de rowid en vez
+        # de recorrer la tabla con NOT IN en cada add
         query = """
             DELETE FROM clipboard_history
-            WHERE id NOT IN (
-                SELECT id FROM clipboard_history
-                ORDER BY copied_at DESC
-                LIMIT ?
-            )
+            WHERE id <= (SELECT MAX(id) FROM clipboard_history) - ?
         """
-        self.execute_update(query, (keep_latest,))
+        self.execute_update(query, (max(int(keep_latest), 0),))
         logger.debug(f"History trimmed to {keep_latest} entries")
 
     # ========== PINNED PANELS ==========
@@ -1467,6 +2139,24 @@ class DBManager:
         self.execute_update(query, (panel_id,))
         logger.debug(f"Panel {panel_id} opened - statistics updated")
 
+    def update_panels_last_opened(self, panel_ids: List[int]) -> None:
+        """
+        Update last_opened and open_count of several panels in one transaction
+
+        Args:
+            panel_ids: Panel IDs
+        """
+        if not panel_ids:
+            return
+        query = """
+            UPDATE pinned_panels
+            SET last_opened = CURRENT_TIMESTAMP,
+                open_count = open_count + 1
+            WHERE id = ?
+        """
+        self.execute_many(query, [(panel_id,) for panel_id in panel_ids])
+        logger.debug(f"{len(panel_ids)} panels opened - statistics updated")
+
     def delete_pinned_panel(self, panel_id: int) -> bool:
         """
         Remove a pinned panel from database
@@ -2558,6 +3248,7 @@ class DBManager:
                 )
 
             logger.info(f"Updated item_count for category {category_id}: {count} items")
+            self._notify_categories_changed(CATEGORY_UPDATED, [category_id])
 
         except Exception as e:
             logger.error(f"Error updating category item_count for {category_id}: {e}")
@@ -0,0 +1,171 @@
+"""
+File storage schema for PATH items
+Ensures the file metadata columns of items, the partial index used by
+duplicate detection, the file_blobs table of the content-addressed
+storage mode (one blob per SHA256, reference-counted by triggers) and
+the storage catalog tables (size/type/mtime per file on disk)
+"""
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Columnas de metadatos de archivo en items (antes solo las agregaba
+# util/migrations/migrate_add_file_metadata.py)
+FILE_COLUMNS = {
+    'file_size': 'INTEGER DEFAULT NULL',
+    'file_type': 'VARCHAR(50) DEFAULT NULL',
+    'file_extension': 'VARCHAR(10) DEFAULT NULL',
+    'original_filename': 'VARCHAR(255) DEFAULT NULL',
+    'file_hash': 'VARCHAR(64) DEFAULT NULL'
+}
+
+# Columnas de file_blobs agregadas después de su creación
+BLOB_COLUMNS = {
+    'released_at': 'TIMESTAMP DEFAULT NULL'
+}
+
+_FILE_STORAGE_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_items_file_hash
+    ON items(file_hash) WHERE file_hash IS NOT NULL;
+
+    CREATE TABLE IF NOT EXISTS file_blobs (
+        file_hash VARCHAR(64) PRIMARY KEY,
+        relative_path TEXT NOT NULL,
+        file_size INTEGER DEFAULT 0,
+        ref_count INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        released_at TIMESTAMP DEFAULT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_file_blobs_unreferenced
+    ON file_blobs(ref_count) WHERE ref_count <= 0;
+
+    -- Catálogo de almacenamiento: un root es una carpeta catalogada
+    -- ('files' = almacenamiento de archivos, 'profile:<id>' = perfil del navegador)
+    CREATE TABLE IF NOT EXISTS storage_catalog_files (
+        root TEXT NOT NULL,
+        rel_path TEXT NOT NULL,
+        rel_dir TEXT NOT NULL,
+        folder TEXT NOT NULL,
+        file_type TEXT NOT NULL,
+        size INTEGER NOT NULL DEFAULT 0,
+        mtime_ns INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (root, rel_path)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_storage_catalog_files_dir
+    ON storage_catalog_files(root, rel_dir);
+
+    CREATE TABLE IF NOT EXISTS storage_catalog_dirs (
+        root TEXT NOT NULL,
+        rel_dir TEXT NOT NULL,
+        parent TEXT,
+        mtime_ns INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (root, rel_dir)
+    ) WITHOUT ROWID;
+
+    -- Totales por (root, carpeta, tipo) mantenidos por triggers: las
+    -- estadísticas se leen de aquí sin recorrer archivos
+    CREATE TABLE IF NOT EXISTS storage_catalog_totals (
+        root TEXT NOT NULL,
+        folder TEXT NOT NULL,
+        file_type TEXT NOT NULL,
+        file_count INTEGER NOT NULL DEFAULT 0,
+        total_size INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (root, folder, file_type)
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS storage_catalog_totals_ai
+    AFTER INSERT ON storage_catalog_files
+    BEGIN
+        INSERT OR IGNORE INTO storage_catalog_totals (root, folder, file_type)
+        VALUES (new.root, new.folder, new.file_type);
+        UPDATE storage_catalog_totals
+        SET file_count = file_count + 1, total_size = total_size + new.size
+        WHERE root = new.root AND folder = new.folder AND file_type = new.file_type;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS storage_catalog_totals_ad
+    AFTER DELETE ON storage_catalog_files
+    BEGIN
+        UPDATE storage_catalog_totals
+        SET file_count = file_count - 1, total_size = total_size - old.size
+        WHERE root = old.root AND folder = old.folder AND file_type = old.file_type;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS storage_catalog_totals_au
+    AFTER UPDATE ON storage_catalog_files
+    BEGIN
+        UPDATE storage_catalog_totals
+        SET file_count = file_count - 1, total_size = total_size - old.size
+        WHERE root = old.root AND folder = old.folder AND file_type = old.file_type;
+        INSERT OR IGNORE INTO storage_catalog_totals (root, folder, file_type)
+        VALUES (new.root, new.folder, new.file_type);
+        UPDATE storage_catalog_totals
+        SET file_count = file_count + 1, total_size = total_size + new.size
+        WHERE root = new.root AND folder = new.folder AND file_type = new.file_type;
+    END;
+"""
+
+# ref_count = número de items con ese file_hash; los triggers lo mantienen
+# sin importar qué código inserte, borre o edite el item. released_at marca
+# el momento en que un item dejó de referenciar el blob. Se recrean en cada
+# arranque para reemplazar las versiones anteriores (sin released_at ni WHEN).
+_FILE_BLOB_TRIGGERS = """
+    DROP TRIGGER IF EXISTS file_blobs_ref_ai;
+    DROP TRIGGER IF EXISTS file_blobs_ref_ad;
+    DROP TRIGGER IF EXISTS file_blobs_ref_au;
+
+    CREATE TRIGGER file_blobs_ref_ai
+    AFTER INSERT ON items WHEN new.file_hash IS NOT NULL
+    BEGIN
+        UPDATE file_blobs SET ref_count = ref_count + 1 WHERE file_hash = new.file_hash;
+    END;
+
+    CREATE TRIGGER file_blobs_ref_ad
+    AFTER DELETE ON items WHEN old.file_hash IS NOT NULL
+    BEGIN
+        UPDATE file_blobs SET ref_count = ref_count - 1, released_at = CURRENT_TIMESTAMP
+        WHERE file_hash = old.file_hash;
+    END;
+
+    CREATE TRIGGER file_blobs_ref_au
+    AFTER UPDATE OF file_hash ON items WHEN old.file_hash IS NOT new.file_hash
+    BEGIN
+        UPDATE file_blobs SET ref_count = ref_count - 1, released_at = CURRENT_TIMESTAMP
+        WHERE file_hash = old.file_hash;
+        UPDATE file_blobs SET ref_count = ref_count + 1 WHERE file_hash = new.file_hash;
+    END;
+"""
+
+
+def ensure_file_storage_schema(conn: sqlite3.Connection) -> None:
+    """
+    Add the missing file metadata columns to items and create the
+    file_hash index, the file_blobs table, the storage catalog tables
+    and their triggers
+
+    Args:
+        conn: SQLite connection
+    """
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+    added = []
+    for column_name, column_def in FILE_COLUMNS.items():
+        if column_name not in existing_columns:
+            conn.execute(f"ALTER TABLE items ADD COLUMN {column_name} {column_def}")
+            added.append(column_name)
+
+    conn.executescript(_FILE_STORAGE_SCHEMA)
+    existing_blob_columns = {row[1] for row in conn.execute("PRAGMA table_info(file_blobs)")}
+    for column_name, column_def in BLOB_COLUMNS.items():
+        if column_name not in existing_blob_columns:
+            conn.execute(f"ALTER TABLE file_blobs ADD COLUMN {column_name} {column_def}")
+            added.append(f"file_blobs.{column_name}")
+    conn.executescript(_FILE_BLOB_TRIGGERS)
+    conn.commit()
+
+    if added:
+        logger.info(f"File storage columns added: {', '.join(added)}")
@@ -0,0 +1,178 @@
+"""
+Full-text index for items (SQLite FTS5)
+Keeps an items_fts virtual table in sync with the items table through triggers
+and builds safe MATCH expressions from free-text user queries
+"""
+
+import re
+import sqlite3
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Columnas indexadas (en orden; los pesos de bm25 siguen este mismo orden)
+FTS_COLUMNS = ('label', 'content', 'tags', 'description', 'list_group')
+
+# Pesos bm25 por columna: el label pesa más que el contenido
+FTS_BM25_WEIGHTS = (10.0, 1.0, 5.0, 2.0, 3.0)
+
+# El contenido de items sensibles nunca entra al índice
+_CONTENT_EXPR = "CASE WHEN {row}.is_sensitive THEN '' ELSE {row}.content END"
+
+_FTS_SCHEMA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        {', '.join(FTS_COLUMNS)},
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts (rowid, label, content, tags, description, list_group)
+        VALUES (new.id, new.label, {_CONTENT_EXPR.format(row='new')},
+                new.tags, new.description, new.list_group);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        DELETE FROM items_fts WHERE rowid = old.id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS items_fts_au
+    AFTER UPDATE OF label, content, tags, description, list_group, is_sensitive ON items
+    BEGIN
+        DELETE FROM items_fts WHERE rowid = old.id;
+        INSERT INTO items_fts (rowid, label, content, tags, description, list_group)
+        VALUES (new.id, new.label, {_CONTENT_EXPR.format(row='new')},
+                new.tags, new.description, new.list_group);
+    END;
+"""
+
+_FTS_BACKFILL = f"""
+    INSERT INTO items_fts (rowid, label, content, tags, description, list_group)
+    SELECT id, label, {_CONTENT_EXPR.format(row='items')}, tags, description, list_group
+    FROM items
+"""
+
+# Marcadores internos usados por highlight() para calcular offsets
+HIGHLIGHT_OPEN = '\x02'
+HIGHLIGHT_CLOSE = '\x03'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_table_exists(conn: sqlite3.Connection) -> bool:
+    """
+    Check if the items_fts virtual table exists
+
+    Args:
+        conn: SQLite connection
+
+    Returns:
+        bool: True if the index is present
+    """
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def ensure_fts_index(conn: sqlite3.Connection) -> bool:
+    """
+    Create the FTS5 index and its sync triggers if missing, backfilling
+    existing items on first creation
+
+    Args:
+        conn: SQLite connection
+
+    Returns:
+        bool: True if the index is available, False if FTS5 is not supported
+    """
+    try:
+        if fts_table_exists(conn):
+            # Re-create triggers in case an older schema dropped them
+            conn.executescript(_FTS_SCHEMA)
+            return True
+
+        conn.executescript(_FTS_SCHEMA)
+        conn.execute(_FTS_BACKFILL)
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM items_fts").fetchone()[0]
+        logger.info(f"FTS index created and backfilled: {count} items")
+        return True
+
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 not available, falling back to LIKE search: {e}")
+        conn.rollback()
+        return False
+
+
+def rebuild_fts_index(conn: sqlite3.Connection) -> int:
+    """
+    Drop and repopulate the FTS index content from the items table
+
+    Args:
+        conn: SQLite connection
+
+    Returns:
+        int: Number of indexed items
+    """
+    conn.execute("DELETE FROM items_fts")
+    conn.execute(_FTS_BACKFILL)
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM items_fts").fetchone()[0]
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Convert free text into an FTS5 MATCH expression
+
+    Each word becomes a quoted prefix term and all terms must match, so user
+    input never reaches the FTS query syntax (no operator injection).
+
+    Args:
+        text: User search text
+
+    Returns:
+        Optional[str]: MATCH expression, or None if text has no searchable words
+
+    Example:
+        "git pu" -> '"git"* "pu"*'
+    """
+    if not text:
+        return None
+
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def parse_highlight_offsets(marked_text: Optional[str]) -> list:
+    """
+    Extract (start, end) character offsets from text produced by highlight()
+    with HIGHLIGHT_OPEN / HIGHLIGHT_CLOSE markers
+
+    Args:
+        marked_text: Column text with markers around matched tokens
+
+    Returns:
+        list: List of (start, end) tuples relative to the unmarked text
+    """
+    if not marked_text:
+        return []
+
+    offsets = []
+    position = 0
+    start = None
+    for char in marked_text:
+        if char == HIGHLIGHT_OPEN:
+            start = position
+        elif char == HIGHLIGHT_CLOSE:
+            if start is not None:
+                offsets.append((start, position))
+            start = None
+        else:
+            position += 1
+    return offsets
@@ -108,21 +108,8 @@ def migrate_json_to_sqlite(
 
                 # Add items for this category
                 items = cat_data.get('items', [])
-                for item_data in items:
-                    # Determine item type
-                    content = item_data['content']
-                    item_type = _determine_item_type(content)
-
-                    db.add_item(
-                        category_id=cat_id,
-                        label=item_data['label'],
-                        content=content,
-                        item_type=item_type,
-                        icon=item_data.get('icon'),
-                        is_sensitive=item_data.get('is_sensitive', False),
-                        tags=item_data.get('tags', [])
-                    )
-                    stats['items'] += 1
+                db.add_items_bulk(cat_id, _item_rows(items))
+                stats['items'] += len(items)
 
                 print(f"   ✓ {cat_data['name']}: {len(items)} items")
 
@@ -147,20 +134,8 @@ def migrate_json_to_sqlite(
 
                 # Add items
                 items = cat_data.get('items', [])
-                for item_data in items:
-                    content = item_data['content']
-                    item_type = _determine_item_type(content)
-
-                    db.add_item(
-                        category_id=cat_id,
-                        label=item_data['label'],
-                        content=content,
-                        item_type=item_type,
-                        icon=item_data.get('icon'),
-                        is_sensitive=item_data.get('is_sensitive', False),
-                        tags=item_data.get('tags', [])
-                    )
-                    custom_items_count += 1
+                db.add_items_bulk(cat_id, _item_rows(items))
+                custom_items_count += len(items)
 
                 print(f"   ✓ {cat_data['name']}: {len(items)} items")
 
@@ -216,6 +191,29 @@ def migrate_json_to_sqlite(
         raise
 
 
+def _item_rows(items_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert JSON items to DBManager.add_items_bulk() rows
+
+    Args:
+        items_data: Items of a category from the JSON config
+
+    Returns:
+        List[Dict[str, Any]]: Rows with the type determined from the content
+    """
+    return [
+        {
+            'label': item_data['label'],
+            'content': item_data['content'],
+            'item_type': _determine_item_type(item_data['content']),
+            'icon': item_data.get('icon'),
+            'is_sensitive': item_data.get('is_sensitive', False),
+            'tags': item_data.get('tags', [])
+        }
+        for item_data in items_data
+    ]
+
+
 def _determine_item_type(content: str) -> str:
     """
     Determine item type based on content
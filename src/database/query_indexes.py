@@ -0,0 +1,51 @@
+"""
+Indexes for the hot usage/history and favorites queries
+Composite indexes created on new and existing databases, so the usage
+tracker, statistics, notifications and favorites queries search an index
+instead of scanning item_usage_history or items
+(tests/test_query_plans.py checks it with EXPLAIN QUERY PLAN)
+"""
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# nombre -> (tabla, columnas); solo se crean si la tabla tiene las columnas
+HOT_QUERY_INDEXES = {
+    # Historial de un item ordenado por fecha (get_usage_history, get_last_error,
+    # borrado del historial de un item)
+    'idx_item_usage_history_item_used': ('item_usage_history', ('item_id', 'used_at')),
+    # Ventanas por fecha (get_recent_history, get_today_usage, compactación);
+    # success en el índice cubre los conteos de éxitos/fallos por rango
+    'idx_item_usage_history_used_success': ('item_usage_history', ('used_at', 'success')),
+    # Listado ordenado de favoritos y sus conteos
+    'idx_items_favorite_order': ('items', ('is_favorite', 'favorite_order')),
+}
+
+
+def ensure_query_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Create the missing hot-query indexes
+
+    Args:
+        conn: SQLite connection
+    """
+    existing_indexes = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+
+    created = []
+    for index_name, (table, columns) in HOT_QUERY_INDEXES.items():
+        if index_name in existing_indexes:
+            continue
+        table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not table_columns.issuperset(columns):
+            continue
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({', '.join(columns)})")
+        created.append(index_name)
+    conn.commit()
+
+    if created:
+        logger.info(f"Query indexes created: {', '.join(created)}")
@@ -0,0 +1,226 @@
+"""
+Normalized tag index for items
+Keeps a tags table (one row per distinct tag) and an item_tags link table
+in sync with items.tags through triggers, so tag filters and tag counts are
+indexed joins with exact matches instead of LIKE '%tag%' scans.
+tags.item_count is the materialized tag frequency (tag cloud, available
+tags) kept by triggers on item_tags.
+"""
+
+import json
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Lista de tags de un items.tags JSON (vacía si el valor no es JSON válido)
+_JSON_TAGS = "json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END)"
+
+_LINK_TAGS = f"""
+        INSERT OR IGNORE INTO tags (name)
+        SELECT trim(value) FROM {_JSON_TAGS.format(row='new')}
+        WHERE type = 'text' AND trim(value) <> '';
+        INSERT OR IGNORE INTO item_tags (item_id, tag_id)
+        SELECT new.id, t.id FROM {_JSON_TAGS.format(row='new')} j
+        JOIN tags t ON t.name = trim(j.value)
+        WHERE j.type = 'text';
+"""
+
+_TAG_INDEX_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        item_count INTEGER NOT NULL DEFAULT 0
+    );
+
+    -- Los filtros comparan sin distinguir mayúsculas (como el LIKE anterior)
+    CREATE INDEX IF NOT EXISTS idx_tags_name_nocase ON tags(name COLLATE NOCASE);
+
+    CREATE TABLE IF NOT EXISTS item_tags (
+        item_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        PRIMARY KEY (item_id, tag_id)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_item_tags_tag ON item_tags(tag_id, item_id);
+
+    -- Frecuencia materializada: un enlace más o menos por tag
+    CREATE TRIGGER IF NOT EXISTS item_tags_count_ai AFTER INSERT ON item_tags
+    BEGIN
+        UPDATE tags SET item_count = item_count + 1 WHERE id = new.tag_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS item_tags_count_ad AFTER DELETE ON item_tags
+    BEGIN
+        UPDATE tags SET item_count = item_count - 1 WHERE id = old.tag_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS item_tags_ai AFTER INSERT ON items
+    BEGIN
+        {_LINK_TAGS}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS item_tags_au AFTER UPDATE OF tags ON items
+    BEGIN
+        DELETE FROM item_tags WHERE item_id = old.id;
+        {_LINK_TAGS}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS item_tags_ad AFTER DELETE ON items
+    BEGIN
+        DELETE FROM item_tags WHERE item_id = old.id;
+    END;
+"""
+
+
+def split_tags(value: Any) -> List[str]:
+    """
+    Parse an items.tags value (JSON list or legacy CSV) into distinct tags
+
+    Args:
+        value: Raw column value
+
+    Returns:
+        List[str]: Trimmed, non-empty tags in their original order
+    """
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+        tags = parsed if isinstance(parsed, list) else [parsed]
+    except (json.JSONDecodeError, TypeError):
+        tags = str(value).split(',')
+    return list(dict.fromkeys(
+        tag.strip() for tag in tags if isinstance(tag, str) and tag.strip()
+    ))
+
+
+def tag_index_exists(conn: sqlite3.Connection) -> bool:
+    """
+    Check if the item_tags table exists
+
+    Args:
+        conn: SQLite connection
+
+    Returns:
+        bool: True if the index is present
+    """
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_tags'"
+    ).fetchone()
+    return row is not None
+
+
+def tagged_items_subquery(tags: Iterable[str]) -> Tuple[str, List[str]]:
+    """
+    Build a subquery with the IDs of the items that have any of the tags
+
+    Matching is exact per tag and case-insensitive. Use it as
+    "id IN (...)" / "id NOT IN (...)".
+
+    Args:
+        tags: Tag names
+
+    Returns:
+        Tuple[str, List[str]]: (SQL subquery, parameters)
+    """
+    names = list(dict.fromkeys(tag.strip() for tag in tags if tag and tag.strip()))
+    if not names:
+        return "SELECT NULL WHERE 0", []
+    placeholders = ', '.join('?' * len(names))
+    return (
+        "SELECT it.item_id FROM tags t JOIN item_tags it ON it.tag_id = t.id "
+        f"WHERE t.name COLLATE NOCASE IN ({placeholders})",
+        names
+    )
+
+
+def group_usage_counts(conn: sqlite3.Connection, group_tags: Dict[int, List[str]]) -> Dict[int, int]:
+    """
+    Count, in one query, the items that have any tag of each group
+
+    Args:
+        conn: SQLite connection
+        group_tags: Group ID -> tag names
+
+    Returns:
+        Dict[int, int]: Group ID -> distinct items (0 for groups without matches)
+    """
+    pairs = [(group_id, tag.strip()) for group_id, tags in group_tags.items()
+             for tag in tags if tag and tag.strip()]
+    counts = {group_id: 0 for group_id in group_tags}
+    if not pairs:
+        return counts
+
+    values = ', '.join('(?, ?)' for _ in pairs)
+    rows = conn.execute(f"""
+        WITH group_tags(group_id, name) AS (VALUES {values})
+        SELECT g.group_id, COUNT(DISTINCT it.item_id)
+        FROM group_tags g
+        JOIN tags t ON t.name = g.name COLLATE NOCASE
+        JOIN item_tags it ON it.tag_id = t.id
+        GROUP BY g.group_id
+    """, [value for pair in pairs for value in pair])
+    counts.update({group_id: count for group_id, count in rows})
+    return counts
+
+
+def rebuild_tag_index(conn: sqlite3.Connection) -> int:
+    """
+    Refill tags/item_tags from items.tags (JSON and legacy CSV values)
+
+    Args:
+        conn: SQLite connection
+
+    Returns:
+        int: Number of item-tag links
+    """
+    conn.execute("DELETE FROM item_tags")
+    conn.execute("DELETE FROM tags")
+
+    links: List[Tuple[int, str]] = []
+    for item_id, value in conn.execute(
+        "SELECT id, tags FROM items WHERE tags IS NOT NULL AND tags NOT IN ('', '[]')"
+    ):
+        links.extend((item_id, tag) for tag in split_tags(value))
+
+    conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)",
+                     ((tag,) for tag in dict.fromkeys(tag for _, tag in links)))
+    tag_ids: Dict[str, int] = {name: tag_id for tag_id, name in conn.execute("SELECT id, name FROM tags")}
+    conn.executemany("INSERT OR IGNORE INTO item_tags (item_id, tag_id) VALUES (?, ?)",
+                     ((item_id, tag_ids[tag]) for item_id, tag in links))
+    conn.commit()
+    return len(links)
+
+
+def ensure_tag_index(conn: sqlite3.Connection) -> None:
+    """
+    Create the tag tables and triggers, backfilling them from items.tags
+    on first creation
+
+    Args:
+        conn: SQLite connection
+    """
+    item_columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+    if 'tags' not in item_columns:
+        return
+
+    first_creation = not tag_index_exists(conn)
+
+    # Índices creados antes de la frecuencia materializada: agregar la columna y contar
+    tag_columns = {row[1] for row in conn.execute("PRAGMA table_info(tags)")}
+    if tag_columns and 'item_count' not in tag_columns:
+        conn.execute("ALTER TABLE tags ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0")
+        conn.execute("""
+            UPDATE tags SET item_count = (SELECT COUNT(*) FROM item_tags WHERE tag_id = tags.id)
+        """)
+        logger.info("Tag frequencies added to the tag index")
+
+    conn.executescript(_TAG_INDEX_SCHEMA)
+
+    if first_creation:
+        count = rebuild_tag_index(conn)
+        logger.info(f"Tag index created ({count} item tags backfilled)")
+    conn.commit()
@@ -0,0 +1,180 @@
+"""
+Usage rollups for item_usage_history
+Hourly and daily per-item aggregates (executions, successes, failures,
+summed/max execution time) maintained by triggers on every usage insert,
+so statistics read a few rollup rows instead of the raw history
+"""
+
+import sqlite3
+import logging
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Días que se conservan las filas crudas de item_usage_history y los
+# buckets por hora; los buckets diarios no se compactan
+RAW_HISTORY_RETENTION_DAYS = 90
+HOURLY_RETENTION_DAYS = 90
+
+_ROLLUP_COLUMNS = """
+        executions INTEGER NOT NULL DEFAULT 0,
+        successes INTEGER NOT NULL DEFAULT 0,
+        failures INTEGER NOT NULL DEFAULT 0,
+        total_time_ms INTEGER NOT NULL DEFAULT 0,
+        success_time_ms INTEGER NOT NULL DEFAULT 0,
+        max_time_ms INTEGER NOT NULL DEFAULT 0
+"""
+
+# Bucket de una fila: las fechas de item_usage_history están en UTC
+_HOUR_EXPR = "strftime('%Y-%m-%d %H:00:00', {row}.used_at)"
+_DAY_EXPR = "date({row}.used_at)"
+
+_ROLLUP_TRIGGER_BODY = """
+        INSERT OR IGNORE INTO {table} (item_id, {bucket}) VALUES (new.item_id, {expr});
+        UPDATE {table}
+        SET executions = executions + 1,
+            successes = successes + (CASE WHEN new.success THEN 1 ELSE 0 END),
+            failures = failures + (CASE WHEN new.success THEN 0 ELSE 1 END),
+            total_time_ms = total_time_ms + COALESCE(new.execution_time_ms, 0),
+            success_time_ms = success_time_ms
+                + (CASE WHEN new.success THEN COALESCE(new.execution_time_ms, 0) ELSE 0 END),
+            max_time_ms = MAX(max_time_ms, COALESCE(new.execution_time_ms, 0))
+        WHERE item_id = new.item_id AND {bucket} = {expr};
+"""
+
+_ROLLUP_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS item_usage_hourly (
+        item_id INTEGER NOT NULL,
+        hour TEXT NOT NULL,
+        {_ROLLUP_COLUMNS},
+        PRIMARY KEY (item_id, hour)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_item_usage_hourly_hour ON item_usage_hourly(hour);
+
+    CREATE TABLE IF NOT EXISTS item_usage_daily (
+        item_id INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        {_ROLLUP_COLUMNS},
+        PRIMARY KEY (item_id, day)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_item_usage_daily_day ON item_usage_daily(day);
+
+    CREATE TRIGGER IF NOT EXISTS item_usage_rollup_ai AFTER INSERT ON item_usage_history
+    BEGIN
+        {_ROLLUP_TRIGGER_BODY.format(table='item_usage_hourly', bucket='hour', expr=_HOUR_EXPR.format(row='new'))}
+        {_ROLLUP_TRIGGER_BODY.format(table='item_usage_daily', bucket='day', expr=_DAY_EXPR.format(row='new'))}
+    END;
+
+    -- Borrar la historia cruda (compactación) no toca los rollups; borrar el item sí
+    CREATE TRIGGER IF NOT EXISTS item_usage_rollup_item_ad AFTER DELETE ON items
+    BEGIN
+        DELETE FROM item_usage_hourly WHERE item_id = old.id;
+        DELETE FROM item_usage_daily WHERE item_id = old.id;
+    END;
+"""
+
+_BACKFILL = """
+    INSERT INTO {table} (item_id, {bucket}, executions, successes, failures,
+                         total_time_ms, success_time_ms, max_time_ms)
+    SELECT item_id, {expr},
+           COUNT(*),
+           SUM(CASE WHEN success THEN 1 ELSE 0 END),
+           SUM(CASE WHEN success THEN 0 ELSE 1 END),
+           SUM(COALESCE(execution_time_ms, 0)),
+           SUM(CASE WHEN success THEN COALESCE(execution_time_ms, 0) ELSE 0 END),
+           MAX(COALESCE(execution_time_ms, 0))
+    FROM item_usage_history h
+    GROUP BY item_id, {expr}
+"""
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_usage_rollups(conn: sqlite3.Connection) -> None:
+    """
+    Create the rollup tables and triggers, backfilling them from the
+    existing history on first creation
+
+    Args:
+        conn: SQLite connection
+    """
+    if not _table_exists(conn, 'item_usage_history'):
+        return
+
+    first_creation = not _table_exists(conn, 'item_usage_daily')
+    conn.executescript(_ROLLUP_SCHEMA)
+
+    if first_creation:
+        conn.execute(_BACKFILL.format(table='item_usage_hourly', bucket='hour',
+                                      expr=_HOUR_EXPR.format(row='h')))
+        conn.execute(_BACKFILL.format(table='item_usage_daily', bucket='day',
+                                      expr=_DAY_EXPR.format(row='h')))
+        count = conn.execute("SELECT COUNT(*) FROM item_usage_daily").fetchone()[0]
+        logger.info(f"Usage rollups created and backfilled: {count} daily buckets")
+    conn.commit()
+
+
+def rollup_window(days: int) -> Tuple[str, str, str]:
+    """
+    Pick the rollup table covering the last N days
+
+    Windows within the hourly retention use the hourly buckets (one hour
+    of precision, like the old datetime('now', '-N days') filters); longer
+    windows fall back to whole days. The source forces the bucket index:
+    without ANALYZE statistics SQLite prefers walking the whole primary
+    key to save the GROUP BY item_id sort.
+
+    Args:
+        days: Window size in days
+
+    Returns:
+        Tuple[str, str, str]: (origen para FROM, condición con un parámetro, valor del parámetro)
+
+    Example:
+        source, where, param = rollup_window(7)
+        cursor.execute(f"SELECT SUM(executions) FROM {source} WHERE {where}", (param,))
+    """
+    if days <= HOURLY_RETENTION_DAYS:
+        return ('item_usage_hourly INDEXED BY idx_item_usage_hourly_hour',
+                "hour >= strftime('%Y-%m-%d %H:00:00', 'now', ?)",
+                f'-{int(days)} days')
+    return ('item_usage_daily INDEXED BY idx_item_usage_daily_day',
+            "day >= date('now', ?)",
+            f'-{int(days)} days')
+
+
+def compact_usage_history(conn: sqlite3.Connection,
+                          raw_days: int = RAW_HISTORY_RETENTION_DAYS,
+                          hourly_days: int = HOURLY_RETENTION_DAYS) -> Tuple[int, int]:
+    """
+    Age out raw history rows and hourly buckets (daily buckets are kept)
+
+    Args:
+        conn: SQLite connection
+        raw_days: Days of raw item_usage_history rows to keep
+        hourly_days: Days of hourly buckets to keep
+
+    Returns:
+        Tuple[int, int]: (filas crudas eliminadas, buckets por hora eliminados)
+    """
+    raw_deleted = conn.execute(
+        "DELETE FROM item_usage_history WHERE used_at < datetime('now', ?)",
+        (f'-{int(raw_days)} days',)
+    ).rowcount
+    hourly_deleted = conn.execute(
+        "DELETE FROM item_usage_hourly WHERE hour < strftime('%Y-%m-%d %H:00:00', 'now', ?)",
+        (f'-{int(hourly_days)} days',)
+    ).rowcount
+    conn.commit()
+
+    if raw_deleted or hourly_deleted:
+        logger.info(f"Usage history compacted: {raw_deleted} raw rows, {hourly_deleted} hourly buckets")
+    return raw_deleted, hourly_deleted
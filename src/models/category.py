@@ -2,12 +2,18 @@
 Category Model
 """
 from typing import List, Optional, Dict, Any
-from .item import Item
+from .item import Item, intern_str
 
 
 class Category:
     """Model representing a category of items"""
 
+    __slots__ = (
+        'id', 'name', 'icon', 'order_index', 'is_active', 'is_predefined', 'color', 'badge', 'items',
+        'item_count', 'total_uses', 'last_accessed', 'access_count', 'is_pinned', 'pinned_order',
+        'created_at', 'updated_at',
+    )
+
     def __init__(
         self,
         category_id: str,
@@ -20,13 +26,13 @@ class Category:
         badge: Optional[str] = None
     ):
         self.id = category_id
-        self.name = name
-        self.icon = icon
+        self.name = intern_str(name)
+        self.icon = intern_str(icon)
         self.order_index = order_index
         self.is_active = is_active
         self.is_predefined = is_predefined
-        self.color = color
-        self.badge = badge
+        self.color = intern_str(color)
+        self.badge = intern_str(badge)
         self.items: List[Item] = []
 
         # Atributos extendidos (para filtros avanzados)
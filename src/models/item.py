@@ -1,6 +1,8 @@
 """
 Item Model
 """
+import sys
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from datetime import datetime
 from enum import Enum
@@ -14,9 +16,49 @@ class ItemType(Enum):
     PATH = "path"
 
 
+def intern_str(value):
+    """Intern a string repeated across many items (categories, icons, colors...)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp_str(value: str) -> Optional[datetime]:
+    try:
+        # Formato SQLite 'YYYY-MM-DD HH:MM:SS' o ISO (con 'T' / 'Z')
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    Parse a database timestamp (cached: each distinct string is parsed once)
+
+    Args:
+        value: SQLite/ISO timestamp string, datetime or None
+
+    Returns:
+        datetime or None if empty/unparseable
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    return _parse_timestamp_str(str(value))
+
+
 class Item:
     """Model representing a clipboard item"""
 
+    # Sin __dict__ por instancia: los campos (incluidos los que agregan las
+    # vistas: categoría y uso) se declaran aquí
+    __slots__ = (
+        'id', 'label', '_content', 'type', 'icon', 'is_sensitive', 'is_favorite',
+        'tags', 'description', 'working_dir', 'color', 'is_active', 'is_archived',
+        'is_list', 'list_group', 'orden_lista',
+        'file_size', 'file_type', 'file_extension', 'original_filename', 'file_hash',
+        'created_at', 'last_used', 'use_count',
+        'category_name', 'category_icon', 'category_color',
+    )
+
     def __init__(
         self,
         item_id: str,
@@ -47,27 +89,54 @@ class Item:
         self.label = label
         self.content = content
         self.type = item_type if isinstance(item_type, ItemType) else ItemType(item_type)
-        self.icon = icon
+        self.icon = intern_str(icon)
         self.is_sensitive = is_sensitive
         self.is_favorite = is_favorite
-        self.tags = tags or []
+        self.tags = [intern_str(tag) for tag in tags] if tags else []
         self.description = description
         self.working_dir = working_dir  # Directorio de trabajo para ejecutar comandos CODE
-        self.color = color  # Color para identificación visual
+        self.color = intern_str(color)  # Color para identificación visual
         self.is_active = is_active  # Si el item está activo (puede usarse)
         self.is_archived = is_archived  # Si el item está archivado (oculto por defecto)
         # Campos de listas avanzadas
         self.is_list = is_list  # Indica si este item es parte de una lista
-        self.list_group = list_group  # Nombre/identificador del grupo de lista
+        self.list_group = intern_str(list_group)  # Nombre/identificador del grupo de lista
         self.orden_lista = orden_lista  # Posición del item dentro de la lista
         # Campos de metadatos de archivos
         self.file_size = file_size  # Tamaño del archivo en bytes
-        self.file_type = file_type  # Tipo de archivo (IMAGEN, VIDEO, PDF, etc.)
-        self.file_extension = file_extension  # Extensión con punto (.jpg, .mp4)
+        self.file_type = intern_str(file_type)  # Tipo de archivo (IMAGEN, VIDEO, PDF, etc.)
+        self.file_extension = intern_str(file_extension)  # Extensión con punto (.jpg, .mp4)
         self.original_filename = original_filename  # Nombre original del archivo
         self.file_hash = file_hash  # Hash SHA256 para detección de duplicados
         self.created_at = datetime.now()
         self.last_used = datetime.now()
+        self.use_count = 0
+        # Categoría de origen (búsqueda global)
+        self.category_name = ''
+        self.category_icon = ''
+        self.category_color = ''
+
+    @property
+    def content(self) -> str:
+        """
+        Item content
+
+        Sensitive items loaded in lazy content mode hold an EncryptedContent
+        handle; it is decrypted here, only when the content is actually read
+        (copy, details dialog...).
+        """
+        content = self._content
+        if content is None or isinstance(content, str):
+            return content
+        return content.reveal()
+
+    @content.setter
+    def content(self, value) -> None:
+        self._content = value
+
+    def is_content_decrypted(self) -> bool:
+        """Retorna False si el contenido sigue cifrado (pendiente de revelar)"""
+        return self._content is None or isinstance(self._content, str)
 
     def update_last_used(self) -> None:
         """Update the last used timestamp"""
@@ -146,6 +215,52 @@ class Item:
             file_hash=data.get("file_hash")
         )
 
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'Item':
+        """
+        Create an Item from a database row (DBManager.get_all_items shape)
+
+        Includes the category info, use count and timestamps of the row.
+
+        Raises:
+            ValueError: If the row type is not a valid ItemType
+        """
+        type_str = row['type'].lower() if row.get('type') else 'text'
+
+        item = cls(
+            item_id=str(row['id']),
+            label=row['label'],
+            content=row['content'],
+            item_type=ItemType(type_str),
+            icon=row.get('icon'),
+            is_sensitive=bool(row.get('is_sensitive', False)),
+            is_favorite=bool(row.get('is_favorite', False)),
+            tags=row.get('tags', []),
+            description=row.get('description'),
+            working_dir=row.get('working_dir'),
+            color=row.get('color'),
+            is_active=bool(row.get('is_active', True)),
+            is_archived=bool(row.get('is_archived', False)),
+            is_list=bool(row.get('is_list', False)),
+            list_group=row.get('list_group'),
+            orden_lista=row.get('orden_lista') or 0,
+            file_size=row.get('file_size'),
+            file_type=row.get('file_type'),
+            file_extension=row.get('file_extension'),
+            original_filename=row.get('original_filename'),
+            file_hash=row.get('file_hash')
+        )
+
+        item.category_name = intern_str(row.get('category_name') or '')
+        item.category_icon = intern_str(row.get('category_icon') or '')
+        item.category_color = intern_str(row.get('category_color') or '')
+
+        # Fechas de SQLite (texto); sin valor válido se usa "ahora" como antes
+        item.created_at = parse_timestamp(row.get('created_at')) or item.created_at
+        item.last_used = parse_timestamp(row.get('last_used')) or item.last_used
+        item.use_count = row.get('use_count') or 0
+        return item
+
     # Estado y visibilidad
     def is_visible(self) -> bool:
         """Retorna True si el item está activo y NO archivado (visible por defecto)"""
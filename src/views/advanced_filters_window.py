@@ -121,9 +121,9 @@ class AdvancedFiltersWindow(QWidget):
 
         main_layout.addWidget(self.filter_panel)
 
-    def update_available_tags(self, items):
-        """Actualizar tags disponibles desde los items"""
-        self.filter_panel.update_available_tags(items)
+    def update_available_tags(self, items, tags=None):
+        """Actualizar tags disponibles desde los items (o desde una lista de tags ya calculada)"""
+        self.filter_panel.update_available_tags(items, tags=tags)
 
     def on_filters_changed(self, filters):
         """Reenviar señal de filtros cambiados"""
@@ -499,7 +499,7 @@ class CategoryEditor(QWidget):
 
         # Conectar señales para actualizar UI automáticamente
         if self.controller and hasattr(self.controller, 'refresh_ui'):
-            dialog.item_created.connect(lambda cat_id: self.controller.refresh_ui())
+            dialog.item_created.connect(lambda cat_id: self.controller.refresh_ui(reload_data=False))
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # Item was saved successfully in the dialog
@@ -636,7 +636,7 @@ class CategoryEditor(QWidget):
 
         # Conectar señales para actualizar UI automáticamente
         if self.controller and hasattr(self.controller, 'refresh_ui'):
-            dialog.item_updated.connect(lambda item_id, cat_id: self.controller.refresh_ui())
+            dialog.item_updated.connect(lambda item_id, cat_id: self.controller.refresh_ui(reload_data=False))
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # Item was updated successfully in the dialog
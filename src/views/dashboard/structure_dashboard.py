@@ -12,6 +12,8 @@ from PyQt6.QtGui import QFont, QIcon, QBrush, QColor, QShortcut, QKeySequence
 import logging
 
 from core.dashboard_manager import DashboardManager
+from database.db_manager import ITEM_UPDATED, ITEM_DELETED
+from core.encryption_manager import reveal_content
 from views.dashboard.search_bar_widget import SearchBarWidget
 from views.dashboard.highlight_delegate import HighlightDelegate
 from views.dashboard.action_bar_widget import ActionBarWidget
@@ -53,6 +55,10 @@ class StructureDashboard(QDialog):
             'items': []        # Lista de (category_id, item_id) tuplas
         }
 
+        # Filas del árbol por id (se rellenan en populate_tree)
+        self._category_widgets = {}
+        self._item_widgets = {}
+
         # Tracking de filtros activos
         self.active_filter = None  # 'favorites', 'inactive', 'archived', None
         self.filter_buttons = {}  # Referencias a los botones de filtro
@@ -593,6 +599,10 @@ class StructureDashboard(QDialog):
 
         logger.info(f"Populating tree with {len(categories)} categories...")
 
+        # Filas por id para actualizar solo las afectadas por una operación
+        self._category_widgets = {}
+        self._item_widgets = {}
+
         for category in categories:
             # Create category item (Level 1)
             category_item = QTreeWidgetItem(self.tree_widget)
@@ -601,177 +611,209 @@ class StructureDashboard(QDialog):
             category_item.setFlags(category_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
             category_item.setCheckState(0, Qt.CheckState.Unchecked)
 
-            # Column 1: Name with icon and item count
-            status_indicator = ""
-            if not category.get('is_active', 1):  # Si is_active es 0 o False
-                status_indicator = "🚫 "  # Icono que coincide con el botón Desactivar
-            category_name = f"{status_indicator}{category['icon']} {category['name']} ({len(category['items'])} items)"
-            category_item.setText(1, category_name)
-            category_item.setFont(1, self.get_bold_font())
-
-            # Aplicar estilo visual adicional para categorías desactivadas
-            if not category.get('is_active', 1):
-                # Cambiar el color del texto para categorías desactivadas
-                for col in range(6):
-                    category_item.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
+            self._fill_category_widget(category_item, category, len(category['items']))
+            self._category_widgets[category['id']] = category_item
 
-            # Column 2: Type
-            category_item.setText(2, "Categoría")
+            # Add items under this category (Level 2)
+            for item in category['items']:
+                item_widget = QTreeWidgetItem(category_item)
 
-            # Column 3: Tags
-            if category['tags']:
-                tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
-                category_item.setText(3, tags_str)
+                # Column 0: Checkbox
+                item_widget.setFlags(item_widget.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                item_widget.setCheckState(0, Qt.CheckState.Unchecked)
 
-            # Column 4: Contenido (empty for categories)
-            category_item.setText(4, "")
+                self._fill_item_widget(item_widget, item)
+                self._item_widgets[item['id']] = item_widget
 
-            # Column 5: Listas (empty for categories)
-            category_item.setText(5, "")
+        logger.info("Tree populated successfully")
 
-            # Build tooltip for category
-            category_tooltip_parts = []
-            category_tooltip_parts.append(f"<b>{category['name']}</b>")
-            category_tooltip_parts.append(f"<b>Items:</b> {len(category['items'])}")
+    def _fill_category_widget(self, category_item: QTreeWidgetItem, category: dict, items_count: int):
+        """
+        Set texts, style, tooltip and data of a category row
 
-            # Mostrar estado de categoría
-            if not category.get('is_active', 1):
-                category_tooltip_parts.append("🚫 <b><span style='color: #f44336;'>CATEGORÍA DESACTIVADA</span></b>")
+        Args:
+            category_item: Category row
+            category: Category dict from the structure
+            items_count: Number of item rows shown under the category
+        """
+        # Column 1: Name with icon and item count
+        status_indicator = ""
+        if not category.get('is_active', 1):  # Si is_active es 0 o False
+            status_indicator = "🚫 "  # Icono que coincide con el botón Desactivar
+        category_name = f"{status_indicator}{category['icon']} {category['name']} ({items_count} items)"
+        category_item.setText(1, category_name)
+        category_item.setFont(1, self.get_bold_font())
+
+        # Aplicar estilo visual adicional para categorías desactivadas
+        if not category.get('is_active', 1):
+            # Cambiar el color del texto para categorías desactivadas
+            for col in range(6):
+                category_item.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
+        else:
+            # Fila reactivada: volver al color del tema
+            for col in range(6):
+                category_item.setData(col, Qt.ItemDataRole.ForegroundRole, None)
 
-            if category['tags']:
-                tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
-                category_tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
+        # Column 2: Type
+        category_item.setText(2, "Categoría")
 
-            if category.get('is_predefined'):
-                category_tooltip_parts.append("📌 <b>Categoría predefinida</b>")
+        # Column 3: Tags
+        if category['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
+            category_item.setText(3, tags_str)
 
-            category_tooltip_parts.append("<br><i>Click para expandir/colapsar | Click derecho para opciones</i>")
+        # Column 4: Contenido (empty for categories)
+        category_item.setText(4, "")
 
-            category_tooltip_html = "<br>".join(category_tooltip_parts)
-            category_item.setToolTip(1, category_tooltip_html)
-            category_item.setToolTip(2, category_tooltip_html)
-            category_item.setToolTip(3, category_tooltip_html)
+        # Column 5: Listas (empty for categories)
+        category_item.setText(5, "")
 
-            # Store category ID in user data (column 0 for identification)
-            category_item.setData(0, Qt.ItemDataRole.UserRole, {
-                'type': 'category',
-                'id': category['id']
-            })
+        # Build tooltip for category
+        category_tooltip_parts = []
+        category_tooltip_parts.append(f"<b>{category['name']}</b>")
+        category_tooltip_parts.append(f"<b>Items:</b> {items_count}")
 
-            # Add items under this category (Level 2)
-            for item in category['items']:
-                item_widget = QTreeWidgetItem(category_item)
+        # Mostrar estado de categoría
+        if not category.get('is_active', 1):
+            category_tooltip_parts.append("🚫 <b><span style='color: #f44336;'>CATEGORÍA DESACTIVADA</span></b>")
 
-                # Column 0: Checkbox
-                item_widget.setFlags(item_widget.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item_widget.setCheckState(0, Qt.CheckState.Unchecked)
+        if category['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
+            category_tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
 
-                # Column 1: Item name with indicators
-                indicators = ""
-                # Estado de archivo/activo (primero para mayor visibilidad)
-                if item.get('is_archived'):
-                    indicators += "📦 "  # Icono que coincide con el botón Archivar
-                if not item.get('is_active', 1):  # Si is_active es 0 o False
-                    indicators += "🚫 "  # Icono que coincide con el botón Desactivar
-                # Otros indicadores
-                if item.get('is_list'):
-                    indicators += "📝 "
-                if item['is_favorite']:
-                    indicators += "⭐ "
-                if item['is_sensitive']:
-                    indicators += "🔒 "
-
-                item_name = f"{indicators}{item['label']}"
-                item_widget.setText(1, item_name)
-
-                # Aplicar estilo visual adicional para items desactivados o archivados
-                if item.get('is_archived') or not item.get('is_active', 1):
-                    # Cambiar el color del texto para items desactivados/archivados
-                    for col in range(6):
-                        item_widget.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
-
-                # Column 2: Item type
-                type_icons = {
-                    'CODE': '💻',
-                    'URL': '🔗',
-                    'PATH': '📂',
-                    'TEXT': '📝'
-                }
-                type_icon = type_icons.get(item['type'], '📄')
-                item_widget.setText(2, f"{type_icon} {item['type']}")
-
-                # Column 3: Tags
-                if item['tags']:
-                    tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
-                    item_widget.setText(3, tags_str)
-                else:
-                    item_widget.setText(3, "")
-
-                # Column 4: Contenido (preview)
-                if not item['is_sensitive'] and item['content']:
-                    preview = item['content'][:100]
-                    if len(item['content']) > 100:
-                        preview += "..."
-                    item_widget.setText(4, preview)
-                else:
-                    item_widget.setText(4, "")
+        if category.get('is_predefined'):
+            category_tooltip_parts.append("📌 <b>Categoría predefinida</b>")
 
-                # Column 5: Listas (list group)
-                if item.get('is_list') and item.get('list_group'):
-                    item_widget.setText(5, f"📝 Lista: {item['list_group']}")
-                else:
-                    item_widget.setText(5, "")
+        category_tooltip_parts.append("<br><i>Click para expandir/colapsar | Click derecho para opciones</i>")
 
-                # Build tooltip with detailed information
-                tooltip_parts = []
-                tooltip_parts.append(f"<b>{item['label']}</b>")
-                tooltip_parts.append(f"<b>Tipo:</b> {item['type']}")
+        category_tooltip_html = "<br>".join(category_tooltip_parts)
+        category_item.setToolTip(1, category_tooltip_html)
+        category_item.setToolTip(2, category_tooltip_html)
+        category_item.setToolTip(3, category_tooltip_html)
 
-                # Mostrar estado de archivo/activo
-                if item.get('is_archived'):
-                    tooltip_parts.append("📦 <b><span style='color: #ff9800;'>ARCHIVADO</span></b>")
-                if not item.get('is_active', 1):
-                    tooltip_parts.append("🚫 <b><span style='color: #f44336;'>DESACTIVADO</span></b>")
+        # Store category ID in user data (column 0 for identification)
+        category_item.setData(0, Qt.ItemDataRole.UserRole, {
+            'type': 'category',
+            'id': category['id']
+        })
 
-                if item['description']:
-                    tooltip_parts.append(f"<b>Descripción:</b> {item['description']}")
+    def _fill_item_widget(self, item_widget: QTreeWidgetItem, item: dict):
+        """
+        Set texts, style, tooltip and data of an item row
 
-                if item.get('is_list') and item.get('list_group'):
-                    tooltip_parts.append(f"📝 <b>Pertenece a la lista:</b> {item['list_group']}")
+        Args:
+            item_widget: Item row
+            item: Item dict from the structure
+        """
+        # Column 1: Item name with indicators
+        indicators = ""
+        # Estado de archivo/activo (primero para mayor visibilidad)
+        if item.get('is_archived'):
+            indicators += "📦 "  # Icono que coincide con el botón Archivar
+        if not item.get('is_active', 1):  # Si is_active es 0 o False
+            indicators += "🚫 "  # Icono que coincide con el botón Desactivar
+        # Otros indicadores
+        if item.get('is_list'):
+            indicators += "📝 "
+        if item['is_favorite']:
+            indicators += "⭐ "
+        if item['is_sensitive']:
+            indicators += "🔒 "
+
+        item_name = f"{indicators}{item['label']}"
+        item_widget.setText(1, item_name)
+
+        # Aplicar estilo visual adicional para items desactivados o archivados
+        if item.get('is_archived') or not item.get('is_active', 1):
+            # Cambiar el color del texto para items desactivados/archivados
+            for col in range(6):
+                item_widget.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
+        else:
+            # Fila reactivada: volver al color del tema
+            for col in range(6):
+                item_widget.setData(col, Qt.ItemDataRole.ForegroundRole, None)
+
+        # Column 2: Item type
+        type_icons = {
+            'CODE': '💻',
+            'URL': '🔗',
+            'PATH': '📂',
+            'TEXT': '📝'
+        }
+        type_icon = type_icons.get(item['type'], '📄')
+        item_widget.setText(2, f"{type_icon} {item['type']}")
 
-                if item['tags']:
-                    tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
-                    tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
+        # Column 3: Tags
+        if item['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
+            item_widget.setText(3, tags_str)
+        else:
+            item_widget.setText(3, "")
 
-                if item['is_favorite']:
-                    tooltip_parts.append("⭐ <b>Favorito</b>")
+        # Column 4: Contenido (preview)
+        if not item['is_sensitive'] and item['content']:
+            preview = item['content'][:100]
+            if len(item['content']) > 100:
+                preview += "..."
+            item_widget.setText(4, preview)
+        else:
+            item_widget.setText(4, "")
 
-                if item['is_sensitive']:
-                    tooltip_parts.append("🔒 <b>Contenido sensible (encriptado)</b>")
-                else:
-                    # Show content preview for non-sensitive items
-                    if item['content']:
-                        content_preview = item['content'][:100]
-                        if len(item['content']) > 100:
-                            content_preview += "..."
-                        tooltip_parts.append(f"<b>Contenido:</b><br><code>{content_preview}</code>")
-
-                tooltip_parts.append("<br><i>Doble click para copiar | Click derecho para más opciones</i>")
-
-                tooltip_html = "<br>".join(tooltip_parts)
-                item_widget.setToolTip(1, tooltip_html)
-                item_widget.setToolTip(2, tooltip_html)
-                item_widget.setToolTip(3, tooltip_html)
-
-                # Store item data (column 0 for identification)
-                item_widget.setData(0, Qt.ItemDataRole.UserRole, {
-                    'type': 'item',
-                    'id': item['id'],
-                    'content': item['content'],
-                    'item_type': item['type']
-                })
+        # Column 5: Listas (list group)
+        if item.get('is_list') and item.get('list_group'):
+            item_widget.setText(5, f"📝 Lista: {item['list_group']}")
+        else:
+            item_widget.setText(5, "")
+
+        # Build tooltip with detailed information
+        tooltip_parts = []
+        tooltip_parts.append(f"<b>{item['label']}</b>")
+        tooltip_parts.append(f"<b>Tipo:</b> {item['type']}")
+
+        # Mostrar estado de archivo/activo
+        if item.get('is_archived'):
+            tooltip_parts.append("📦 <b><span style='color: #ff9800;'>ARCHIVADO</span></b>")
+        if not item.get('is_active', 1):
+            tooltip_parts.append("🚫 <b><span style='color: #f44336;'>DESACTIVADO</span></b>")
+
+        if item['description']:
+            tooltip_parts.append(f"<b>Descripción:</b> {item['description']}")
+
+        if item.get('is_list') and item.get('list_group'):
+            tooltip_parts.append(f"📝 <b>Pertenece a la lista:</b> {item['list_group']}")
+
+        if item['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
+            tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
+
+        if item['is_favorite']:
+            tooltip_parts.append("⭐ <b>Favorito</b>")
+
+        if item['is_sensitive']:
+            tooltip_parts.append("🔒 <b>Contenido sensible (encriptado)</b>")
+        else:
+            # Show content preview for non-sensitive items
+            if item['content']:
+                content_preview = item['content'][:100]
+                if len(item['content']) > 100:
+                    content_preview += "..."
+                tooltip_parts.append(f"<b>Contenido:</b><br><code>{content_preview}</code>")
+
+        tooltip_parts.append("<br><i>Doble click para copiar | Click derecho para más opciones</i>")
+
+        tooltip_html = "<br>".join(tooltip_parts)
+        item_widget.setToolTip(1, tooltip_html)
+        item_widget.setToolTip(2, tooltip_html)
+        item_widget.setToolTip(3, tooltip_html)
+
+        # Store item data (column 0 for identification)
+        item_widget.setData(0, Qt.ItemDataRole.UserRole, {
+            'type': 'item',
+            'id': item['id'],
+            'content': item['content'],
+            'item_type': item['type']
+        })
 
-        logger.info("Tree populated successfully")
 
     def update_statistics(self):
         """Update statistics label"""
@@ -822,7 +864,7 @@ class StructureDashboard(QDialog):
 
         if data['type'] == 'item':
             # Copy item content to clipboard
-            content = data.get('content', '')
+            content = reveal_content(data.get('content', ''))
             if content:
                 clipboard = QApplication.clipboard()
                 clipboard.setText(content)
@@ -1118,6 +1160,183 @@ class StructureDashboard(QDialog):
         # Update action bar
         self.update_action_bar()
 
+    # ========== INCREMENTAL TREE UPDATES ==========
+
+    def _item_passes_filters(self, item: dict) -> bool:
+        """Check an item against the active state and type filters"""
+        if self.active_type_filters and item.get('type') not in self.active_type_filters:
+            return False
+        if self.active_filter == 'favorites':
+            return bool(item.get('is_favorite', False))
+        if self.active_filter == 'inactive':
+            return not item.get('is_active', 1)
+        if self.active_filter == 'archived':
+            return bool(item.get('is_archived', False))
+        return True
+
+    def _remove_item_row(self, item_id: int) -> None:
+        """Remove the row of an item (if shown)"""
+        item_widget = self._item_widgets.pop(item_id, None)
+        if item_widget is not None and item_widget.parent() is not None:
+            item_widget.parent().removeChild(item_widget)
+
+    def _refresh_category_rows(self, categories: list) -> None:
+        """Refresh name/count of category rows after their children changed"""
+        for category in categories:
+            category_item = self._category_widgets.get(category['id'])
+            if category_item is not None:
+                self._fill_category_widget(category_item, category, category_item.childCount())
+
+    def _finish_tree_patch(self, rows_removed: bool) -> None:
+        """Refresh statistics and search results after patching rows"""
+        # self.structure es la caché de DashboardManager: ya refleja los cambios
+        if not self.active_filter and not self.active_type_filters:
+            self.update_statistics()
+
+        # Los resultados de búsqueda son índices de filas: recalcular si cambiaron
+        if rows_removed and self.current_matches:
+            self.on_search_changed(self.search_bar.get_query(), self.search_bar.get_scope_filters())
+
+    def apply_item_changes(self, item_ids: list, **fields):
+        """
+        Patch the structure and the tree rows of updated items (no reload)
+
+        Rows that no longer match the active filters are removed.
+
+        Args:
+            item_ids: Updated item IDs
+            **fields: New field values (as passed to bulk_update_items)
+        """
+        pending = set(item_ids)
+        touched_categories = []
+        rows_removed = False
+
+        for category in self.structure.get('categories', []) if self.structure else []:
+            category_touched = False
+            for item in category['items']:
+                if item['id'] not in pending:
+                    continue
+                for field, value in fields.items():
+                    # La estructura guarda algunos flags como bool
+                    item[field] = bool(value) if isinstance(item.get(field), bool) else value
+
+                item_widget = self._item_widgets.get(item['id'])
+                if item_widget is None:
+                    continue
+                if self._item_passes_filters(item):
+                    self._fill_item_widget(item_widget, item)
+                else:
+                    self._remove_item_row(item['id'])
+                    category_touched = rows_removed = True
+            if category_touched:
+                touched_categories.append(category)
+
+        self._refresh_category_rows(touched_categories)
+        self._finish_tree_patch(rows_removed)
+
+    def remove_items(self, item_ids: list):
+        """
+        Remove deleted items from the structure and the tree (no reload)
+
+        Args:
+            item_ids: Deleted item IDs
+        """
+        removed = set(item_ids)
+        touched_categories = []
+
+        for category in self.structure.get('categories', []) if self.structure else []:
+            remaining = [item for item in category['items'] if item['id'] not in removed]
+            if len(remaining) != len(category['items']):
+                category['items'] = remaining
+                touched_categories.append(category)
+
+        for item_id in removed:
+            self._remove_item_row(item_id)
+
+        self._refresh_category_rows(touched_categories)
+        self._finish_tree_patch(rows_removed=True)
+
+    def apply_category_changes(self, category_ids: list, **fields):
+        """
+        Patch the structure and the tree rows of updated categories
+
+        Args:
+            category_ids: Updated category IDs
+            **fields: New field values (as passed to update_category)
+        """
+        pending = set(category_ids)
+        for category in self.structure.get('categories', []) if self.structure else []:
+            if category['id'] not in pending:
+                continue
+            category.update(fields)
+            category_item = self._category_widgets.get(category['id'])
+            if category_item is not None:
+                self._fill_category_widget(category_item, category, category_item.childCount())
+
+        self._finish_tree_patch(rows_removed=False)
+
+    def remove_categories(self, category_ids: list):
+        """
+        Remove deleted categories (and their items) from the structure and the tree
+
+        Args:
+            category_ids: Deleted category IDs
+        """
+        removed = set(category_ids)
+        if self.structure:
+            for category in self.structure['categories']:
+                if category['id'] in removed:
+                    for item in category['items']:
+                        self._item_widgets.pop(item['id'], None)
+            self.structure['categories'] = [
+                category for category in self.structure['categories']
+                if category['id'] not in removed
+            ]
+
+        for category_id in removed:
+            category_item = self._category_widgets.pop(category_id, None)
+            if category_item is not None:
+                self.tree_widget.takeTopLevelItem(self.tree_widget.indexOfTopLevelItem(category_item))
+
+        self._finish_tree_patch(rows_removed=True)
+
+    def _bulk_update_selected_items(self, **fields) -> tuple:
+        """
+        Update the selected items in one transaction and patch their rows
+
+        Returns:
+            tuple: (items actualizados, items no encontrados)
+        """
+        item_ids = [item_id for _, item_id in self.selected_items['items']]
+        if not item_ids:
+            return 0, 0
+
+        outcomes = self.db.bulk_update_items(item_ids, **fields)
+        updated_ids = [item_id for item_id, outcome in outcomes.items() if outcome == ITEM_UPDATED]
+        self.apply_item_changes(updated_ids, **fields)
+        return len(updated_ids), len(outcomes) - len(updated_ids)
+
+    def _update_selected_categories(self, **fields) -> tuple:
+        """
+        Update the selected categories and patch their rows
+
+        Returns:
+            tuple: (categorías actualizadas, errores)
+        """
+        updated_ids = []
+        error_count = 0
+        for category_id in self.selected_items['categories']:
+            try:
+                self.db.update_category(category_id, **fields)
+                updated_ids.append(category_id)
+            except Exception as e:
+                error_count += 1
+                logger.error(f"Error updating category {category_id}: {e}")
+
+        if updated_ids:
+            self.apply_category_changes(updated_ids, **fields)
+        return len(updated_ids), error_count
+
     # ========== BULK OPERATIONS (Fase 3 - Implemented) ==========
 
     def bulk_set_favorite(self):
@@ -1141,19 +1360,9 @@ class StructureDashboard(QDialog):
             error_count = 0
 
             try:
-                # Update each item in database
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.update_item(item_id, is_favorite=1)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} marked as favorite")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error marking item {item_id} as favorite: {e}")
-
-                # Clear selection and reload
+                # One transaction for all items, then patch only their rows
+                success_count, error_count = self._bulk_update_selected_items(is_favorite=1)
                 self.clear_selection()
-                self.load_data()
 
                 # Show result
                 if error_count == 0:
@@ -1201,19 +1410,9 @@ class StructureDashboard(QDialog):
             error_count = 0
 
             try:
-                # Update each item in database
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.update_item(item_id, is_favorite=0)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} unmarked as favorite")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error unmarking item {item_id} as favorite: {e}")
-
-                # Clear selection and reload
+                # One transaction for all items, then patch only their rows
+                success_count, error_count = self._bulk_update_selected_items(is_favorite=0)
                 self.clear_selection()
-                self.load_data()
 
                 # Show result
                 if error_count == 0:
@@ -1269,28 +1468,14 @@ class StructureDashboard(QDialog):
 
             try:
                 # Activate categories
-                for category_id in self.selected_items['categories']:
-                    try:
-                        self.db.update_category(category_id, is_active=1)
-                        success_count += 1
-                        logger.debug(f"Category {category_id} activated")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error activating category {category_id}: {e}")
+                categories_done, categories_failed = self._update_selected_categories(is_active=1)
 
                 # Activate items (and unarchive them)
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.update_item(item_id, is_active=1, is_archived=0)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} activated")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error activating item {item_id}: {e}")
+                items_done, items_failed = self._bulk_update_selected_items(is_active=1, is_archived=0)
 
-                # Clear selection and reload
+                success_count = categories_done + items_done
+                error_count = categories_failed + items_failed
                 self.clear_selection()
-                self.load_data()
 
                 # Show result
                 if error_count == 0:
@@ -1346,28 +1531,14 @@ class StructureDashboard(QDialog):
 
             try:
                 # Archive categories (deactivate them)
-                for category_id in self.selected_items['categories']:
-                    try:
-                        self.db.update_category(category_id, is_active=0)
-                        success_count += 1
-                        logger.debug(f"Category {category_id} archived (deactivated)")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error archiving category {category_id}: {e}")
+                categories_done, categories_failed = self._update_selected_categories(is_active=0)
 
                 # Archive items
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.update_item(item_id, is_archived=1)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} archived")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error archiving item {item_id}: {e}")
+                items_done, items_failed = self._bulk_update_selected_items(is_archived=1)
 
-                # Clear selection and reload
+                success_count = categories_done + items_done
+                error_count = categories_failed + items_failed
                 self.clear_selection()
-                self.load_data()
 
                 # Show result
                 if error_count == 0:
@@ -1423,28 +1594,14 @@ class StructureDashboard(QDialog):
 
             try:
                 # Deactivate categories
-                for category_id in self.selected_items['categories']:
-                    try:
-                        self.db.update_category(category_id, is_active=0)
-                        success_count += 1
-                        logger.debug(f"Category {category_id} deactivated")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error deactivating category {category_id}: {e}")
+                categories_done, categories_failed = self._update_selected_categories(is_active=0)
 
                 # Deactivate items
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.update_item(item_id, is_active=0)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} deactivated")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error deactivating item {item_id}: {e}")
+                items_done, items_failed = self._bulk_update_selected_items(is_active=0)
 
-                # Clear selection and reload
+                success_count = categories_done + items_done
+                error_count = categories_failed + items_failed
                 self.clear_selection()
-                self.load_data()
 
                 # Show result
                 if error_count == 0:
@@ -1504,18 +1661,8 @@ class StructureDashboard(QDialog):
 
             try:
                 # Unarchive items
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.update_item(item_id, is_archived=0)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} unarchived")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error unarchiving item {item_id}: {e}")
-
-                # Clear selection and reload
+                success_count, error_count = self._bulk_update_selected_items(is_archived=0)
                 self.clear_selection()
-                self.load_data()
 
                 # Show result
                 if error_count == 0:
@@ -1581,28 +1728,37 @@ class StructureDashboard(QDialog):
 
             try:
                 # Delete categories (this also deletes their items via CASCADE)
+                deleted_categories = []
                 for category_id in self.selected_items['categories']:
                     try:
                         self.db.delete_category(category_id)
+                        deleted_categories.append(category_id)
                         success_count += 1
                         logger.debug(f"Category {category_id} deleted (with all its items)")
                     except Exception as e:
                         error_count += 1
                         logger.error(f"Error deleting category {category_id}: {e}")
 
-                # Delete items
-                for category_id, item_id in self.selected_items['items']:
-                    try:
-                        self.db.delete_item(item_id)
-                        success_count += 1
-                        logger.debug(f"Item {item_id} deleted")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error deleting item {item_id}: {e}")
+                # Delete the remaining items in one transaction
+                item_ids = [
+                    item_id for category_id, item_id in self.selected_items['items']
+                    if category_id not in deleted_categories
+                ]
+                if item_ids:
+                    outcomes = self.db.bulk_delete_items(item_ids)
+                    deleted_ids = [item_id for item_id, outcome in outcomes.items()
+                                   if outcome == ITEM_DELETED]
+                    success_count += len(deleted_ids)
+                    error_count += len(outcomes) - len(deleted_ids)
+                else:
+                    deleted_ids = []
 
-                # Clear selection and reload
+                # Clear selection and remove only the affected rows
                 self.clear_selection()
-                self.load_data()
+                if deleted_categories:
+                    self.remove_categories(deleted_categories)
+                if deleted_ids:
+                    self.remove_items(deleted_ids)
 
                 # Show result
                 if error_count == 0:
@@ -2346,7 +2502,7 @@ class StructureDashboard(QDialog):
 
     def copy_item_content(self, data: dict):
         """Copy item content to clipboard"""
-        content = data.get('content', '')
+        content = reveal_content(data.get('content', ''))
         if content:
             clipboard = QApplication.clipboard()
             clipboard.setText(content)
@@ -2370,7 +2526,7 @@ class StructureDashboard(QDialog):
         details.append(f"<b>Nombre:</b> {item_name}")
 
         # Content preview
-        content = data.get('content', '')
+        content = reveal_content(data.get('content', ''))
         if content:
             preview = content[:200]
             if len(content) > 200:
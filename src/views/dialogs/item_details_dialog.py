@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                               QPushButton, QFrame, QScrollArea, QWidget, QGroupBox, QCheckBox)
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
+import copy
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -20,11 +21,13 @@ logger = logging.getLogger(__name__)
 class ItemDetailsDialog(QDialog):
     """Diálogo que muestra información detallada de un item"""
 
-    def __init__(self, item: Item, floating_panel=None, parent=None):
+    def __init__(self, item: Item, floating_panel=None, parent=None, db_manager=None):
         super().__init__(parent)
-        self.item = item
+        # Copia: el item puede pertenecer al snapshot compartido (solo lectura)
+        self.item = copy.copy(item)
         self.floating_panel = floating_panel  # Optional reference to FloatingPanel for refresh
-        self.db = DBManager()
+        # DBManager de la aplicación si se pasa (sus listeners actualizan el almacén de items)
+        self.db = db_manager or DBManager()
         self.category_name = self.get_category_name()
         self.init_ui()
 
@@ -14,7 +14,7 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from core.config_manager import ConfigManager
-from core.file_manager import FileManager
+from core.file_manager import FileManager, STORAGE_MODE_FOLDERS, STORAGE_MODE_CONTENT
 
 
 class FilesSettings(QWidget):
@@ -157,6 +157,13 @@ class FilesSettings(QWidget):
         self.auto_create_checkbox.stateChanged.connect(self._on_options_changed)
         layout.addRow("Auto-crear:", self.auto_create_checkbox)
 
+        # Almacenamiento por contenido (un archivo por hash)
+        self.content_addressed_checkbox = QCheckBox(
+            "Guardar cada archivo una sola vez (por contenido, carpeta BLOBS)"
+        )
+        self.content_addressed_checkbox.stateChanged.connect(self._on_options_changed)
+        layout.addRow("Deduplicar:", self.content_addressed_checkbox)
+
         return group
 
     def _create_stats_section(self) -> QGroupBox:
@@ -223,6 +230,7 @@ class FilesSettings(QWidget):
         # Cargar opciones
         auto_create = self.config_manager.get_files_auto_create_folders()
         self.auto_create_checkbox.setChecked(auto_create)
+        self.content_addressed_checkbox.setChecked(self.file_manager.is_content_addressed())
 
         # Actualizar estadísticas
         self._update_statistics()
@@ -372,29 +380,12 @@ class FilesSettings(QWidget):
 
     def _update_statistics(self):
         """Actualizar estadísticas de almacenamiento"""
-        # Contar archivos guardados (items con file_hash)
-        # Esto requiere acceso a DBManager
+        # Totales del catálogo de almacenamiento (sin recorrer el disco;
+        # la reconciliación corre en segundo plano)
         try:
-            from database.db_manager import DBManager
-            db_path = Path(__file__).parent.parent.parent / "widget_sidebar.db"
-            db = DBManager(str(db_path))
-
-            # Contar items con file_hash (archivos guardados)
-            cursor = db.conn.execute(
-                "SELECT COUNT(*) FROM items WHERE file_hash IS NOT NULL"
-            )
-            file_count = cursor.fetchone()[0]
-
-            # Calcular espacio total
-            cursor = db.conn.execute(
-                "SELECT SUM(file_size) FROM items WHERE file_hash IS NOT NULL"
-            )
-            total_size = cursor.fetchone()[0] or 0
-
-            db.close()
-
-            self.stats_files_count.setText(f"{file_count} archivos")
-            self.stats_total_size.setText(self.file_manager.format_file_size(total_size))
+            stats = self.file_manager.get_storage_stats()
+            self.stats_files_count.setText(f"{stats['total_files']} archivos")
+            self.stats_total_size.setText(stats['total_size_formatted'])
 
         except Exception as e:
             self.stats_files_count.setText("Error al cargar")
@@ -424,6 +415,30 @@ class FilesSettings(QWidget):
         # Abrir en explorador de archivos de Windows
         os.startfile(base_path)
 
+    def _enable_content_addressed_storage(self):
+        """Activar el almacenamiento por contenido, migrando si se acepta"""
+        reply = QMessageBox.question(
+            self,
+            "Almacenamiento por Contenido",
+            "¿Deseas migrar ahora los archivos ya guardados a la carpeta BLOBS?\n\n"
+            "Los archivos idénticos se guardarán una sola vez.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+
+        if reply != QMessageBox.StandardButton.Yes:
+            self.config_manager.set_files_storage_mode(STORAGE_MODE_CONTENT)
+            return
+
+        stats = self.file_manager.migrate_to_content_addressed()
+        QMessageBox.information(
+            self,
+            "Migración Completada",
+            f"Archivos migrados: {stats['files_migrated']}\n"
+            f"Duplicados eliminados: {stats['files_deduplicated']}\n"
+            f"Espacio liberado: {self.file_manager.format_file_size(stats['bytes_saved'])}"
+        )
+
     def _save_settings(self):
         """Guardar configuración"""
         # Validar ruta base
@@ -461,6 +476,14 @@ class FilesSettings(QWidget):
             auto_create = self.auto_create_checkbox.isChecked()
             self.config_manager.set_files_auto_create_folders(auto_create)
 
+            # Modo de almacenamiento: al activar el modo por contenido se
+            # ofrece migrar los archivos de las carpetas por tipo
+            if self.content_addressed_checkbox.isChecked():
+                if not self.file_manager.is_content_addressed():
+                    self._enable_content_addressed_storage()
+            else:
+                self.config_manager.set_files_storage_mode(STORAGE_MODE_FOLDERS)
+
             # Actualizar FileManager con nueva configuración
             self.file_manager = FileManager(self.config_manager)
 
@@ -11,7 +11,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.category import Category
 from models.item import Item
-from views.widgets.item_widget import ItemButton
+from views.widgets.item_list_view import ItemListView
 from views.widgets.list_widget import ListWidget
 from views.widgets.search_bar import SearchBar
 from views.advanced_filters_window import AdvancedFiltersWindow
@@ -54,6 +54,7 @@ class FloatingPanel(QWidget):
         self.search_engine = SearchEngine()
         self.filter_engine = AdvancedFilterEngine()  # Motor de filtrado avanzado
         self.all_items = []  # Store all items before filtering
+        self.items_version = 0  # Cambia con cada all_items nuevo (caché de filtros)
         self.all_lists = []  # Store all lists before filtering
         self.visible_items = []  # Store currently visible items (after filtering)
         self.current_filters = {}  # Filtros activos actuales
@@ -63,6 +64,7 @@ class FloatingPanel(QWidget):
         self.normal_height = None  # Altura normal antes de minimizar
         self.normal_width = None  # Ancho normal antes de minimizar
         self.normal_position = None  # Posición normal antes de minimizar
+        self.hydrate_callback = None  # Carga pendiente del contenido (panel restaurado minimizado)
 
         # Panel persistence attributes
         self.panel_id = panel_id  # ID del panel en la base de datos (None si no está guardado)
@@ -433,6 +435,16 @@ class FloatingPanel(QWidget):
         self.items_layout.setSpacing(0)
         self.items_layout.addStretch()
 
+        # Virtualized item list, sized to its rows inside the scroll area
+        # (reused across reloads: clear_items() only empties it)
+        db_manager = self.config_manager.db if self.config_manager and hasattr(self.config_manager, 'db') else None
+        self.items_view = ItemListView(parent=self.items_container, db_manager=db_manager)
+        self.items_view.set_fit_to_contents(True)
+        self.items_view.item_clicked.connect(self.on_item_clicked)
+        self.items_view.url_open_requested.connect(self.on_url_open_requested)
+        self.items_view.setStyleSheet("QListView { border: none; background-color: transparent; }")
+        self.items_view.hide()
+
         self.scroll_area.setWidget(self.items_container)
         main_layout.addWidget(self.scroll_area)
 
@@ -470,6 +482,7 @@ class FloatingPanel(QWidget):
 
         # Separar items normales de items de listas
         self.all_items = [item for item in category.items if not item.is_list_item()]
+        self.items_version += 1
 
         # Obtener listas si tenemos ListController
         self.all_lists = []
@@ -516,15 +529,15 @@ class FloatingPanel(QWidget):
         # Clear existing items
         self.clear_items()
 
-        # Add items
-        for idx, item in enumerate(items):
-            logger.debug(f"Creating button {idx+1}/{len(items)}: {item.label}")
-            item_button = ItemButton(item)
-            item_button.item_clicked.connect(self.on_item_clicked)
-            item_button.url_open_requested.connect(self.on_url_open_requested)
-            self.items_layout.insertWidget(self.items_layout.count() - 1, item_button)
+        self._show_items_view(items)
+
+        logger.info(f"Successfully displayed {len(items)} items")
 
-        logger.info(f"Successfully added {len(items)} item buttons to layout")
+    def _show_items_view(self, items):
+        """Insert the item list view at the end of the layout and fill it"""
+        self.items_layout.insertWidget(self.items_layout.count() - 1, self.items_view)
+        self.items_view.set_items(items)
+        self.items_view.show()
 
     def display_items_and_lists(self, items, lists):
         """Display items and lists in separate sections
@@ -561,12 +574,7 @@ class FloatingPanel(QWidget):
             self.items_layout.insertWidget(self.items_layout.count() - 1, items_header)
 
             # Add items
-            for idx, item in enumerate(items):
-                logger.debug(f"Creating item button {idx+1}/{len(items)}: {item.label}")
-                item_button = ItemButton(item)
-                item_button.item_clicked.connect(self.on_item_clicked)
-                item_button.url_open_requested.connect(self.on_url_open_requested)
-                self.items_layout.insertWidget(self.items_layout.count() - 1, item_button)
+            self._show_items_view(items)
 
         # === SECCIÓN DE LISTAS ===
         if lists:
@@ -622,11 +630,16 @@ class FloatingPanel(QWidget):
         logger.info(f"Successfully displayed {len(items)} items and {len(lists)} lists")
 
     def clear_items(self):
-        """Clear all item buttons"""
+        """Clear all item and list widgets"""
         while self.items_layout.count() > 1:  # Keep the stretch at the end
             item = self.items_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            widget = item.widget()
+            if widget is self.items_view:
+                # La lista de items se reutiliza
+                widget.clear()
+                widget.hide()
+            elif widget:
+                widget.deleteLater()
 
     def on_item_clicked(self, item: Item):
         """Handle item click"""
@@ -889,7 +902,7 @@ class FloatingPanel(QWidget):
 
                 # Obtener items desde config_manager
                 if hasattr(self.config_manager, 'db'):
-                    all_items_from_db = self.config_manager.db.get_items_by_category(category_id)
+                    all_items_from_db = self.config_manager.db.get_items_by_category(category_id, lazy_content=True)
 
                     # Actualizar items en la categoría
                     from models.item import Item
@@ -897,6 +910,7 @@ class FloatingPanel(QWidget):
 
                     # Separar items normales
                     self.all_items = [item for item in self.current_category.items if not item.is_list_item()]
+                    self.items_version += 1
 
                     # Recargar listas
                     if self.list_controller:
@@ -916,7 +930,8 @@ class FloatingPanel(QWidget):
             return
 
         # Aplicar filtros avanzados primero a items
-        filtered_items = self.filter_engine.apply_filters(self.all_items, self.current_filters)
+        filtered_items = self.filter_engine.apply_filters(self.all_items, self.current_filters,
+                                                          dataset_version=self.items_version)
 
         # Aplicar filtro de estado (is_active, is_archived)
         filtered_items = self.filter_items_by_state(filtered_items)
@@ -935,7 +950,11 @@ class FloatingPanel(QWidget):
             )
             # Asignar items después de crear la categoría
             temp_category.items = filtered_items
-            filtered_items = self.search_engine.search_in_category(query, temp_category)
+            # Versión de los items filtrados: el índice no los recompara en cada pulsación
+            filters_key = self.filter_engine.result_key(self.current_filters, self.items_version)
+            search_version = (filters_key, self.current_state_filter) if filters_key else None
+            filtered_items = self.search_engine.search_in_category(query, temp_category,
+                                                                   version=search_version)
 
             # Buscar en nombres de listas
             query_lower = query.lower()
@@ -1442,6 +1461,11 @@ class FloatingPanel(QWidget):
             self.minimize_button.setToolTip("Maximizar panel")
             logger.info(f"Panel '{self.header_label.text()}' MINIMIZADO")
         else:
+            # Panel restaurado sin contenido todavía: cargarlo al expandir
+            if self.hydrate_callback:
+                hydrate, self.hydrate_callback = self.hydrate_callback, None
+                hydrate()
+
             # Restore content widgets
             self.filters_button_widget.setVisible(True)
             self.search_bar.setVisible(True)
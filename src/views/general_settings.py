@@ -6,7 +6,7 @@ Widget for general application settings
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox,
     QSpinBox, QPushButton, QGroupBox, QFormLayout, QFileDialog,
-    QMessageBox
+    QMessageBox, QProgressDialog, QApplication
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
@@ -20,6 +20,12 @@ from views.dialogs.password_verify_dialog import PasswordVerifyDialog
 
 logger = logging.getLogger(__name__)
 
+# .jsonl se exporta/importa por streaming (comprimido con .gz/.zst)
+CONFIG_FILE_FILTERS = (
+    "JSON Lines (*.jsonl *.jsonl.gz *.jsonl.zst);;"
+    "JSON Files (*.json)"
+)
+
 
 class GeneralSettings(QWidget):
     """
@@ -252,15 +258,17 @@ class GeneralSettings(QWidget):
             self,
             "Exportar Configuración",
             str(Path.home() / "widget_sidebar_config.json"),
-            "JSON Files (*.json)"
+            CONFIG_FILE_FILTERS
         )
 
         if not file_path:
             return
 
+        progress_dialog, progress = self._create_progress("Exportando configuración...")
         try:
             # Export config
-            success = self.config_manager.export_config(file_path)
+            success = self.config_manager.export_config(file_path, progress=progress)
+            progress_dialog.close()
             if success:
                 QMessageBox.information(
                     self,
@@ -274,6 +282,7 @@ class GeneralSettings(QWidget):
                     "No se pudo exportar la configuración"
                 )
         except Exception as e:
+            progress_dialog.close()
             QMessageBox.critical(
                 self,
                 "Error",
@@ -295,15 +304,17 @@ class GeneralSettings(QWidget):
             self,
             "Importar Configuración",
             str(Path.home()),
-            "JSON Files (*.json)"
+            CONFIG_FILE_FILTERS
         )
 
         if not file_path:
             return
 
+        progress_dialog, progress = self._create_progress("Importando configuración...")
         try:
-            # Import config
-            success = self.config_manager.import_config(file_path)
+            # Import config (JSON Lines: se reanuda si se interrumpe)
+            success = self.config_manager.import_config(file_path, progress=progress)
+            progress_dialog.close()
             if success:
                 QMessageBox.information(
                     self,
@@ -320,12 +331,31 @@ class GeneralSettings(QWidget):
                     "No se pudo importar la configuración"
                 )
         except Exception as e:
+            progress_dialog.close()
             QMessageBox.critical(
                 self,
                 "Error",
                 f"Error al importar configuración:\n{str(e)}"
             )
 
+    def _create_progress(self, label: str):
+        """
+        Create a progress dialog and the callback that updates it
+
+        Returns:
+            (QProgressDialog, callable(done, total))
+        """
+        dialog = QProgressDialog(label, None, 0, 0, self)
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(500)
+
+        def progress(done: int, total: int):
+            dialog.setMaximum(max(total, 1))
+            dialog.setValue(min(done, max(total, 1)))
+            QApplication.processEvents()
+
+        return dialog, progress
+
     def get_settings(self) -> dict:
         """
         Get current general settings
@@ -1,7 +1,7 @@
 """
 Global Search Panel Window - Independent window for searching all items across all categories
 """
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QPushButton, QSizePolicy, QComboBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox
 from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QEvent, QTimer
 from PyQt6.QtGui import QFont, QCursor
 import sys
@@ -10,8 +10,8 @@ import json
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from models.item import Item, ItemType
-from views.widgets.item_widget import ItemButton
+from models.item import Item
+from views.widgets.item_list_view import ItemListView
 from views.widgets.search_bar import SearchBar
 from views.advanced_filters_window import AdvancedFiltersWindow
 from core.search_engine import SearchEngine
@@ -34,14 +34,19 @@ class GlobalSearchPanel(QWidget):
     # Signal emitted when pin state changes
     pin_state_changed = pyqtSignal(bool)  # True = pinned, False = unpinned
 
-    def __init__(self, db_manager=None, config_manager=None, list_controller=None, parent=None):
+    def __init__(self, db_manager=None, config_manager=None, list_controller=None, parent=None,
+                 item_snapshots=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.config_manager = config_manager
         self.list_controller = list_controller
+        # Items compartidos entre paneles (MainController): se toma una
+        # referencia al cargar y se suelta al cerrar
+        self.item_snapshots = item_snapshots
+        self.snapshot = None  # ItemSnapshot actual (solo lectura)
         self.search_engine = SearchEngine()
         self.filter_engine = AdvancedFilterEngine()  # Motor de filtrado avanzado
-        self.all_items = []  # Store all items before filtering
+        self.all_items = []  # Store all items before filtering (snapshot items if shared)
         self.current_filters = {}  # Filtros activos actuales
         self.current_state_filter = "normal"  # Filtro de estado actual: normal, archived, inactive, all
 
@@ -68,6 +73,7 @@ class GlobalSearchPanel(QWidget):
         self.normal_height = None  # Altura normal antes de minimizar
         self.normal_width = None  # Ancho normal antes de minimizar
         self.normal_position = None  # Posición normal antes de minimizar
+        self.hydrate_callback = None  # Carga pendiente del contenido (panel restaurado minimizado)
 
         # Pinned panels manager
         self.panels_manager = None
@@ -419,13 +425,12 @@ class GlobalSearchPanel(QWidget):
         self.search_bar.search_changed.connect(self.on_search_changed)
         main_layout.addWidget(self.search_bar)
 
-        # Scroll area for items
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Virtualized item list (only the visible rows are painted)
+        self.items_view = ItemListView(show_category=True,  # show_category=True for global search
+                                       db_manager=self.db_manager)
+        self.items_view.item_clicked.connect(self.on_item_clicked)
+        self.items_view.setStyleSheet("""
+            QListView {
                 border: none;
                 background-color: #252525;
                 border-radius: 0 0 6px 6px;
@@ -457,23 +462,31 @@ class GlobalSearchPanel(QWidget):
                 background-color: #666666;
             }
         """)
+        main_layout.addWidget(self.items_view)
 
-        # Container for items
-        self.items_container = QWidget()
+    def _item_from_dict(self, item_dict: dict):
+        """
+        Build an Item (with category info, dates and use_count) from a row
 
-        # Configurar política de tamaño para permitir expansión horizontal
-        self.items_container.setSizePolicy(
-            QSizePolicy.Policy.MinimumExpanding,  # Horizontal: puede expandirse
-            QSizePolicy.Policy.Preferred          # Vertical: tamaño preferido
-        )
+        Returns:
+            Item or None if the row cannot be converted
+        """
+        try:
+            return Item.from_row(item_dict)
+        except Exception as e:
+            logger.error(f"Error converting item {item_dict.get('id')}: {e}")
+            return None
 
-        self.items_layout = QVBoxLayout(self.items_container)
-        self.items_layout.setContentsMargins(0, 0, 0, 0)
-        self.items_layout.setSpacing(0)
-        self.items_layout.addStretch()
+    def _on_snapshot_changed(self, snapshot):
+        """Switch to the new shared snapshot and refresh the results"""
+        self.snapshot = snapshot
+        self.all_items = snapshot.items
+        logger.debug(f"Global search panel now on item snapshot v{snapshot.version}")
 
-        self.scroll_area.setWidget(self.items_container)
-        main_layout.addWidget(self.scroll_area)
+        if self.isVisible():
+            # Re-aplicar búsqueda y filtros (el timer agrupa diffs consecutivos)
+            self.pending_search_query = self.search_bar.text()
+            self.search_timer.start(0)
 
     def load_all_items(self):
         """Load and display ALL items from ALL categories"""
@@ -483,88 +496,31 @@ class GlobalSearchPanel(QWidget):
 
         logger.info("Loading all items for global search")
 
-        # Get all items from database
-        items_data = self.db_manager.get_all_items(include_inactive=False)
-
-        # Convert dict items to Item objects
-        self.all_items = []
-        for item_dict in items_data:
-            try:
-                # Convert type string to ItemType enum (handle both uppercase and lowercase)
-                type_str = item_dict['type'].lower() if item_dict['type'] else 'text'
-                item_type = ItemType(type_str)
-
-                item = Item(
-                    item_id=str(item_dict['id']),
-                    label=item_dict['label'],
-                    content=item_dict['content'],
-                    item_type=item_type,
-                    icon=item_dict.get('icon'),
-                    is_sensitive=bool(item_dict.get('is_sensitive', False)),
-                    is_favorite=bool(item_dict.get('is_favorite', False)),
-                    tags=item_dict.get('tags', []),
-                    description=item_dict.get('description')
-                )
-
-                # Store category info for display
-                item.category_name = item_dict.get('category_name', '')
-                item.category_icon = item_dict.get('category_icon', '')
-                item.category_color = item_dict.get('category_color', '')
-
-                # Parse date fields from database (SQLite returns strings)
-                from datetime import datetime
-                if item_dict.get('created_at'):
-                    try:
-                        # SQLite datetime format: 'YYYY-MM-DD HH:MM:SS' or ISO format
-                        created_at_str = item_dict['created_at']
-                        if 'T' in created_at_str:
-                            # ISO format
-                            item.created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                        else:
-                            # SQLite format
-                            item.created_at = datetime.strptime(created_at_str, '%Y-%m-%d %H:%M:%S')
-                        logger.debug(f"Parsed created_at for '{item.label}': {item.created_at}")
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Could not parse created_at '{item_dict.get('created_at')}': {e}")
-                        item.created_at = datetime.now()
-                else:
-                    logger.debug(f"Item '{item.label}' has no created_at in database")
-
-                if item_dict.get('last_used'):
-                    try:
-                        last_used_str = item_dict['last_used']
-                        if 'T' in last_used_str:
-                            # ISO format
-                            item.last_used = datetime.fromisoformat(last_used_str.replace('Z', '+00:00'))
-                        else:
-                            # SQLite format
-                            item.last_used = datetime.strptime(last_used_str, '%Y-%m-%d %H:%M:%S')
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Could not parse last_used '{item_dict.get('last_used')}': {e}")
-                        item.last_used = datetime.now()
-
-                # Parse use_count
-                item.use_count = item_dict.get('use_count', 0)
-
-                self.all_items.append(item)
-            except Exception as e:
-                logger.error(f"Error converting item {item_dict.get('id')}: {e}")
-                continue
+        # Get all items (the snapshot shared with the other panels if
+        # available, else the database; sensitive content decrypted on read)
+        if self.item_snapshots:
+            if self.snapshot is None:
+                self.snapshot = self.item_snapshots.acquire(self._on_snapshot_changed)
+            self.all_items = self.snapshot.items
+        else:
+            self.all_items = []
+            for item_dict in self.db_manager.get_all_items(include_inactive=False, lazy_content=True):
+                item = self._item_from_dict(item_dict)
+                if item is not None:
+                    self.all_items.append(item)
 
         logger.info(f"Loaded {len(self.all_items)} items from database")
 
-        # Update available tags in filters window
+        # Update available tags in filters window (from the loaded items: the
+        # materialized frequencies also count items this panel does not hold)
         self.filters_window.update_available_tags(self.all_items)
         logger.debug(f"Updated available tags from {len(self.all_items)} items")
 
         # Clear search bar
         self.search_bar.clear_search()
 
-        # Display only first 100 items initially (for performance)
-        # When user searches/filters, all matching items will be shown
-        initial_display_limit = 100
-        items_to_display = self.all_items[:initial_display_limit]
-        self.display_items(items_to_display, total_count=len(self.all_items))
+        # Display all items (the list view only paints the visible rows)
+        self.display_items(self.all_items)
 
         # Show the window
         self.show()
@@ -588,56 +544,11 @@ class GlobalSearchPanel(QWidget):
             # Showing all results
             self.header_label.setText(f"🌐 Búsqueda Global ({len(items)} items)")
 
-        # Clear existing items
-        self.clear_items()
-
-        # Add items
-        for idx, item in enumerate(items):
-            logger.debug(f"Creating button {idx+1}/{len(items)}: {item.label}")
-            item_button = ItemButton(item, show_category=True)  # show_category=True for global search
-            item_button.item_clicked.connect(self.on_item_clicked)
-            self.items_layout.insertWidget(self.items_layout.count() - 1, item_button)
-
-        # Add info message if showing limited results
-        if total_count and total_count > len(items):
-            info_widget = QWidget()
-            info_widget.setStyleSheet("""
-                QWidget {
-                    background-color: #2d2d2d;
-                    border: 1px solid #4d4d4d;
-                    border-radius: 4px;
-                    padding: 10px;
-                    margin: 5px;
-                }
-            """)
-            info_layout = QVBoxLayout(info_widget)
-            info_layout.setContentsMargins(10, 10, 10, 10)
-
-            info_label = QLabel(
-                f"ℹ️ Mostrando los primeros {len(items)} items de {total_count} totales.\n"
-                f"💡 Usa la búsqueda o filtros para encontrar items específicos."
-            )
-            info_label.setWordWrap(True)
-            info_label.setStyleSheet("""
-                QLabel {
-                    color: #aaaaaa;
-                    font-size: 10pt;
-                    background-color: transparent;
-                    border: none;
-                }
-            """)
-            info_layout.addWidget(info_label)
-
-            self.items_layout.insertWidget(self.items_layout.count() - 1, info_widget)
-
-        logger.info(f"Successfully added {len(items)} item buttons to layout")
+        self.items_view.set_items(items)
 
     def clear_items(self):
-        """Clear all item buttons"""
-        while self.items_layout.count() > 1:  # Keep the stretch at the end
-            item = self.items_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        """Clear all displayed items"""
+        self.items_view.clear()
 
     def on_item_clicked(self, item: Item):
         """Handle item click"""
@@ -646,6 +557,22 @@ class GlobalSearchPanel(QWidget):
 
     def on_item_state_changed(self, item_id: str):
         """Handle item state change (favorite/archived) from ItemDetailsDialog"""
+        if self.snapshot is not None:
+            # El cambio llega al snapshot compartido como diff del almacén de
+            # items; si el almacén no lo vio, releer la fila (nuevo snapshot)
+            store = self.item_snapshots.item_store
+            rows = self.db_manager.get_items_by_ids([int(item_id)], lazy_content=True)
+            cached = store.get(item_id)
+            if rows and cached is not None and any(
+                bool(rows[0].get(field)) != bool(cached.get(field))
+                for field in ('is_favorite', 'is_archived')
+            ):
+                logger.info(f"Item {item_id} state changed outside the item store, refreshing it")
+                store.refresh([item_id])
+            else:
+                logger.debug(f"Item {item_id} state changed, patched from item snapshot")
+            return
+
         logger.info(f"Item {item_id} state changed, refreshing search results")
         # Reload all items and re-apply current search
         self.load_all_items()
@@ -669,7 +596,10 @@ class GlobalSearchPanel(QWidget):
         logger.debug(f"Current filters: {self.current_filters}")
 
         # Aplicar filtros avanzados primero
-        filtered_items = self.filter_engine.apply_filters(self.all_items, self.current_filters)
+        # Memorizado por versión del snapshot compartido
+        dataset_version = self.snapshot.version if self.snapshot is not None else None
+        filtered_items = self.filter_engine.apply_filters(self.all_items, self.current_filters,
+                                                          dataset_version=dataset_version)
         logger.debug(f"Items after advanced filters: {len(filtered_items)}")
 
         # Aplicar filtro de estado
@@ -677,7 +607,34 @@ class GlobalSearchPanel(QWidget):
         logger.debug(f"Items after state filter: {len(filtered_items)}")
 
         # Luego aplicar búsqueda si hay query
-        if query and query.strip():
+        ranked_ids = None
+        if query and query.strip() and self.db_manager:
+            # Búsqueda indexada (FTS5): label, content, tags, description, list_group
+            try:
+                ranked_ids = self.db_manager.search_item_ids_fts(query)
+            except Exception as e:
+                logger.warning(f"FTS search failed, falling back to scan: {e}")
+
+        if ranked_ids is not None:
+            ranking = {str(item_id): position for position, item_id in enumerate(ranked_ids)}
+            query_lower = query.lower()
+            unranked = len(ranking)
+
+            # El nombre de categoría no está en el índice: se compara en memoria
+            search_results = [
+                item for item in filtered_items
+                if item.id in ranking
+                or (getattr(item, 'category_name', None) and query_lower in item.category_name.lower())
+            ]
+
+            # Ordenar por relevancia salvo que el usuario haya elegido un orden
+            if not self.current_filters.get('sort_by'):
+                search_results.sort(key=lambda item: ranking.get(item.id, unranked))
+
+            filtered_items = search_results
+            logger.debug(f"Items after FTS search: {len(filtered_items)}")
+
+        elif query and query.strip():
             # Search in labels, content, tags, description, and category name
             search_results = []
             query_lower = query.lower()
@@ -711,18 +668,7 @@ class GlobalSearchPanel(QWidget):
 
             filtered_items = search_results
 
-        # Apply initial display limit if no search/filters are active
-        # (for performance with large datasets)
-        if not query.strip() and not self.current_filters and self.current_state_filter == 'normal':
-            # No search, no advanced filters, no state filter -> limit to 100 items
-            initial_display_limit = 100
-            if len(filtered_items) > initial_display_limit:
-                self.display_items(filtered_items[:initial_display_limit], total_count=len(filtered_items))
-            else:
-                self.display_items(filtered_items)
-        else:
-            # Search or filters active -> show all results
-            self.display_items(filtered_items)
+        self.display_items(filtered_items)
 
         # Update filter badge when search changes
         self.update_filter_badge()
@@ -1106,7 +1052,7 @@ class GlobalSearchPanel(QWidget):
             # Hide content widgets
             self.filters_button_widget.setVisible(False)
             self.search_bar.setVisible(False)
-            self.scroll_area.setVisible(False)
+            self.items_view.setVisible(False)
 
             # Reduce header margins for compact look
             self.header_layout.setContentsMargins(8, 3, 5, 3)
@@ -1136,10 +1082,15 @@ class GlobalSearchPanel(QWidget):
             self.minimize_button.setToolTip("Maximizar panel")
             logger.info(f"Panel '{self.header_label.text()}' MINIMIZADO")
         else:
+            # Panel restaurado sin contenido todavía: cargarlo al expandir
+            if self.hydrate_callback:
+                hydrate, self.hydrate_callback = self.hydrate_callback, None
+                hydrate()
+
             # Restore content widgets
             self.filters_button_widget.setVisible(True)
             self.search_bar.setVisible(True)
-            self.scroll_area.setVisible(True)
+            self.items_view.setVisible(True)
 
             # Restore header margins
             self.header_layout.setContentsMargins(15, 10, 10, 10)
@@ -1372,12 +1323,8 @@ class GlobalSearchPanel(QWidget):
 
     def on_copy_all_visible(self):
         """Copiar al portapapeles el contenido de todos los items visibles"""
-        # Obtener todos los widgets de items actualmente en el layout
-        visible_items = []
-        for i in range(self.items_layout.count() - 1):  # -1 para excluir el stretch
-            widget = self.items_layout.itemAt(i).widget()
-            if widget and hasattr(widget, 'item'):
-                visible_items.append(widget.item)
+        # Obtener todos los items mostrados en la lista
+        visible_items = self.items_view.items()
 
         if not visible_items:
             logger.warning("No visible items to copy")
@@ -1483,11 +1430,7 @@ class GlobalSearchPanel(QWidget):
             return
 
         # Obtener items visibles
-        visible_items = []
-        for i in range(self.items_layout.count() - 1):
-            widget = self.items_layout.itemAt(i).widget()
-            if widget and hasattr(widget, 'item'):
-                visible_items.append(widget.item)
+        visible_items = self.items_view.items()
 
         if not visible_items:
             logger.warning("No visible items to create list from")
@@ -1774,11 +1717,7 @@ class GlobalSearchPanel(QWidget):
         from PyQt6.QtWidgets import QMessageBox
 
         # Count visible items
-        visible_count = 0
-        for i in range(self.items_layout.count() - 1):
-            widget = self.items_layout.itemAt(i).widget()
-            if widget:
-                visible_count += 1
+        visible_count = self.items_view.count()
 
         # Build info message
         info_lines = [
@@ -1869,5 +1808,9 @@ class GlobalSearchPanel(QWidget):
         if self.filters_window.isVisible():
             self.filters_window.close()
 
+        if self.snapshot is not None:
+            self.item_snapshots.release(self._on_snapshot_changed)
+            self.snapshot = None
+
         self.window_closed.emit()
         event.accept()
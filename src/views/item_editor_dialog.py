@@ -8,8 +8,8 @@ from PyQt6.QtWidgets import (
     QTextEdit, QComboBox, QPushButton, QFormLayout, QMessageBox, QCheckBox,
     QFrame, QScrollArea, QFileDialog, QGroupBox, QWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, pyqtSignal, QUrl
+from PyQt6.QtGui import QFont, QDesktopServices
 import sys
 from pathlib import Path
 import re
@@ -916,6 +916,53 @@ class ItemEditorDialog(QDialog):
 
         return data
 
+    def confirm_duplicate_file(self, copy_result: dict) -> bool:
+        """
+        Ask what to do when the selected file is already in storage
+
+        The file was not copied again (copy_file_to_storage reuses the stored
+        one). The user can reuse the existing item (nothing is saved), open
+        the stored file, or create this item pointing to the same file.
+
+        Returns:
+            bool: True to continue saving this item
+        """
+        duplicate_item = copy_result.get('duplicate_item')
+        if not duplicate_item:
+            return True
+        if self.is_edit_mode and str(duplicate_item.get('id')) == str(self.item.id):
+            # El item ya apuntaba a este archivo
+            return True
+
+        label = duplicate_item.get('label', 'Sin nombre')
+        logger.info(f"[ItemEditor] Selected file already stored as item {duplicate_item.get('id')} ('{label}')")
+
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Information)
+        box.setWindowTitle("Archivo ya guardado")
+        box.setText(
+            f"Este archivo ya está guardado en el item '{label}'.\n"
+            f"Ruta: {copy_result.get('relative_path')}"
+        )
+        box.setInformativeText("¿Usar el item existente o crear este item apuntando al mismo archivo?")
+        reuse_button = box.addButton("Usar item existente", QMessageBox.ButtonRole.AcceptRole)
+        open_button = box.addButton("Abrir archivo", QMessageBox.ButtonRole.ActionRole)
+        create_button = box.addButton("Crear de todas formas", QMessageBox.ButtonRole.YesRole)
+        box.addButton("Cancelar", QMessageBox.ButtonRole.RejectRole)
+        box.setDefaultButton(reuse_button)
+        box.exec()
+
+        clicked = box.clickedButton()
+        if clicked is create_button:
+            return True
+        if clicked is reuse_button:
+            # No se crea ni modifica nada: el item existente ya tiene el archivo
+            logger.info(f"[ItemEditor] Reusing existing item '{label}' instead of saving")
+            self.reject()
+        elif clicked is open_button:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(copy_result.get('destination_path')))
+        return False
+
     def on_save(self):
         """Handle save button click - saves directly to database"""
         # Validate form data
@@ -945,6 +992,9 @@ class ItemEditorDialog(QDialog):
                     copy_result = self.file_manager.copy_file_to_storage(self.selected_file_path)
 
                     if copy_result and copy_result.get('success'):
+                        if copy_result.get('duplicate') and not self.confirm_duplicate_file(copy_result):
+                            return
+
                         # IMPORTANTE: Guardar RUTA RELATIVA (portable) en content
                         relative_path = copy_result.get('relative_path')
                         self.content_input.setPlainText(relative_path)
@@ -1001,12 +1051,10 @@ class ItemEditorDialog(QDialog):
                     working_dir=item_data.get("working_dir"),
                     is_active=item_data.get("is_active", True),
                     is_archived=item_data.get("is_archived", False),
-                    # File metadata (if present)
-                    file_size=item_data.get("file_size"),
-                    file_type=item_data.get("file_type"),
-                    file_extension=item_data.get("file_extension"),
-                    original_filename=item_data.get("original_filename"),
-                    file_hash=item_data.get("file_hash")
+                    # File metadata only when a new file was selected (keeps the stored blob)
+                    **{field: item_data[field] for field in (
+                        "file_size", "file_type", "file_extension", "original_filename", "file_hash"
+                    ) if field in item_data}
                 )
 
                 # If no exception was raised, the update was successful
@@ -2,9 +2,10 @@
 Main Window View
 """
 from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QMessageBox, QApplication
-from PyQt6.QtCore import Qt, QPoint, pyqtSignal
+from PyQt6.QtCore import Qt, QPoint, QTimer, pyqtSignal
 from PyQt6.QtGui import QScreen, QShortcut, QKeySequence
 import sys
+from typing import List
 import logging
 import traceback
 from pathlib import Path
@@ -32,6 +33,7 @@ from core.hotkey_manager import HotkeyManager
 from core.tray_manager import TrayManager
 from core.session_manager import SessionManager
 from core.notification_manager import NotificationManager
+from core.panel_restore_scheduler import PanelRestoreScheduler, PRIORITY_VISIBLE, PRIORITY_OFFSCREEN
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -104,8 +106,11 @@ class MainWindow(QMainWindow):
         self.check_notifications_delayed()
 
         # AUTO-RESTORE: Restore pinned panels from database on startup
-        self.restore_pinned_panels_on_startup()
-        self.restore_pinned_global_search_panels()
+        # (shells now, contents in idle-time slices once the event loop runs)
+        self.panel_restore_scheduler = PanelRestoreScheduler(
+            schedule=lambda callback: QTimer.singleShot(0, callback)
+        )
+        self.restore_pinned_panels()
 
     def init_ui(self):
         """Initialize the user interface"""
@@ -424,7 +429,8 @@ class MainWindow(QMainWindow):
                     db_manager=db_manager,
                     config_manager=self.config_manager,
                     list_controller=self.controller.list_controller,
-                    parent=self
+                    parent=self,
+                    item_snapshots=self.controller.item_snapshots
                 )
                 self.global_search_panel.item_clicked.connect(self.on_item_clicked)
                 self.global_search_panel.window_closed.connect(self.on_global_search_panel_closed)
@@ -1449,11 +1455,20 @@ class MainWindow(QMainWindow):
         # Usar el nuevo método show_pinned_panels_manager()
         self.show_pinned_panels_manager()
 
-    def restore_pinned_panels_on_startup(self):
-        """AUTO-RESTORE: Restore active pinned panels from database on application startup"""
+    def restore_pinned_panels_on_startup(self) -> List[int]:
+        """AUTO-RESTORE: Restore active pinned panels from database on application startup
+
+        Only the panel shells (geometry, header, pin/minimized state, signals,
+        shortcut) are built here; the category content is loaded later by
+        the restore scheduler (see _schedule_panel_hydration).
+
+        Returns:
+            List[int]: IDs of the restored panels
+        """
+        restored_ids = []
         if not self.controller:
             logger.warning("No controller available - skipping panel restoration")
-            return
+            return restored_ids
 
         try:
             # Get all active panels from database
@@ -1461,7 +1476,7 @@ class MainWindow(QMainWindow):
 
             if not active_panels:
                 logger.info("No active panels to restore")
-                return
+                return restored_ids
 
             logger.info(f"Restoring {len(active_panels)} active panels from database...")
 
@@ -1476,9 +1491,9 @@ class MainWindow(QMainWindow):
                         logger.debug(f"Skipping panel {panel_id} - no category_id (global search panel)")
                         continue
 
-                    # Get category
-                    category = self.controller.get_category(str(category_id))
-                    if not category:
+                    # Solo la fila de la categoría (nombre); los items se cargan al hidratar
+                    category_row = self.config_manager.db.get_category(category_id)
+                    if not category_row:
                         logger.warning(f"Category {category_id} not found for panel {panel_id} - skipping")
                         continue
 
@@ -1499,8 +1514,8 @@ class MainWindow(QMainWindow):
                     restored_panel.customization_requested.connect(self.on_panel_customization_requested)
                     restored_panel.url_open_requested.connect(self.on_url_open_in_browser)
 
-                    # Load category
-                    restored_panel.load_category(category)
+                    # Placeholder header until the category is loaded
+                    restored_panel.header_label.setText(panel_data.get('custom_name') or category_row['name'])
 
                     # Restore position and size
                     restored_panel.move(panel_data['x_position'], panel_data['y_position'])
@@ -1519,20 +1534,9 @@ class MainWindow(QMainWindow):
                     if panel_data.get('is_minimized'):
                         restored_panel.toggle_minimize()
 
-                    # Restore filter configuration if available
-                    if panel_data.get('filter_config'):
-                        filter_config = self.controller.pinned_panels_manager._deserialize_filter_config(
-                            panel_data['filter_config']
-                        )
-                        if filter_config:
-                            restored_panel.apply_filter_config(filter_config)
-                            logger.debug(f"Applied saved filters to panel {panel_id}")
-
                     # Add to pinned panels list
                     self.pinned_panels.append(restored_panel)
-
-                    # Update last_opened in database
-                    self.controller.pinned_panels_manager.mark_panel_opened(panel_id)
+                    restored_ids.append(panel_id)
 
                     # Register keyboard shortcut if one is assigned
                     if panel_data.get('keyboard_shortcut'):
@@ -1541,7 +1545,13 @@ class MainWindow(QMainWindow):
                     # Show panel
                     restored_panel.show()
 
-                    logger.info(f"Panel {panel_id} (Category: {category.name}) restored successfully")
+                    # Load category and saved filters in an idle slice (or on expand)
+                    self._schedule_panel_hydration(
+                        restored_panel,
+                        lambda p=restored_panel, c=category_id, d=panel_data: self._hydrate_floating_panel(p, c, d)
+                    )
+
+                    logger.info(f"Panel {panel_id} (Category: {category_row['name']}) restored successfully")
 
                 except Exception as e:
                     logger.error(f"Error restoring panel {panel_data.get('id', 'unknown')}: {e}", exc_info=True)
@@ -1552,13 +1562,45 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error during panel restoration on startup: {e}", exc_info=True)
 
-    def restore_pinned_global_search_panels(self):
-        """Restaurar paneles de búsqueda global anclados desde la BD"""
+        return restored_ids
+
+    def _hydrate_floating_panel(self, panel, category_id: int, panel_data: dict):
+        """Load the category and saved filters of a restored panel shell"""
+        if panel not in self.pinned_panels:
+            return  # Cerrado antes de cargarse
+
+        category = self.controller.get_category(str(category_id))
+        if not category:
+            logger.warning(f"Category {category_id} not found for panel {panel.panel_id}")
+            return
+
+        panel.load_category(category)
+        panel.update_header_title()
+
+        # Restore filter configuration if available
+        if panel_data.get('filter_config'):
+            filter_config = self.controller.pinned_panels_manager._deserialize_filter_config(
+                panel_data['filter_config']
+            )
+            if filter_config:
+                panel.apply_filter_config(filter_config)
+                logger.debug(f"Applied saved filters to panel {panel.panel_id}")
+
+    def restore_pinned_global_search_panels(self) -> List[int]:
+        """Restaurar paneles de búsqueda global anclados desde la BD
+
+        Como en restore_pinned_panels_on_startup, solo se crean los paneles;
+        los items y la búsqueda inicial se cargan con el scheduler.
+
+        Returns:
+            List[int]: IDs de los paneles restaurados
+        """
         logger.info("=== [GLOBAL SEARCH RESTORE] Starting restore_pinned_global_search_panels() ===")
+        restored_ids = []
 
         if not self.controller:
             logger.warning("[GLOBAL SEARCH RESTORE] No controller available - skipping global search panels restoration")
-            return
+            return restored_ids
 
         try:
             logger.info("[GLOBAL SEARCH RESTORE] Calling get_global_search_panels(active_only=True)...")
@@ -1567,7 +1609,7 @@ class MainWindow(QMainWindow):
 
             if not global_panels_data:
                 logger.info("[GLOBAL SEARCH RESTORE] No active global search panels to restore")
-                return
+                return restored_ids
 
             logger.info(f"[GLOBAL SEARCH RESTORE] Restoring {len(global_panels_data)} global search panels...")
 
@@ -1577,12 +1619,12 @@ class MainWindow(QMainWindow):
                     config = self.controller.pinned_panels_manager.restore_global_search_panel(panel_data)
 
                     # Crear nuevo panel de búsqueda global
-                    from views.global_search_panel import GlobalSearchPanel
                     restored_panel = GlobalSearchPanel(
                         db_manager=self.config_manager.db if self.config_manager else None,
                         config_manager=self.config_manager,
                         list_controller=self.controller.list_controller if self.controller else None,
-                        parent=self  # Conectar como hijo de MainWindow para señales
+                        parent=self,  # Conectar como hijo de MainWindow para señales
+                        item_snapshots=self.controller.item_snapshots if self.controller else None
                     )
 
                     # Conectar señales
@@ -1622,18 +1664,9 @@ class MainWindow(QMainWindow):
                     restored_panel.update_pin_button_style()
                     restored_panel.update_filter_badge()
 
-                    # IMPORTANTE: Cargar todos los items primero
-                    restored_panel.load_all_items()
-
-                    # Realizar búsqueda inicial si hay query (después de cargar items)
-                    if config['search_query']:
-                        restored_panel._perform_search()
-
                     # Agregar a lista
                     self.pinned_global_search_panels.append(restored_panel)
-
-                    # Actualizar last_opened en BD
-                    self.controller.pinned_panels_manager.mark_panel_opened(config['panel_id'])
+                    restored_ids.append(config['panel_id'])
 
                     # IMPORTANTE: Mostrar panel ANTES de minimizar (si no, el estado minimizado no se mantiene)
                     restored_panel.show()
@@ -1643,6 +1676,12 @@ class MainWindow(QMainWindow):
                         restored_panel.is_minimized = False  # Asegurar que empieza en False
                         restored_panel.toggle_minimize()
 
+                    # Cargar items y búsqueda inicial en una porción ociosa (o al expandir)
+                    self._schedule_panel_hydration(
+                        restored_panel,
+                        lambda p=restored_panel, q=config['search_query']: self._hydrate_global_search_panel(p, q)
+                    )
+
                     logger.info(f"Global search panel {config['panel_id']} ({config['custom_name']}) restored successfully")
 
                 except Exception as e:
@@ -1654,6 +1693,39 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Failed to restore pinned global search panels: {e}", exc_info=True)
 
+        return restored_ids
+
+    def _hydrate_global_search_panel(self, panel, search_query: str):
+        """Load the items (and run the saved search) of a restored global search panel"""
+        if panel not in self.pinned_global_search_panels:
+            return  # Cerrado antes de cargarse
+
+        # IMPORTANTE: Cargar todos los items primero
+        panel.load_all_items()
+
+        # Realizar búsqueda inicial si hay query (después de cargar items)
+        if search_query:
+            panel._perform_search()
+
+    def _schedule_panel_hydration(self, panel, hydrate):
+        """Queue the content load of a restored panel shell
+
+        Visible panels load first, panels outside every screen after them;
+        minimized panels wait until they are expanded.
+        """
+        center = panel.frameGeometry().center()
+        priority = PRIORITY_VISIBLE if QApplication.screenAt(center) else PRIORITY_OFFSCREEN
+        self.panel_restore_scheduler.add(panel, hydrate, priority=priority, deferred=panel.is_minimized)
+        panel.hydrate_callback = lambda p=panel: self.panel_restore_scheduler.run_now(p)
+
+    def restore_pinned_panels(self):
+        """Restore every pinned panel shell, record the opening with one
+        write and start hydrating panel contents in idle-time slices"""
+        restored_ids = self.restore_pinned_panels_on_startup() + self.restore_pinned_global_search_panels()
+        if restored_ids and self.controller:
+            self.controller.pinned_panels_manager.mark_panels_opened(restored_ids)
+        self.panel_restore_scheduler.start()
+
     def on_restore_panel_requested(self, panel_id: int):
         """Handle request to restore/open a saved panel"""
         logger.info(f"[MAIN WINDOW] Restore panel requested: {panel_id}")
@@ -1698,7 +1770,8 @@ class MainWindow(QMainWindow):
                 db_manager=self.config_manager.db if self.config_manager else None,
                 config_manager=self.config_manager,
                 list_controller=self.controller.list_controller if self.controller else None,
-                parent=self
+                parent=self,
+                item_snapshots=self.controller.item_snapshots if self.controller else None
             )
 
             # Set panel properties
@@ -1933,7 +1933,7 @@ class SimpleBrowserWindow(QWidget):
 
                 # Conectar señales para actualizar UI automáticamente
                 if self.controller and hasattr(self.controller, 'refresh_ui'):
-                    dialog.item_created.connect(lambda cat_id: self.controller.refresh_ui())
+                    dialog.item_created.connect(lambda cat_id: self.controller.refresh_ui(reload_data=False))
 
                 # Asegurar que el dialog tenga file_manager y db_manager
                 if not hasattr(dialog, 'file_manager') or dialog.file_manager is None:
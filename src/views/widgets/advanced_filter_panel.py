@@ -1040,21 +1040,31 @@ class AdvancedFilterPanel(QWidget):
         self.actions_animation.setEasingCurve(QEasingCurve.Type.InOutCubic)
         self.actions_animation.start()
 
-    def update_available_tags(self, items):
+    def update_available_tags(self, items, tags=None):
         """
         Actualizar la lista de tags disponibles desde los items actuales
 
         Args:
             items: Lista de items de la categoría actual
+            tags: Tags ya conocidos (p.ej. frecuencias materializadas de la
+                  base); si se pasan no se recorren los items
         """
-        # Obtener todos los tags únicos de los items
-        all_tags = set()
-        for item in items:
-            if hasattr(item, 'tags') and item.tags:
-                all_tags.update(item.tags)
+        if tags is None:
+            # Obtener todos los tags únicos de los items
+            all_tags = set()
+            for item in items:
+                if hasattr(item, 'tags') and item.tags:
+                    all_tags.update(item.tags)
+        else:
+            all_tags = set(tags)
+
+        # Misma lista que la mostrada: conservar los checkboxes (y su estado)
+        new_tags = sorted(list(all_tags))
+        if new_tags and new_tags == self.available_tags and len(self.tag_checkboxes) == len(new_tags):
+            return
 
         # Convertir a lista ordenada
-        self.available_tags = sorted(list(all_tags))
+        self.available_tags = new_tags
 
         # Limpiar checkboxes anteriores
         while self.tags_container_layout.count() > 1:  # Mantener el stretch al final
@@ -0,0 +1,471 @@
+"""
+Item List View
+Virtualized item list (model + painted delegate) used instead of one
+ItemButton widget per item: only the visible rows are painted and the
+widget count does not grow with the number of items
+"""
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QMenu, QAbstractItemView, QFrame
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex, QRect, QSize, QTimer
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter
+import sys
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from models.item import Item, ItemType
+from core.usage_tracker import UsageTracker
+from views.widgets.item_widget import ItemButton, format_item_label, get_item_badge
+
+logger = logging.getLogger(__name__)
+
+
+# Roles del modelo
+ITEM_ROLE = Qt.ItemDataRole.UserRole + 1       # Item de la fila
+COPIED_ROLE = Qt.ItemDataRole.UserRole + 2     # Feedback de copiado activo
+REVEALED_ROLE = Qt.ItemDataRole.UserRole + 3   # Contenido sensible revelado
+
+# Altura fija de fila (uniformItemSizes)
+ROW_HEIGHT = 56
+
+
+class ItemListModel(QAbstractListModel):
+    """List model over a plain list of Item objects"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._rows = {}            # item_id -> row
+        self._revealed = set()     # item_ids con contenido revelado
+        self._copied_id = None     # item_id con feedback de copiado
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+
+        item = self._items[index.row()]
+        if role == ITEM_ROLE:
+            return item
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_item_label(item, item.id in self._revealed)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            # Igual que ItemButton: preview del contenido salvo items sensibles
+            if not item.is_sensitive and item.content:
+                content = item.content
+                return content[:150] + "..." if len(content) > 150 else content
+            return item.label
+        if role == COPIED_ROLE:
+            return item.id == self._copied_id
+        if role == REVEALED_ROLE:
+            return item.id in self._revealed
+        return None
+
+    def set_items(self, items) -> None:
+        """Replace the displayed items"""
+        self.beginResetModel()
+        self._items = list(items)
+        self._rows = {item.id: row for row, item in enumerate(self._items)}
+        self._revealed &= set(self._rows)
+        self._copied_id = None
+        self.endResetModel()
+
+    def items(self) -> list:
+        """Get the displayed items, in display order"""
+        return list(self._items)
+
+    def item_at(self, row: int):
+        """Get the Item of a row (None if out of range)"""
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def set_copied(self, item_id) -> None:
+        """Mark an item as just copied (None clears the feedback)"""
+        previous, self._copied_id = self._copied_id, item_id
+        self._emit_item_changed(previous)
+        self._emit_item_changed(item_id)
+
+    def set_revealed(self, item_id, revealed: bool) -> None:
+        """Reveal or hide the content of a sensitive item"""
+        if revealed:
+            self._revealed.add(item_id)
+        else:
+            self._revealed.discard(item_id)
+        self._emit_item_changed(item_id)
+
+    def is_revealed(self, item_id) -> bool:
+        return item_id in self._revealed
+
+    def _emit_item_changed(self, item_id) -> None:
+        row = self._rows.get(item_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+
+class ItemDelegate(QStyledItemDelegate):
+    """Paints an item row with the same look as ItemButton"""
+
+    def __init__(self, show_category: bool = False, parent=None, db_manager=None):
+        super().__init__(parent)
+        self.show_category = show_category
+        self.db_manager = db_manager  # Para marcar/desmarcar favoritos
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(max(option.rect.width(), 300), ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        item = index.data(ITEM_ROLE)
+        if item is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = option.rect
+        sensitive = bool(getattr(item, 'is_sensitive', False))
+        saved_file = item.type == ItemType.PATH and bool(getattr(item, 'file_hash', None))
+        copied = bool(index.data(COPIED_ROLE))
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+
+        # Fondo
+        if copied:
+            background = "#cc7a00" if sensitive else "#007acc"
+        elif sensitive:
+            background = "#4d2525" if hovered else "#3d2020"
+        else:
+            background = "#3d3d3d" if hovered else "#2d2d2d"
+        painter.fillRect(rect, QColor(background))
+        if selected and not copied:
+            painter.fillRect(rect, QColor(255, 255, 255, 18))
+
+        # Bordes: izquierdo (sensible / archivo guardado) e inferior
+        if copied:
+            painter.fillRect(QRect(rect.left(), rect.bottom(), rect.width(), 1),
+                             QColor("#9e5e00" if sensitive else "#005a9e"))
+        else:
+            if sensitive or saved_file:
+                painter.fillRect(QRect(rect.left(), rect.top(), 3, rect.height()),
+                                 QColor("#cc0000" if sensitive else "#4CAF50"))
+            painter.fillRect(QRect(rect.left(), rect.bottom(), rect.width(), 1), QColor("#1e1e1e"))
+
+        x = rect.left() + 15
+        right = rect.right() - 15
+
+        # Indicador de color del item
+        if getattr(item, 'color', None):
+            painter.fillRect(QRect(x, rect.center().y() - 15, 6, 30), QColor(item.color))
+            x += 16
+
+        # Fila del label (arriba si hay tags, centrada si no)
+        has_tags = bool(item.tags)
+        label_top = rect.top() + 6 if has_tags else rect.top()
+        label_height = 24 if has_tags else rect.height()
+        label_rect = QRect(x, label_top, right - x, label_height)
+
+        # Badges a la derecha del label: categoría, favorito, popular, archivo guardado
+        badge_font = QFont(option.font)
+        badge_font.setPointSize(8)
+        badge_font.setBold(True)
+        category_text = None
+        if self.show_category and getattr(item, 'category_name', None):
+            category_text = f"📁 {item.category_name}"
+        favorite = "⭐" if getattr(item, 'is_favorite', False) else ""
+        trailing = " ".join(part for part in (favorite, get_item_badge(item), "📦" if saved_file else "") if part)
+
+        reserved = 0
+        if category_text:
+            reserved += QFontMetrics(badge_font).horizontalAdvance(category_text) + 16 + 8
+        if trailing:
+            emoji_font = QFont(option.font)
+            emoji_font.setPointSize(12)
+            reserved += QFontMetrics(emoji_font).horizontalAdvance(trailing) + 8
+
+        label_font = QFont(option.font)
+        label_font.setPointSize(10)
+        if copied:
+            label_font.setBold(True)
+        painter.setFont(label_font)
+        painter.setPen(QColor("#ffffff" if copied else "#cccccc"))
+        metrics = QFontMetrics(label_font)
+        label_text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        elided = metrics.elidedText(label_text, Qt.TextElideMode.ElideRight, max(label_rect.width() - reserved, 20))
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+
+        cursor_x = x + metrics.horizontalAdvance(elided) + 8
+        if category_text:
+            painter.setFont(badge_font)
+            width = QFontMetrics(badge_font).horizontalAdvance(category_text) + 16
+            badge_rect = QRect(cursor_x, label_rect.center().y() - 9, width, 18)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#3d3d3d"))
+            painter.drawRoundedRect(badge_rect, 3, 3)
+            painter.setPen(QColor("#f093fb"))
+            painter.drawText(badge_rect, Qt.AlignmentFlag.AlignCenter, category_text)
+            cursor_x += width + 8
+        if trailing:
+            painter.setFont(emoji_font)
+            painter.setPen(QColor("#4CAF50" if saved_file else "#cccccc"))
+            painter.drawText(QRect(cursor_x, label_rect.top(), right - cursor_x, label_rect.height()),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, trailing)
+
+        # Tags (chips); los que no caben se omiten
+        if has_tags:
+            tag_font = QFont(option.font)
+            tag_font.setPointSize(8)
+            tag_metrics = QFontMetrics(tag_font)
+            painter.setFont(tag_font)
+            tag_x = x
+            tag_top = rect.top() + 32
+            for tag in item.tags:
+                width = tag_metrics.horizontalAdvance(tag) + 16
+                if tag_x + width > right:
+                    break
+                chip = QRect(tag_x, tag_top, width, 17)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor("#007acc"))
+                painter.drawRoundedRect(chip, 3, 3)
+                painter.setPen(QColor("#ffffff"))
+                painter.drawText(chip, Qt.AlignmentFlag.AlignCenter, tag)
+                tag_x += width + 5
+
+        painter.restore()
+
+
+class ItemListView(QListView):
+    """
+    Virtualized list of items
+
+    Left click copies the item (same signal, usage tracking and feedback as
+    ItemButton); the context menu offers the ItemButton actions (details,
+    reveal, execute, open URL/path) and the favorite toggle. Actions run on
+    a short-lived hidden ItemButton so their behaviour stays in one place.
+    """
+
+    # Signals (same as ItemButton)
+    item_clicked = pyqtSignal(object)
+    url_open_requested = pyqtSignal(str)
+
+    def __init__(self, show_category: bool = False, parent=None, db_manager=None):
+        super().__init__(parent)
+        self.show_category = show_category
+        self.db_manager = db_manager  # Para marcar/desmarcar favoritos
+        self._fit_to_contents = False
+
+        self.item_model = ItemListModel(self)
+        self.setModel(self.item_model)
+        self.setItemDelegate(ItemDelegate(show_category, self))
+
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setMouseTracking(True)
+        self.setMinimumWidth(300)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+
+        # Un solo tracker para todas las filas
+        self.usage_tracker = UsageTracker()
+
+        self._copied_timer = QTimer(self)
+        self._copied_timer.setSingleShot(True)
+        self._copied_timer.timeout.connect(lambda: self.item_model.set_copied(None))
+
+        self._clipboard_clear_timer = QTimer(self)
+        self._clipboard_clear_timer.setSingleShot(True)
+        self._clipboard_clear_timer.timeout.connect(self._clear_clipboard)
+
+        self._reveal_timers = {}
+
+        self.clicked.connect(self._on_index_clicked)
+
+    # ========== DATOS ==========
+
+    def set_items(self, items) -> None:
+        """Display a list of items"""
+        self.item_model.set_items(items)
+        if self._fit_to_contents:
+            self._update_fixed_height()
+
+    def items(self) -> list:
+        """Get the displayed items"""
+        return self.item_model.items()
+
+    def count(self) -> int:
+        return self.item_model.rowCount()
+
+    def clear(self) -> None:
+        self.set_items([])
+
+    def set_fit_to_contents(self, enabled: bool) -> None:
+        """
+        Size the view to all its rows (for a view embedded in a scroll area)
+
+        The outer scroll area then scrolls the view; only the exposed rows
+        are still painted.
+        """
+        self._fit_to_contents = enabled
+        self.setVerticalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff if enabled else Qt.ScrollBarPolicy.ScrollBarAsNeeded
+        )
+        if enabled:
+            self._update_fixed_height()
+
+    def _update_fixed_height(self) -> None:
+        self.setFixedHeight(self.count() * ROW_HEIGHT + 2 * self.frameWidth())
+
+    # ========== CLICK (COPIAR) ==========
+
+    def _on_index_clicked(self, index: QModelIndex) -> None:
+        item = index.data(ITEM_ROLE)
+        if item is not None:
+            self.copy_item(item)
+
+    def keyPressEvent(self, event):
+        # Enter copia la fila seleccionada
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self.currentIndex().isValid():
+            self._on_index_clicked(self.currentIndex())
+            return
+        super().keyPressEvent(event)
+
+    def copy_item(self, item: Item) -> None:
+        """Emit item_clicked with usage tracking and copied feedback"""
+        # Track clipboard copy (comando simple)
+        if item.type not in [ItemType.URL, ItemType.PATH]:
+            start_time = self.usage_tracker.track_execution_start(item.id)
+
+        self.item_clicked.emit(item)
+
+        # Feedback de copiado durante 500ms
+        self.item_model.set_copied(item.id)
+        self._copied_timer.start(500)
+
+        if item.type not in [ItemType.URL, ItemType.PATH]:
+            self.usage_tracker.track_execution_end(item.id, start_time, True, None)
+
+        # Items sensibles: limpiar el portapapeles a los 30 segundos
+        if getattr(item, 'is_sensitive', False):
+            self._clipboard_clear_timer.start(30000)
+
+    def _clear_clipboard(self) -> None:
+        """Clear clipboard content"""
+        try:
+            import pyperclip
+            pyperclip.copy("")
+        except Exception as e:
+            logger.error(f"Error clearing clipboard: {e}")
+
+    # ========== REVELAR ==========
+
+    def toggle_reveal(self, item: Item) -> None:
+        """Reveal/hide a sensitive item (auto-hidden after 10 seconds)"""
+        revealed = not self.item_model.is_revealed(item.id)
+        self.item_model.set_revealed(item.id, revealed)
+
+        timer = self._reveal_timers.pop(item.id, None)
+        if timer:
+            timer.stop()
+            timer.deleteLater()
+
+        if revealed:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda item_id=item.id: self._auto_hide(item_id))
+            timer.start(10000)
+            self._reveal_timers[item.id] = timer
+
+    def _auto_hide(self, item_id) -> None:
+        self.item_model.set_revealed(item_id, False)
+        timer = self._reveal_timers.pop(item_id, None)
+        if timer:
+            timer.deleteLater()
+
+    # ========== FAVORITOS ==========
+
+    def toggle_favorite(self, item: Item) -> None:
+        """
+        Mark/unmark an item as favorite
+
+        The Item is not modified (it may belong to the shared snapshot): the
+        owning panel refreshes as after a change in ItemDetailsDialog.
+        """
+        is_favorite = not getattr(item, 'is_favorite', False)
+        try:
+            self.db_manager.update_item(int(item.id), is_favorite=is_favorite)
+        except Exception as e:
+            logger.error(f"Error toggling favorite for item {item.id}: {e}")
+            return
+
+        msg = "agregado a" if is_favorite else "quitado de"
+        logger.info(f"Item '{item.label}' {msg} favoritos")
+
+        panel = self.parent()
+        while panel is not None and not hasattr(panel, 'on_item_state_changed'):
+            panel = panel.parent()
+        if panel is not None:
+            panel.on_item_state_changed(str(item.id))
+
+    # ========== MENÚ CONTEXTUAL ==========
+
+    def contextMenuEvent(self, event):
+        index = self.indexAt(event.pos())
+        item = index.data(ITEM_ROLE) if index.isValid() else None
+        if item is None:
+            # Fuera de las filas: menú del panel contenedor
+            event.ignore()
+            return
+
+        menu = QMenu(self)
+        menu.addAction("📋 Copiar").triggered.connect(lambda: self.copy_item(item))
+        menu.addAction("ℹ️ Ver detalles").triggered.connect(lambda: self.run_item_action(item, 'show_details'))
+        if self.db_manager is not None:
+            text = "☆ Quitar de favoritos" if getattr(item, 'is_favorite', False) else "⭐ Marcar como favorito"
+            menu.addAction(text).triggered.connect(lambda: self.toggle_favorite(item))
+
+        if item.is_sensitive:
+            text = "🙈 Ocultar contenido" if self.item_model.is_revealed(item.id) else "👁 Revelar contenido"
+            menu.addAction(text).triggered.connect(lambda: self.toggle_reveal(item))
+
+        if item.type == ItemType.CODE:
+            menu.addSeparator()
+            menu.addAction("⚡ Ejecutar comando").triggered.connect(
+                lambda: self.run_item_action(item, 'execute_command'))
+        elif item.type == ItemType.URL:
+            menu.addSeparator()
+            menu.addAction("🌐 Abrir en navegador integrado").triggered.connect(
+                lambda: self.run_item_action(item, 'open_in_browser'))
+            menu.addAction("🔗 Abrir en navegador del sistema").triggered.connect(
+                lambda: self.run_item_action(item, 'open_in_system_browser'))
+        elif item.type == ItemType.PATH:
+            menu.addSeparator()
+            menu.addAction("📁 Abrir en explorador").triggered.connect(
+                lambda: self.run_item_action(item, 'open_in_explorer'))
+            menu.addAction("📝 Abrir archivo").triggered.connect(
+                lambda: self.run_item_action(item, 'open_file'))
+
+        menu.exec(event.globalPos())
+        event.accept()
+
+    def run_item_action(self, item: Item, action: str) -> None:
+        """
+        Run an ItemButton action for an item
+
+        A hidden ItemButton child is created only for the duration of the
+        action (its parent chain reaches the panel, as show_details expects).
+        """
+        button = ItemButton(item, show_category=self.show_category, parent=self)
+        button.hide()
+        button.url_open_requested.connect(self.url_open_requested.emit)
+        try:
+            getattr(button, action)()
+        except Exception as e:
+            logger.error(f"Error running '{action}' for item {item.label}: {e}", exc_info=True)
+        finally:
+            button.deleteLater()
@@ -25,6 +25,44 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def format_item_label(item: Item, revealed: bool = False) -> str:
+    """
+    Build the display label of an item (ofuscado si es sensible y no revelado)
+
+    Shared by ItemButton and the virtualized ItemListView.
+    """
+    # Get file type icon if this is a PATH item with file metadata
+    file_icon = ""
+    if (item.type == ItemType.PATH and
+        hasattr(item, 'file_hash') and item.file_hash and
+        hasattr(item, 'get_file_type_icon')):
+        file_icon = item.get_file_type_icon() + " "
+
+    if hasattr(item, 'is_sensitive') and item.is_sensitive and not revealed:
+        # Ofuscar: mostrar label + (********)
+        content_preview = "********"
+        return f"{file_icon}{item.label} ({content_preview})"
+    elif hasattr(item, 'is_sensitive') and item.is_sensitive and revealed:
+        # Revelado: mostrar label + preview del contenido
+        content = item.content[:30] if len(item.content) > 30 else item.content
+        return f"{file_icon}{item.label} ({content}...)" if len(item.content) > 30 else f"{file_icon}{item.label} ({content})"
+    else:
+        # Item normal: solo el label (con icono de archivo si aplica)
+        return f"{file_icon}{item.label}"
+
+
+def get_item_badge(item: Item) -> str:
+    """Obtener badge del item (🔥 Popular)"""
+    use_count = getattr(item, 'use_count', 0)
+
+    # Popular: más de 50 usos
+    if use_count > 50:
+        return "🔥"
+
+    # Badge "Nuevo" deshabilitado
+    return ""
+
+
 class ItemButton(QFrame):
     """Custom item button widget for content panel with tags support"""
 
@@ -788,24 +826,7 @@ class ItemButton(QFrame):
 
     def get_display_label(self):
         """Get display label (ofuscado si es sensible y no revelado)"""
-        # Get file type icon if this is a PATH item with file metadata
-        file_icon = ""
-        if (self.item.type == ItemType.PATH and
-            hasattr(self.item, 'file_hash') and self.item.file_hash and
-            hasattr(self.item, 'get_file_type_icon')):
-            file_icon = self.item.get_file_type_icon() + " "
-
-        if hasattr(self.item, 'is_sensitive') and self.item.is_sensitive and not self.is_revealed:
-            # Ofuscar: mostrar label + (********)
-            content_preview = "********"
-            return f"{file_icon}{self.item.label} ({content_preview})"
-        elif hasattr(self.item, 'is_sensitive') and self.item.is_sensitive and self.is_revealed:
-            # Revelado: mostrar label + preview del contenido
-            content = self.item.content[:30] if len(self.item.content) > 30 else self.item.content
-            return f"{file_icon}{self.item.label} ({content}...)" if len(self.item.content) > 30 else f"{file_icon}{self.item.label} ({content})"
-        else:
-            # Item normal: solo el label (con icono de archivo si aplica)
-            return f"{file_icon}{self.item.label}"
+        return format_item_label(self.item, self.is_revealed)
 
     def toggle_reveal(self):
         """Toggle reveal/hide sensitive content"""
@@ -893,14 +914,7 @@ class ItemButton(QFrame):
 
     def get_badge(self) -> str:
         """Obtener badge del item (🔥 Popular)"""
-        use_count = getattr(self.item, 'use_count', 0)
-
-        # Popular: más de 50 usos
-        if use_count > 50:
-            return "🔥"
-
-        # Badge "Nuevo" deshabilitado
-        return ""
+        return get_item_badge(self.item)
 
     def get_usage_stats(self) -> str:
         """Obtener estadísticas de uso (use_count + last_used)"""
@@ -969,7 +983,14 @@ class ItemButton(QFrame):
                     break
                 parent_widget = parent_widget.parent()
 
-            dialog = ItemDetailsDialog(self.item, floating_panel=refresh_panel, parent=self.window())
+            # DBManager de la aplicación (el del panel) para que el cambio notifique a sus listeners
+            db_manager = getattr(refresh_panel, 'db_manager', None)
+            config_manager = getattr(refresh_panel, 'config_manager', None)
+            if db_manager is None and config_manager is not None:
+                db_manager = getattr(config_manager, 'db', None)
+
+            dialog = ItemDetailsDialog(self.item, floating_panel=refresh_panel, parent=self.window(),
+                                       db_manager=db_manager)
             dialog.exec()
         except Exception as e:
             logger.error(f"Error showing item details: {e}")
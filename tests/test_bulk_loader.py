@@ -0,0 +1,71 @@
+"""
+Script de testing para la carga masiva de categorías con items
+Verifica agrupación, orden y exclusión de categorías inactivas en una sola pasada
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+
+
+def _create_db():
+    """Crear base de datos en memoria con categorías e items de prueba"""
+    db = DBManager(":memory:")
+    # Limpiar categorías predefinidas para un resultado determinista
+    db.connect().execute("DELETE FROM categories")
+    db.connect().commit()
+
+    second = db.add_category("Second", order_index=2)
+    first = db.add_category("First", order_index=1)
+    inactive = db.add_category("Inactive", order_index=3)
+    db.update_category(inactive, is_active=False)
+
+    conn = db.connect()
+    rows = [
+        (second, "b1", '["x"]', "2024-01-01"),
+        (first, "a2", 'tag1, tag2', "2024-01-02"),
+        (first, "a1", None, "2024-01-01"),
+        (inactive, "z1", None, "2024-01-01"),
+    ]
+    for category_id, label, tags, created_at in rows:
+        conn.execute("""
+            INSERT INTO items (category_id, label, content, tags, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (category_id, label, label, tags, created_at))
+    conn.commit()
+    return db
+
+
+def test_categories_with_items_grouped_and_ordered():
+    """Test de agrupación por categoría respetando order_index y created_at"""
+    db = _create_db()
+    categories = db.get_categories_with_items()
+
+    assert [c['name'] for c in categories] == ["First", "Second"]
+    assert [i['label'] for i in categories[0]['items']] == ["a1", "a2"]
+    assert categories[0]['items'][1]['tags'] == ["tag1", "tag2"]
+    assert categories[1]['items'][0]['tags'] == ["x"]
+
+
+def test_categories_with_items_include_inactive():
+    """Test de inclusión de categorías inactivas (y categorías sin items)"""
+    db = _create_db()
+    db.add_category("Empty", order_index=4)
+    categories = db.get_categories_with_items(include_inactive=True)
+
+    by_name = {c['name']: c for c in categories}
+    assert [i['label'] for i in by_name["Inactive"]['items']] == ["z1"]
+    assert by_name["Empty"]['items'] == []
+
+
+def test_categories_with_items_matches_per_category_queries():
+    """Test de equivalencia con get_items_by_category por categoría"""
+    db = _create_db()
+    for category in db.get_categories_with_items():
+        expected = db.get_items_by_category(category['id'])
+        assert category['items'] == expected
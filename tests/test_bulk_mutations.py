@@ -0,0 +1,114 @@
+"""
+Script de testing para las operaciones masivas de DBManager
+Verifica bulk_update_items / bulk_delete_items: una transacción,
+resultados por id y un único evento de cambio
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database import db_manager as db_module
+from database.db_manager import DBManager, ITEM_UPDATED, ITEM_DELETED, ITEM_NOT_FOUND
+
+
+@pytest.fixture
+def db():
+    """Base en memoria con una categoría y cinco items"""
+    manager = DBManager(":memory:")
+    category_id = manager.add_category("Bulk")
+    manager.item_ids = [manager.add_item(category_id, f"item {i}", f"contenido {i}") for i in range(5)]
+    yield manager
+    manager.close()
+
+
+def test_bulk_update_sets_fields_and_reports_outcomes(db):
+    """Test: todos los items existentes se actualizan; los ausentes se reportan"""
+    events = []
+    db.add_item_listener(lambda kind, ids: events.append((kind, ids)))
+    target = db.item_ids[:3] + [9999]
+
+    outcomes = db.bulk_update_items(target, is_archived=1, tags=['a', 'b'])
+
+    assert outcomes == {**{item_id: ITEM_UPDATED for item_id in db.item_ids[:3]}, 9999: ITEM_NOT_FOUND}
+    archived = db.execute_query("SELECT id, tags FROM items WHERE is_archived = 1 ORDER BY id")
+    assert [row['id'] for row in archived] == db.item_ids[:3]
+    assert archived[0]['tags'] == '["a", "b"]'
+    assert events == [(ITEM_UPDATED, db.item_ids[:3])]
+
+
+def test_bulk_update_runs_in_chunks(db, monkeypatch):
+    """Test: más ids que BULK_CHUNK_SIZE se procesan en varias sentencias"""
+    monkeypatch.setattr(db_module, 'BULK_CHUNK_SIZE', 2)
+
+    outcomes = db.bulk_update_items(db.item_ids, is_favorite=1)
+
+    assert set(outcomes.values()) == {ITEM_UPDATED}
+    assert db.execute_query("SELECT COUNT(*) as n FROM items WHERE is_favorite = 1")[0]['n'] == 5
+
+
+def test_bulk_update_rejects_per_item_fields(db):
+    """Test: content/is_sensitive requieren cifrado por item"""
+    with pytest.raises(ValueError):
+        db.bulk_update_items(db.item_ids, is_sensitive=1)
+    with pytest.raises(ValueError):
+        db.bulk_update_items(db.item_ids, not_a_column=1)
+    with pytest.raises(ValueError):
+        db.bulk_update_items(db.item_ids)
+
+
+def test_bulk_delete_items(db):
+    """Test: borrado en una transacción con un único evento"""
+    events = []
+    db.add_item_listener(lambda kind, ids: events.append((kind, ids)))
+
+    outcomes = db.bulk_delete_items([db.item_ids[0], db.item_ids[0], db.item_ids[1], 9999])
+
+    assert outcomes == {db.item_ids[0]: ITEM_DELETED, db.item_ids[1]: ITEM_DELETED, 9999: ITEM_NOT_FOUND}
+    remaining = db.execute_query("SELECT id FROM items ORDER BY id")
+    assert [row['id'] for row in remaining] == db.item_ids[2:]
+    assert events == [(ITEM_DELETED, db.item_ids[:2])]
+
+
+def test_add_items_bulk_returns_ids_in_order(db):
+    """Test: inserción masiva con ids contiguos y un único evento"""
+    events = []
+    db.add_item_listener(lambda kind, ids: events.append((kind, ids)))
+    category_id = db.add_category("Importados")
+
+    item_ids = db.add_items_bulk(category_id, [
+        {'label': 'uno', 'content': 'echo 1', 'item_type': 'CODE', 'tags': ['git', 'deploy']},
+        {'label': 'dos', 'content': 'https://example.com', 'item_type': 'URL', 'is_favorite': 1},
+        {'label': 'tres', 'content': 'paso', 'is_list': 1, 'list_group': 'pasos', 'orden_lista': 1},
+    ])
+
+    rows = db.execute_query(
+        "SELECT id, label, type, tags, is_favorite, orden_lista FROM items WHERE category_id = ? ORDER BY id",
+        (category_id,)
+    )
+    assert [row['id'] for row in rows] == item_ids
+    assert [row['label'] for row in rows] == ['uno', 'dos', 'tres']
+    assert rows[0]['type'] == 'CODE' and rows[0]['tags'] == '["git", "deploy"]'
+    assert rows[1]['is_favorite'] == 1 and rows[2]['orden_lista'] == 1
+    assert events == [('added', item_ids)]
+    assert db.add_items_bulk(category_id, []) == []
+
+
+def test_ai_bulk_manager_creates_items_in_one_batch(db):
+    """Test: AIBulkItemManager usa la inserción masiva y actualiza item_count"""
+    from core.ai_bulk_manager import AIBulkItemManager
+    from models.bulk_item_data import BulkItemData
+
+    category_id = db.add_category("IA")
+    items = [BulkItemData(label=f"cmd {i}", content=f"echo {i}", type='CODE', tags='a, b') for i in range(50)]
+    items[3].selected = False
+
+    result = AIBulkItemManager(db).create_items_bulk(items, category_id)
+
+    assert result.success and result.created_count == 49 and result.failed_count == 0
+    assert db.get_category_by_id(category_id)['item_count'] == 49
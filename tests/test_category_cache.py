@@ -0,0 +1,175 @@
+"""
+Script de testing para CategoryCache
+Verifica aciertos tras la primera carga, invalidación dirigida por cambios
+de items/categorías, escrituras de otras conexiones y carga única para
+peticiones concurrentes
+"""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.connection_pool import get_connection_pool
+from core.category_cache import CategoryCache
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base con dos categorías de tres items"""
+    manager = DBManager(str(tmp_path / "cache.db"))
+    manager.category_ids = []
+    for name in ("Git", "Docker"):
+        category_id = manager.add_category(name)
+        manager.add_items_bulk(category_id, [
+            {'label': f"{name} {index}", 'content': f"cmd {index}"} for index in range(3)
+        ])
+        manager.category_ids.append(category_id)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def cache(db):
+    """Cache con un loader que lee la categoría y sus items de la base"""
+    def load(category_id):
+        row = db.get_category(category_id)
+        if not row:
+            return None
+        items = [SimpleNamespace(id=str(item['id']), label=item['label'])
+                 for item in db.get_items_by_category(category_id)]
+        return SimpleNamespace(id=str(category_id), name=row['name'], items=items)
+
+    category_cache = CategoryCache(db, load)
+    yield category_cache
+    category_cache.close()
+
+
+def test_toggling_categories_loads_each_once(db, cache):
+    """Test: alternar entre dos categorías solo carga cada una la primera vez"""
+    git, docker = db.category_ids
+    for _ in range(5):
+        assert cache.get(git).name == "Git"
+        assert cache.get(docker).name == "Docker"
+
+    assert cache.loads == 2
+    assert cache.hits == 8
+
+
+def test_item_changes_invalidate_only_their_category(db, cache):
+    """Test: altas, cambios y bajas de items recargan solo su categoría"""
+    git, docker = db.category_ids
+    cache.get(git), cache.get(docker)
+    git_item = int(cache.get(git).items[0].id)
+
+    db.update_item(git_item, label="renombrado")
+    assert cache.get(git).items[0].label == "renombrado"
+    cache.get(docker)
+    assert cache.loads == 3
+
+    db.add_item(docker, "nuevo", "contenido")
+    assert [item.label for item in cache.get(docker).items][-1] == "nuevo"
+    cache.get(git)
+    assert cache.loads == 4
+
+    db.delete_item(git_item)
+    assert len(cache.get(git).items) == 2
+    assert cache.loads == 5
+
+
+def test_bulk_mutations_invalidate_touched_categories(db, cache):
+    """Test: una operación masiva recarga solo las categorías de sus items"""
+    git, docker = db.category_ids
+    git_ids = [int(item.id) for item in cache.get(git).items]
+    cache.get(docker)
+
+    db.bulk_update_items(git_ids[:2], is_favorite=1)
+    cache.get(git), cache.get(docker)
+    assert cache.loads == 3
+
+    db.bulk_delete_items(git_ids)
+    assert cache.get(git).items == []
+    cache.get(docker)
+    assert cache.loads == 4
+
+
+def test_category_changes_invalidate(db, cache):
+    """Test: renombrar, reordenar y borrar categorías invalidan sus entradas"""
+    git, docker = db.category_ids
+    cache.get(git), cache.get(docker)
+
+    db.update_category(git, name="Git 2")
+    assert cache.get(git).name == "Git 2"
+
+    db.reorder_categories([docker, git])
+    cache.get(git), cache.get(docker)
+    assert cache.loads == 5
+
+    db.delete_category(docker)
+    assert cache.get(docker) is None
+
+
+def test_writes_from_other_connections_clear_cache(db, cache):
+    """Test: una escritura por otra conexión (p.ej. favoritos) no deja datos viejos"""
+    git = db.category_ids[0]
+    item_id = int(cache.get(git).items[0].id)
+
+    conn = get_connection_pool(db.db_path).connection()
+    conn.execute("UPDATE items SET label = 'externo' WHERE id = ?", (item_id,))
+    conn.commit()
+    conn.close()
+
+    assert cache.get(git).items[0].label == "externo"
+
+
+def test_concurrent_requests_share_one_load(db):
+    """Test: peticiones simultáneas de la misma categoría hacen una sola carga"""
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_load(category_id):
+        calls.append(category_id)
+        started.set()
+        release.wait(5)
+        return SimpleNamespace(id=str(category_id), items=[])
+
+    cache = CategoryCache(db, slow_load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(db.category_ids[0])))
+               for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [db.category_ids[0]]
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    cache.close()
+
+
+def test_invalidation_during_load_is_not_cached(db):
+    """Test: un cambio durante la carga impide guardar el resultado viejo"""
+    git = db.category_ids[0]
+    cache = None
+
+    def load(category_id):
+        if cache.loads == 0:
+            db.update_category(category_id, name="cambiada")
+        return SimpleNamespace(id=str(category_id), items=[])
+
+    cache = CategoryCache(db, load)
+    cache.get(git)
+    cache.get(git)
+
+    assert cache.loads == 2
+    cache.close()
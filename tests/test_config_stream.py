@@ -0,0 +1,147 @@
+"""
+Script de testing para el export/import por streaming (JSON Lines)
+Verifica ida y vuelta (plano y comprimido), progreso por chunks y
+reanudación de un import interrumpido sin duplicar items
+"""
+
+import sys
+import json
+import gzip
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager, ITEM_ADDED
+from database.config_stream import (
+    STREAM_FORMAT, ZSTD_AVAILABLE, is_stream_path, export_jsonl, import_jsonl
+)
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    """Base con settings, dos categorías y 25 items"""
+    db = DBManager(str(tmp_path / "source.db"))
+    db.set_setting("theme", "dark")
+    db.set_setting("max_history", 50)
+    for name in ("Git", "Docker"):
+        category_id = db.add_category(name)
+        db.add_items_bulk(category_id, [
+            {'label': f"{name} {index}", 'content': f"{name.lower()} cmd {index}",
+             'item_type': 'CODE', 'tags': [name.lower(), f"t{index % 3}"]}
+            for index in range(12 if name == "Git" else 13)
+        ])
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def target_db(tmp_path):
+    db = DBManager(str(tmp_path / "target.db"))
+    yield db
+    db.close()
+
+
+def _snapshot(db):
+    """Categorías con sus items (sin ids) para comparar bases"""
+    return {
+        category['name']: sorted(
+            (item['label'], item['content'], item['type'], tuple(item['tags']))
+            for item in db.get_items_by_category(category['id'])
+        )
+        for category in db.get_categories()
+    }
+
+
+def test_is_stream_path():
+    """Test: solo .jsonl (opcionalmente comprimido) usa el formato streaming"""
+    assert is_stream_path("export.jsonl")
+    assert is_stream_path("export.jsonl.gz")
+    assert is_stream_path("export.jsonl.zst")
+    assert not is_stream_path("export.json")
+    assert not is_stream_path("export.gz")
+
+
+@pytest.mark.parametrize("suffix", [
+    ".jsonl",
+    ".jsonl.gz",
+    pytest.param(".jsonl.zst", marks=pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")),
+])
+def test_round_trip(source_db, target_db, tmp_path, suffix):
+    """Test: exportar e importar reproduce settings, categorías e items"""
+    path = tmp_path / f"export{suffix}"
+    settings = len(source_db.get_all_settings())
+
+    exported = export_jsonl(source_db, path, chunk_size=10)
+    imported = import_jsonl(target_db, path, chunk_size=10)
+
+    assert exported == {'settings': settings, 'categories': 2, 'items': 25}
+    assert imported == {'settings': settings, 'categories': 2, 'items': 25, 'resumed_from': 0}
+    assert target_db.get_setting("theme") == "dark"
+    assert target_db.get_setting("max_history") == 50
+    assert _snapshot(target_db) == _snapshot(source_db)
+    counts = {c['name']: c['item_count'] for c in target_db.get_categories()}
+    assert counts == {"Git": 12, "Docker": 13}
+    assert not path.with_name(path.name + '.partial').exists()
+
+
+def test_export_writes_one_record_per_line(source_db, tmp_path):
+    """Test: cabecera, registros y fin, un JSON por línea (gzip legible)"""
+    path = tmp_path / "export.jsonl.gz"
+    settings = len(source_db.get_all_settings())
+    export_jsonl(source_db, path)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+
+    assert records[0]['record'] == 'header' and records[0]['format'] == STREAM_FORMAT
+    assert records[0]['items'] == 25
+    assert records[-1] == {'record': 'end', 'settings': settings, 'categories': 2, 'items': 25}
+    assert [r['record'] for r in records].count('item') == 25
+
+
+def test_progress_and_events_per_chunk(source_db, target_db, tmp_path):
+    """Test: progreso y un evento ITEM_ADDED por chunk"""
+    path = tmp_path / "export.jsonl"
+    export_progress, import_progress, events = [], [], []
+    target_db.add_item_listener(lambda kind, ids: events.append((kind, len(ids))))
+
+    export_jsonl(source_db, path, chunk_size=10, progress=lambda done, total: export_progress.append((done, total)))
+    import_jsonl(target_db, path, chunk_size=10, progress=lambda done, total: import_progress.append((done, total)))
+
+    assert export_progress == [(10, 25), (20, 25), (25, 25)]
+    assert import_progress == [(10, 25), (20, 25), (25, 25)]
+    assert events == [(ITEM_ADDED, 10), (ITEM_ADDED, 10), (ITEM_ADDED, 5)]
+
+
+def test_interrupted_import_resumes(source_db, target_db, tmp_path):
+    """Test: un import interrumpido continúa tras el último chunk confirmado"""
+    path = tmp_path / "export.jsonl"
+    export_jsonl(source_db, path)
+
+    def interrupt(done, total):
+        if done >= 20:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        import_jsonl(target_db, path, chunk_size=10, progress=interrupt)
+    assert target_db.execute_query("SELECT COUNT(*) AS n FROM items")[0]['n'] == 20
+
+    stats = import_jsonl(target_db, path, chunk_size=10)
+
+    assert stats['resumed_from'] > 0
+    assert stats['items'] == 25 and stats['categories'] == 2
+    assert _snapshot(target_db) == _snapshot(source_db)
+    assert target_db.execute_query("SELECT COUNT(*) AS n FROM import_checkpoints")[0]['n'] == 0
+
+
+def test_rejects_foreign_file(target_db, tmp_path):
+    """Test: un archivo que no es un export JSON Lines se rechaza"""
+    path = tmp_path / "other.jsonl"
+    path.write_text('{"record": "header", "format": "other"}\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        import_jsonl(target_db, path)
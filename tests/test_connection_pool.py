@@ -0,0 +1,100 @@
+"""
+Script de testing para el pool de conexiones SQLite
+Verifica configuración WAL, lectores por hilo y writer serializado
+"""
+
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.connection_pool import ConnectionPool, get_connection_pool
+
+
+def _create_pool(tmp_path):
+    """Crear pool sobre una base de datos temporal con una tabla de prueba"""
+    db_path = tmp_path / "pool.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, value TEXT)")
+    conn.commit()
+    conn.close()
+    return ConnectionPool(db_path)
+
+
+def test_pool_connection_settings(tmp_path):
+    """Test de pragmas aplicados a las conexiones del pool"""
+    pool = _create_pool(tmp_path)
+    reader = pool.reader()
+
+    assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert reader.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert reader.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert reader is pool.reader()
+    pool.close_all()
+
+
+def test_readers_are_per_thread(tmp_path):
+    """Test de una conexión lectora distinta por hilo"""
+    pool = _create_pool(tmp_path)
+    main_reader = pool.reader()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.reader()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main_reader
+    pool.close_all()
+
+
+def test_lease_writes_on_writer_and_releases_lock(tmp_path):
+    """Test de escritura a través de la lease: commit visible y lock liberado"""
+    pool = _create_pool(tmp_path)
+
+    conn = pool.connection()
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO t (value) VALUES (?)", ("a",))
+    assert cursor.lastrowid == 1
+    conn.commit()
+    conn.close()
+
+    # Otro hilo puede tomar el writer y el lector ve el commit
+    acquired = []
+
+    def write():
+        lease = pool.connection()
+        lease.execute("INSERT INTO t (value) VALUES ('b')")
+        lease.commit()
+        acquired.append(True)
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert acquired == [True]
+    rows = pool.connection().execute("SELECT value FROM t ORDER BY id").fetchall()
+    assert [row['value'] for row in rows] == ["a", "b"]
+    pool.close_all()
+
+
+def test_lease_close_discards_uncommitted(tmp_path):
+    """Test de rollback al cerrar una lease sin commit"""
+    pool = _create_pool(tmp_path)
+
+    conn = pool.connection()
+    conn.execute("INSERT INTO t (value) VALUES ('x')")
+    conn.close()
+
+    count = pool.connection().execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    assert count == 0
+    pool.close_all()
+
+
+def test_shared_pool_per_database(tmp_path):
+    """Test de pool compartido por ruta de base de datos"""
+    db_path = tmp_path / "shared.db"
+    assert get_connection_pool(db_path) is get_connection_pool(str(db_path))
+    assert get_connection_pool(":memory:") is not get_connection_pool(":memory:")
@@ -0,0 +1,98 @@
+"""
+Script de testing para el EncryptionManager compartido
+Verifica la instancia única por .env, el orden y los fallos de decrypt_many
+y el vaciado de la caché de texto plano al bloquear la cuenta o cerrar sesión
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("dotenv")
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from cryptography.fernet import Fernet
+
+import core.encryption_manager as encryption_module
+from core.encryption_manager import (
+    EncryptedContent, DECRYPTION_ERROR, get_encryption_manager
+)
+from core.auth_manager import AuthManager
+from core.session_manager import SessionManager
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """Clave propia, .env temporal y registro de instancias vacío"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    for key in ("SESSION_TOKEN", "SESSION_EXPIRES", "LOCK_TIMESTAMP"):
+        monkeypatch.setenv(key, "")
+    monkeypatch.setattr(encryption_module, "_shared_instances", {})
+    path = tmp_path / ".env"
+    path.touch()
+    return path
+
+
+def test_shared_instance_per_env_file(env_file, tmp_path):
+    """Test: la misma ruta (relativa o absoluta) devuelve la misma instancia"""
+    manager = get_encryption_manager(str(env_file))
+
+    assert get_encryption_manager(".env") is manager
+    assert get_encryption_manager(str(tmp_path / "other.env")) is not manager
+
+
+def test_decrypt_many_keeps_order_and_reports_failures(env_file):
+    """Test: resultados en el orden de entrada, None para los tokens inválidos"""
+    manager = get_encryption_manager(str(env_file))
+    plaintexts = [f"secret {index}" for index in range(manager.PARALLEL_DECRYPT_THRESHOLD + 6)]
+    tokens = manager.encrypt_many(plaintexts)
+    tokens[3] = "gAAAAA-corrupted"
+    tokens[5] = ""
+
+    results = manager.decrypt_many(tokens, item_ids=list(range(len(tokens))))
+
+    expected = list(plaintexts)
+    expected[3] = None
+    expected[5] = ""
+    assert results == expected
+    assert len(manager._plaintext_cache) == len(tokens) - 2
+
+
+def test_decrypt_many_serves_cache_per_item_and_token(env_file):
+    """Test: la caché responde por (item, token); un token editado se descifra de nuevo"""
+    manager = get_encryption_manager(str(env_file))
+    token = manager.encrypt("old")
+    assert manager.decrypt_many([token], item_ids=[1]) == ["old"]
+
+    manager.cipher_suite = None  # Un acierto de caché no necesita el cifrador
+    assert manager.decrypt_many([token], item_ids=[1]) == ["old"]
+    assert manager.decrypt_many([token], item_ids=[2]) == [None]
+
+
+def test_encrypted_content_reveals_error_marker(env_file):
+    """Test: EncryptedContent.reveal devuelve el marcador si el token no es válido"""
+    manager = get_encryption_manager(str(env_file))
+
+    assert EncryptedContent(manager.encrypt("hola"), item_id=7).reveal() == "hola"
+    assert EncryptedContent("gAAAAA-corrupted", item_id=8).reveal() == DECRYPTION_ERROR
+
+
+@pytest.mark.parametrize("purge", [
+    lambda env_file: AuthManager(str(env_file)).lock_account(60),
+    lambda env_file: SessionManager(str(env_file)).invalidate_session(),
+], ids=["lock_account", "invalidate_session"])
+def test_plaintext_cache_purged(env_file, purge):
+    """Test: bloquear la cuenta o cerrar sesión vacía la caché de texto plano"""
+    manager = get_encryption_manager(str(env_file))
+    manager.decrypt_many([manager.encrypt("secret")], item_ids=[1])
+    assert len(manager._plaintext_cache) == 1
+
+    purge(env_file)
+
+    assert len(manager._plaintext_cache) == 0
@@ -0,0 +1,267 @@
+"""
+Script de testing para la copia de archivos al almacenamiento (FileManager)
+Verifica hash calculado durante la copia y deduplicación antes de confirmar
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.file_manager import FileManager, BLOB_GRACE_PERIOD, COPY_BUFFER_SIZE, STORAGE_MODE_CONTENT
+from database.db_manager import DBManager
+
+
+class _FakeConfig:
+    """Configuración mínima de almacenamiento de archivos"""
+
+    def __init__(self, base_path, db):
+        self.db = db
+        self.base_path = str(base_path)
+        self.storage_mode = 'folders'
+
+    def get_files_base_path(self):
+        return self.base_path
+
+    def get_files_folders_config(self):
+        return {}
+
+    def get_files_auto_create_folders(self):
+        return True
+
+    def get_files_storage_mode(self):
+        return self.storage_mode
+
+    def set_files_storage_mode(self, mode):
+        self.storage_mode = mode
+        return True
+
+
+def _create_manager(tmp_path):
+    storage = tmp_path / "storage"
+    storage.mkdir()
+    config = _FakeConfig(storage, DBManager(":memory:"))
+    return FileManager(config), config.db, storage
+
+
+def test_copy_hashes_while_copying(tmp_path):
+    """Test de copia con hash de un archivo mayor que el buffer"""
+    manager, db, storage = _create_manager(tmp_path)
+    data = bytes(range(256)) * (COPY_BUFFER_SIZE // 256 * 2 + 7)
+    source = tmp_path / "video.mp4"
+    source.write_bytes(data)
+
+    result = manager.copy_file_to_storage(str(source))
+
+    assert result['success'] and not result['duplicate']
+    assert result['relative_path'] == "VIDEOS/video.mp4"
+    assert result['file_hash'] == hashlib.sha256(data).hexdigest()
+    assert result['file_size'] == len(data)
+    assert (storage / "VIDEOS" / "video.mp4").read_bytes() == data
+    # Sin temporales en la carpeta destino
+    assert [p.name for p in (storage / "VIDEOS").iterdir()] == ["video.mp4"]
+
+
+def test_duplicate_drops_temp_file(tmp_path):
+    """Test de duplicado: no se confirma la copia y se reutiliza el archivo"""
+    manager, db, storage = _create_manager(tmp_path)
+    source = tmp_path / "notas.txt"
+    source.write_text("contenido")
+    first = manager.copy_file_to_storage(str(source))
+    item_id = db.add_item(db.add_category("Archivos"), "notas", first['relative_path'],
+                          item_type='PATH', file_hash=first['file_hash'])
+
+    copy = tmp_path / "copia.txt"
+    copy.write_text("contenido")
+    result = manager.copy_file_to_storage(str(copy))
+
+    assert result['duplicate']
+    assert result['relative_path'] == "TEXT/notas.txt"
+    assert result['duplicate_item']['id'] == item_id
+    assert [p.name for p in (storage / "TEXT").iterdir()] == ["notas.txt"]
+
+
+def test_duplicate_with_missing_file_is_copied(tmp_path):
+    """Test de duplicado cuyo archivo ya no existe: se copia igualmente"""
+    manager, db, storage = _create_manager(tmp_path)
+    source = tmp_path / "informe.pdf"
+    source.write_bytes(b"%PDF-1.4")
+    file_hash = hashlib.sha256(b"%PDF-1.4").hexdigest()
+    db.add_item(db.add_category("Archivos"), "viejo", "PDFS/borrado.pdf",
+                item_type='PATH', file_hash=file_hash)
+
+    result = manager.copy_file_to_storage(str(source))
+
+    assert not result['duplicate']
+    assert (storage / "PDFS" / "informe.pdf").exists()
+
+
+def _create_blob_manager(tmp_path):
+    """FileManager en modo por contenido sobre una base de datos en memoria"""
+    storage = tmp_path / "storage"
+    storage.mkdir()
+    db = DBManager(":memory:")
+    config = _FakeConfig(storage, db)
+    config.storage_mode = STORAGE_MODE_CONTENT
+    return FileManager(config), db, storage
+
+
+def _add_path_item(db, category_id, result):
+    return db.add_item(category_id, result['original_filename'], result['relative_path'],
+                       item_type='PATH', file_size=result['file_size'],
+                       file_hash=result['file_hash'])
+
+
+def test_content_addressed_stores_identical_files_once(tmp_path):
+    """Test de modo por contenido: un blob por hash con contador de referencias"""
+    manager, db, storage = _create_blob_manager(tmp_path)
+    category_id = db.add_category("Archivos")
+    (tmp_path / "a.iso").write_bytes(b"imagen de disco")
+    (tmp_path / "b.iso").write_bytes(b"imagen de disco")
+
+    first = manager.copy_file_to_storage(str(tmp_path / "a.iso"))
+    first_id = _add_path_item(db, category_id, first)
+    second = manager.copy_file_to_storage(str(tmp_path / "b.iso"))
+    item_id = _add_path_item(db, category_id, second)
+
+    assert not first['duplicate'] and second['duplicate']
+    assert second['duplicate_item']['id'] == first_id
+    assert first['relative_path'] == second['relative_path']
+    assert first['relative_path'] == f"BLOBS/{first['file_hash'][:2]}/{first['file_hash']}.iso"
+    assert len(list((storage / "BLOBS").rglob("*.iso"))) == 1
+    assert db.get_file_blob(first['file_hash'])['ref_count'] == 2
+
+    # Sin referencias el blob se elimina
+    db.delete_item(item_id)
+    assert manager.collect_unreferenced_blobs() == 0
+    db.execute_update("DELETE FROM items WHERE file_hash = ?", (first['file_hash'],))
+    assert manager.collect_unreferenced_blobs() == 0  # Periodo de gracia
+    _age_blobs(db)
+    assert manager.collect_unreferenced_blobs() == 1
+    assert not (storage / first['relative_path']).exists()
+
+
+def _age_blobs(db, seconds=2 * BLOB_GRACE_PERIOD):
+    """Simula blobs copiados hace tiempo (fuera del periodo de gracia)"""
+    db.execute_update("UPDATE file_blobs SET created_at = datetime('now', ?)", (f"-{seconds} seconds",))
+
+
+def test_deleting_items_collects_their_blob(tmp_path):
+    """Test de recogida automática: borrar el último item elimina su blob"""
+    manager, db, storage = _create_blob_manager(tmp_path)
+    category_id = db.add_category("Archivos")
+    (tmp_path / "a.iso").write_bytes(b"imagen")
+    (tmp_path / "b.iso").write_bytes(b"otra imagen")
+    kept = manager.copy_file_to_storage(str(tmp_path / "a.iso"))
+    first = _add_path_item(db, category_id, kept)
+    second = _add_path_item(db, category_id, kept)
+    orphan = manager.copy_file_to_storage(str(tmp_path / "b.iso"))  # Sin item (guardado cancelado)
+    _age_blobs(db)
+
+    manager.start_blob_collection()
+    assert not (storage / orphan['relative_path']).exists()
+
+    db.delete_item(first)
+    assert (storage / kept['relative_path']).exists()
+    db.delete_item(second)
+    assert not (storage / kept['relative_path']).exists()
+    assert db.get_file_blob(kept['file_hash']) is None
+    manager.stop_blob_collection()
+
+
+def test_editing_label_keeps_blob(tmp_path):
+    """Test: editar un item sin elegir otro archivo (file_hash=None) conserva su blob"""
+    manager, db, storage = _create_blob_manager(tmp_path)
+    category_id = db.add_category("Archivos")
+    (tmp_path / "a.iso").write_bytes(b"imagen")
+    result = manager.copy_file_to_storage(str(tmp_path / "a.iso"))
+    item_id = _add_path_item(db, category_id, result)
+    _age_blobs(db)
+    manager.start_blob_collection()
+
+    # Lo que envía el editor cuando no se seleccionó un archivo nuevo
+    db.update_item(item_id, label="renombrado", content=result['relative_path'],
+                   file_size=None, file_hash=None)
+
+    assert db.get_item(item_id)['file_hash'] == result['file_hash']
+    assert (storage / result['relative_path']).exists()
+    assert db.get_file_blob(result['file_hash'])['ref_count'] == 1
+    manager.stop_blob_collection()
+
+
+def test_unrelated_update_keeps_fresh_blob(tmp_path):
+    """Test: un blob recién copiado sobrevive a cambios de otros items antes de guardarse"""
+    manager, db, storage = _create_blob_manager(tmp_path)
+    category_id = db.add_category("Archivos")
+    other = db.add_item(category_id, "otro", "echo", item_type='CODE')
+    (tmp_path / "a.iso").write_bytes(b"imagen")
+    manager.start_blob_collection()
+
+    fresh = manager.copy_file_to_storage(str(tmp_path / "a.iso"))
+    db.update_last_used(other)
+    db.update_item(other, label="otro editado")
+    db.delete_item(other)
+
+    assert (storage / fresh['relative_path']).exists()
+    item_id = _add_path_item(db, category_id, fresh)
+    assert db.get_file_blob(fresh['file_hash'])['ref_count'] == 1
+    assert db.get_item(item_id)['file_hash'] == fresh['file_hash']
+    manager.stop_blob_collection()
+
+
+def test_migrate_folders_to_content_addressed(tmp_path):
+    """Test de migración de carpetas por tipo a blobs"""
+    manager, db, storage = _create_blob_manager(tmp_path)
+    manager.config_manager.storage_mode = 'folders'
+    category_id = db.add_category("Archivos")
+    (storage / "PDFS").mkdir()
+    (storage / "PDFS" / "a.pdf").write_bytes(b"%PDF")
+    (storage / "PDFS" / "b.pdf").write_bytes(b"%PDF")
+    first = db.add_item(category_id, "a", "PDFS/a.pdf", item_type='PATH')
+    second = db.add_item(category_id, "b", "PDFS\\b.pdf", item_type='PATH')
+    external = db.add_item(category_id, "ext", str(tmp_path / "fuera.pdf"), item_type='PATH')
+
+    stats = manager.migrate_to_content_addressed()
+
+    assert stats['files_migrated'] == 1
+    assert stats['files_deduplicated'] == 1
+    assert stats['items_updated'] == 2
+    assert stats['items_skipped'] == 1
+    assert manager.is_content_addressed()
+    blob_path = db.get_item(first)['content']
+    assert blob_path.startswith("BLOBS/") and db.get_item(second)['content'] == blob_path
+    assert (storage / blob_path).read_bytes() == b"%PDF"
+    assert list((storage / "PDFS").iterdir()) == []
+    assert db.get_file_blob(db.get_item(first)['file_hash'])['ref_count'] == 2
+    assert db.get_item(external)['content'] == str(tmp_path / "fuera.pdf")
+
+
+def test_storage_stats_follow_copies_and_reconcile(tmp_path):
+    """Test de estadísticas: catálogo incremental y reconciliación"""
+    manager, db, storage = _create_manager(tmp_path)
+    (tmp_path / "foto.png").write_bytes(b"x" * 10)
+    (tmp_path / "video.mp4").write_bytes(b"y" * 100)
+    manager.copy_file_to_storage(str(tmp_path / "foto.png"))
+    manager.copy_file_to_storage(str(tmp_path / "video.mp4"))
+
+    # Registrados en la copia, sin recorrer el disco
+    stats = manager.get_storage_stats(reconcile=False)
+    assert stats['total_files'] == 2 and stats['total_size'] == 110
+    assert stats['by_type']['VIDEO'] == {'count': 1, 'size': 100}
+    assert stats['by_folder']['IMAGENES'] == {'count': 1, 'size': 10}
+
+    # Cambios hechos fuera de la aplicación: los corrige la reconciliación
+    (storage / "IMAGENES" / "foto.png").unlink()
+    (storage / "PDFS").mkdir()
+    (storage / "PDFS" / "doc.pdf").write_bytes(b"z" * 5)
+    manager.get_storage_stats()
+    manager.catalog.wait(5)
+
+    stats = manager.get_storage_stats(reconcile=False)
+    assert stats['catalogued']
+    assert stats['total_files'] == 2 and stats['total_size'] == 105
+    assert 'IMAGEN' not in stats['by_type']
+    assert stats['by_folder']['PDFS'] == {'count': 1, 'size': 5}
@@ -0,0 +1,73 @@
+"""
+Script de testing para el esquema de almacenamiento de archivos
+Verifica columnas de metadatos, índice de file_hash y contadores de blobs
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+
+
+def test_fresh_database_accepts_file_items():
+    """Test de base de datos nueva: add_item con metadatos de archivo"""
+    db = DBManager(":memory:")
+    category_id = db.add_category("Archivos")
+
+    item_id = db.add_item(category_id, "video", "VIDEOS/video.mp4", item_type='PATH',
+                          file_size=10, file_type='VIDEO', file_extension='.mp4',
+                          original_filename='video.mp4', file_hash='abc')
+
+    assert db.get_item_by_hash('abc')['id'] == item_id
+    assert db.get_item_by_hash('otro') is None
+
+
+def test_hash_lookup_uses_index():
+    """Test de plan de consulta: búsqueda por hash sin recorrer items"""
+    db = DBManager(":memory:")
+    plan = db.execute_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM items WHERE file_hash = ? LIMIT 1", ('abc',)
+    )
+    assert any('idx_items_file_hash' in row['detail'] for row in plan)
+
+
+def test_existing_database_gets_file_columns(tmp_path):
+    """Test de migración: bases de datos antiguas reciben las columnas"""
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE items (id INTEGER PRIMARY KEY, category_id INTEGER, label TEXT,
+                            content TEXT, type TEXT, tags TEXT, description TEXT,
+                            list_group TEXT, is_sensitive BOOLEAN DEFAULT 0);
+    """)
+    conn.close()
+
+    db = DBManager(str(db_path))
+    columns = {row['name'] for row in db.execute_query("PRAGMA table_info(items)")}
+    assert {'file_size', 'file_type', 'file_extension', 'original_filename', 'file_hash'} <= columns
+    db.close()
+
+
+def test_blob_ref_count_follows_items():
+    """Test de triggers: ref_count sigue a los items con ese hash"""
+    db = DBManager(":memory:")
+    category_id = db.add_category("Archivos")
+    first = db.add_item(category_id, "a", "BLOBS/ab/abc", item_type='PATH', file_hash='abc')
+    db.register_file_blob('abc', "BLOBS/ab/abc", 3)
+    assert db.get_file_blob('abc')['ref_count'] == 1
+
+    second = db.add_item(category_id, "b", "BLOBS/ab/abc", item_type='PATH', file_hash='abc')
+    assert db.get_file_blob('abc')['ref_count'] == 2
+
+    db.update_item(second, file_hash='otro')
+    assert db.get_file_blob('abc')['ref_count'] == 1
+
+    db.delete_item(first)
+    assert db.get_file_blob('abc')['ref_count'] == 0
+    assert [blob['file_hash'] for blob in db.get_unreferenced_file_blobs()] == ['abc']
@@ -0,0 +1,122 @@
+"""
+Script de testing para el compilador de filtros de AdvancedFilterEngine
+Verifica cada criterio del diccionario de filtros, el orden de etapas por
+selectividad y la memorización por filtros + versión del dataset
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.advanced_filter_engine import AdvancedFilterEngine
+from core.filter_compiler import compile_filters, SELECTIVITY_SAMPLE_SIZE
+from models.item import Item, ItemType
+
+
+def _item(index, **fields):
+    item = Item(item_id=str(index), label=fields.pop('label', f"item {index}"),
+                content=f"content {index}", item_type=fields.pop('item_type', ItemType.TEXT),
+                tags=fields.pop('tags', []))
+    item.use_count = fields.pop('use_count', 0)
+    for name, value in fields.items():
+        setattr(item, name, value)
+    return item
+
+
+@pytest.fixture
+def items():
+    now = datetime.now()
+    return [
+        _item(1, label="git clone", tags=['git', 'cli'], is_favorite=True, use_count=10,
+              created_at=now - timedelta(days=40)),
+        _item(2, label="docker", item_type=ItemType.CODE, tags=['docker', 'cli'], use_count=3,
+              created_at=now - timedelta(days=2)),
+        _item(3, label="docs", item_type=ItemType.URL, is_sensitive=True,
+              created_at=now - timedelta(hours=1)),
+        _item(4, label="ci", tags=['github'], is_favorite=True, use_count=0,
+              created_at=now - timedelta(days=10)),
+    ]
+
+
+def _ids(items):
+    return [item.id for item in items]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({'type': ['code', 'URL']}, ['2', '3']),
+    ({'is_favorite': True}, ['1', '4']),
+    ({'is_sensitive': False}, ['1', '2', '4']),
+    ({'has_tags': False}, ['3']),
+    ({'tags': {'values': ['cli', 'git'], 'mode': 'AND'}}, ['1']),
+    ({'tags': {'values': ['git', 'github'], 'mode': 'OR'}}, ['1', '4']),
+    ({'use_count': {'operator': '>=', 'value': 3}}, ['1', '2']),
+    ({'use_count': {'operator': '!=', 'value': 3}}, []),
+    ({'last_used': {'preset': 'never'}}, ['3', '4']),
+    ({'created_at': {'preset': 'last_7_days'}}, ['2', '3']),
+    ({'is_favorite': True, 'tags': {'values': ['cli']}}, ['1']),
+    ({'sort_by': 'use_count_desc', 'top_n': 2}, ['1', '2']),
+    ({'sort_by': 'label_asc', 'has_tags': True}, ['4', '2', '1']),
+])
+def test_filter_criteria(items, filters, expected):
+    """Test: cada criterio (y sus combinaciones) selecciona los items esperados"""
+    assert _ids(AdvancedFilterEngine().apply_filters(items, filters)) == expected
+
+
+def test_custom_created_range_parses_strings(items):
+    """Test: el rango personalizado acepta fechas de creación en texto"""
+    items[0].created_at = "2024-05-01 10:00:00"
+    filters = {'created_at': {'custom_from': datetime(2024, 1, 1), 'custom_to': datetime(2024, 12, 31)}}
+
+    assert _ids(AdvancedFilterEngine().apply_filters(items, filters)) == ['1']
+
+
+def test_stages_ordered_by_sampled_selectivity():
+    """Test: la etapa que más descarta en la muestra se evalúa primero"""
+    data = [_item(index, is_favorite=index % 2 == 0, use_count=index % 50)
+            for index in range(SELECTIVITY_SAMPLE_SIZE * 4)]
+    compiled = compile_filters({'is_favorite': True, 'use_count': {'operator': '=', 'value': 7}})
+
+    result = compiled.apply(data)
+
+    assert [stage.name for stage in compiled.stages] == ['use_count', 'is_favorite']
+    assert _ids(result) == [item.id for item in data if item.is_favorite and item.use_count == 7]
+
+
+def test_results_memoized_per_dataset_version(items):
+    """Test: mismos filtros y versión reutilizan el resultado; otra versión recalcula"""
+    engine = AdvancedFilterEngine()
+    filters = {'tags': {'values': ['cli']}}
+
+    first = engine.apply_filters(items, filters, dataset_version=1)
+    items[1].tags = []  # Cambio en sitio sin cambiar de versión: se sirve la memoria
+    assert engine.apply_filters(items, filters, dataset_version=1) == first
+    assert _ids(engine.apply_filters(items, filters, dataset_version=2)) == ['1']
+    assert len(engine.cache) == 1
+
+
+def test_clock_dependent_filters_not_memoized(items):
+    """Test: ventanas de fecha móviles y last_used no se memorizan"""
+    engine = AdvancedFilterEngine()
+
+    engine.apply_filters(items, {'created_at': {'preset': 'last_7_days'}}, dataset_version=1)
+    engine.apply_filters(items, {'sort_by': 'recent'}, dataset_version=1)
+    assert engine.cache == {}
+
+    engine.apply_filters(items, {'created_at': {'preset': 'today'}}, dataset_version=1)
+    assert len(engine.cache) == 1
+
+
+def test_result_key_follows_cacheability():
+    """Test: result_key identifica resultados fijos y es None si no lo son"""
+    engine = AdvancedFilterEngine()
+
+    assert engine.result_key({}, 3) == ('', 3)
+    assert engine.result_key({'is_favorite': True}, None) is None
+    assert engine.result_key({'created_at': {'preset': 'last_7_days'}}, 3) is None
+    assert engine.result_key({'is_favorite': True}, 3) != engine.result_key({'is_favorite': True}, 4)
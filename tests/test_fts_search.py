@@ -0,0 +1,91 @@
+"""
+Script de testing para la búsqueda full-text (FTS5) de DBManager
+Verifica sincronización por triggers, ranking bm25 y exclusión de contenido sensible
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.fts_index import build_match_query
+
+
+def _create_db():
+    """Crear base de datos en memoria con items de prueba"""
+    db = DBManager(":memory:")
+    category_id = db.add_category("FTS Test")
+    conn = db.connect()
+    rows = [
+        ("Git push", "git push origin main", '["git", "github"]', "Publicar cambios", 0),
+        ("Docker ps", "docker ps -a", '["docker"]', "Listar contenedores", 0),
+        ("Clave servidor", "supersecreto", '[]', None, 1),
+    ]
+    for label, content, tags, description, is_sensitive in rows:
+        conn.execute("""
+            INSERT INTO items (category_id, label, content, tags, description, is_sensitive)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (category_id, label, content, tags, description, is_sensitive))
+    conn.commit()
+    return db
+
+
+def test_build_match_query():
+    """Test de construcción de expresiones MATCH seguras"""
+    assert build_match_query("git pu") == '"git"* "pu"*'
+    assert build_match_query('docker" OR *') == '"docker"* "OR"*'
+    assert build_match_query("  ") is None
+
+
+def test_search_ranked_with_offsets():
+    """Test de búsqueda rankeada con snippet y offsets"""
+    db = _create_db()
+    assert db.fts_enabled
+
+    results = db.search_items_fts("git")
+    assert [r['label'] for r in results] == ["Git push"]
+    assert results[0]['category_name'] == "FTS Test"
+    assert results[0]['match_offsets']['label'] == [(0, 3)]
+    assert '<mark>' in results[0]['snippet']
+    assert results[0]['tags'] == ["git", "github"]
+
+    # Prefijos en varias columnas (description)
+    assert len(db.search_items_fts("contened")) == 1
+
+
+def test_triggers_keep_index_in_sync():
+    """Test de sincronización del índice en insert/update/delete"""
+    db = _create_db()
+    conn = db.connect()
+
+    conn.execute("UPDATE items SET label = 'Kubernetes pods' WHERE label = 'Docker ps'")
+    conn.commit()
+    assert len(db.search_item_ids_fts("kubernetes")) == 1
+
+    conn.execute("DELETE FROM items WHERE label = 'Git push'")
+    conn.commit()
+    assert db.search_item_ids_fts("git") == []
+
+
+def test_sensitive_content_not_indexed():
+    """Test de exclusión del contenido de items sensibles"""
+    db = _create_db()
+    assert db.search_item_ids_fts("supersecreto") == []
+    # El label sigue siendo buscable
+    assert len(db.search_item_ids_fts("servidor")) == 1
+
+
+def test_ids_scoped_to_category_and_limit():
+    """Test de búsqueda de ids acotada a una categoría y a un límite"""
+    db = _create_db()
+    other_id = db.add_category("Otra")
+    first = db.add_item(other_id, "Git log", "git log --oneline")
+    second = db.add_item(other_id, "Git diff", "git diff --stat")
+
+    assert len(db.search_item_ids_fts("git")) == 3
+    assert sorted(db.search_item_ids_fts("git", category_id=other_id)) == sorted([first, second])
+    assert len(db.search_item_ids_fts("git", limit=1, category_id=other_id)) == 1
+    assert db.search_item_ids_fts("docker", category_id=other_id) == []
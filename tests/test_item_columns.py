@@ -0,0 +1,108 @@
+"""
+Script de testing para ItemColumns (backend columnar NumPy)
+Verifica que máscaras y argsorts dan exactamente el mismo resultado que el
+predicado compilado y el filtrado de estructura del dashboard
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.advanced_filter_engine import AdvancedFilterEngine
+from core.dashboard_manager import DashboardManager
+from core.filter_compiler import compile_filters
+from core.item_columns import ItemColumns, COLUMNAR_THRESHOLD
+from models.item import Item, ItemType
+
+TAGS = ['git', 'docker', 'cli', 'ci', 'python']
+
+
+def _random_items(count, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now()
+    items = []
+    for index in range(count):
+        item = Item(item_id=str(index), label=rng.choice(['alpha', 'Beta', 'gamma', 'delta']) + str(index % 7),
+                    content="x", item_type=rng.choice(list(ItemType)),
+                    tags=rng.sample(TAGS, rng.randint(0, 3)))
+        item.is_favorite = rng.random() < 0.2
+        item.is_sensitive = rng.random() < 0.1
+        item.is_list = rng.random() < 0.1
+        item.use_count = rng.randint(0, 20)
+        item.created_at = now - timedelta(days=rng.randint(0, 90), minutes=rng.randint(0, 1440))
+        item.last_used = now - timedelta(days=rng.randint(0, 120))
+        items.append(item)
+    return items
+
+
+FILTERS = [
+    {'type': ['code', 'URL']},
+    {'is_favorite': True},
+    {'is_sensitive': False, 'has_tags': True},
+    {'is_list': False, 'has_tags': False},
+    {'tags': {'values': ['git', 'cli'], 'mode': 'AND'}},
+    {'tags': {'values': ['docker', 'unknown'], 'mode': 'OR'}},
+    {'tags': {'values': ['git', 'unknown'], 'mode': 'AND'}},
+    {'use_count': {'operator': '>=', 'value': 10}},
+    {'use_count': {'operator': '=', 'value': 3}, 'sort_by': 'label_desc'},
+    {'last_used': {'preset': 'last_30_days'}, 'sort_by': 'recent'},
+    {'last_used': {'preset': 'never'}},
+    {'created_at': {'preset': 'this_month'}, 'sort_by': 'oldest'},
+    {'created_at': {'preset': 'last_7_days'}, 'sort_by': 'use_count_desc', 'top_n': 25},
+    {'is_favorite': True, 'tags': {'values': ['python']}, 'sort_by': 'label_asc'},
+    {'sort_by': 'use_count_asc', 'top_n': 100},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_columnar_matches_compiled_path(filters):
+    """Test: la máscara columnar selecciona y ordena igual que el predicado compilado"""
+    items = _random_items(3000)
+    now = datetime.now()
+    expected = compile_filters(filters, now=now).apply(items)
+
+    assert ItemColumns.from_items(items).apply(filters, now=now) == expected
+
+
+def test_engine_uses_columns_above_threshold():
+    """Test: con un dataset versionado grande el motor construye columnas una vez"""
+    items = _random_items(COLUMNAR_THRESHOLD)
+    engine = AdvancedFilterEngine()
+
+    for filters in FILTERS[:4]:
+        assert engine.apply_filters(items, filters, dataset_version=1) == compile_filters(filters).apply(items)
+    columns = engine._columns[2]
+    engine.apply_filters(items, {'is_favorite': False}, dataset_version=1)
+    assert engine._columns[2] is columns
+
+
+def test_dashboard_columnar_structure_filter():
+    """Test: el filtrado columnar de la estructura coincide con el recorrido por items"""
+    rng = random.Random(3)
+    structure = {'categories': [
+        {'id': category_id, 'name': f"Cat {category_id}", 'items': [
+            {'id': category_id * 10000 + index, 'label': f"item {index}",
+             'type': rng.choice(['TEXT', 'URL', 'CODE', 'PATH']), 'tags': [],
+             'is_favorite': rng.random() < 0.3, 'is_sensitive': rng.random() < 0.2}
+            for index in range(rng.randint(0, 400))
+        ]}
+        for category_id in range(60)
+    ]}
+    manager = DashboardManager(db_manager=None)
+    type_filters = {'URL': False, 'PATH': False}
+    state_filters = {'favorites': True, 'sensitive': False, 'normal': True}
+
+    expected = manager._filter_structure(structure, type_filters, state_filters)
+    result = manager._filter_structure_columnar(structure, type_filters, state_filters)
+
+    assert result == expected
+    assert result['categories'][0]['items'] is not structure['categories'][0]['items']
@@ -0,0 +1,84 @@
+"""
+Script de testing para el modelo compacto de Item/Category
+Verifica __slots__, strings internadas y parseo de fechas en caché
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from models.item import Item, ItemType, parse_timestamp
+from models.category import Category
+
+
+def _row(item_id, category_name='Git', **extra):
+    """Fila con la forma de DBManager.get_all_items()"""
+    row = {
+        'id': item_id,
+        'label': f'item {item_id}',
+        'content': f'content {item_id}',
+        'type': 'CODE',
+        'tags': ['git', 'cli'],
+        'category_name': category_name,
+        'category_icon': '🔧',
+        'category_color': '#ff0000',
+        'created_at': '2025-01-02 03:04:05',
+        'last_used': None,
+        'use_count': 7,
+    }
+    row.update(extra)
+    return row
+
+
+def test_item_has_no_instance_dict():
+    """Item y Category no tienen __dict__ por instancia"""
+    item = Item("1", "label", "content")
+    category = Category("1", "Git")
+
+    assert not hasattr(item, '__dict__')
+    assert not hasattr(category, '__dict__')
+
+    with pytest.raises(AttributeError):
+        item.undeclared_field = 1
+
+
+def test_from_row_fills_view_fields():
+    """from_row incluye categoría, uso y fechas de la fila"""
+    item = Item.from_row(_row(5, is_list=1, list_group='deploy', orden_lista=2))
+
+    assert item.id == "5"
+    assert item.type == ItemType.CODE
+    assert item.category_name == 'Git'
+    assert item.category_icon == '🔧'
+    assert item.use_count == 7
+    assert item.created_at == datetime(2025, 1, 2, 3, 4, 5)
+    assert isinstance(item.last_used, datetime)
+    assert item.is_list_item() and item.get_list_group() == 'deploy'
+
+
+def test_repeated_strings_are_shared():
+    """Nombres de categoría y tags repetidos comparten el mismo objeto"""
+    first = Item.from_row(_row(1, category_name=''.join(['Do', 'cker'])))
+    second = Item.from_row(_row(2, category_name=''.join(['Doc', 'ker'])))
+
+    assert first.category_name is second.category_name
+    assert first.tags[0] is second.tags[0]
+
+
+def test_parse_timestamp_formats_and_cache():
+    """Formatos SQLite e ISO; cada string se parsea una sola vez"""
+    assert parse_timestamp('2025-01-02 03:04:05') == datetime(2025, 1, 2, 3, 4, 5)
+    assert parse_timestamp('2025-01-02T03:04:05') == datetime(2025, 1, 2, 3, 4, 5)
+    assert parse_timestamp('2025-01-02T03:04:05Z').tzinfo is not None
+    assert parse_timestamp('no es una fecha') is None
+    assert parse_timestamp(None) is None
+
+    now = datetime.now()
+    assert parse_timestamp(now) is now
+    assert parse_timestamp('2024-06-01 10:00:00') is parse_timestamp('2024-06-01 10:00:00')
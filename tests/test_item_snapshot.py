@@ -0,0 +1,98 @@
+"""
+Script de testing para ItemSnapshotService
+Verifica que varios paneles comparten una sola carga, que los cambios
+publican un snapshot nuevo sin tocar el anterior (copy-on-write) y que el
+snapshot se libera al soltar la última referencia
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.item_store import ItemStore
+from core.item_snapshot import ItemSnapshotService
+
+
+@pytest.fixture
+def db():
+    manager = DBManager(":memory:")
+    manager.category_id = manager.add_category("Snapshot")
+    manager.item_ids = manager.add_items_bulk(manager.category_id, [
+        {'label': f"item {index}", 'content': f"cmd {index}"} for index in range(4)
+    ])
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def service(db):
+    store = ItemStore(db)
+    store.load()
+    yield ItemSnapshotService(store)
+    store.close()
+
+
+def test_panels_share_one_build(service):
+    """Test: N paneles reciben el mismo snapshot con una sola construcción"""
+    snapshots = [service.acquire() for _ in range(5)]
+
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert len(snapshots[0]) == 4
+    assert service.builds == 1 and service.refcount == 5
+
+
+def test_update_is_copy_on_write(db, service):
+    """Test: un cambio crea un snapshot nuevo reutilizando los items sin cambios"""
+    refreshed = []
+    old = service.acquire(refreshed.append)
+    service.acquire(refreshed.append)
+
+    db.update_item(db.item_ids[1], label="renombrado")
+
+    new = service.current
+    assert refreshed == [new, new]
+    assert new.version == old.version + 1
+    assert [item.id for item in new.items] == [item.id for item in old.items]
+    labels = {item.id: item.label for item in new.items}
+    assert labels[str(db.item_ids[1])] == "renombrado"
+    assert {item.id: item.label for item in old.items}[str(db.item_ids[1])] == "item 1"
+    assert all(new_item is old_item for new_item, old_item in zip(new.items, old.items)
+               if new_item.id != str(db.item_ids[1]))
+
+
+def test_add_and_delete_patch_snapshot(db, service):
+    """Test: altas al principio y bajas eliminadas, sin reconstruir"""
+    service.acquire()
+
+    new_id = db.add_item(db.category_id, "nuevo", "contenido")
+    assert service.current.items[0].id == str(new_id)
+
+    db.delete_item(db.item_ids[0])
+    assert str(db.item_ids[0]) not in {item.id for item in service.current.items}
+    assert service.builds == 1 and service.patches == 2
+
+
+def test_last_release_drops_snapshot(db, service):
+    """Test: al soltar la última referencia se libera y deja de seguir cambios"""
+    refreshed = []
+    service.acquire(refreshed.append)
+    service.acquire()
+
+    service.release()
+    assert service.current is not None
+
+    service.release(refreshed.append)
+    assert service.current is None and service.refcount == 0
+
+    db.update_item(db.item_ids[0], label="sin paneles")
+    assert refreshed == [] and service.patches == 0
+
+    labels = {item.id: item.label for item in service.acquire().items}
+    assert labels[str(db.item_ids[0])] == "sin paneles"
+    assert service.builds == 2
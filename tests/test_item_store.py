@@ -0,0 +1,117 @@
+"""
+Script de testing para el almacén central de items (ItemStore)
+Verifica índices en memoria y diffs publicados tras mutaciones de DBManager
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager, ITEM_ADDED, ITEM_UPDATED, ITEM_DELETED
+from core.item_store import ItemStore
+
+
+def _insert_item(db, category_id, label, tags='[]', list_group=None):
+    """Insertar un item directamente (sin notificar)"""
+    conn = db.connect()
+    cursor = conn.execute("""
+        INSERT INTO items (category_id, label, content, tags, is_list, list_group)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (category_id, label, label, tags, 1 if list_group else 0, list_group))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def _create_store():
+    """Crear base de datos en memoria y almacén cargado"""
+    db = DBManager(":memory:")
+    category_id = db.add_category("Store Test")
+    _insert_item(db, category_id, "git", tags='["dev", "vcs"]')
+    _insert_item(db, category_id, "paso 1", list_group="deploy")
+    store = ItemStore(db)
+    store.load()
+    changes = []
+    store.subscribe(changes.append)
+    return db, store, category_id, changes
+
+
+def test_store_indexes():
+    """Test de índices por id, categoría, lista y tag"""
+    db, store, category_id, _ = _create_store()
+
+    assert [row['label'] for row in store.get_by_category(category_id)] == ["git", "paso 1"]
+    assert [row['label'] for row in store.get_by_tag("vcs")] == ["git"]
+    assert [row['label'] for row in store.get_by_list_group(category_id, "deploy")] == ["paso 1"]
+    assert store.get(1)['category_name'] == "Store Test"
+
+
+def test_update_patches_row_and_publishes_diff():
+    """Test de update_item: fila reemplazada e índice de tags actualizado"""
+    db, store, category_id, changes = _create_store()
+    order_before = [row['id'] for row in store.get_items()]
+
+    db.update_item(1, is_favorite=True, tags=["dev"])
+
+    assert store.get(1)['is_favorite'] == 1
+    assert store.get_by_tag("vcs") == []
+    assert len(changes) == 1
+    assert changes[0].kind == ITEM_UPDATED
+    assert changes[0].item_ids == [1]
+    assert changes[0].previous[1]['tags'] == ["dev", "vcs"]
+    # El item conserva su posición
+    assert [row['id'] for row in store.get_items()] == order_before
+
+
+def test_delete_and_add_events():
+    """Test de eliminación y alta notificadas por DBManager"""
+    db, store, category_id, changes = _create_store()
+
+    db.delete_item(1)
+    assert store.get(1) is None
+    assert changes[-1].kind == ITEM_DELETED
+
+    new_id = _insert_item(db, category_id, "nuevo")
+    db._notify_items_changed(ITEM_ADDED, [new_id])
+    assert store.get(new_id)['label'] == "nuevo"
+    assert changes[-1].kind == ITEM_ADDED
+    assert store.get_items()[0]['id'] == new_id
+
+
+def test_delete_category_removes_items():
+    """Test de eliminación de categoría (items en cascada)"""
+    db, store, category_id, changes = _create_store()
+
+    db.delete_category(category_id)
+
+    assert store.get_items(include_inactive=True) == []
+    assert sorted(changes[-1].item_ids) == [1, 2]
+
+
+def test_changes_from_another_manager_of_same_file(tmp_path):
+    """Test: un DBManager propio (p. ej. de un diálogo) también parchea el almacén"""
+    db_path = tmp_path / "shared.db"
+    db = DBManager(str(db_path))
+    category_id = db.add_category("Shared")
+    _insert_item(db, category_id, "git")
+    store = ItemStore(db)
+    store.load()
+    changes = []
+    store.subscribe(changes.append)
+
+    DBManager(str(db_path)).update_item(1, is_favorite=True, is_archived=True)
+
+    assert store.get(1)['is_favorite'] == 1
+    assert store.get(1)['is_archived'] == 1
+    assert [change.kind for change in changes] == [ITEM_UPDATED]
+
+    # refresh(): releer filas cambiadas sin notificación (SQL directo)
+    conn = db.connect()
+    conn.execute("UPDATE items SET is_favorite = 0 WHERE id = 1")
+    conn.commit()
+    store.refresh(["1"])
+    assert store.get(1)['is_favorite'] == 0
+    assert len(changes) == 2
+    store.close()
@@ -0,0 +1,153 @@
+"""
+Script de testing para PanelRestoreScheduler
+Verifica el orden por prioridad, las porciones con presupuesto de tiempo,
+los paneles minimizados diferidos hasta expandirse y la escritura única de
+last_opened al restaurar varios paneles
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.panel_restore_scheduler import PanelRestoreScheduler, PRIORITY_OFFSCREEN
+from core.pinned_panels_manager import PinnedPanelsManager
+from database.db_manager import DBManager
+
+
+class FakeClock:
+    """Reloj manual: cada tarea avanza el tiempo que quiera"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def idle():
+    """Cola de callbacks 'ociosos' (sustituye a QTimer.singleShot(0, ...))"""
+    return []
+
+
+def _drain(idle):
+    while idle:
+        idle.pop(0)()
+
+
+def test_nothing_runs_until_event_loop(idle, clock):
+    """Test: registrar paneles no ejecuta ninguna carga hasta la primera porción"""
+    ran = []
+    scheduler = PanelRestoreScheduler(idle.append, clock=clock)
+    scheduler.add('a', lambda: ran.append('a'))
+    scheduler.start()
+    scheduler.start()
+
+    assert ran == [] and len(idle) == 1
+    _drain(idle)
+    assert ran == ['a']
+
+
+def test_visible_panels_first_in_budgeted_slices(idle, clock):
+    """Test: los visibles van primero y cada porción respeta el presupuesto"""
+    ran = []
+    scheduler = PanelRestoreScheduler(idle.append, budget_ms=25, clock=clock)
+
+    def task(name):
+        def run():
+            ran.append(name)
+            clock.now += 0.010  # 10 ms por panel
+        return run
+
+    scheduler.add('offscreen', task('offscreen'), priority=PRIORITY_OFFSCREEN)
+    for index in range(5):
+        scheduler.add(index, task(index))
+    scheduler.start()
+    _drain(idle)
+
+    assert ran == [0, 1, 2, 3, 4, 'offscreen']
+    assert scheduler.slices == 2
+    assert scheduler.queued_count == 0
+
+
+def test_minimized_panels_wait_for_expand(idle, clock):
+    """Test: un panel diferido solo se carga al expandirlo, y una sola vez"""
+    ran = []
+    scheduler = PanelRestoreScheduler(idle.append, clock=clock)
+    scheduler.add('visible', lambda: ran.append('visible'))
+    scheduler.add('minimized', lambda: ran.append('minimized'), deferred=True)
+    scheduler.start()
+    _drain(idle)
+
+    assert ran == ['visible']
+    assert scheduler.is_pending('minimized')
+
+    assert scheduler.run_now('minimized') is True
+    assert scheduler.run_now('minimized') is False
+    assert ran == ['visible', 'minimized']
+
+
+def test_expand_before_slice_and_cancel(idle, clock):
+    """Test: expandir antes de la porción adelanta la carga; cerrar la cancela"""
+    ran = []
+    scheduler = PanelRestoreScheduler(idle.append, clock=clock)
+    scheduler.add('a', lambda: ran.append('a'))
+    scheduler.add('b', lambda: ran.append('b'))
+    scheduler.add('c', lambda: ran.append('c'))
+    scheduler.start()
+
+    scheduler.run_now('b')
+    scheduler.cancel('c')
+    _drain(idle)
+
+    assert ran == ['b', 'a']
+    assert not scheduler.is_pending('c')
+
+
+def test_failing_panel_does_not_stop_others(idle, clock):
+    """Test: un error al cargar un panel no impide cargar los demás"""
+    ran = []
+    scheduler = PanelRestoreScheduler(idle.append, clock=clock)
+    scheduler.add('broken', lambda: 1 / 0)
+    scheduler.add('ok', lambda: ran.append('ok'))
+    scheduler.start()
+    _drain(idle)
+
+    assert ran == ['ok'] and scheduler.completed == 2
+
+
+def test_mark_panels_opened_single_write(tmp_path, monkeypatch):
+    """Test: marcar varios paneles abiertos actualiza todos en una transacción"""
+    db = DBManager(str(tmp_path / "panels.db"))
+    category_id = db.add_category("Git")
+    panel_ids = [db.execute_update(
+        "INSERT INTO pinned_panels (category_id, x_position, y_position, width, height) VALUES (?, 0, 0, 300, 400)",
+        (category_id,)
+    ) for _ in range(15)]
+
+    commits = []
+    execute_many = db.execute_many
+
+    def counting_execute_many(query, params_list):
+        commits.append(len(params_list))
+        execute_many(query, params_list)
+
+    monkeypatch.setattr(db, 'execute_many', counting_execute_many)
+    PinnedPanelsManager(db).mark_panels_opened(panel_ids)
+
+    assert commits == [15]
+    counts = {row['open_count'] for row in db.execute_query(
+        f"SELECT open_count FROM pinned_panels WHERE id IN ({', '.join('?' * len(panel_ids))})", tuple(panel_ids)
+    )}
+    assert counts == {1}
+    db.close()
@@ -0,0 +1,168 @@
+"""
+Script de testing de planes de consulta (EXPLAIN QUERY PLAN)
+Ejecuta las consultas calientes de los managers de uso, estadísticas,
+notificaciones y favoritos, y falla si alguna recorre completa una tabla
+de historial (o items, en las consultas de favoritos)
+"""
+
+import re
+import sys
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.connection_pool import get_connection_pool
+from core.usage_tracker import UsageTracker, DURABILITY_SYNC
+from core.stats_manager import StatsManager
+from core.notification_manager import NotificationManager
+from core.favorites_manager import FavoritesManager
+
+
+# El historial crudo y el portapapeles crecen sin límite: nunca se recorren
+HISTORY_TABLES = {'item_usage_history', 'clipboard_history'}
+# Ventanas por fecha: deben buscar por el índice del bucket
+WINDOW_TABLES = HISTORY_TABLES | {'item_usage_hourly', 'item_usage_daily'}
+FAVORITE_TABLES = HISTORY_TABLES | {'items'}
+
+_SQL_KEYWORDS = {'WHERE', 'JOIN', 'LEFT', 'INNER', 'ON', 'GROUP', 'ORDER', 'LIMIT', 'SET', 'USING', 'INDEXED'}
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+
+
+def _aliases(sql):
+    """Mapear alias (o nombre) -> tabla de las referencias FROM/JOIN de una sentencia"""
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _full_scans(conn, sql):
+    """Tablas recorridas completas según EXPLAIN QUERY PLAN"""
+    aliases = _aliases(sql)
+    scans = set()
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        match = re.match(r'SCAN (\w+)', row[3])
+        if match and match.group(1) in aliases:
+            scans.add(aliases[match.group(1)])
+    return scans
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    """Base con items, favoritos, historial de uso y portapapeles"""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    db = DBManager(str(path))
+    category_id = db.add_category("Planes")
+    conn = db.connect()
+    for index in range(20):
+        cursor = conn.execute(
+            "INSERT INTO items (category_id, label, content, use_count, is_favorite, favorite_order) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (category_id, f"item {index}", f"contenido {index}", index, index % 4 == 0, index)
+        )
+        for days_ago in range(0, 10, 3):
+            conn.execute(
+                "INSERT INTO item_usage_history (item_id, used_at, execution_time_ms, success) "
+                "VALUES (?, datetime('now', ?), ?, ?)",
+                (cursor.lastrowid, f'-{days_ago} days', 100 * days_ago, days_ago % 2)
+            )
+    conn.commit()
+    for index in range(5):
+        db.add_to_history(None, f"copiado {index}")
+    db.close()
+    return Path(path)
+
+
+@pytest.fixture
+def traced(db_path):
+    """Capturar las sentencias que ejecutan los managers a través del pool"""
+    statements = []
+    pool = get_connection_pool(db_path)
+    connections = [pool.reader(), pool._get_writer()]
+    for conn in connections:
+        conn.set_trace_callback(statements.append)
+    yield statements
+    for conn in connections:
+        conn.set_trace_callback(None)
+
+
+HOT_QUERIES = [
+    # UsageTracker
+    ('usage_history', lambda m: m['tracker'].get_usage_history(1), HISTORY_TABLES),
+    ('recent_history', lambda m: m['tracker'].get_recent_history(7), HISTORY_TABLES),
+    ('today_usage', lambda m: m['tracker'].get_today_usage(), HISTORY_TABLES),
+    ('last_error', lambda m: m['tracker'].get_last_error(1), HISTORY_TABLES),
+    ('executions_today', lambda m: m['tracker'].get_total_executions_today(), WINDOW_TABLES),
+    ('executions_week', lambda m: m['tracker'].get_total_executions_week(), WINDOW_TABLES),
+    ('item_stats', lambda m: m['tracker'].get_item_stats(1), WINDOW_TABLES),
+    ('usage_by_hour', lambda m: m['tracker'].get_usage_by_hour(7), WINDOW_TABLES),
+    ('usage_by_day', lambda m: m['tracker'].get_usage_by_day(30), WINDOW_TABLES),
+    ('total_executions', lambda m: m['tracker'].get_total_executions(), HISTORY_TABLES),
+    ('compact_history', lambda m: m['tracker'].compact_history(365, 365), WINDOW_TABLES),
+    # StatsManager
+    ('most_used_week', lambda m: m['stats'].get_most_used_items(days=7), WINDOW_TABLES),
+    ('trending', lambda m: m['stats'].get_trending_items(7), WINDOW_TABLES),
+    ('suggest_favorites', lambda m: m['stats'].suggest_favorites(), WINDOW_TABLES),
+    ('productivity', lambda m: m['stats'].get_productivity_stats(7), WINDOW_TABLES),
+    ('dashboard', lambda m: m['stats'].get_dashboard_stats(), HISTORY_TABLES),
+    ('slowest', lambda m: m['stats'].get_slowest_items(min_executions=1), HISTORY_TABLES),
+    ('most_failing', lambda m: m['stats'].get_most_failing_items(min_executions=1), HISTORY_TABLES),
+    ('health_report', lambda m: m['stats'].get_health_report(), HISTORY_TABLES),
+    # NotificationManager
+    ('failing_items', lambda m: m['notifications']._get_failing_items(), HISTORY_TABLES),
+    ('slow_items', lambda m: m['notifications']._get_slow_items(), HISTORY_TABLES),
+    # FavoritesManager
+    ('all_favorites', lambda m: m['favorites'].get_all_favorites(), FAVORITE_TABLES),
+    ('favorites_count', lambda m: m['favorites'].get_favorites_count(), FAVORITE_TABLES),
+    ('next_order_index', lambda m: m['favorites'].get_next_order_index(), FAVORITE_TABLES),
+]
+
+
+@pytest.mark.parametrize("name, run, guarded", HOT_QUERIES, ids=[case[0] for case in HOT_QUERIES])
+def test_hot_query_uses_indexes(db_path, traced, name, run, guarded):
+    """Test: ninguna consulta caliente recorre completa una tabla protegida"""
+    managers = {
+        'tracker': UsageTracker(str(db_path), durability=DURABILITY_SYNC),
+        'stats': StatsManager(str(db_path)),
+        'notifications': NotificationManager(str(db_path)),
+        'favorites': FavoritesManager(str(db_path)),
+    }
+    run(managers)
+
+    queries = [sql for sql in traced if not sql.lstrip().upper().startswith(('PRAGMA', 'BEGIN', 'COMMIT'))]
+    assert queries, f"{name} no ejecutó ninguna consulta"
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        for sql in queries:
+            scans = _full_scans(conn, sql) & guarded
+            assert not scans, f"{name}: recorrido completo de {sorted(scans)} en:\n{sql}"
+    finally:
+        conn.close()
+
+
+def test_trim_clipboard_history_keeps_latest(tmp_path):
+    """Test: el recorte del portapapeles conserva las N entradas más recientes"""
+    db = DBManager(str(tmp_path / "clipboard.db"))
+    for index in range(8):
+        db.add_to_history(None, f"copiado {index}")
+
+    db.trim_history(keep_latest=3)
+
+    assert [entry['content'] for entry in db.execute_query(
+        "SELECT content FROM clipboard_history ORDER BY id"
+    )] == ["copiado 5", "copiado 6", "copiado 7"]
+
+    plan = db.execute_query(
+        "EXPLAIN QUERY PLAN DELETE FROM clipboard_history "
+        "WHERE id <= (SELECT MAX(id) FROM clipboard_history) - 3"
+    )
+    assert all(not row['detail'].startswith('SCAN clipboard_history') for row in plan)
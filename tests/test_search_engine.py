@@ -0,0 +1,122 @@
+"""
+Script de testing para el índice en memoria del motor de búsqueda
+Verifica coincidencias, búsqueda incremental y atribución por categoría
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from models.item import Item
+from models.category import Category
+from core.search_engine import SearchEngine
+
+
+def _category(category_id, name, labels, **item_fields):
+    """Crear categoría con un item por label"""
+    category = Category(category_id, name)
+    for index, label in enumerate(labels):
+        category.items.append(Item(f"{category_id}-{index}", label, f"contenido {label}", **item_fields))
+    return category
+
+
+def test_search_matches_label_content_and_tags():
+    """Coincidencias en label, contenido y tags (sin distinguir mayúsculas)"""
+    git = _category("1", "Git", ["Git Status", "Git Log"])
+    docker = _category("2", "Docker", ["Docker PS"])
+    docker.items[0].tags = ["Contenedores"]
+    engine = SearchEngine()
+
+    assert [item.label for item in engine.search("git", [git, docker])] == ["Git Status", "Git Log"]
+    assert [item.label for item in engine.search("CONTENEDOR", [git, docker])] == ["Docker PS"]
+    assert [item.label for item in engine.search("contenido docker", [git, docker])] == ["Docker PS"]
+    assert engine.search("status log", [git, docker]) == []
+
+
+def test_search_skips_inactive_categories_and_sensitive_content():
+    """Categorías inactivas no se buscan; contenido sensible no se indexa"""
+    active = _category("1", "Claves", ["Token API"], is_sensitive=True)
+    inactive = _category("2", "Vieja", ["Token viejo"])
+    inactive.is_active = False
+    engine = SearchEngine()
+
+    assert [item.label for item in engine.search("token", [active, inactive])] == ["Token API"]
+    assert engine.search("contenido", [active, inactive]) == []
+
+
+def test_type_ahead_narrows_previous_results():
+    """Al extender la consulta solo se revisan los resultados anteriores"""
+    category = _category("1", "Cmd", ["docker ps", "docker images", "dotnet build"])
+    engine = SearchEngine()
+
+    assert len(engine.search_in_category("k", category)) == 2
+    assert len(engine.search_in_category("do", category)) == 3
+    assert len(engine.search_in_category("dock", category)) == 2
+    # Un candidato nuevo no puede aparecer al extender: se filtra de los 2 anteriores
+    assert [item.label for item in engine.search_in_category("docker i", category)] == ["docker images"]
+    # Retroceder vuelve a consultar el índice completo
+    assert len(engine.search_in_category("do", category)) == 3
+
+
+def test_index_follows_replaced_items():
+    """Un item reemplazado en sitio se reindexa"""
+    category = _category("1", "Cmd", ["docker ps", "git status"])
+    engine = SearchEngine()
+    assert len(engine.search_in_category("git", category)) == 1
+
+    category.items[0] = Item("1-0", "git log", "git log --oneline")
+    assert [item.label for item in engine.search_in_category("git", category)] == ["git log", "git status"]
+
+    # Una lista nueva con los mismos items conserva el índice
+    filtered = Category("temp", "temp")
+    filtered.items = list(category.items)
+    assert len(engine.search_in_category("git", filtered)) == 2
+
+
+def test_search_stats_category_breakdown():
+    """La atribución por categoría sale del índice"""
+    git = _category("1", "Git", ["git status", "git log"])
+    tools = _category("2", "Tools", ["gitk", "htop"])
+    engine = SearchEngine()
+
+    stats = engine.get_search_stats("git", [git, tools])
+
+    assert stats['total_results'] == 3
+    assert stats['category_breakdown'] == {"Git": 2, "Tools": 1}
+
+
+def test_version_skips_item_comparison():
+    """Con la misma versión no se recomparan los items; otra versión sí"""
+    category = _category("1", "Cmd", ["docker ps", "git status"])
+    engine = SearchEngine()
+    assert len(engine.search_in_category("git", category, version=1)) == 1
+
+    category.items[0] = Item("1-0", "git log", "git log --oneline")
+    # El llamador no cambió la versión: el índice no mira los items
+    assert len(engine.search_in_category("git", category, version=1)) == 1
+    assert len(engine.search_in_category("git", category, version=2)) == 2
+
+
+def test_short_queries_memoized_until_items_change():
+    """Las consultas cortas se memorizan y se descartan al reindexar"""
+    category = _category("1", "Cmd", ["docker ps", "git status"])
+    engine = SearchEngine()
+
+    first = engine.search_in_category("s", category)
+    assert len(engine.search_in_category("st", category)) == 1
+    assert engine.search_in_category("s", category) == first
+
+    category.items[1] = Item("1-1", "htop", "htop")
+    assert [item.label for item in engine.search_in_category("s", category)] == ["docker ps"]
+
+
+def test_substring_matches_inside_words():
+    """Se busca por subcadena (no solo prefijos de palabra, como FTS)"""
+    category = _category("1", "Cmd", ["git status", "kubectl get pods"])
+    engine = SearchEngine()
+
+    assert [item.label for item in engine.search_in_category("tatus", category)] == ["git status"]
+    assert [item.label for item in engine.search_in_category("ctl g", category)] == ["kubectl get pods"]
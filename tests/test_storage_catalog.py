@@ -0,0 +1,108 @@
+"""
+Script de testing para el catálogo de almacenamiento (StorageCatalog)
+Verifica totales por tipo/carpeta y el salto de carpetas sin cambios
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.storage_catalog import StorageCatalog, get_storage_catalog, profile_root, ROOT_FILES
+from core.file_manager import detect_file_type
+
+
+def _create_tree(base):
+    (base / "cache" / "data").mkdir(parents=True)
+    (base / "Cookies").write_bytes(b"c" * 4)
+    (base / "cache" / "index").write_bytes(b"i" * 10)
+    (base / "cache" / "data" / "a.js").write_bytes(b"a" * 100)
+
+
+def test_reconcile_builds_totals(tmp_path):
+    """Test de reconciliación inicial: totales por carpeta y tipo"""
+    _create_tree(tmp_path)
+    catalog = StorageCatalog(DBManager(":memory:"), lambda ext: 'JS' if ext == '.js' else 'OTROS')
+    root = profile_root(1)
+
+    assert not catalog.is_catalogued(root)
+    assert catalog.reconcile(root, tmp_path) == 3
+    totals = catalog.get_totals(root)
+
+    assert catalog.is_catalogued(root)
+    assert totals['total_files'] == 3 and totals['total_size'] == 114
+    assert totals['by_folder'] == {'': {'count': 1, 'size': 4}, 'cache': {'count': 2, 'size': 110}}
+    assert totals['by_type']['JS'] == {'count': 1, 'size': 100}
+    assert catalog.get_root_size(root) == 114
+
+
+def test_reconcile_skips_unchanged_directories(tmp_path):
+    """Test de salto por mtime: solo se revisan carpetas modificadas"""
+    _create_tree(tmp_path)
+    catalog = StorageCatalog(DBManager(":memory:"))
+    root = profile_root(1)
+    catalog.reconcile(root, tmp_path)
+
+    assert catalog.reconcile(root, tmp_path) == 0
+
+    # Nuevo archivo en cache/data: solo esa carpeta se vuelve a listar
+    data_dir = tmp_path / "cache" / "data"
+    (data_dir / "b.js").write_bytes(b"b" * 50)
+    os.utime(data_dir, ns=(1, 1))
+    assert catalog.reconcile(root, tmp_path) == 1
+    assert catalog.get_root_size(root) == 164
+
+    # Carpeta eliminada: sus archivos salen del catálogo
+    for child in data_dir.iterdir():
+        child.unlink()
+    data_dir.rmdir()
+    catalog.reconcile(root, tmp_path)
+    assert catalog.get_root_size(root) == 14
+
+
+def test_incremental_updates_and_forget_root(tmp_path):
+    """Test de actualización incremental y borrado de un root"""
+    catalog = StorageCatalog(DBManager(":memory:"))
+    (tmp_path / "VIDEOS").mkdir()
+    (tmp_path / "VIDEOS" / "v.mp4").write_bytes(b"v" * 30)
+
+    catalog.record_file('files', tmp_path, "VIDEOS/v.mp4")
+    catalog.record_file('files', tmp_path, "VIDEOS/v.mp4")
+    assert catalog.get_totals('files')['total_files'] == 1
+
+    (tmp_path / "VIDEOS" / "v.mp4").write_bytes(b"v" * 40)
+    catalog.record_file('files', tmp_path, "VIDEOS\\v.mp4")
+    assert catalog.get_root_size('files') == 40
+
+    catalog.forget_file('files', "VIDEOS/v.mp4")
+    assert catalog.get_totals('files')['total_files'] == 0
+
+    catalog.reconcile('files', tmp_path)
+    catalog.forget_root('files')
+    assert catalog.get_root_size('files') == 0
+    assert not catalog.is_catalogued('files')
+
+
+def test_classifier_set_after_catalog_created(tmp_path):
+    """Test del orden de producción: el gestor de perfiles crea el catálogo sin clasificador"""
+    db = DBManager(str(tmp_path / "test.db"))
+    (tmp_path / "PDF").mkdir()
+    (tmp_path / "PDF" / "old.pdf").write_bytes(b"p" * 20)
+    (tmp_path / "PDF" / "new.pdf").write_bytes(b"p" * 5)
+
+    # BrowserProfileManager llega primero, sin clasificador
+    early = get_storage_catalog(db)
+    early.record_file(ROOT_FILES, tmp_path, "PDF/old.pdf")
+
+    # FileManager después, con detect_file_type
+    catalog = get_storage_catalog(db, detect_file_type)
+    assert catalog is early
+    catalog.record_file(ROOT_FILES, tmp_path, "PDF/new.pdf")
+
+    by_type = catalog.get_totals(ROOT_FILES)['by_type']
+    assert by_type == {'PDF': {'count': 2, 'size': 25}}
+    db.close()
@@ -0,0 +1,211 @@
+"""
+Script de testing para el índice normalizado de tags (tags / item_tags)
+Verifica la sincronización por triggers, el backfill desde items.tags
+(JSON y CSV legacy), los filtros exactos de colecciones, grupos y búsqueda
+y las frecuencias materializadas (tags.item_count)
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.tag_index import split_tags, tagged_items_subquery
+from database.migrations.add_tag_groups_and_collections import migrate_add_tag_groups_and_collections
+from core.smart_collections_manager import SmartCollectionsManager
+from core.tag_groups_manager import TagGroupsManager
+from core.advanced_filter_engine import AdvancedFilterEngine
+from core.dashboard_manager import DashboardManager
+from models.item import Item
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base con items etiquetados: 'git' y 'github' no deben confundirse"""
+    path = tmp_path / "tags.db"
+    manager = DBManager(str(path))
+    category_id = manager.add_category("Dev")
+    manager.ids = dict(zip(("clone", "actions", "compose", "plain"), manager.add_items_bulk(category_id, [
+        {'label': 'clone', 'content': 'git clone', 'tags': ['git', 'cli']},
+        {'label': 'actions', 'content': 'gh run', 'tags': ['github', 'ci']},
+        {'label': 'compose', 'content': 'docker compose up', 'tags': ['Docker', 'cli']},
+        {'label': 'plain', 'content': 'sin tags'},
+    ])))
+    yield manager
+    manager.close()
+
+
+def _item_tags(db, item_id):
+    return sorted(row['name'] for row in db.execute_query(
+        "SELECT t.name FROM item_tags it JOIN tags t ON t.id = it.tag_id WHERE it.item_id = ?", (item_id,)
+    ))
+
+
+def test_split_tags_handles_json_and_csv():
+    """Test: JSON y CSV legacy se normalizan sin vacíos ni duplicados"""
+    assert split_tags('["git", " cli ", "", "git"]') == ['git', 'cli']
+    assert split_tags('git, cli,,docker') == ['git', 'cli', 'docker']
+    assert split_tags(None) == []
+
+
+def test_triggers_keep_index_in_sync(db):
+    """Test: insertar, cambiar tags y borrar actualizan item_tags"""
+    clone = db.ids['clone']
+    assert _item_tags(db, clone) == ['cli', 'git']
+
+    db.update_item(clone, tags=['git', 'vcs'])
+    assert _item_tags(db, clone) == ['git', 'vcs']
+
+    db.delete_item(clone)
+    assert _item_tags(db, clone) == []
+    assert db.get_tag_counts() == {'cli': 1, 'github': 1, 'ci': 1, 'Docker': 1}
+
+
+def test_backfill_from_legacy_columns(tmp_path):
+    """Test: una base sin índice se rellena desde JSON y CSV al abrirla"""
+    path = tmp_path / "legacy.db"
+    db = DBManager(str(path))
+    category_id = db.add_category("Legacy")
+    json_id = db.add_item(category_id, "json", "a", tags=['git', 'cli'])
+    csv_id = db.add_item(category_id, "csv", "b")
+    db.close()
+
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        DROP TRIGGER item_tags_ai; DROP TRIGGER item_tags_au; DROP TRIGGER item_tags_ad;
+        DROP TABLE item_tags; DROP TABLE tags;
+    """)
+    conn.execute("UPDATE items SET tags = 'docker, cli' WHERE id = ?", (csv_id,))
+    conn.commit()
+    conn.close()
+
+    db = DBManager(str(path))
+    assert _item_tags(db, json_id) == ['cli', 'git']
+    assert _item_tags(db, csv_id) == ['cli', 'docker']
+    assert db.get_tag_counts() == {'cli': 2, 'git': 1, 'docker': 1}
+    db.close()
+
+
+def test_search_items_matches_exact_tags(db):
+    """Test: buscar 'git' no devuelve items etiquetados 'github'"""
+    assert [item['label'] for item in db.search_items('git')] == ['clone']
+    assert [item['label'] for item in db.search_items('docker')] == ['compose']
+
+
+def test_smart_collection_tag_filters(db):
+    """Test: tags_include / tags_exclude comparan tags completos"""
+    migrate_add_tag_groups_and_collections(str(db.db_path))
+    manager = SmartCollectionsManager(str(db.db_path))
+
+    include_id = manager.create_collection("Git", tags_include="git")
+    exclude_id = manager.create_collection("Sin CLI", tags_exclude="cli, github")
+
+    assert [item['label'] for item in manager.execute_collection(include_id)] == ['clone']
+    assert [item['label'] for item in manager.execute_collection(exclude_id)] == ['plain']
+
+
+def test_tag_group_usage_count(db):
+    """Test: el conteo de uso de un grupo no cuenta coincidencias parciales"""
+    migrate_add_tag_groups_and_collections(str(db.db_path))
+    manager = TagGroupsManager(str(db.db_path))
+
+    group_id = manager.create_group("VCS", "git,docker")
+
+    assert manager.get_group_usage_count(group_id) == 2
+
+
+def test_group_usage_for_all_groups(db):
+    """Test: el uso de todos los grupos sale de una consulta y coincide por grupo"""
+    migrate_add_tag_groups_and_collections(str(db.db_path))
+    manager = TagGroupsManager(str(db.db_path))
+    manager.create_group("CLI", "cli,git")
+    manager.create_group("CI", "ci,github")
+    manager.create_group("Vacío", "rust")
+
+    groups = manager.get_all_groups_with_usage()
+
+    usage = {group['name']: group['usage_count'] for group in groups}
+    assert {name: usage[name] for name in ("CLI", "CI", "Vacío")} == {"CLI": 2, "CI": 1, "Vacío": 0}
+    assert all(group['usage_count'] == manager.get_group_usage_count(group['id']) for group in groups)
+
+
+def test_materialized_counts_follow_mutations(db):
+    """Test: tags.item_count coincide con los enlaces tras altas, cambios y bajas"""
+    category_id = db.get_categories()[0]['id']
+    new_ids = db.add_items_bulk(category_id, [
+        {'label': f"extra {index}", 'content': 'x', 'tags': ['cli', f"t{index % 2}"]} for index in range(6)
+    ])
+    db.bulk_update_items(new_ids[:3], tags=['t0'])
+    db.bulk_delete_items(new_ids[4:])
+    db.update_item(db.ids['compose'], tags=[])
+
+    joined = {row['name']: row['count'] for row in db.execute_query("""
+        SELECT t.name, COUNT(*) AS count FROM item_tags it JOIN tags t ON t.id = it.tag_id GROUP BY t.id
+    """)}
+    assert db.get_tag_counts() == dict(sorted(joined.items(), key=lambda entry: entry[1], reverse=True))
+    assert db.get_tag_counts()['cli'] == 2 and 'Docker' not in db.get_tag_counts()
+    assert DashboardManager(db).get_tag_cloud() == list(db.get_tag_counts().items())
+
+
+def test_tag_cloud_matches_structure(db):
+    """Test: la nube desde la base cuenta lo mismo que la estructura (categorías activas y sus tags)"""
+    hidden_id = db.add_category("Oculta")
+    db.add_items_bulk(hidden_id, [{'label': 'old', 'content': 'x', 'tags': ['git', 'legacy']}])
+    db.update_category(hidden_id, is_active=False)
+    db.execute_update("ALTER TABLE categories ADD COLUMN tags TEXT")
+    db.execute_update("UPDATE categories SET tags = 'cli, infra'")
+
+    dashboard = DashboardManager(db)
+    cloud = dict(dashboard.get_tag_cloud())
+
+    assert cloud == dict(dashboard.get_tag_cloud(dashboard.get_full_structure(force_refresh=True)))
+    assert cloud['cli'] == 3 and cloud['infra'] == 1 and cloud['git'] == 1
+    assert 'legacy' not in cloud
+
+
+def test_frequencies_added_to_existing_index(tmp_path):
+    """Test: un índice de tags sin item_count recibe la columna con los conteos"""
+    path = tmp_path / "old_index.db"
+    db = DBManager(str(path))
+    category_id = db.add_category("Old")
+    db.add_items_bulk(category_id, [{'label': 'a', 'content': 'a', 'tags': ['git', 'cli']},
+                                    {'label': 'b', 'content': 'b', 'tags': ['git']}])
+    db.close()
+
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        DROP TRIGGER item_tags_count_ai; DROP TRIGGER item_tags_count_ad;
+        ALTER TABLE tags DROP COLUMN item_count;
+    """)
+    conn.close()
+
+    db = DBManager(str(path))
+    assert db.get_tag_counts() == {'git': 2, 'cli': 1}
+    db.close()
+
+
+def test_available_tags_from_index(db):
+    """Test: los conteos del índice coinciden con el recorrido en memoria"""
+    engine = AdvancedFilterEngine()
+    items = [
+        Item(item_id=str(item['id']), label=item['label'], content=item['content'], tags=item['tags'])
+        for item in db.get_items_by_category(db.get_categories()[0]['id'])
+    ]
+
+    assert engine.get_available_tags(items, db_manager=db) == engine.get_available_tags(items)
+
+
+def test_tag_filter_plan_uses_indexes(db):
+    """Test: el subquery de tags busca por índice, sin recorrer tags ni item_tags"""
+    subquery, params = tagged_items_subquery(['git', 'cli'])
+    plan = [row['detail'] for row in db.execute_query(
+        f"EXPLAIN QUERY PLAN SELECT * FROM items WHERE id IN ({subquery})", tuple(params)
+    )]
+
+    assert not [detail for detail in plan if detail.startswith('SCAN')], plan
@@ -0,0 +1,120 @@
+"""
+Script de testing para los rollups de uso por hora y por día
+Verifica mantenimiento por triggers, lecturas de estadísticas y compactación
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.stats_manager import StatsManager
+from core.usage_tracker import UsageTracker, DURABILITY_SYNC
+from core.notification_manager import NotificationManager
+
+
+def _create_db(tmp_path):
+    """Crear base de datos temporal con dos items e historial de uso"""
+    db_path = tmp_path / "rollups.db"
+    db = DBManager(str(db_path))
+    category_id = db.add_category("Rollups")
+    conn = db.connect()
+    item_ids = []
+    for label in ("rápido", "lento"):
+        cursor = conn.execute(
+            "INSERT INTO items (category_id, label, content, use_count) VALUES (?, ?, ?, 10)",
+            (category_id, label, label)
+        )
+        item_ids.append(cursor.lastrowid)
+
+    fast, slow = item_ids
+    rows = [
+        # (item_id, used_at, execution_time_ms, success)
+        (fast, "datetime('now')", 100, 1),
+        (fast, "datetime('now')", 300, 1),
+        (fast, "datetime('now', '-3 days')", 200, 0),
+        (slow, "datetime('now', '-200 days')", 9000, 1),
+        (slow, "datetime('now', '-200 days')", 7000, 0),
+    ]
+    for item_id, used_at, time_ms, success in rows:
+        conn.execute(
+            f"INSERT INTO item_usage_history (item_id, used_at, execution_time_ms, success) "
+            f"VALUES (?, {used_at}, ?, ?)",
+            (item_id, time_ms, success)
+        )
+    conn.commit()
+    return db, db_path, fast, slow
+
+
+def test_triggers_fill_hourly_and_daily_buckets(tmp_path):
+    """Test de rollups: cada uso suma en su hora y su día"""
+    db, db_path, fast, slow = _create_db(tmp_path)
+
+    daily = db.execute_query(
+        "SELECT * FROM item_usage_daily WHERE item_id = ? AND day = date('now')", (fast,)
+    )[0]
+    assert daily['executions'] == 2 and daily['successes'] == 2 and daily['failures'] == 0
+    assert daily['total_time_ms'] == 400 and daily['max_time_ms'] == 300
+
+    hourly = db.execute_query("SELECT SUM(executions) as n FROM item_usage_hourly")[0]
+    assert hourly['n'] == 5
+
+
+def test_existing_history_is_backfilled(tmp_path):
+    """Test de backfill: rollups creados sobre un historial existente"""
+    db, db_path, fast, slow = _create_db(tmp_path)
+    conn = db.connect()
+    conn.executescript("DROP TABLE item_usage_daily; DROP TABLE item_usage_hourly;")
+    db.close()
+
+    db = DBManager(str(db_path))
+    total = db.execute_query("SELECT SUM(executions) as n, SUM(failures) as f FROM item_usage_daily")[0]
+    assert total['n'] == 5 and total['f'] == 2
+
+
+def test_stats_read_rollups(tmp_path):
+    """Test de estadísticas leídas desde los rollups"""
+    db, db_path, fast, slow = _create_db(tmp_path)
+    stats = StatsManager(str(db_path))
+    tracker = UsageTracker(str(db_path), durability=DURABILITY_SYNC)
+
+    dashboard = stats.get_dashboard_stats()
+    assert dashboard['total_executions'] == 5
+    assert dashboard['executions_today'] == 2
+    assert dashboard['executions_week'] == 3
+    assert dashboard['success_rate'] == 60.0
+
+    assert tracker.get_success_rate(fast) == 66.67
+    assert tracker.get_error_count(slow) == 1
+    assert tracker.get_average_execution_time(fast) == 0.2
+    assert sum(row['executions'] for row in tracker.get_usage_by_hour(7)) == 3
+
+    trending = stats.get_trending_items(days=7)
+    assert [item['id'] for item in trending] == [fast]
+    assert trending[0]['recent_uses'] == 3
+
+    failing = stats.get_most_failing_items(min_executions=2)
+    assert [item['id'] for item in failing] == [slow, fast]
+
+    slow_items = NotificationManager(str(db_path))._get_slow_items(min_executions=1, min_avg_time_seconds=5)
+    assert [item['id'] for item in slow_items] == [slow]
+
+    # Un uso nuevo se refleja al instante
+    tracker.track_usage(fast, 50, success=True)
+    assert stats.get_dashboard_stats()['executions_today'] == 3
+
+
+def test_compaction_keeps_daily_totals(tmp_path):
+    """Test de compactación: se borra historia cruda, no los totales"""
+    db, db_path, fast, slow = _create_db(tmp_path)
+    tracker = UsageTracker(str(db_path))
+
+    raw_deleted, hourly_deleted = tracker.compact_history(raw_days=90, hourly_days=90)
+
+    assert raw_deleted == 2 and hourly_deleted == 1
+    assert tracker.get_total_executions() == 5
+    assert tracker.get_error_count(slow) == 1
+    assert len(tracker.get_usage_history(slow)) == 0
@@ -0,0 +1,151 @@
+"""
+Script de testing para el registro de uso en segundo plano (write-behind)
+Verifica agrupación de usos, flush explícito y modo de durabilidad síncrono
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.usage_tracker import UsageTracker, UsageWriteQueue, DURABILITY_SYNC
+
+
+def _create_db(tmp_path):
+    """Crear base de datos temporal con dos items"""
+    db_path = tmp_path / "usage.db"
+    db = DBManager(str(db_path))
+    category_id = db.add_category("Usage Test")
+    conn = db.connect()
+    for label in ("uno", "dos"):
+        conn.execute(
+            "INSERT INTO items (category_id, label, content) VALUES (?, ?, ?)",
+            (category_id, label, label)
+        )
+    conn.commit()
+    return db, db_path
+
+
+def test_flush_groups_use_count_and_writes_history(tmp_path):
+    """Test de flush: un INSERT por evento y use_count agrupado por item"""
+    db, db_path = _create_db(tmp_path)
+    queue = UsageWriteQueue(db_path)
+
+    for _ in range(3):
+        queue.put(1, execution_time_ms=5)
+    queue.put(2, success=False, error_message="boom")
+
+    assert queue.pending_usage(1)[0] == 3
+    assert queue.flush() == 4
+    assert queue.pending_usage(1)[0] == 0
+
+    assert db.get_item(1)['use_count'] == 3
+    assert db.get_item(2)['use_count'] == 1
+    history = db.execute_query("SELECT * FROM item_usage_history ORDER BY id")
+    assert len(history) == 4
+    assert history[-1]['success'] == 0
+    assert history[-1]['error_message'] == "boom"
+    queue.stop()
+
+
+def test_tracker_counts_pending_uses(tmp_path):
+    """Test de get_use_count incluyendo usos aún no escritos"""
+    db, db_path = _create_db(tmp_path)
+    tracker = UsageTracker(str(db_path))
+
+    tracker.track_usage(1)
+    tracker.track_usage(1)
+    assert tracker.get_use_count(1) == 2
+
+    tracker.flush()
+    assert db.get_item(1)['use_count'] == 2
+    assert tracker.get_use_count(1) == 2
+
+
+def test_sync_durability_writes_immediately(tmp_path):
+    """Test de modo síncrono: el uso está en la base al retornar"""
+    db, db_path = _create_db(tmp_path)
+    tracker = UsageTracker(str(db_path), durability=DURABILITY_SYNC)
+
+    assert tracker.track_usage(2) is True
+    assert db.get_item(2)['use_count'] == 1
+
+
+def test_flush_skips_deleted_items(tmp_path):
+    """Test de eventos de items eliminados mientras estaban en cola"""
+    db, db_path = _create_db(tmp_path)
+    queue = UsageWriteQueue(db_path)
+
+    queue.put(1)
+    queue.put(999)
+    assert queue.flush() == 2
+
+    history = db.execute_query("SELECT item_id FROM item_usage_history")
+    assert [row['item_id'] for row in history] == [1]
+    queue.stop()
+
+
+def test_failed_flush_rolls_back_and_retries(tmp_path):
+    """Test de flush fallido: sin cambios a medias y los eventos se reintentan"""
+    db, db_path = _create_db(tmp_path)
+    queue = UsageWriteQueue(db_path)
+    conn = db.connect()
+    conn.execute("ALTER TABLE item_usage_history RENAME TO item_usage_history_off")
+    conn.commit()
+
+    queue.put(1)
+    queue.put(2)
+    assert queue.flush() == 0  # El UPDATE se aplica, el INSERT falla
+    assert db.get_item(1)['use_count'] == 0
+    assert queue.pending_usage(1)[0] == 1
+
+    queue.put(1)
+    conn.execute("ALTER TABLE item_usage_history_off RENAME TO item_usage_history")
+    conn.commit()
+    assert queue.flush() == 3
+
+    assert db.get_item(1)['use_count'] == 2
+    assert db.get_item(2)['use_count'] == 1
+    history = db.execute_query("SELECT item_id FROM item_usage_history ORDER BY id")
+    assert [row['item_id'] for row in history] == [1, 2, 1]
+    queue.stop()
+
+
+def test_permanent_failure_drops_events(tmp_path):
+    """Test de error permanente: tras MAX_FLUSH_RETRIES flushes fallidos se descartan los eventos"""
+    db, db_path = _create_db(tmp_path)
+    queue = UsageWriteQueue(db_path)
+    conn = db.connect()
+    conn.execute("ALTER TABLE item_usage_history RENAME TO item_usage_history_off")
+    conn.commit()
+
+    queue.put(1)
+    queue.put(2)
+    for _ in range(UsageWriteQueue.MAX_FLUSH_RETRIES - 1):
+        assert queue.flush() == 0
+        assert queue.pending_usage(1)[0] == 1
+    assert queue.flush() == 0
+
+    assert queue.pending_usage(1)[0] == 0 and queue.pending_usage(2)[0] == 0
+    assert queue.dropped_events == 2
+    assert db.get_item(1)['use_count'] == 0
+    queue.stop()
+
+
+def test_pending_queue_is_bounded(tmp_path, monkeypatch):
+    """Test de cola llena: se descartan los eventos más antiguos"""
+    _, db_path = _create_db(tmp_path)
+    queue = UsageWriteQueue(db_path)
+    monkeypatch.setattr(UsageWriteQueue, "MAX_PENDING", 3)
+    monkeypatch.setattr(UsageWriteQueue, "FLUSH_INTERVAL", 60.0)  # Sin flush por tiempo
+
+    for item_id in (1, 1, 2, 2, 2):
+        queue.put(item_id)
+
+    assert queue.pending_usage(1)[0] == 0
+    assert queue.pending_usage(2)[0] == 3
+    assert queue.dropped_events == 2
+    queue.stop()